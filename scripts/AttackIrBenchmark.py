@@ -0,0 +1,1140 @@
+#!/usr/bin/env python
+# coding: utf-8
+import argparse
+import contextlib
+import datetime
+import functools
+import http.server
+import importlib.util
+import io
+import json
+import os
+import pickle
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+import zipfile
+
+script_path = os.path.dirname(os.path.abspath(__file__))
+import_time_budget = 0.15
+incremental_ratio_budget = 0.5
+list_attack_tactics = ["initial-access", "execution", "persistence", "privilege-escalation", "defense-evasion", "credential-access", "discovery", "lateral-movement", "collection", "command-and-control", "exfiltration", "impact"]
+dict_resources_url_paths = {
+    "helper_enterprise_attack.json": "attack/enterprise-attack/enterprise-attack.json",
+    "helper_cis_controls_mapping.json": "cis/cis-controls-8-enterprise-attack-12.json",
+    "helper_nist_attack_mapping.json": "nist/frameworks/attack_10_1/nist800_53_r5/stix/nist800-53-r5-enterprise-attack.json",
+    "helper_ossem_attack_mapping.json": "ossem/use-cases/mitre_attack/techniques_to_events_mapping.json",
+    "helper_atomicred_attack_mapping.json": "atomicred/atomics/Indexes/Attack-Navigator-Layers/art-navigator-layer.json"
+}
+
+def get_attackirreporting(working_path):
+    """
+    This function imports a fresh instance of AttackIrReporting working in the given folder, the script resolves its folders from the working folder at import.
+    The templates are copied into the working folder.
+    """
+    if not os.path.isdir(os.path.join(working_path, "templates")):
+        shutil.copytree(os.path.join(os.path.dirname(script_path), "templates"), os.path.join(working_path, "templates"))
+    current_path = os.getcwd()
+    os.chdir(working_path)
+    try:
+        spec = importlib.util.spec_from_file_location("AttackIrReporting", os.path.join(script_path, "AttackIrReporting.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(current_path)
+    return module
+
+def new_synthetic_resources(resources_path, techniques=600, mitigations=45, data_sources=40, filler_objects=10000, seed=1):
+    """
+    This function generates synthetic resource files with the structure of the ATT&CK(r) Enterprise bundle and of the CIS, NIST, OSSEM-DM and Atomic Red Team mappings.
+    The sizes are configurable so the behaviour can be measured as ATT&CK(r) grows. The generation is deterministic for a given seed.
+
+    :param resources_path: str, the folder receiving the five resource files
+    :param techniques: int, the number of (Sub-)Techniques. Default value is 600.
+    :param mitigations: int, the number of mitigations. Default value is 45.
+    :param data_sources: int, the number of data sources, each with four data components. Default value is 40.
+    :param filler_objects: int, the number of groups, software and uses relationships the report never reads. Default value is 10000.
+    :param seed: int, the seed of the generator. Default value is 1.
+    :return: list, the ATT&CK(r) IDs of the active (Sub-)Techniques
+    """
+    generator = random.Random(seed)
+    def new_stix_id(stix_type):
+        return stix_type + "--" + str(uuid.UUID(int=generator.getrandbits(128), version=4))
+    os.makedirs(resources_path, exist_ok=True)
+    array_obj_attack = [{"type": "x-mitre-collection", "id": new_stix_id("x-mitre-collection"), "name": "Enterprise ATT&CK", "modified": "2023-04-25T14:00:00.188Z", "x_mitre_version": "13.1"}]
+    array_obj_techniques = []
+    list_attack_ids = []
+    for index in range(techniques):
+        parent_id = 1000 + index // 3
+        attack_id = "T" + str(parent_id) if index % 3 == 0 else "T" + str(parent_id) + ".00" + str(index % 3)
+        obj_technique = {
+            "type": "attack-pattern",
+            "id": new_stix_id("attack-pattern"),
+            "name": "Synthetic Technique " + str(index),
+            "modified": "2023-04-25T14:00:00.188Z",
+            "description": "Adversaries may perform synthetic technique " + str(index) + ". (Citation: Synthetic " + str(index) + ")\n\nSee [Synthetic](https://example.com/" + str(index) + ") running <code>cmd.exe /c " + str(index) + "</code>.",
+            "kill_chain_phases": [{"kill_chain_name": "mitre-attack", "phase_name": tactic} for tactic in generator.sample(list_attack_tactics, generator.choice([1, 1, 1, 2, 3]))],
+            "external_references": [{"source_name": "mitre-attack", "external_id": attack_id, "url": "https://attack.mitre.org/techniques/" + attack_id.replace(".", "/")}]
+        }
+        array_obj_attack.append(obj_technique)
+        array_obj_techniques.append(obj_technique)
+        list_attack_ids.append(attack_id)
+    for index in range(max(1, techniques // 50)):
+        obj_revoked = {
+            "type": "attack-pattern",
+            "id": new_stix_id("attack-pattern"),
+            "name": "Revoked Technique " + str(index),
+            "revoked": True,
+            "kill_chain_phases": [{"kill_chain_name": "mitre-attack", "phase_name": "execution"}],
+            "external_references": [{"source_name": "mitre-attack", "external_id": "T0" + str(900 + index), "url": "https://attack.mitre.org/techniques/T0" + str(900 + index)}]
+        }
+        array_obj_attack.append(obj_revoked)
+        array_obj_attack.append({"type": "relationship", "id": new_stix_id("relationship"), "relationship_type": "revoked-by", "source_ref": obj_revoked["id"], "target_ref": generator.choice(array_obj_techniques)["id"]})
+    array_obj_mitigations = []
+    for index in range(mitigations):
+        obj_mitigation = {
+            "type": "course-of-action",
+            "id": new_stix_id("course-of-action"),
+            "name": "Synthetic Mitigation " + str(index),
+            "description": "Synthetic mitigation " + str(index) + ".",
+            "external_references": [{"source_name": "mitre-attack", "external_id": "M" + str(1000 + index), "url": "https://attack.mitre.org/mitigations/M" + str(1000 + index)}]
+        }
+        array_obj_attack.append(obj_mitigation)
+        array_obj_mitigations.append(obj_mitigation)
+    for obj_technique in array_obj_techniques:
+        for obj_mitigation in generator.sample(array_obj_mitigations, min(len(array_obj_mitigations), generator.randint(0, 5))):
+            array_obj_attack.append({"type": "relationship", "id": new_stix_id("relationship"), "relationship_type": "mitigates", "source_ref": obj_mitigation["id"], "target_ref": obj_technique["id"], "modified": "2023-04-25T14:00:00.188Z", "description": "Apply " + obj_mitigation["name"] + " against " + obj_technique["name"] + ". (Citation: Synthetic)\n\nReview regularly."})
+    array_obj_data_components = []
+    for index in range(data_sources):
+        obj_data_source = {
+            "type": "x-mitre-data-source",
+            "id": new_stix_id("x-mitre-data-source"),
+            "name": "Synthetic Data Source " + str(index),
+            "x_mitre_platforms": generator.sample(["Windows", "Linux", "macOS", "IaaS", "Containers"], generator.randint(1, 3)),
+            "x_mitre_collection_layers": generator.sample(["Host", "Network", "Cloud Control Plane"], generator.randint(1, 2)),
+            "external_references": [{"source_name": "mitre-attack", "external_id": "DS" + str(index).zfill(4), "url": "https://attack.mitre.org/datasources/DS" + str(index).zfill(4)}]
+        }
+        array_obj_attack.append(obj_data_source)
+        for component in range(4):
+            obj_data_component = {"type": "x-mitre-data-component", "id": new_stix_id("x-mitre-data-component"), "name": "Synthetic Component " + str(index) + " " + str(component), "x_mitre_data_source_ref": obj_data_source["id"]}
+            array_obj_attack.append(obj_data_component)
+            array_obj_data_components.append(obj_data_component)
+    dict_obj_detections = {}
+    for obj_technique in array_obj_techniques:
+        list_components = generator.sample(array_obj_data_components, min(len(array_obj_data_components), generator.randint(1, 5)))
+        dict_obj_detections[obj_technique["id"]] = list_components
+        for obj_data_component in list_components:
+            description = "Monitor " + obj_data_component["name"] + " for " + obj_technique["name"] + ". (Citation: Synthetic)"
+            if generator.random() < 0.4:
+                description += "\n\n<h4> Implementation 1 : Synthetic Analytic </h4>\n<h5>Detection Pseudocode</h5>\n<code>processes = search Process:Create\nsynthetic = filter processes where (exe == \"synthetic.exe\")</code>\n<h4>Detection Notes</h4>\n\n- None.\n"
+            array_obj_attack.append({"type": "relationship", "id": new_stix_id("relationship"), "relationship_type": "detects", "source_ref": obj_data_component["id"], "target_ref": obj_technique["id"], "modified": "2023-04-25T14:00:00.188Z", "description": description})
+    for index in range(filler_objects // 2):
+        obj_group = {"type": "intrusion-set", "id": new_stix_id("intrusion-set"), "name": "Synthetic Group " + str(index), "description": "Synthetic group " + str(index) + " used for size only."}
+        array_obj_attack.append(obj_group)
+        array_obj_attack.append({"type": "relationship", "id": new_stix_id("relationship"), "relationship_type": "uses", "source_ref": obj_group["id"], "target_ref": generator.choice(array_obj_techniques)["id"], "description": "Synthetic Group " + str(index) + " used this technique."})
+    with open(os.path.join(resources_path, "helper_enterprise_attack.json"), 'w', encoding='utf-8') as f:
+        json.dump({"type": "bundle", "id": new_stix_id("bundle"), "spec_version": "2.1", "objects": array_obj_attack}, f)
+    array_obj_cis = []
+    array_obj_cis_controls = []
+    for index in range(150):
+        obj_cis_control = {"type": "course-of-action", "id": new_stix_id("course-of-action"), "name": "Synthetic CIS Safeguard " + str(index), "x_cis_ig": "IG" + str(index % 3 + 1), "external_references": [{"source_name": "CIS Controls", "external_id": str(index // 10 + 1) + "." + str(index % 10 + 1)}]}
+        array_obj_cis.append(obj_cis_control)
+        array_obj_cis_controls.append(obj_cis_control)
+    for obj_mitigation in array_obj_mitigations:
+        for obj_cis_control in generator.sample(array_obj_cis_controls, generator.randint(0, 8)):
+            array_obj_cis.append({"type": "relationship", "id": new_stix_id("relationship"), "relationship_type": "mitigates", "source_ref": obj_cis_control["id"], "target_ref": obj_mitigation["id"]})
+    with open(os.path.join(resources_path, "helper_cis_controls_mapping.json"), 'w', encoding='utf-8') as f:
+        json.dump({"type": "bundle", "id": new_stix_id("bundle"), "objects": array_obj_cis}, f)
+    array_obj_nist = []
+    array_obj_nist_controls = []
+    for index in range(300):
+        obj_nist_control = {"type": "course-of-action", "id": new_stix_id("course-of-action"), "name": "Synthetic NIST Control " + str(index), "external_references": [{"source_name": "NIST 800-53 Revision 5", "external_id": "SC-" + str(index)}]}
+        array_obj_nist.append(obj_nist_control)
+        array_obj_nist_controls.append(obj_nist_control)
+    for obj_technique in array_obj_techniques:
+        for obj_nist_control in generator.sample(array_obj_nist_controls, generator.randint(0, 10)):
+            array_obj_nist.append({"type": "relationship", "id": new_stix_id("relationship"), "relationship_type": "mitigates", "source_ref": obj_nist_control["id"], "target_ref": obj_technique["id"]})
+    with open(os.path.join(resources_path, "helper_nist_attack_mapping.json"), 'w', encoding='utf-8') as f:
+        json.dump({"type": "bundle", "id": new_stix_id("bundle"), "objects": array_obj_nist}, f)
+    array_obj_ossem = []
+    for obj_technique, attack_id in zip(array_obj_techniques, list_attack_ids):
+        for obj_data_component in dict_obj_detections[obj_technique["id"]]:
+            for row in range(generator.randint(0, 4)):
+                log_source = generator.choice(["Microsoft-Windows-Security-Auditing", "Microsoft-Windows-Sysmon", "sysmon", "Microsoft Defender for Endpoint"])
+                array_obj_ossem.append({
+                    "technique_id": attack_id,
+                    "x_mitre_version": 13.1,
+                    "technique": obj_technique["name"],
+                    "tactic": [obj_phase["phase_name"] for obj_phase in obj_technique["kill_chain_phases"]],
+                    "data_source": "process",
+                    "data_component": obj_data_component["name"].lower(),
+                    "name": "process created process",
+                    "source": "process",
+                    "relationship": "created",
+                    "target": "process",
+                    "event_id": "DeviceProcessEvents" if log_source == "Microsoft Defender for Endpoint" else 4688 + row,
+                    "event_name": "A new process has been created",
+                    "event_platform": "Windows",
+                    "audit_category": "Detailed Tracking" if row % 2 else float("nan"),
+                    "audit_sub_category": "Process Creation" if row == 1 else float("nan"),
+                    "log_source": log_source,
+                    "channel": "Security" if log_source == "Microsoft-Windows-Security-Auditing" else ("Microsoft-Windows-Sysmon/Operational" if log_source == "Microsoft-Windows-Sysmon" else float("nan")),
+                    "filter_in": [{"ActionType": "ProcessCreated"}] if log_source == "Microsoft Defender for Endpoint" else float("nan")
+                })
+    with open(os.path.join(resources_path, "helper_ossem_attack_mapping.json"), 'w', encoding='utf-8') as f:
+        json.dump(array_obj_ossem, f)
+    obj_atomicred = {"name": "Atomic Red Team (Synthetic)", "domain": "enterprise-attack", "techniques": []}
+    for attack_id in list_attack_ids[::2]:
+        obj_atomicred["techniques"].append({"techniqueID": attack_id, "score": 100, "enabled": True, "links": [{"label": "View Atomic", "url": "https://github.com/redcanaryco/atomic-red-team/blob/master/atomics/" + attack_id + "/" + attack_id + ".md"}]})
+    with open(os.path.join(resources_path, "helper_atomicred_attack_mapping.json"), 'w', encoding='utf-8') as f:
+        json.dump(obj_atomicred, f)
+    return list_attack_ids
+
+class QuietHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+@contextlib.contextmanager
+def get_local_http_server(served_path):
+    """
+    This function serves a folder over HTTP on localhost as a stand-in for the resource hosts, it supports If-Modified-Since requests.
+
+    :param served_path: str, the folder to serve
+    :return: str, the base URL of the server
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHTTPRequestHandler, directory=served_path))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield "http://127.0.0.1:" + str(server.server_address[1])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def bench_import(runs=5, budget=import_time_budget):
+    """
+    This function measures the time needed to import AttackIrReporting in a fresh interpreter and verifies the import has no side effects.
+    Every run starts from an empty working folder, the import must not create any folder nor load python-docx.
+
+    :param runs: int, the number of measured imports. Default value is 5.
+    :param budget: float, the maximum accepted import time in seconds. Default value is 0.15.
+    :return: dict, the measured import times and whether the budget is respected
+    """
+    code_import = (
+        "import sys, time, os\n"
+        "sys.path.insert(0, " + repr(script_path) + ")\n"
+        "start = time.perf_counter()\n"
+        "import AttackIrReporting\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(elapsed, int('docx' in sys.modules), len(os.listdir('.')))\n"
+    )
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    list_import_times = []
+    list_side_effects = []
+    with tempfile.TemporaryDirectory() as working_path:
+        # The first import compiles the script, only the following imports are measured
+        subprocess.run([sys.executable, "-c", code_import], cwd=working_path, env=env, check=True, capture_output=True)
+        for run in range(runs):
+            with tempfile.TemporaryDirectory() as run_path:
+                result = subprocess.run([sys.executable, "-c", code_import], cwd=run_path, env=env, check=True, capture_output=True, text=True)
+                elapsed, docx_loaded, created_entries = result.stdout.split()
+                list_import_times.append(float(elapsed))
+                if int(docx_loaded):
+                    list_side_effects.append("python-docx imported")
+                if int(created_entries):
+                    list_side_effects.append("working folder modified")
+    obj_result = {
+        "runs": runs,
+        "budget": budget,
+        "best": min(list_import_times),
+        "median": sorted(list_import_times)[len(list_import_times) // 2],
+        "side_effects": sorted(set(list_side_effects))
+    }
+    obj_result["passed"] = obj_result["median"] <= budget and not obj_result["side_effects"]
+    return obj_result
+
+def bench_downloads(techniques=600, filler_objects=10000):
+    """
+    This function measures get_resources() against a local stand-in HTTP server serving synthetic resources.
+    It times the initial downloads and a forced refresh of all resources, which is answered with 304 Not Modified as the served files did not change.
+
+    :param techniques: int, the number of synthetic (Sub-)Techniques. Default value is 600.
+    :param filler_objects: int, the number of synthetic filler objects. Default value is 10000.
+    :return: dict, the measured times and the number of replaced files
+    """
+    with tempfile.TemporaryDirectory() as working_path:
+        served_path = os.path.join(working_path, "served")
+        new_synthetic_resources(os.path.join(working_path, "synthetic"), techniques=techniques, filler_objects=filler_objects)
+        for file_name, url_path in dict_resources_url_paths.items():
+            os.makedirs(os.path.dirname(os.path.join(served_path, url_path)), exist_ok=True)
+            shutil.copy(os.path.join(working_path, "synthetic", file_name), os.path.join(served_path, url_path))
+        module = get_attackirreporting(working_path)
+        with get_local_http_server(served_path) as url_base:
+            module.url_base_attack_stix_data = url_base + "/attack"
+            module.url_base_cis_controls = url_base + "/cis"
+            module.url_base_nist_controls = url_base + "/nist"
+            module.url_base_ossem = url_base + "/ossem"
+            module.url_base_atomicred = url_base + "/atomicred"
+            with contextlib.redirect_stdout(io.StringIO()):
+                time_start = time.perf_counter()
+                module.get_resources()
+                time_initial = time.perf_counter() - time_start
+                dict_mtimes = {file_json: os.stat(file_json).st_mtime_ns for file_json in module.list_file_json_helper_resources}
+                time_start = time.perf_counter()
+                module.get_resources(attack_force=True, cis_force=True, nist_force=True, ossem_force=True, atomicred_force=True)
+                time_refresh = time.perf_counter() - time_start
+        return {
+            "bytes": sum(os.path.getsize(file_json) for file_json in module.list_file_json_helper_resources),
+            "initial": time_initial,
+            "forced_refresh": time_refresh,
+            "replaced_on_refresh": len([file_json for file_json in module.list_file_json_helper_resources if os.stat(file_json).st_mtime_ns != dict_mtimes[file_json]])
+        }
+
+def get_mitigations_scan(array_obj_mitigations, array_obj_complete_cis_controls_mapping, array_obj_complete_nist_mapping):
+    """
+    This function resolves the CIS Controls and NIST controls of the mitigation relationships by scanning the mappings, as new_attackmitigationsconstruct() did before the join tables.
+    It is the reference the join tables are measured and verified against.
+    """
+    array_obj_controls = []
+    for mitigation in array_obj_mitigations:
+        array_obj_filtered_cis_controls_mapping = [obj for obj in array_obj_complete_cis_controls_mapping['objects'] if obj.get('target_ref', '') == mitigation['source_ref']]
+        array_cis_content = []
+        for mapping in array_obj_filtered_cis_controls_mapping:
+            obj_complete_cis_control = [obj for obj in array_obj_complete_cis_controls_mapping['objects'] if obj['type'] == 'course-of-action']
+            obj_complete_cis_control = [obj for obj in obj_complete_cis_control if obj.get('id', '') == mapping['source_ref']]
+            array_cis_content.append(obj_complete_cis_control[0]["external_references"][0]["external_id"] + " " + obj_complete_cis_control[0]["name"])
+        nist_coas = [obj for obj in array_obj_complete_nist_mapping["objects"] if obj.get("relationship_type") == "mitigates"]
+        nist_coas = [obj for obj in nist_coas if obj.get('target_ref', '') == mitigation['target_ref']]
+        array_nist_content = []
+        for coa in nist_coas:
+            nist_coa_block = [obj for obj in array_obj_complete_nist_mapping["objects"] if obj.get("type") == "course-of-action"]
+            nist_coa_block = [obj for obj in nist_coa_block if obj.get('id', '') == coa['source_ref']]
+            array_nist_content.append(nist_coa_block[0]["external_references"][0]["external_id"] + " " + nist_coa_block[0]["name"])
+        array_obj_controls.append((array_cis_content, sorted(array_nist_content)))
+    return array_obj_controls
+
+def bench_mitigations(techniques=100):
+    """
+    This function measures the mitigation stage of a case with the given number of synthetic (Sub-)Techniques.
+    The CIS Controls and NIST controls resolved through the join tables are verified against the scans over the mappings, both are timed for the same mitigations.
+
+    :param techniques: int, the number of (Sub-)Techniques of the case. Default value is 100.
+    :return: dict, the measured times and the speedup of the join tables over the scans
+    """
+    with tempfile.TemporaryDirectory() as working_path:
+        list_attack_ids = new_synthetic_resources(os.path.join(working_path, "resources"))
+        module = get_attackirreporting(working_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.set_attack_empty(";".join(list_attack_ids[:techniques]), tactic_pairs={})
+            time_start = time.perf_counter()
+            module.new_attackmitigationsconstruct()
+            time_construct = time.perf_counter() - time_start
+        dict_attack_patterns = {attack_pattern["id"]: attack_pattern for attack_pattern in module.case_session.array_obj_filtered_mapping_external_id_attack_pattern}
+        array_obj_mitigations = [obj for obj in module.get_attackknowledgebase_relationships("mitigates", dict_attack_patterns) if obj.get("x_mitre_deprecated") != True]
+        time_start = time.perf_counter()
+        array_obj_joined = [([cis_control["cis_control_id"] + " " + cis_control["cis_control_name"] for cis_control in module.obj_attack_controls_join["cis_controls_by_mitigation"].get(mitigation['source_ref'], [])], module.obj_attack_controls_join["nist_controls_by_technique"].get(mitigation['target_ref'], [])) for mitigation in array_obj_mitigations]
+        time_join = time.perf_counter() - time_start
+        with open(module.file_json_helper_cis_controls_mapping, 'r', encoding='utf-8') as f:
+            array_obj_complete_cis_controls_mapping = json.load(f)
+        with open(module.file_json_helper_nist_mapping, 'r', encoding='utf-8') as f:
+            array_obj_complete_nist_mapping = json.load(f)
+        time_start = time.perf_counter()
+        array_obj_scanned = get_mitigations_scan(array_obj_mitigations, array_obj_complete_cis_controls_mapping, array_obj_complete_nist_mapping)
+        time_scan = time.perf_counter() - time_start
+        return {
+            "techniques": techniques,
+            "mitigations": len(array_obj_mitigations),
+            "construct": time_construct,
+            "controls_join": time_join,
+            "controls_scan": time_scan,
+            "speedup": time_scan / time_join if time_join else None,
+            "identical": array_obj_joined == array_obj_scanned
+        }
+
+def bench_ossem(techniques=100):
+    """
+    This function measures the memory of the OSSEM-DM mapping as a list of dicts and as the columnar store, and the lookups of the detections annex of a case with the given number of synthetic (Sub-)Techniques.
+    The rows of the store are verified against a scan over the list of dicts.
+
+    :param techniques: int, the number of (Sub-)Techniques of the case. Default value is 100.
+    :return: dict, the memory of both forms in bytes and the lookup times
+    """
+    with tempfile.TemporaryDirectory() as working_path:
+        list_attack_ids = new_synthetic_resources(os.path.join(working_path, "resources"))
+        module = get_attackirreporting(working_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.set_attack_empty(";".join(list_attack_ids[:techniques]), tactic_pairs={})
+            module.new_attackdetectionsconstruct()
+        tracemalloc.start()
+        with open(module.file_json_helper_ossem_mapping_array, 'r', encoding='utf-8') as f:
+            array_obj_complete_ossem_mapping = json.load(f)
+        memory_list = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        # The store is measured as loaded from the compiled cache, owning its values
+        pickle_ossem_mapping_store = pickle.dumps(module.new_ossemmappingstore(array_obj_complete_ossem_mapping), protocol=pickle.HIGHEST_PROTOCOL)
+        tracemalloc.start()
+        obj_ossem_mapping_store = pickle.loads(pickle_ossem_mapping_store)
+        memory_store = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        module.obj_ossem_mapping_store = obj_ossem_mapping_store
+        list_keys = [(item["combined_attack"], item["name"].lower()) for item in module.case_session.array_obj_condensed_detections]
+        time_start = time.perf_counter()
+        array_obj_scanned = [[{field: ossem_obj[field] for field in module.list_ossem_mapping_fields} for ossem_obj in array_obj_complete_ossem_mapping if ossem_obj["technique_id"] == technique_id and str(ossem_obj["data_component"]) == data_component] for technique_id, data_component in list_keys]
+        time_scan = time.perf_counter() - time_start
+        time_start = time.perf_counter()
+        array_obj_stored = [module.get_ossemmappingstore_rows(technique_id, data_component) for technique_id, data_component in list_keys]
+        time_store = time.perf_counter() - time_start
+        return {
+            "rows": len(array_obj_complete_ossem_mapping),
+            "memory_list": memory_list,
+            "memory_store": memory_store,
+            "lookups": len(list_keys),
+            "lookups_scan": time_scan,
+            "lookups_store": time_store,
+            "identical": json.dumps(array_obj_scanned) == json.dumps(array_obj_stored)
+        }
+
+def bench_attackflow(list_actions=(500, 1000, 2000, 4000)):
+    """
+    This function measures the generation of CTID ATT&CK(r) Flow files with growing numbers of actions, named with quotes and backslashes, and verifies that every file is valid JSON holding all actions and assets.
+
+    :param list_actions: tuple, the numbers of actions to generate. Default value is (500, 1000, 2000, 4000).
+    :return: dict, the time, size and validity per number of actions
+    """
+    obj_results = {}
+    with tempfile.TemporaryDirectory() as working_path:
+        module = get_attackirreporting(working_path)
+        module.case_session.document_prefix_content = 'Benchmark "flow"'
+        for actions in list_actions:
+            module.case_session.document_prefix = "benchmark_" + str(actions) + "_"
+            module.case_session.array_obj_sorted_construct = [{"guid": str(uuid.uuid4()), "attack_name": 'Technique "' + str(index) + '" \\ C:\\Temp', "attack_id": "T" + str(1000 + index), "attack_tactics": [list_attack_tactics[index % len(list_attack_tactics)]]} for index in range(actions)]
+            time_start = time.perf_counter()
+            module.new_ctidattackflow('SRV "01";Obsolete Device')
+            time_flow = time.perf_counter() - time_start
+            file_afb_ctid_flow = os.path.join(module.get_case_path(), module.case_session.document_prefix + "ctid_attack_flow.afb")
+            try:
+                with open(file_afb_ctid_flow, 'r', encoding='utf-8') as f:
+                    obj_flow = json.load(f)
+                valid = len(obj_flow["objects"]) == 1 + 13 * (actions + 2) and obj_flow["objects"][1]["properties"][0][1] == module.case_session.array_obj_sorted_construct[0]["attack_name"]
+            except (ValueError, KeyError, IndexError):
+                valid = False
+            obj_results[str(actions)] = {"time": time_flow, "bytes": os.path.getsize(file_afb_ctid_flow), "valid": valid}
+    return obj_results
+
+def get_mitigations_table_reference(module, document, array_obj_mitigations):
+    """
+    This function writes the Mitigations Overview rows the way python-docx does it by default, with add_row, merge and relate_to on every row.
+
+    :return: the python-docx table
+    """
+    docx = module.get_docx()
+    table_mitigations = document.add_table(rows=0,cols=3)
+    table_mitigations.style = 'Table Grid'
+    for mitigation in array_obj_mitigations:
+        row_cells = table_mitigations.add_row().cells
+        row_cells[0].paragraphs[0].add_run(mitigation["external_id"] + ": " + mitigation["name"]).bold = True
+        for cell, text, url in ((row_cells[1], mitigation['external_id'], mitigation['url']), (row_cells[2], mitigation['attack_id'], "https://attack.mitre.org/techniques/" + mitigation["attack_id"].replace(".", "/"))):
+            r_id = document.part.relate_to(url, docx.opc.constants.RELATIONSHIP_TYPE.HYPERLINK, is_external=True)
+            hyperlink = docx.oxml.shared.OxmlElement('w:hyperlink')
+            hyperlink.set(docx.oxml.shared.qn('r:id'), r_id, )
+            new_run = docx.oxml.shared.OxmlElement('w:r')
+            new_run.append(docx.oxml.shared.OxmlElement('w:rPr'))
+            new_run.text = text
+            hyperlink.append(new_run)
+            r = cell.paragraphs[0].add_run ()
+            r._r.append (hyperlink)
+            r.font.color.theme_color = docx.enum.dml.MSO_THEME_COLOR_INDEX.HYPERLINK
+            r.font.underline = True
+        for key in ("description", "cis_control", "nist_control"):
+            row_cells = table_mitigations.add_row().cells
+            row_cells[0].merge(row_cells[2])
+            row_cells[0].text = mitigation[key]
+    return table_mitigations
+
+def bench_tables(list_mitigations=(250, 500, 1000, 2000)):
+    """
+    This function measures the mitigations annex with growing numbers of mitigations, four table rows and two hyperlinks each.
+    The rows written from the row prototypes are verified against the rows python-docx writes by default for the smallest number of mitigations, both are timed.
+
+    :param list_mitigations: tuple, the numbers of mitigations of the annex. Default value is (250, 500, 1000, 2000).
+    :return: dict, the time, the time per row and the validity per number of mitigations
+    """
+    obj_results = {}
+    with tempfile.TemporaryDirectory() as working_path:
+        module = get_attackirreporting(working_path)
+        docx = module.get_docx()
+        module.case_session.switch_control_mapping_selection = "CN"
+        module.case_session.array_obj_complete_cis_controls_prio_sorted = []
+        for mitigations in list_mitigations:
+            module.case_session.document_prefix = "benchmark_" + str(mitigations) + "_"
+            module.case_session.array_obj_sorted_mitigations = [{
+                "external_id": "M" + str(1000 + index % 45), "name": "Mitigation " + str(index % 45), "url": "https://attack.mitre.org/mitigations/M" + str(1000 + index % 45),
+                "attack_id": "T" + str(1000 + index // 3) + ("." + str(index % 3 + 1).zfill(3) if index % 2 else ""),
+                "description": "Mitigation " + str(index) + " description.", "cis_control": "1.1 CIS control\n2.2 CIS control", "nist_control": "AC-2 Account Management"
+            } for index in range(mitigations)]
+            time_start = time.perf_counter()
+            module.new_attackdocmitigations(None, None, interactive=False, construct=False)
+            time_table = time.perf_counter() - time_start
+            file_docx_mitigations = os.path.join(module.get_case_path(), module.case_session.document_prefix + "mitigations.docx")
+            document = docx.Document(file_docx_mitigations)
+            list_urls = {mitigation["url"] for mitigation in module.case_session.array_obj_sorted_mitigations} | {"https://attack.mitre.org/techniques/" + mitigation["attack_id"].replace(".", "/") for mitigation in module.case_session.array_obj_sorted_mitigations}
+            list_hyperlinks = [rel for rel in document.part.rels.values() if rel.reltype == docx.opc.constants.RELATIONSHIP_TYPE.HYPERLINK]
+            valid = len(document.tables[0].rows) == 4 + 4 * mitigations and len(list_hyperlinks) == len(list_urls)
+            obj_results[str(mitigations)] = {"rows": 4 * mitigations, "time": time_table, "time_per_row": time_table / (4 * mitigations), "valid": valid}
+        mitigations = min(list_mitigations)
+        module.case_session.array_obj_sorted_mitigations = module.case_session.array_obj_sorted_mitigations[:mitigations]
+        document = docx.Document(module.file_docx_template)
+        time_start = time.perf_counter()
+        table_reference = get_mitigations_table_reference(module, document, module.case_session.array_obj_sorted_mitigations)
+        time_reference = time.perf_counter() - time_start
+        document = docx.Document(module.file_docx_template)
+        table_prototypes = document.add_table(rows=0,cols=3)
+        table_prototypes.style = 'Table Grid'
+        time_start = time.perf_counter()
+        for mitigation in module.case_session.array_obj_sorted_mitigations:
+            list_row_cells = module.add_table_rows(table_prototypes, [None, (0, 2), (0, 2), (0, 2)])
+            list_row_cells[0][0].paragraphs[0].add_run(mitigation["external_id"] + ": " + mitigation["name"]).bold = True
+            module.add_hyperlink(list_row_cells[0][1].paragraphs[0], mitigation['external_id'], mitigation['url'])
+            module.add_hyperlink(list_row_cells[0][2].paragraphs[0], mitigation['attack_id'], "https://attack.mitre.org/techniques/" + mitigation["attack_id"].replace(".", "/"))
+            list_row_cells[1][0].text = mitigation["description"]
+            list_row_cells[2][0].text = mitigation["cis_control"]
+            list_row_cells[3][0].text = mitigation["nist_control"]
+        time_prototypes = time.perf_counter() - time_start
+        obj_results["reference"] = {
+            "rows": 4 * mitigations,
+            "add_row": time_reference,
+            "prototypes": time_prototypes,
+            "identical": table_reference._tbl.xml == table_prototypes._tbl.xml
+        }
+    return obj_results
+
+def bench_template(runs=50):
+    """
+    This function measures new documents parsed from templates/template.docx against new documents copied from the parsed template, and verifies that a change of the template file is picked up.
+
+    :param runs: int, the number of documents of each kind. Default value is 50.
+    :return: dict, the average times and the validity of the copies
+    """
+    with tempfile.TemporaryDirectory() as working_path:
+        module = get_attackirreporting(working_path)
+        docx = module.get_docx()
+        time_start = time.perf_counter()
+        for run in range(runs):
+            document = docx.Document(module.file_docx_template)
+        time_parse = (time.perf_counter() - time_start) / runs
+        module.new_attackdocument()
+        time_start = time.perf_counter()
+        for run in range(runs):
+            document = module.new_attackdocument()
+        time_copy = (time.perf_counter() - time_start) / runs
+        document.add_paragraph("Benchmark")
+        valid = module.new_attackdocument().element.xml == docx.Document(module.file_docx_template).element.xml
+        document_changed = docx.Document(module.file_docx_template)
+        document_changed.add_paragraph("Benchmark")
+        document_changed.save(module.file_docx_template)
+        reloaded = module.new_attackdocument().paragraphs[-1].text == "Benchmark"
+        return {"runs": runs, "parse": time_parse, "copy": time_copy, "valid": valid, "reloaded": reloaded}
+
+def get_session_artifacts(session):
+    """
+    This function returns the content of the documents and the ATT&CK(r) Navigator Layer of a session, keyed by file name.
+    """
+    obj_artifacts = {}
+    for file_name in sorted(os.listdir(session.case_path)):
+        file_path = os.path.join(session.case_path, file_name)
+        if file_name.endswith(".docx"):
+            with zipfile.ZipFile(file_path) as file_docx:
+                obj_artifacts[file_name] = file_docx.read("word/document.xml")
+        elif file_name.endswith("navigator_layer.json"):
+            with open(file_path, 'rb') as f:
+                obj_artifacts[file_name] = f.read()
+    return obj_artifacts
+
+def bench_sessions(sessions=8, techniques=25):
+    """
+    This function verifies the isolation of CaseSession: cases run one after the other and the same cases run interleaved, each in its own session and thread.
+    The documents and ATT&CK(r) Navigator Layers of the interleaved sessions are verified against the sequential ones, the times are reported for reference only, the threads share a single core.
+
+    :param sessions: int, the number of cases. Default value is 8.
+    :param techniques: int, the number of (Sub-)Techniques of each case. Default value is 25.
+    :return: dict, the measured times and the validity of the concurrent sessions
+    """
+    with tempfile.TemporaryDirectory() as working_path:
+        list_attack_ids = new_synthetic_resources(os.path.join(working_path, "resources"))
+        module = get_attackirreporting(working_path)
+        module.get_resources_content()
+        module.get_docx()
+        list_cases = [(";".join(list_attack_ids[case * techniques // 2:][:techniques]), "Session " + str(case), case % 2 == 0, case % 3 == 0) for case in range(sessions)]
+        def new_session_case(session, obj_case):
+            session.set_attack_empty(obj_case[0], tactic_pairs={})
+            session.new_attackrecommendations(obj_case[1], obj_case[2], obj_case[3], interactive=False)
+            session.new_attacknavigatorlayer()
+        current_path = os.getcwd()
+        os.chdir(working_path)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                list_sequential_sessions = [module.CaseSession() for obj_case in list_cases]
+                time_start = time.perf_counter()
+                for session, obj_case in zip(list_sequential_sessions, list_cases):
+                    new_session_case(session, obj_case)
+                time_sequential = time.perf_counter() - time_start
+                list_concurrent_sessions = [module.CaseSession() for obj_case in list_cases]
+                list_threads = [threading.Thread(target=new_session_case, args=(session, obj_case)) for session, obj_case in zip(list_concurrent_sessions, list_cases)]
+                time_start = time.perf_counter()
+                for thread in list_threads:
+                    thread.start()
+                for thread in list_threads:
+                    thread.join()
+                time_concurrent = time.perf_counter() - time_start
+        finally:
+            os.chdir(current_path)
+        valid = all(get_session_artifacts(session_sequential) == get_session_artifacts(session_concurrent) and len(get_session_artifacts(session_concurrent)) == 5 for session_sequential, session_concurrent in zip(list_sequential_sessions, list_concurrent_sessions))
+        return {"sessions": sessions, "techniques": techniques, "sequential": time_sequential, "concurrent": time_concurrent, "valid": valid}
+
+def bench_service(requests=40, concurrency=4, workers=None, techniques=25):
+    """
+    This function measures the report service under load against a cold run generating the same case in a new process, both over synthetic resources.
+    The load test of AttackIrLoadTest sends the requests from concurrent clients and verifies every returned zip.
+
+    :param requests: int, the number of requests. Default value is 40.
+    :param concurrency: int, the number of concurrent clients. Default value is 4.
+    :param workers: int, the number of workers of the service. Default value is the number of processors.
+    :param techniques: int, the number of (Sub-)Techniques of the case. Default value is 25.
+    :return: dict, the time of the cold run, the report time of a job in its worker and the results of the load test
+    """
+    spec = importlib.util.spec_from_file_location("AttackIrLoadTest", os.path.join(script_path, "AttackIrLoadTest.py"))
+    loadtest = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(loadtest)
+    workers = workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as working_path:
+        list_attack_ids = new_synthetic_resources(os.path.join(working_path, "resources"))
+        obj_request = {"prefix": "Service", "techniques": ";".join(list_attack_ids[:techniques]), "assets": "SRV01", "start_time": "2023-01-01T00:00:00Z", "sector": 22, "country": "BE", "detection_source": "host_based", "platform": "windows", "privilege_level": "admin"}
+        file_manifest = os.path.join(working_path, "service.jsonl")
+        with open(file_manifest, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(obj_request) + "\n")
+        module = get_attackirreporting(working_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.get_resources_content()
+        # A cold run pays the interpreter, the resources, the template and the worker pool for a single case
+        time_start = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(script_path, "AttackIrReporting.py"), "--batch", file_manifest, "--workers", "1"], cwd=working_path, check=True, capture_output=True)
+        time_cold = time.perf_counter() - time_start
+        # The workers of the service are forked and find the functions of the module by its name
+        sys.modules["AttackIrReporting"] = module
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                server = module.new_attackservice(port=0, max_workers=workers, queue_size=requests, serve=False)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                obj_loadtest = loadtest.get_loadtest("http://127.0.0.1:" + str(server.server_address[1]), [obj_request], requests, concurrency)
+            finally:
+                server.shutdown()
+                server.server_close()
+                server.obj_service["executor"].shutdown()
+        finally:
+            sys.modules.pop("AttackIrReporting", None)
+    # The report time is the time of a job in its worker, the rest of the cold run is the fixed cost the service avoids
+    time_report = obj_loadtest.pop("service")["latency"]["report"].get("mean")
+    return {
+        "techniques": techniques,
+        "workers": workers,
+        "cold": time_cold,
+        "cold_throughput": 1 / time_cold,
+        "report": time_report,
+        "cold_fixed": time_cold - time_report if time_report else None,
+        "report_throughput": workers / time_report if time_report else None,
+        "loadtest": obj_loadtest,
+        "valid": obj_loadtest["valid"] and obj_loadtest["status"] == {"200": requests}
+    }
+
+def bench_versions(versions=3, changed=0.05):
+    """
+    This function measures the store of ATT&CK(r) versions over synthetic versions of a bundle, every version changing a share of the (Sub-)Techniques and relationships of the previous one.
+    The store is built from the bundles and loaded again by a fresh instance of the script, its knowledge base per version is timed on the first selection and on the following ones, and verified against the knowledge base parsed from the bundle of that version.
+
+    :param versions: int, the number of versions. Default value is 3.
+    :param changed: float, the share of objects changed by every version. Default value is 0.05.
+    :return: dict, the sizes, the numbers of objects, the measured times and memory and the validity of the knowledge bases
+    """
+    with tempfile.TemporaryDirectory() as working_path:
+        new_synthetic_resources(os.path.join(working_path, "resources"))
+        with open(os.path.join(working_path, "resources", "helper_enterprise_attack.json"), 'r', encoding='utf-8') as f:
+            obj_bundle = json.load(f)
+        attack_versions_path = os.path.join(working_path, "resources", "attack_versions")
+        os.makedirs(attack_versions_path)
+        generator = random.Random(1)
+        list_versions = []
+        for version in range(versions):
+            attack_version = str(10 + version) + ".0"
+            if version:
+                for obj in obj_bundle["objects"]:
+                    if obj["type"] in ("attack-pattern", "relationship") and generator.random() < changed:
+                        obj["modified"] = str(2020 + version) + "-01-01T00:00:00.000Z"
+                        obj["description"] = obj.get("description", "") + " Changed in " + attack_version + "."
+            with open(os.path.join(attack_versions_path, "enterprise-attack-" + attack_version + ".json"), 'w', encoding='utf-8') as f:
+                json.dump(obj_bundle, f)
+            list_versions.append(attack_version)
+        module = get_attackirreporting(working_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.get_resources_content()
+            time_start = time.perf_counter()
+            with module.lock_attack_store:
+                obj_attack_store = module.get_attackstore()
+            time_build = time.perf_counter() - time_start
+        obj_results = {
+            "versions": versions,
+            "bundles_bytes": sum(os.path.getsize(module.get_attackstore_file(attack_version)) for attack_version in list_versions),
+            "store_bytes": os.path.getsize(module.file_pickle_helper_attack_store),
+            "objects": sum(len(obj_version["keys"]) for obj_version in obj_attack_store["versions"].values()),
+            "stored_objects": len(obj_attack_store["objects"]),
+            "build": time_build
+        }
+        module = get_attackirreporting(working_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.get_resources_content()
+            tracemalloc.start()
+            time_start = time.perf_counter()
+            for attack_version in list_versions:
+                module.get_attackstore_knowledgebase(attack_version)
+            obj_results["first_selection"] = (time.perf_counter() - time_start) / versions
+            obj_results["store_memory"] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            time_start = time.perf_counter()
+            for attack_version in list_versions * 100:
+                module.get_attackstore_knowledgebase(attack_version)
+            obj_results["selection"] = (time.perf_counter() - time_start) / (versions * 100)
+            tracemalloc.start()
+            time_start = time.perf_counter()
+            list_parsed_knowledgebases = [module.new_attackknowledgebase(module.get_attackbundle_objects(module.get_attackstore_file(attack_version), module.list_attackknowledgebase_types)) for attack_version in list_versions]
+            obj_results["parse"] = (time.perf_counter() - time_start) / versions
+            obj_results["parsed_memory"] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+        obj_results["valid"] = all(module.get_attackstore_knowledgebase(attack_version) == obj_parsed_knowledgebase for attack_version, obj_parsed_knowledgebase in zip(list_versions, list_parsed_knowledgebases))
+    return obj_results
+
+def get_former_rows(session):
+    """
+    This function rebuilds the rows of a session as the dicts used before the records, every row with its own copies of the strings and lists it built.
+    The tactic splits of a (Sub-)Technique share their title and description, as the copies of the former dict did.
+    """
+    def get_copy(value):
+        return value.encode().decode()
+    dict_obj_techniques = {}
+    array_obj_construct = []
+    for record in session.array_obj_sorted_construct:
+        if record["attack_id"] not in dict_obj_techniques:
+            list_attack_tactics = list(record["attack_all_tactics"])
+            dict_obj_techniques[record["attack_id"]] = {"attack_title": get_copy(record["attack_title"]), "attack_description": get_copy(record["attack_description"]), "attack_all_tactics": list_attack_tactics}
+        array_obj_construct.append(dict(record, attack_tactics=list(record["attack_tactics"]), **dict_obj_techniques[record["attack_id"]]))
+    array_obj_mitigations = [dict(record, description=get_copy(record["description"]), cis_control=get_copy(record["cis_control"]), nist_control=get_copy(record["nist_control"])) for record in session.array_obj_sorted_mitigations]
+    array_obj_detections = [dict(record, url=get_copy(record["url"]), reduced_description=list(record["reduced_description"]), car_pseudocode=list(record["car_pseudocode"])) for record in session.array_obj_filtered_mitigations_detections]
+    array_obj_condensed_detections = [dict(record, attack_id=list(record["attack_id"]), description=list(record["description"]), car_pseudocode=list(record["car_pseudocode"])) for record in session.array_obj_condensed_detections]
+    return [array_obj_construct, array_obj_mitigations, array_obj_detections, array_obj_condensed_detections]
+
+def bench_records(cases=50, techniques=25):
+    """
+    This function measures the memory per case of the records of the (Sub-)Techniques, mitigations and detections against the dicts they replace, for cases held at once as on a portfolio run.
+    The memory of the records includes the technique records shared by the cases. The records are verified against the dicts, through a pickle round trip and for the tactic splits sharing their technique record.
+
+    :param cases: int, the number of cases. Default value is 50.
+    :param techniques: int, the number of (Sub-)Techniques of each case. Default value is 25.
+    :return: dict, the number of rows and the traced memory per case of the records and of the dicts
+    """
+    list_row_keys = ["array_obj_sorted_construct", "array_obj_sorted_mitigations", "array_obj_filtered_mitigations_detections", "array_obj_condensed_detections"]
+    with tempfile.TemporaryDirectory() as working_path:
+        list_attack_ids = new_synthetic_resources(os.path.join(working_path, "resources"))
+        module = get_attackirreporting(working_path)
+        current_path = os.getcwd()
+        os.chdir(working_path)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                module.get_resources_content()
+                list_sessions = [module.CaseSession() for case in range(cases)]
+                tracemalloc.start()
+                for case, session in enumerate(list_sessions):
+                    session.set_attack_empty(";".join(list_attack_ids[case * techniques // 4:][:techniques]), tactic_pairs={})
+                    session.new_attackmitigationsconstruct()
+                    session.new_attackdetectionsconstruct()
+        finally:
+            os.chdir(current_path)
+        array_obj_former_rows = [get_former_rows(session) for session in list_sessions]
+        valid = all(json.dumps([[dict(record) for record in getattr(session, key)] for key in list_row_keys]) == json.dumps(obj_former_rows) for session, obj_former_rows in zip(list_sessions, array_obj_former_rows))
+        # The records reach the workers of the parallel mode pickled, pickle finds their classes by the name of the module
+        sys.modules["AttackIrReporting"] = module
+        try:
+            valid = valid and all(pickle.loads(pickle.dumps(getattr(session, key))) == getattr(session, key) for session in list_sessions for key in list_row_keys)
+        finally:
+            sys.modules.pop("AttackIrReporting", None)
+        dict_obj_split_techniques = {}
+        for session in list_sessions:
+            for record in session.array_obj_sorted_construct:
+                dict_obj_split_techniques.setdefault(record["attack_id"], set()).add(id(record.technique))
+        valid = valid and all(len(set_technique_ids) == 1 for set_technique_ids in dict_obj_split_techniques.values())
+        rows = sum(len(getattr(session, key)) for session in list_sessions for key in list_row_keys)
+        memory_traced = tracemalloc.get_traced_memory()[0]
+        array_obj_former_rows = None
+        memory_dicts = memory_traced - tracemalloc.get_traced_memory()[0]
+        memory_traced = tracemalloc.get_traced_memory()[0]
+        for session in list_sessions:
+            for key in list_row_keys:
+                delattr(session, key)
+        module.dict_obj_attack_technique_records.clear()
+        memory_records = memory_traced - tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    return {"cases": cases, "techniques": techniques, "rows": rows / cases, "records_memory": memory_records / cases, "dicts_memory": memory_dicts / cases, "reduction": 1 - memory_records / memory_dicts, "valid": valid}
+
+def get_attackflow_outline(session):
+    """
+    This function returns the objects of the CTID ATT&CK(r) Flow of a session without their random ids: the template, the position, the number of children and the properties of every object.
+    """
+    with open(os.path.join(session.case_path, session.document_prefix + "ctid_attack_flow.afb"), 'r', encoding='utf-8') as f:
+        obj_flow = json.load(f)
+    return [[obj["template"], obj["x"], obj["y"], len(obj["children"]), obj.get("angle"), obj["properties"] if obj["template"] != "flow" else None] for obj in obj_flow["objects"]]
+
+def bench_incremental(techniques=100, added=2):
+    """
+    This function measures an incremental case rerun after (Sub-)Techniques are added, after the same run and after a switch of the controls, against a full run of the same case in a new case folder.
+    The documents, the CTID ATT&CK(r) Flow and the ATT&CK(r) Navigator Layer of every incremental run are verified against the ones of the full run, the rerun after the (Sub-)Techniques are added has to stay within incremental_ratio_budget of the full run.
+
+    :param techniques: int, the number of (Sub-)Techniques of the case. Default value is 100.
+    :param added: int, the number of (Sub-)Techniques added to the case. Default value is 2.
+    :return: dict, the measured times, the artifacts kept by every incremental run and the validity of the artifacts
+    """
+    with tempfile.TemporaryDirectory() as working_path:
+        list_attack_ids = new_synthetic_resources(os.path.join(working_path, "resources"))
+        module = get_attackirreporting(working_path)
+        def new_incremental_case(session, list_case_attack_ids, nistcontrols, incremental):
+            time_start = time.perf_counter()
+            session.set_attack_empty(";".join(list_case_attack_ids), tactic_pairs={})
+            session.new_attackrecommendations("Incremental", True, nistcontrols, interactive=False, incremental=incremental)
+            session.new_ctidattackflow("SRV01")
+            session.new_attacknavigatorlayer()
+            return time.perf_counter() - time_start
+        list_runs = [("initial", list_attack_ids[:techniques], False), ("techniques_added", list_attack_ids[:techniques + added], False), ("unchanged", list_attack_ids[:techniques + added], False), ("controls_changed", list_attack_ids[:techniques + added], True)]
+        obj_results = {"techniques": techniques, "added": added, "valid": True}
+        current_path = os.getcwd()
+        os.chdir(working_path)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                module.get_resources_content()
+                module.get_docx()
+                session = module.CaseSession("incremental")
+                for run_name, list_case_attack_ids, nistcontrols in list_runs:
+                    time_incremental = new_incremental_case(session, list_case_attack_ids, nistcontrols, True)
+                    session_full = module.CaseSession()
+                    time_full = new_incremental_case(session_full, list_case_attack_ids, nistcontrols, False)
+                    obj_results[run_name] = {"incremental": time_incremental, "full": time_full, "ratio": time_incremental / time_full, "kept": list(session.list_unchanged_artifacts)}
+                    obj_results["valid"] = obj_results["valid"] and get_session_artifacts(session) == get_session_artifacts(session_full) and len(get_session_artifacts(session)) == 5 and get_attackflow_outline(session) == get_attackflow_outline(session_full)
+        finally:
+            os.chdir(current_path)
+    obj_results["budget"] = incremental_ratio_budget
+    obj_results["passed"] = obj_results["valid"] and obj_results["techniques_added"]["ratio"] <= incremental_ratio_budget and len(obj_results["unchanged"]["kept"]) == 5
+    return obj_results
+
+def bench_delta(changed=0.05, cases=4, techniques=25):
+    """
+    This function measures the refresh of the compiled resources after a new release of the ATT&CK(r) bundle, changing a share of the (Sub-)Techniques and relationships, revoking a (Sub-)Technique of the first stored case and adding a (Sub-)Technique.
+    The compiled resources updated with the changes are timed and verified against the compiled resources built again from the JSON files, the changelog is verified to list the first stored case as stale.
+
+    :param changed: float, the share of objects changed by the release. Default value is 0.05.
+    :param cases: int, the number of stored cases. Default value is 4.
+    :param techniques: int, the number of (Sub-)Techniques of every stored case. Default value is 25.
+    :return: dict, the numbers of changes, the measured times, the stale cases and the validity of the compiled resources
+    """
+    with tempfile.TemporaryDirectory() as working_path:
+        list_attack_ids = new_synthetic_resources(os.path.join(working_path, "resources"))
+        module = get_attackirreporting(working_path)
+        current_path = os.getcwd()
+        os.chdir(working_path)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                module.get_resources_content()
+                for case in range(cases):
+                    session = module.CaseSession("case" + str(case))
+                    session.set_attack_empty(";".join(list_attack_ids[case * techniques:(case + 1) * techniques]), tactic_pairs={})
+                    session.new_attacknavigatorlayer()
+            file_json_enterprise_attack = os.path.join(working_path, "resources", "helper_enterprise_attack.json")
+            with open(file_json_enterprise_attack, 'r', encoding='utf-8') as f:
+                obj_bundle = json.load(f)
+            generator = random.Random(1)
+            for obj in obj_bundle["objects"]:
+                if obj["type"] in ("attack-pattern", "relationship") and generator.random() < changed:
+                    obj["modified"] = "2030-01-01T00:00:00.000Z"
+                    obj["description"] = obj.get("description", "") + " Changed."
+                elif obj["type"] == "attack-pattern" and obj["external_references"][0]["external_id"] == list_attack_ids[0]:
+                    obj["revoked"] = True
+                    obj["modified"] = "2030-01-01T00:00:00.000Z"
+            obj_bundle["objects"].append({"type": "attack-pattern", "id": "attack-pattern--" + str(uuid.UUID(int=generator.getrandbits(128))), "modified": "2030-01-01T00:00:00.000Z", "name": "Added technique", "kill_chain_phases": [{"kill_chain_name": "mitre-attack", "phase_name": "execution"}], "external_references": [{"source_name": "mitre-attack", "external_id": "T1999", "url": "https://attack.mitre.org/techniques/T1999"}]})
+            with open(file_json_enterprise_attack, 'w', encoding='utf-8') as f:
+                json.dump(obj_bundle, f)
+            with contextlib.redirect_stdout(io.StringIO()):
+                time_start = time.perf_counter()
+                obj_compiled_resources_delta = module.get_resources_cache()
+                time_delta = time.perf_counter() - time_start
+                time_start = time.perf_counter()
+                obj_compiled_resources_full = module.new_resources_cache()
+                time_full = time.perf_counter() - time_start
+            with open(module.file_json_helper_resources_changelog, 'r', encoding='utf-8') as f:
+                obj_changelog_entry = json.load(f)[0]
+        finally:
+            os.chdir(current_path)
+    obj_results = {
+        "changed": changed,
+        "cases": cases,
+        "changes": obj_changelog_entry["attack"],
+        "delta": time_delta,
+        "full": time_full,
+        "ratio": time_delta / time_full,
+        "stale_cases": [os.path.basename(obj_case["case_path"]) for obj_case in obj_changelog_entry["stale_cases"]]
+    }
+    # The categories of the OSSEM-DM store hold NaN, the stores are compared by their representation
+    obj_results["valid"] = all(obj_compiled_resources_delta[key] == obj_compiled_resources_full[key] for key in ("obj_attack_knowledgebase", "dict_obj_detection_descriptions", "obj_attack_controls_join", "obj_atomicred_index")) and repr(obj_compiled_resources_delta["obj_ossem_mapping_store"]) == repr(obj_compiled_resources_full["obj_ossem_mapping_store"]) and "case0" in obj_results["stale_cases"]
+    return obj_results
+
+def get_portfolio_scores_reference(array_obj_cases, by=None, half_life=None):
+    """
+    This function scores the (Sub-)Technique/Tactic pairs per slice of synthetic cases with a loop over the cases, the reference of the portfolio scores.
+    """
+    dict_group_weights = {}
+    dict_group_pair_weights = {}
+    reference_date = datetime.date.fromisoformat(max(obj_case["date"] for obj_case in array_obj_cases))
+    for obj_case in array_obj_cases:
+        case_date = datetime.date.fromisoformat(obj_case["date"])
+        group = {None: "all", "sector": obj_case["sector"], "year": obj_case["date"][:4], "month": obj_case["date"][:7], "quarter": obj_case["date"][:4] + "-Q" + str((case_date.month - 1) // 3 + 1)}[by]
+        weight = 0.5 ** ((reference_date - case_date).days / half_life) if half_life else 1.0
+        dict_group_weights[group] = dict_group_weights.get(group, 0.0) + weight
+        dict_pair_weights = dict_group_pair_weights.setdefault(group, {})
+        for pair in set(obj_case["pairs"]):
+            dict_pair_weights[pair] = dict_pair_weights.get(pair, 0.0) + weight
+    return {group: {pair: 100.0 * weight / dict_group_weights[group] for pair, weight in dict_pair_weights.items()} for group, dict_pair_weights in dict_group_pair_weights.items()}
+
+def bench_portfolio(cases=500, techniques=25, runs=20):
+    """
+    This function measures the portfolio of synthetic cases spread over sectors and two years: loading the cases into the matrix, scoring all cases, every sector, every quarter and all cases weighted by recency, writing the scored ATT&CK(r) Navigator Layers of every quarter and writing the layer of a single sector.
+    The scores are verified against a loop over the cases. Requires NumPy.
+
+    :param cases: int, the number of cases. Default value is 500.
+    :param techniques: int, the number of (Sub-)Technique/Tactic pairs of every case. Default value is 25.
+    :param runs: int, the number of measured runs of every slice. Default value is 20.
+    :return: dict, the size of the matrix, the measured times per slice against the loop and the validity of the scores
+    """
+    try:
+        import numpy
+    except ImportError:
+        return {"skipped": "NumPy is not installed", "valid": True}
+    generator = random.Random(1)
+    list_pairs = [("T" + str(1000 + index), generator.choice(list_attack_tactics)) for index in range(600)]
+    array_obj_cases = [{
+        "case_path": "case" + str(case),
+        "prefix": "Case " + str(case),
+        "sector": generator.choice(["22", "31", "44", "52", "62", "92"]),
+        "date": (datetime.date(2022, 1, 1) + datetime.timedelta(days=generator.randrange(730))).isoformat(),
+        "pairs": generator.sample(list_pairs, techniques)
+    } for case in range(cases)]
+    with tempfile.TemporaryDirectory() as working_path:
+        module = get_attackirreporting(working_path)
+        module.parent_dir = working_path
+        module.template_path = os.path.join(working_path, "templates")
+        time_start = time.perf_counter()
+        obj_portfolio = module.new_attackportfolio(array_obj_cases)
+        obj_results = {"cases": cases, "pairs": len(obj_portfolio["pairs"]), "load": time.perf_counter() - time_start, "valid": True}
+        for slice_name, by, half_life in (("all", None, None), ("sector", "sector", None), ("quarter", "quarter", None), ("recency", None, 90)):
+            time_start = time.perf_counter()
+            for run in range(runs):
+                obj_scores = module.get_attackportfolio_scores(obj_portfolio, by=by, half_life=half_life)
+            time_scores = (time.perf_counter() - time_start) / runs
+            time_start = time.perf_counter()
+            obj_reference = get_portfolio_scores_reference(array_obj_cases, by, half_life)
+            time_reference = time.perf_counter() - time_start
+            obj_results[slice_name] = {"slices": len(obj_scores["groups"]), "scores": time_scores, "loop": time_reference, "speedup": time_reference / time_scores}
+            for index, group in enumerate(obj_scores["groups"]):
+                list_scores = [float(score) for score in obj_scores["scores"][index]]
+                list_reference = [obj_reference[group].get(pair, 0.0) for pair in obj_portfolio["pairs"]]
+                obj_results["valid"] = obj_results["valid"] and all(abs(score - reference) < 1e-9 for score, reference in zip(list_scores, list_reference))
+        with contextlib.redirect_stdout(io.StringIO()):
+            time_start = time.perf_counter()
+            list_file_layers = module.new_attackportfoliolayer(obj_portfolio, by="quarter")
+            obj_results["layers"] = {"layers": len(list_file_layers), "write": time.perf_counter() - time_start}
+            obj_results["layers"]["per_layer"] = obj_results["layers"]["write"] / len(list_file_layers)
+            # A single slice end to end: scoring the cases of one sector and writing its layer
+            time_start = time.perf_counter()
+            for run in range(runs):
+                module.new_attackportfoliolayer(obj_portfolio, sector=array_obj_cases[0]["sector"])
+            obj_results["layers"]["slice"] = (time.perf_counter() - time_start) / runs
+        for file_layer in list_file_layers:
+            with open(file_layer, 'r', encoding='utf-8') as f:
+                obj_layer = json.load(f)
+            obj_results["valid"] = obj_results["valid"] and all(0 < technique["score"] <= 100 for technique in obj_layer["techniques"]) and "gradient" in obj_layer
+    return obj_results
+
+def get_stage_timing(function, *args, **kwargs):
+    """
+    This function runs a stage of the report with its output silenced and returns its wall time in seconds.
+    """
+    time_start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function(*args, **kwargs)
+    return time.perf_counter() - time_start
+
+def bench_stages(list_techniques=(5, 25, 100, 250, 500), bundle_techniques=600, filler_objects=10000):
+    """
+    This function times every stage of a report separately, for cases of growing numbers of (Sub-)Techniques over a synthetic ATT&CK(r) bundle and mappings of the given size.
+    The resources are timed once compiled from the JSON files and once loaded from the compiled cache, the cases all use the loaded knowledge base.
+
+    :param list_techniques: tuple, the numbers of (Sub-)Techniques of the cases. Default value is (5, 25, 100, 250, 500).
+    :param bundle_techniques: int, the number of (Sub-)Techniques of the synthetic bundle. Default value is 600.
+    :param filler_objects: int, the number of objects of the synthetic bundle the report never reads. Default value is 10000.
+    :return: dict, the size of the bundle, the resource times and the stage times per case
+    """
+    obj_results = {"bundle": {"techniques": bundle_techniques, "filler_objects": filler_objects}, "resources": {}, "cases": {}}
+    with tempfile.TemporaryDirectory() as working_path:
+        list_attack_ids = new_synthetic_resources(os.path.join(working_path, "resources"), techniques=bundle_techniques, filler_objects=filler_objects)
+        obj_results["bundle"]["bytes"] = sum(os.path.getsize(os.path.join(working_path, "resources", file_name)) for file_name in dict_resources_url_paths)
+        module = get_attackirreporting(working_path)
+        obj_results["resources"]["compile"] = get_stage_timing(module.get_resources_content)
+        module = get_attackirreporting(working_path)
+        obj_results["resources"]["load"] = get_stage_timing(module.get_resources_content)
+        module.get_docx()
+        for techniques in list_techniques:
+            module.case_session.document_prefix = "benchmark_" + str(techniques) + "_"
+            module.case_session.document_prefix_content = "Benchmark " + str(techniques)
+            step = max(1, len(list_attack_ids) // techniques)
+            module.case_session.list_obj_selected_attack_techniques = [{"attack_id": attack_id} for attack_id in list_attack_ids[::step][:techniques]]
+            obj_stages = {}
+            obj_stages["new_attackconstruct"] = get_stage_timing(module.new_attackconstruct, tactic_pairs={})
+            obj_stages["new_attackmitigationsconstruct"] = get_stage_timing(module.new_attackmitigationsconstruct) + get_stage_timing(module.get_attackmitigationsmappings, True, True, False)
+            obj_stages["new_attackdetectionsconstruct"] = get_stage_timing(module.new_attackdetectionsconstruct)
+            obj_stages["new_attackdocintroduction"] = get_stage_timing(module.new_attackdocintroduction)
+            obj_stages["new_attackdocmitigations"] = get_stage_timing(module.new_attackdocmitigations, True, True, interactive=False, construct=False)
+            obj_stages["new_attackdocdetections"] = get_stage_timing(module.new_attackdocdetections, construct=False)
+            obj_stages["new_attackdocvalidations"] = get_stage_timing(module.new_attackdocvalidations)
+            obj_stages["new_ctidattackflow"] = get_stage_timing(module.new_ctidattackflow, "SRV01")
+            obj_stages["new_attacknavigatorlayer"] = get_stage_timing(module.new_attacknavigatorlayer)
+            obj_results["cases"][str(techniques)] = {
+                "techniques": len(module.case_session.list_obj_selected_attack_techniques),
+                "actions": len(module.case_session.array_obj_sorted_construct),
+                "mitigations": len(module.case_session.array_obj_sorted_mitigations),
+                "detections": len(module.case_session.array_obj_condensed_detections),
+                "stages": obj_stages,
+                "total": sum(obj_stages.values())
+            }
+    return obj_results
+
+def get_stages_comparison(obj_results, obj_baseline):
+    """
+    This function compares the stage times of two runs of the stages benchmark, for the cases and stages both runs hold.
+
+    :return: dict, the ratio of the current time over the baseline time per case and stage, above 1 is slower
+    """
+    obj_comparison = {"resources": {}, "cases": {}}
+    for stage, time_stage in obj_results["resources"].items():
+        if obj_baseline.get("resources", {}).get(stage):
+            obj_comparison["resources"][stage] = time_stage / obj_baseline["resources"][stage]
+    for techniques, obj_case in obj_results["cases"].items():
+        obj_baseline_case = obj_baseline.get("cases", {}).get(techniques)
+        if obj_baseline_case is None:
+            continue
+        obj_comparison["cases"][techniques] = {stage: time_stage / obj_baseline_case["stages"][stage] for stage, time_stage in obj_case["stages"].items() if obj_baseline_case["stages"].get(stage)}
+    return obj_comparison
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for AttackIrReporting.")
+    parser.add_argument("suites", nargs="*", default=["import", "downloads", "mitigations", "ossem", "attackflow", "tables", "template", "sessions", "service", "versions", "records", "incremental", "delta", "portfolio", "stages"], choices=["import", "downloads", "mitigations", "ossem", "attackflow", "tables", "template", "sessions", "service", "versions", "records", "incremental", "delta", "portfolio", "stages"], help="benchmarks to run, all by default")
+    parser.add_argument("--import-runs", type=int, default=5, help="number of measured imports")
+    parser.add_argument("--import-budget", type=float, default=import_time_budget, help="maximum accepted import time in seconds")
+    parser.add_argument("--techniques", type=int, nargs="+", default=[5, 25, 100, 250, 500], help="numbers of (Sub-)Techniques of the cases of the stages benchmark")
+    parser.add_argument("--bundle-techniques", type=int, default=600, help="number of (Sub-)Techniques of the synthetic bundle of the stages benchmark")
+    parser.add_argument("--filler-objects", type=int, default=10000, help="number of objects of the synthetic bundle the report never reads")
+    parser.add_argument("--output", help="JSON file receiving the results")
+    parser.add_argument("--baseline", help="JSON file with the results of an earlier run, the stage times are compared with it")
+    args = parser.parse_args()
+    obj_results = {}
+    if "import" in args.suites:
+        obj_results["import"] = bench_import(args.import_runs, args.import_budget)
+    if "downloads" in args.suites:
+        obj_results["downloads"] = bench_downloads()
+    if "mitigations" in args.suites:
+        obj_results["mitigations"] = bench_mitigations()
+    if "ossem" in args.suites:
+        obj_results["ossem"] = bench_ossem()
+    if "attackflow" in args.suites:
+        obj_results["attackflow"] = bench_attackflow()
+    if "tables" in args.suites:
+        obj_results["tables"] = bench_tables()
+    if "template" in args.suites:
+        obj_results["template"] = bench_template()
+    if "sessions" in args.suites:
+        obj_results["sessions"] = bench_sessions()
+    if "service" in args.suites:
+        obj_results["service"] = bench_service()
+    if "versions" in args.suites:
+        obj_results["versions"] = bench_versions()
+    if "records" in args.suites:
+        obj_results["records"] = bench_records()
+    if "incremental" in args.suites:
+        obj_results["incremental"] = bench_incremental()
+    if "delta" in args.suites:
+        obj_results["delta"] = bench_delta()
+    if "portfolio" in args.suites:
+        obj_results["portfolio"] = bench_portfolio()
+    if "stages" in args.suites:
+        obj_results["stages"] = bench_stages(tuple(args.techniques), args.bundle_techniques, args.filler_objects)
+        if args.baseline:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                obj_baseline = json.load(f)
+            if "stages" in obj_baseline:
+                obj_results["stages_comparison"] = get_stages_comparison(obj_results["stages"], obj_baseline["stages"])
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(obj_results, indent=4))
+    print(json.dumps(obj_results, indent=4))
+    if "import" in obj_results and not obj_results["import"]["passed"]:
+        print("⚠ The import of AttackIrReporting exceeds its budget or has side effects.")
+        sys.exit(1)
+    if "mitigations" in obj_results and not obj_results["mitigations"]["identical"]:
+        print("⚠ The CIS Controls or NIST controls of the join tables differ from the mappings.")
+        sys.exit(1)
+    if "ossem" in obj_results and not obj_results["ossem"]["identical"]:
+        print("⚠ The rows of the OSSEM-DM store differ from the mapping.")
+        sys.exit(1)
+    if "attackflow" in obj_results and not all(obj["valid"] for obj in obj_results["attackflow"].values()):
+        print("⚠ A generated CTID ATT&CK® Flow file is not valid.")
+        sys.exit(1)
+    if "tables" in obj_results and not (obj_results["tables"]["reference"]["identical"] and all(obj["valid"] for key, obj in obj_results["tables"].items() if key != "reference")):
+        print("⚠ The rows written from the row prototypes differ from the rows of python-docx.")
+        sys.exit(1)
+    if "template" in obj_results and not (obj_results["template"]["valid"] and obj_results["template"]["reloaded"]):
+        print("⚠ A document copied from the parsed template differs from the template or a changed template is not parsed again.")
+        sys.exit(1)
+    if "sessions" in obj_results and not obj_results["sessions"]["valid"]:
+        print("⚠ The output of a case session running concurrently differs from the same case running alone.")
+        sys.exit(1)
+    if "service" in obj_results and not obj_results["service"]["valid"]:
+        print("⚠ A request to the report service failed or returned an invalid zip.")
+        sys.exit(1)
+    if "versions" in obj_results and not obj_results["versions"]["valid"]:
+        print("⚠ The knowledge base of a version of the store differs from the knowledge base parsed from its bundle.")
+        sys.exit(1)
+    if "records" in obj_results and not (obj_results["records"]["valid"] and obj_results["records"]["reduction"] > 0):
+        print("⚠ The records of a case differ from the rows they replace or do not take less memory.")
+        sys.exit(1)
+    if "incremental" in obj_results and not obj_results["incremental"]["passed"]:
+        print("⚠ The artifacts of an incremental case differ from a full run of the case, an unchanged case was generated again or adding (Sub-)Techniques to a case exceeds its budget.")
+        sys.exit(1)
+    if "delta" in obj_results and not obj_results["delta"]["valid"]:
+        print("⚠ The compiled resources updated with the changes of a release differ from the compiled resources built again, or a stale case is missing from the changelog.")
+        sys.exit(1)
+    if "portfolio" in obj_results and not obj_results["portfolio"]["valid"]:
+        print("⚠ The scores of the portfolio differ from the scores counted case by case or a scored layer is not valid.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# coding: utf-8
+import argparse
+import csv
+import io
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import zipfile
+
+def get_loadtest_latency(list_latencies):
+    """
+    This function returns the count, mean, maximum and the 50th, 95th and 99th percentiles of a list of latencies in seconds.
+    """
+    list_sorted = sorted(list_latencies)
+    if not list_sorted:
+        return {"count": 0}
+    obj_latency = {"count": len(list_sorted), "mean": round(sum(list_sorted) / len(list_sorted), 4), "max": round(list_sorted[-1], 4)}
+    for percentile in (50, 95, 99):
+        obj_latency["p" + str(percentile)] = round(list_sorted[min(len(list_sorted) - 1, len(list_sorted) * percentile // 100)], 4)
+    return obj_latency
+
+def get_loadtest_requests(file_manifest):
+    """
+    This function reads the cases sent by the load test from a JSONL file with one case per line or a CSV file with one case per row, see the batch mode of AttackIrReporting.
+    """
+    with open(file_manifest, 'r', encoding='utf-8', newline='') as f:
+        if file_manifest.lower().endswith(".csv"):
+            return [dict(row) for row in csv.DictReader(f)]
+        return [json.loads(line) for line in f if line.strip()]
+
+def get_loadtest_response(url, obj_request, timeout=600):
+    """
+    This function sends a single case to the report service and verifies the returned zip.
+
+    :return: dict, the HTTP status, the latency, the size of the response and the files of a valid zip
+    """
+    obj_response = {"status": None, "latency": None, "bytes": 0, "files": [], "valid": False, "error": None}
+    obj_http_request = urllib.request.Request(url.rstrip("/") + "/reports", data=json.dumps(obj_request).encode(), headers={"Content-Type": "application/json"}, method="POST")
+    time_start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(obj_http_request, timeout=timeout) as response:
+            body = response.read()
+            obj_response["status"] = response.status
+    except urllib.error.HTTPError as error:
+        body = error.read()
+        obj_response["status"] = error.code
+        obj_response["error"] = json.loads(body or b"{}").get("error")
+    except OSError as error:
+        obj_response["error"] = type(error).__name__ + ": " + str(error)
+        body = b""
+    obj_response["latency"] = time.perf_counter() - time_start
+    obj_response["bytes"] = len(body)
+    if obj_response["status"] == 200:
+        with zipfile.ZipFile(io.BytesIO(body)) as file_zip:
+            obj_response["files"] = file_zip.namelist()
+            obj_response["valid"] = file_zip.testzip() is None and len([file_name for file_name in obj_response["files"] if file_name.endswith(".docx")]) == 4
+    return obj_response
+
+def get_loadtest(url, array_obj_requests, requests=50, concurrency=4):
+    """
+    This function sends the cases to the report service from concurrent clients, cycling through the cases until the number of requests is reached.
+    The metrics of the service are read after the last response.
+
+    :param url: str, the address of the report service
+    :param array_obj_requests: list, the cases to send
+    :param requests: int, the number of requests. Default value is 50.
+    :param concurrency: int, the number of concurrent clients. Default value is 4.
+    :return: dict, the throughput, the status counts and the latencies seen by the clients, and the metrics of the service
+    """
+    array_obj_responses = [None] * requests
+    lock_index = threading.Lock()
+    list_index = [0]
+    def set_loadtest_client():
+        while True:
+            with lock_index:
+                index = list_index[0]
+                list_index[0] += 1
+            if index >= requests:
+                return
+            array_obj_responses[index] = get_loadtest_response(url, array_obj_requests[index % len(array_obj_requests)])
+    list_threads = [threading.Thread(target=set_loadtest_client) for client in range(concurrency)]
+    time_start = time.perf_counter()
+    for thread in list_threads:
+        thread.start()
+    for thread in list_threads:
+        thread.join()
+    time_total = time.perf_counter() - time_start
+    obj_status_counts = {}
+    for obj_response in array_obj_responses:
+        obj_status_counts[str(obj_response["status"])] = obj_status_counts.get(str(obj_response["status"]), 0) + 1
+    with urllib.request.urlopen(url.rstrip("/") + "/metrics") as response:
+        obj_service_metrics = json.loads(response.read())
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "wall_time": round(time_total, 4),
+        "throughput": round(requests / time_total, 4),
+        "status": obj_status_counts,
+        "valid": all(obj_response["valid"] for obj_response in array_obj_responses if obj_response["status"] == 200),
+        "latency": get_loadtest_latency([obj_response["latency"] for obj_response in array_obj_responses if obj_response["status"] == 200]),
+        "errors": sorted(set(obj_response["error"] for obj_response in array_obj_responses if obj_response["error"])),
+        "service": obj_service_metrics
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the report service of AttackIrReporting, started with python scripts/AttackIrReporting.py --serve.")
+    parser.add_argument("--url", default="http://127.0.0.1:8337", help="address of the report service")
+    parser.add_argument("--manifest", help="JSONL or CSV file with the cases to send, in the format of the batch mode")
+    parser.add_argument("--techniques", default="T1566.002;T1018;T1033;T1053.005;T1486", help="semicolon separated list of ATT&CK IDs of the case sent when no manifest is given")
+    parser.add_argument("--requests", type=int, default=50, help="number of requests")
+    parser.add_argument("--concurrency", type=int, default=4, help="number of concurrent clients")
+    parser.add_argument("--output", help="JSON file receiving the results")
+    args = parser.parse_args()
+    array_obj_requests = get_loadtest_requests(args.manifest) if args.manifest else [{"prefix": "Load test", "techniques": args.techniques, "assets": "SRV01"}]
+    obj_results = get_loadtest(args.url, array_obj_requests, args.requests, args.concurrency)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(obj_results, indent=4))
+    print(json.dumps(obj_results, indent=4))
+    if not obj_results["valid"] or obj_results["status"].get("200", 0) == 0:
+        print("⚠ The report service returned no or invalid reports.")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,332 @@
 #!/usr/bin/env python
 # coding: utf-8
+import collections.abc
+import contextlib
+import copy
+import csv
+import functools
+import gc
+import hashlib
+import io
 import json
 import os
+import pickle
 import re
-import urllib.request
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+import zipfile
 import uuid
 import shutil
-from datetime import datetime
-import docx
-from docx import Document
-from docx.enum.dml import MSO_THEME_COLOR_INDEX
-from docx.enum.table import WD_TABLE_ALIGNMENT
-from docx.enum.section import WD_ORIENT
-from docx.shared import RGBColor
+from datetime import datetime, timezone
 
 template_directory = "templates"
 resources_directory = "resources"
+cache_directory = "cache"
 case_directory = str(uuid.uuid4())
 parent_dir = os.path.join(os.getcwd())
 template_path = os.path.join(parent_dir, template_directory)
 resources_path = os.path.join(parent_dir, resources_directory)
+cache_path = os.path.join(parent_dir, cache_directory)
 case_path = os.path.join(parent_dir, case_directory)
-os.mkdir(case_path, 0o744)
-check_resources_path = os.path.isdir(resources_path)
-dot_present = shutil.which("dot")
 file_json_helper_enterprise_attack = os.path.join(resources_path, "helper_enterprise_attack.json")
 file_json_helper_cis_controls_mapping = os.path.join(resources_path, "helper_cis_controls_mapping.json")
 file_json_helper_nist_mapping = os.path.join(resources_path, "helper_nist_attack_mapping.json")
 file_json_helper_ossem_mapping_array = os.path.join(resources_path, "helper_ossem_attack_mapping.json")
 file_json_helper_atomicred_mapping_array = os.path.join(resources_path, "helper_atomicred_attack_mapping.json")
 file_docx_template = os.path.join(template_path, "template.docx")
-    
-if not check_resources_path:
-    os.mkdir(resources_path, 0o744)
+list_file_json_helper_resources = [file_json_helper_enterprise_attack, file_json_helper_cis_controls_mapping, file_json_helper_nist_mapping, file_json_helper_ossem_mapping_array, file_json_helper_atomicred_mapping_array]
+file_pickle_helper_compiled_resources = os.path.join(cache_path, "helper_compiled_resources.pickle")
+compiled_resources_format = 9
+attack_versions_path = os.path.join(resources_path, "attack_versions")
+file_pickle_helper_attack_store = os.path.join(cache_path, "helper_attack_store.pickle")
+attack_store_format = 1
+case_state_file_name = "case_state.pickle"
+case_state_format = 2
+dict_obj_attackstore_knowledgebases = {}
+lock_attack_store = threading.Lock()
+list_attackknowledgebase_types = ["attack-pattern", "course-of-action", "relationship", "x-mitre-data-component", "x-mitre-data-source"]
+list_attackknowledgebase_relationship_types = ["mitigates", "detects", "revoked-by", "subtechnique-of"]
+file_json_helper_resources_manifest = os.path.join(resources_path, "helper_resources_manifest.json")
+file_json_helper_resources_changelog = os.path.join(resources_path, "helper_resources_changelog.json")
+lock_resources_manifest = threading.Lock()
+url_base_attack_stix_data = os.environ.get("ATTACKIR_URL_BASE_ATTACK", "https://raw.githubusercontent.com/mitre-attack/attack-stix-data/master")
+url_base_cis_controls = os.environ.get("ATTACKIR_URL_BASE_CIS", "https://raw.githubusercontent.com/nightly-nessie/attack-cis-controls/main")
+url_base_nist_controls = os.environ.get("ATTACKIR_URL_BASE_NIST", "https://raw.githubusercontent.com/center-for-threat-informed-defense/attack-control-framework-mappings/main")
+url_base_ossem = os.environ.get("ATTACKIR_URL_BASE_OSSEM", "https://raw.githubusercontent.com/OTRF/OSSEM-DM/main")
+url_base_atomicred = os.environ.get("ATTACKIR_URL_BASE_ATOMICRED", "https://raw.githubusercontent.com/redcanaryco/atomic-red-team/master")
+atomics_path = os.environ.get("ATTACKIR_ATOMICS_PATH")
+download_retries = 3
+download_timeout = 60
+detection_citation_pattern = re.compile(r'\(Citation:.*\)')
+detection_h4_open_pattern = re.compile(r'<h4>\s+')
+detection_h5_open_pattern = re.compile(r'<h5>\s+')
+detection_h4_close_pattern = re.compile(r'\s*</h4>')
+detection_h5_close_pattern = re.compile(r'\s*</h5>')
+detection_description_pattern = re.compile(r'^(.*?)\n\n<h4>', re.DOTALL)
+detection_implementation_pattern = re.compile(r'<h4>Implementation\s*\d*\s*:\s*(.*?)</h4>', re.DOTALL)
+detection_pseudocode_pattern = re.compile(r'<h5>Detection Pseudocode</h5>\n<code>(.*?)</code>', re.DOTALL)
+obj_attack_knowledgebase = None
+obj_attack_controls_join = None
+dict_obj_detection_descriptions = {}
+obj_ossem_mapping_store = None
+obj_atomicred_index = None
+dict_obj_resources_fingerprint = None
+dict_obj_attack_technique_records = {}
+graphviz_workers = 4
+lock_graphviz_executor = threading.Lock()
+lock_document_template = threading.Lock()
+lock_resources_content = threading.Lock()
+# The objects created on first use: python-docx, the dot executable, the table row prototypes, the hyperlink ids, the parsed template, the Graphviz pool, the Attack Flow schema and the store of ATT&CK(r) versions
+dict_obj_module_cache = {}
+list_attackflow_anchor_angles = [1, 1, 1, 0, 0, 0, 1, 1, 1, 0, 0, 0]
+list_attackportfolio_tactics = ["initial-access", "execution", "persistence", "privilege-escalation", "defense-evasion", "credential-access", "discovery", "lateral-movement", "collection", "command-and-control", "exfiltration", "impact"]
+list_ossem_mapping_fields = ["name", "log_source", "channel", "event_id", "event_name", "event_platform", "audit_category", "audit_sub_category", "filter_in"]
+instrumentation_verbose = os.environ.get("ATTACKIR_VERBOSE", "") not in ("", "0")
+instrumentation_memory = os.environ.get("ATTACKIR_TRACE_MEMORY", "") not in ("", "0")
+instrumentation_profile_stage = os.environ.get("ATTACKIR_PROFILE_STAGE")
+instrumentation_run_report = True
+list_run_count_keys = ["table_rows", "ossem_rows", "graphviz_renders"]
+lock_run_stages = threading.Lock()
+local_run_stages = threading.local()
+
+def get_case_path():
+    return case_session.get_case_path()
+
+def get_run_thread_counts():
+    """
+    This function returns the counters of the rows written and the Graphviz renders of the current thread.
+    """
+    dict_counts = getattr(local_run_stages, "counts", None)
+    if dict_counts is None:
+        dict_counts = local_run_stages.counts = dict.fromkeys(list_run_count_keys, 0)
+    return dict_counts
+
+def attackstage(function):
+    """
+    This decorator records the wall time, CPU time, peak traced memory and rows written of a stage of the report in run_report.json.
+    """
+    @functools.wraps(function)
+    def stage(*args, **kwargs):
+        # A stage outside a session, for example the Graphviz render, belongs to the session running in the thread
+        session = args[0] if args and isinstance(args[0], CaseSession) else get_case_session()
+        session_previous = getattr(local_run_stages, "session", None)
+        local_run_stages.session = session
+        list_stack = getattr(local_run_stages, "stack", None)
+        if list_stack is None:
+            list_stack = local_run_stages.stack = []
+        trace_memory = instrumentation_memory or instrumentation_verbose
+        tracing_started = trace_memory and not list_stack and not tracemalloc.is_tracing()
+        if tracing_started:
+            tracemalloc.start()
+        if not list_stack:
+            local_run_stages.finished = []
+            local_run_stages.entries = 0
+        entry_index = local_run_stages.entries
+        local_run_stages.entries += 1
+        obj_stage = {"stage": function.__name__, "parent": list_stack[-1]["stage"] if list_stack else None, "depth": len(list_stack), "thread": threading.current_thread().name, "status": "ok"}
+        if trace_memory and tracemalloc.is_tracing():
+            memory_current, memory_peak = tracemalloc.get_traced_memory()
+            if list_stack:
+                list_stack[-1]["memory_peak"] = max(list_stack[-1]["memory_peak"], memory_peak)
+            tracemalloc.reset_peak()
+            obj_stage["memory_start"] = obj_stage["memory_peak"] = memory_current
+        dict_counts_start = dict(get_run_thread_counts())
+        profiler = None
+        if instrumentation_profile_stage == function.__name__ and not any(obj["stage"] == function.__name__ for obj in list_stack):
+            import cProfile
+            profiler = cProfile.Profile()
+        list_stack.append(obj_stage)
+        time_start = time.perf_counter()
+        time_cpu_start = time.process_time()
+        try:
+            if profiler is not None:
+                return profiler.runcall(function, *args, **kwargs)
+            return function(*args, **kwargs)
+        except BaseException as error:
+            obj_stage["status"] = "failed: " + type(error).__name__
+            raise
+        finally:
+            obj_stage["wall_time"] = round(time.perf_counter() - time_start, 6)
+            obj_stage["cpu_time"] = round(time.process_time() - time_cpu_start, 6)
+            list_stack.pop()
+            if "memory_start" in obj_stage and tracemalloc.is_tracing():
+                memory_peak = max(obj_stage.pop("memory_peak"), tracemalloc.get_traced_memory()[1])
+                obj_stage["peak_memory"] = memory_peak - obj_stage.pop("memory_start")
+                if list_stack:
+                    list_stack[-1]["memory_peak"] = max(list_stack[-1]["memory_peak"], memory_peak)
+                tracemalloc.reset_peak()
+            else:
+                obj_stage.pop("memory_start", None)
+                obj_stage.pop("memory_peak", None)
+                obj_stage["peak_memory"] = None
+            dict_counts = get_run_thread_counts()
+            obj_stage["counts"] = {key: dict_counts[key] - dict_counts_start[key] for key in list_run_count_keys}
+            obj_stage["case_path"] = session.case_path
+            if profiler is not None:
+                file_profile = os.path.join(session.get_case_path(), function.__name__ + ".prof")
+                profiler.dump_stats(file_profile)
+                obj_stage["profile"] = file_profile
+            with lock_run_stages:
+                session.array_obj_run_stages.append(obj_stage)
+            local_run_stages.finished.append((entry_index, obj_stage))
+            local_run_stages.session = session_previous
+            if not list_stack:
+                if tracing_started:
+                    tracemalloc.stop()
+                set_run_report(session, local_run_stages.finished)
+    return stage
+
+def get_case_session():
+    return getattr(local_run_stages, "session", None) or case_session
+
+def get_run_counts(session, array_obj_stages):
+    """
+    This function returns the item counts of a case: the selected (Sub-)Techniques and the actions, mitigations and detections derived from them, and the OSSEM-DM rows, table rows and Graphviz renders of its stages.
+    """
+    obj_counts = {
+        "techniques": len(session.list_obj_selected_attack_techniques),
+        "actions": len(session.array_obj_sorted_construct),
+        "mitigations": len(session.array_obj_sorted_mitigations),
+        "detections": len(session.array_obj_condensed_detections)
+    }
+    for key in list_run_count_keys:
+        obj_counts[key] = sum(obj_stage["counts"].get(key, 0) for obj_stage in array_obj_stages if obj_stage["depth"] == 0)
+    return obj_counts
+
+def set_run_report(session, list_finished_stages):
+    """
+    This function writes run_report.json to the case folder when an outermost stage returns.
+
+    :param session: CaseSession, the session of the case
+    :param list_finished_stages: list, the (entry index, stage) pairs of the outermost stage that returned and its nested stages
+    """
+    with lock_run_stages:
+        # Only the stages of the current case are kept, a session may run many cases
+        session.array_obj_run_stages[:] = [obj_stage for obj_stage in session.array_obj_run_stages if obj_stage["case_path"] == session.case_path]
+        array_obj_stages = [{key: value for key, value in obj_stage.items() if key != "case_path"} for obj_stage in session.array_obj_run_stages]
+    if instrumentation_verbose:
+        for entry_index, obj_stage in sorted(list_finished_stages, key=lambda x: x[0]):
+            list_details = [str(round(obj_stage["wall_time"], 3)) + "s wall", str(round(obj_stage["cpu_time"], 3)) + "s CPU"]
+            if obj_stage["peak_memory"] is not None:
+                list_details.append(str(round(obj_stage["peak_memory"] / 1048576, 1)) + "MB peak")
+            list_details += [str(count) + " " + key.replace("_", " ") for key, count in obj_stage["counts"].items() if count]
+            print("\u23F1 " + "  " * obj_stage["depth"] + obj_stage["stage"] + ": " + ", ".join(list_details) + ("" if obj_stage["status"] == "ok" else " (" + obj_stage["status"] + ")"))
+            if obj_stage.get("profile"):
+                import pstats
+                pstats.Stats(obj_stage["profile"], stream=sys.stdout).sort_stats("cumulative").print_stats(20)
+    if not instrumentation_run_report or not os.path.isdir(session.case_path):
+        return
+    obj_run_report = {
+        "case_path": session.case_path,
+        "prefix": session.document_prefix,
+        "attack_version": session.attack_version,
+        "attack_ids": [d.get("attack_id") for d in session.list_obj_selected_attack_techniques],
+        "counts": get_run_counts(session, array_obj_stages),
+        "stages": array_obj_stages
+    }
+    file_json_run_report = os.path.join(session.case_path, "run_report.json")
+    file_json_temporary = file_json_run_report + "." + str(os.getpid()) + "." + str(threading.get_ident()) + ".tmp"
+    with open(file_json_temporary, 'w', encoding='utf-8') as f:
+        f.write(json.dumps(obj_run_report, indent=4))
+    os.replace(file_json_temporary, file_json_run_report)
+
+def set_module_cache_empty():
+    """
+    This function empties the module cache, every object of dict_obj_module_cache is created again on its next use.
+    """
+    with lock_graphviz_executor, lock_document_template, lock_attack_store:
+        pid_graphviz_executor, executor_graphviz = dict_obj_module_cache.get("graphviz_executor", (None, None))
+        if pid_graphviz_executor == os.getpid():
+            executor_graphviz.shutdown(wait=False)
+        dict_obj_module_cache.clear()
+
+def get_dot_present():
+    """
+    This function looks up the Graphviz dot executable once, on first use.
+
+    :return: str, the path of the dot executable or None when Graphviz is not installed
+    """
+    if "dot_present" not in dict_obj_module_cache:
+        dict_obj_module_cache["dot_present"] = shutil.which("dot")
+    return dict_obj_module_cache["dot_present"]
+
+def get_docx():
+    """
+    This function imports python-docx on first use.
+
+    :return: module, the docx package with the submodules used by the documents
+    """
+    if "docx" not in dict_obj_module_cache:
+        import docx
+        import docx.enum.dml
+        import docx.opc.constants
+        import docx.oxml.ns
+        import docx.oxml.shared
+        import docx.shared
+        import docx.table
+        dict_obj_module_cache["docx"] = docx
+    return dict_obj_module_cache["docx"]
+
+def add_table_rows(table, list_spans):
+    """
+    This function appends rows to a table by cloning pre-styled row prototypes and returns the cells of every row.
+    :param table: the python-docx table to append the rows to
+    :param list_spans: one entry per row, None for a plain row or a (first, last) tuple of the cells merged into one
+    """
+    docx = get_docx()
+    dict_obj_table_row_prototypes = dict_obj_module_cache.setdefault("table_row_prototypes", {})
+    tbl = table._tbl
+    widths = tuple(gridCol.w for gridCol in tbl.tblGrid.gridCol_lst)
+    array_obj_rows = []
+    for span in list_spans:
+        tr_prototype = dict_obj_table_row_prototypes.get((widths, span))
+        if tr_prototype is None:
+            row = table.add_row()
+            if span is not None:
+                row_cells = row.cells
+                row_cells[span[0]].merge(row_cells[span[1]])
+            tbl.remove(row._tr)
+            tr_prototype = row._tr
+            dict_obj_table_row_prototypes[(widths, span)] = tr_prototype
+        array_obj_rows.append(copy.deepcopy(tr_prototype))
+    tbl.extend(array_obj_rows)
+    return [docx.table._Row(tr, table).cells for tr in array_obj_rows]
+
+def get_hyperlink_rid(part, url):
+    """
+    This function returns the relationship id of an external hyperlink, adding one relationship per distinct URL and per part.
+    :param part: the document part that holds the hyperlink
+    :param url: the target of the hyperlink
+    """
+    docx = get_docx()
+    dict_obj_hyperlink_rids = dict_obj_module_cache.get("hyperlink_rids")
+    if dict_obj_hyperlink_rids is None:
+        dict_obj_hyperlink_rids = dict_obj_module_cache.setdefault("hyperlink_rids", weakref.WeakKeyDictionary())
+    rels = part.rels
+    reltype = docx.opc.constants.RELATIONSHIP_TYPE.HYPERLINK
+    obj_hyperlink_rids = dict_obj_hyperlink_rids.get(part)
+    if obj_hyperlink_rids is None or obj_hyperlink_rids["count"] != len(rels):
+        obj_hyperlink_rids = {"rids": {}, "next": 1, "count": len(rels)}
+        for rel in rels.values():
+            if rel.is_external and rel.reltype == reltype:
+                obj_hyperlink_rids["rids"].setdefault(rel.target_ref, rel.rId)
+        dict_obj_hyperlink_rids[part] = obj_hyperlink_rids
+    r_id = obj_hyperlink_rids["rids"].get(url)
+    if r_id is None:
+        while "rId%d" % obj_hyperlink_rids["next"] in rels:
+            obj_hyperlink_rids["next"] += 1
+        r_id = "rId%d" % obj_hyperlink_rids["next"]
+        rels.add_relationship(reltype, url, r_id, is_external=True)
+        obj_hyperlink_rids["rids"][url] = r_id
+        obj_hyperlink_rids["count"] = len(rels)
+    return r_id
 
 def add_hyperlink(paragraph, text, url):
-    part = paragraph.part
-    r_id = part.relate_to(url, docx.opc.constants.RELATIONSHIP_TYPE.HYPERLINK, is_external=True)
+    docx = get_docx()
+    r_id = get_hyperlink_rid(paragraph.part, url)
     hyperlink = docx.oxml.shared.OxmlElement('w:hyperlink')
     hyperlink.set(docx.oxml.shared.qn('r:id'), r_id, )
     new_run = docx.oxml.shared.OxmlElement('w:r')
@@ -46,10 +336,92 @@ def add_hyperlink(paragraph, text, url):
     hyperlink.append(new_run)
     r = paragraph.add_run ()
     r._r.append (hyperlink)
-    r.font.color.theme_color = MSO_THEME_COLOR_INDEX.HYPERLINK
+    r.font.color.theme_color = docx.enum.dml.MSO_THEME_COLOR_INDEX.HYPERLINK
     r.font.underline = True
     return hyperlink
 
+def get_attackdocument_position(parent):
+    """
+    This function returns where the content appended to the body or to a table of a document goes, see get_attackdocument_fragment().
+
+    :param parent: the body or the table element
+    :return: tuple, the element after which the content goes and the element closing parent, the sectPr of the body or None for a table
+    """
+    docx = get_docx()
+    element_end = parent[-1]
+    if element_end.tag != docx.oxml.ns.qn("w:sectPr"):
+        return element_end, None
+    return element_end.getprevious(), element_end
+
+def get_attackdocument_fragment(document, parent, obj_position):
+    """
+    This function serialises the elements appended to the body or to a table of a document since get_attackdocument_position() returned obj_position.
+
+    :param document: the python-docx document
+    :param parent: the body or the table element
+    :param obj_position: tuple, as returned by get_attackdocument_position() before the elements were appended
+    :return: tuple, the XML of every element and the URL of every hyperlink of the elements in document order
+    """
+    import lxml.etree
+    docx = get_docx()
+    element_start, element_end = obj_position
+    element = element_start.getnext() if element_start is not None else parent[0]
+    list_elements = []
+    while element is not None and element is not element_end:
+        list_elements.append(element)
+        element = element.getnext()
+    rels = document.part.rels
+    list_urls = tuple(rels[hyperlink.get(docx.oxml.ns.qn("r:id"))].target_ref for element in list_elements for hyperlink in element.iter(docx.oxml.ns.qn("w:hyperlink")))
+    return tuple(lxml.etree.tostring(element) for element in list_elements), list_urls
+
+def add_attackdocument_fragment(document, parent, obj_fragment):
+    """
+    This function appends the elements serialised by get_attackdocument_fragment() to the body or to a table of a document, their hyperlinks get the relationships of the document.
+
+    :param document: the python-docx document
+    :param parent: the body or the table element
+    :param obj_fragment: tuple, as returned by get_attackdocument_fragment()
+    """
+    docx = get_docx()
+    element_start, element_end = get_attackdocument_position(parent)
+    list_elements = [docx.oxml.parse_xml(xml) for xml in obj_fragment[0]]
+    list_hyperlinks = [hyperlink for element in list_elements for hyperlink in element.iter(docx.oxml.ns.qn("w:hyperlink"))]
+    for hyperlink, url in zip(list_hyperlinks, obj_fragment[1]):
+        hyperlink.set(docx.oxml.ns.qn("r:id"), get_hyperlink_rid(document.part, url))
+    for element in list_elements:
+        if element_end is not None:
+            element_end.addprevious(element)
+        else:
+            parent.append(element)
+
+def new_attackdocument():
+    """
+    This function returns a new DOCX document based on templates/template.docx, a copy of the template parsed once per process.
+
+    :return: Document, the python-docx document
+    """
+    obj_stat = os.stat(file_docx_template)
+    template_fingerprint = (os.path.abspath(file_docx_template), obj_stat.st_mtime_ns, obj_stat.st_size)
+    with lock_document_template:
+        obj_document_template_fingerprint, obj_document_template = dict_obj_module_cache.get("document_template", (None, None))
+        if obj_document_template_fingerprint != template_fingerprint:
+            obj_document_template = get_docx().Document(file_docx_template)
+            dict_obj_module_cache["document_template"] = (template_fingerprint, obj_document_template)
+    return copy.deepcopy(obj_document_template)
+
+def save_attackdocument(document, file_docx):
+    """
+    This function saves a DOCX document with a fixed timestamp on every part of the package.
+    """
+    get_run_thread_counts()["table_rows"] += len(document.element.body.xpath(".//w:tr"))
+    obj_buffer = io.BytesIO()
+    document.save(obj_buffer)
+    with zipfile.ZipFile(obj_buffer) as obj_zip_source, zipfile.ZipFile(file_docx, 'w', zipfile.ZIP_DEFLATED) as obj_zip_target:
+        for obj_info_source in obj_zip_source.infolist():
+            obj_info_target = zipfile.ZipInfo(obj_info_source.filename, date_time=(1980, 1, 1, 0, 0, 0))
+            obj_info_target.external_attr = obj_info_source.external_attr
+            obj_zip_target.writestr(obj_info_target, obj_zip_source.read(obj_info_source), compress_type=zipfile.ZIP_DEFLATED)
+
 def process_text_with_links_code(text, paragraph):
     links_segments = re.split(r'(\[.*?\]\(.*?\))', text)
     for segment in links_segments:
@@ -67,73 +439,259 @@ def process_text_with_links_code(text, paragraph):
                     paragraph.add_run(code_segment)
     return paragraph
 
-def tactic_viz(tactic):
-    filtered_array = [elem for elem in array_obj_sorted_construct if tactic in elem['attack_tactics']]
-    x = 1
-    tactic_column = ""
+def tactic_viz(tactic, filtered_array):
+    tactic_column_nodes = []
     tactic_column_attributes_list = []
-    for item in filtered_array:
-        attack_label = (item['attack_title']).replace(": ",":\\n")
-        tactic_column_nodes = tactic.replace("-","")+str(x) + " [label = \"" + attack_label + "\"];"
-        tactic_column = tactic_column + tactic_column_nodes
-        tactic_column_attributes = tactic.replace("-","") + str(x)
-        tactic_column_attributes_list.append(tactic_column_attributes)
-        x = x + 1
+    for x, item in enumerate(filtered_array, 1):
+        # Quotes and backslashes of the title are escaped, they would end the DOT label
+        attack_label = item['attack_title'].replace("\\", "\\\\").replace("\"", "\\\"").replace(": ",":\\n")
+        tactic_column_nodes.append(tactic.replace("-","") + str(x) + " [label = \"" + attack_label + "\"];")
+        tactic_column_attributes_list.append(tactic.replace("-","") + str(x))
     tactic_edges = " -> ".join(tactic_column_attributes_list)
     tactic_cluster = "subgraph cluster"+tactic.replace("-","")+" {label=\""+tactic.title().replace("-"," ")+"\";rank=same;style=dotted;" + tactic_edges + "};"
-    tactic_content = (tactic_column + tactic_edges + ";" + tactic_cluster)
+    tactic_content = "".join(tactic_column_nodes) + tactic_edges + ";" + tactic_cluster
     return(tactic_content)
 
+def get_graphviz_executor():
+    """
+    This function returns the pool running at most graphviz_workers Graphviz dot subprocesses, created on first use in every process.
+
+    :return: ThreadPoolExecutor, the pool of the dot subprocesses
+    """
+    with lock_graphviz_executor:
+        pid_graphviz_executor, executor_graphviz = dict_obj_module_cache.get("graphviz_executor", (None, None))
+        if pid_graphviz_executor != os.getpid():
+            from concurrent.futures import ThreadPoolExecutor
+            executor_graphviz = ThreadPoolExecutor(max_workers=graphviz_workers, thread_name_prefix="graphviz")
+            dict_obj_module_cache["graphviz_executor"] = (os.getpid(), executor_graphviz)
+    return executor_graphviz
+
+@attackstage
+def get_graphviz_render(dot_source, image_format="png", dpi=300):
+    """
+    This function renders a DOT source with Graphviz into the render cache, keyed by the SHA-256 of the DOT source and the render options.
+
+    :param dot_source: str, the DOT source of the graph
+    :param image_format: str, the output format of dot, for example png or svg. Default value is png.
+    :param dpi: int, the resolution of the render. Default value is 300.
+    :return: str, the path of the cached render
+    """
+    render_key = hashlib.sha256("\0".join([dot_source, image_format, str(dpi)]).encode("utf-8")).hexdigest()
+    graphviz_cache_path = os.path.join(cache_path, "graphviz")
+    os.makedirs(graphviz_cache_path, exist_ok=True)
+    file_render = os.path.join(graphviz_cache_path, render_key + "." + image_format)
+    if not os.path.isfile(file_render):
+        from subprocess import run
+        file_render_temporary = file_render + "." + str(os.getpid()) + "." + str(threading.get_ident()) + ".tmp"
+        try:
+            run(['dot','-T' + image_format,'-o',file_render_temporary,r'-Gsize=5,3\!','-Gdpi=' + str(dpi)], input=dot_source.encode("utf-8"), check=True)
+            os.replace(file_render_temporary, file_render)
+            get_run_thread_counts()["graphviz_renders"] += 1
+        finally:
+            if os.path.isfile(file_render_temporary):
+                os.remove(file_render_temporary)
+    return file_render
+
+def get_resources_manifest():
+    if not os.path.isfile(file_json_helper_resources_manifest):
+        return {}
+    with open(file_json_helper_resources_manifest, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def set_resources_manifest(file_name, obj_manifest_entry):
+    # The downloads run concurrently, the read-modify-write of the sidecar manifest is serialised
+    with lock_resources_manifest:
+        dict_obj_manifest = get_resources_manifest()
+        dict_obj_manifest[file_name] = obj_manifest_entry
+        file_json_temporary = file_json_helper_resources_manifest + "." + str(os.getpid()) + ".tmp"
+        with open(file_json_temporary, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(dict_obj_manifest, indent=4))
+        os.replace(file_json_temporary, file_json_helper_resources_manifest)
+
+def get_resource_download(url, file_json, force):
+    """
+    This function downloads a resource file when it is missing, or when forced and the remote file changed.
+    The ETag and Last-Modified values are stored in resources/helper_resources_manifest.json.
+
+    :param url: str, the URL of the resource
+    :param file_json: str, the path of the local resource file
+    :param force: bool, whether an existing local file should be refreshed
+    :return: bool, True when the local file was replaced
+    """
+    import urllib.error
+    import urllib.request
+    if os.path.isfile(file_json) and not force:
+        return False
+    file_name = os.path.basename(file_json)
+    obj_manifest_entry = get_resources_manifest().get(file_name, {})
+    dict_request_headers = {}
+    if os.path.isfile(file_json) and obj_manifest_entry.get("url") == url:
+        if obj_manifest_entry.get("etag"):
+            dict_request_headers["If-None-Match"] = obj_manifest_entry["etag"]
+        if obj_manifest_entry.get("last_modified"):
+            dict_request_headers["If-Modified-Since"] = obj_manifest_entry["last_modified"]
+    file_json_temporary = file_json + "." + str(os.getpid()) + "." + str(threading.get_ident()) + ".tmp"
+    for attempt in range(download_retries):
+        try:
+            request = urllib.request.Request(url, headers=dict_request_headers)
+            with urllib.request.urlopen(request, timeout=download_timeout) as response:
+                with open(file_json_temporary, 'wb') as f:
+                    shutil.copyfileobj(response, f, 1024 * 1024)
+                os.replace(file_json_temporary, file_json)
+                set_resources_manifest(file_name, {"url": url, "etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")})
+            return True
+        except urllib.error.HTTPError as error:
+            if error.code == 304:
+                return False
+            # Client errors other than throttling are not transient
+            if error.code < 500 and error.code != 429 or attempt == download_retries - 1:
+                raise
+        except (urllib.error.URLError, OSError):
+            if attempt == download_retries - 1:
+                raise
+        finally:
+            if os.path.isfile(file_json_temporary):
+                os.remove(file_json_temporary)
+        time.sleep(2 ** attempt)
+
 def get_attack_enterprise_json(attack_force, attack_version):
     """
     This function fetches the latest available ATT&CK(r) STIX JSON file from Github.
-    A verification is performed whether the file already exists or not. No option is implemented to fetch a previous version of the file.
+    A verification is performed whether the file already exists or not. A previous version is fetched into the store of ATT&CK(r) versions in resources/attack_versions instead, next to the versions fetched before. It never replaces the latest version, a case selects it through its ATT&CK(r) version.
 
     :param force: bool, using this parameter will allow you to force a download of the ATT&CK(r) STIX JSON file from Github. Default value is False.
     :param version: str, using this parameter will allow you to select the version of the ATT&CK(r) STIX JSON file from Github. Default value is None.
     :return: dict, the contents of the JSON file
     """
     if attack_version:
-        url_json_helper_enterprise_attack = f"https://raw.githubusercontent.com/mitre-attack/attack-stix-data/master/enterprise-attack/enterprise-attack-{attack_version}.json"
-    else:
-        url_json_helper_enterprise_attack = "https://raw.githubusercontent.com/mitre-attack/attack-stix-data/master/enterprise-attack/enterprise-attack.json"
+        attack_version = get_attackstore_version(attack_version)
+        url_json_helper_enterprise_attack = f"{url_base_attack_stix_data}/enterprise-attack/enterprise-attack-{attack_version}.json"
+        if not os.path.isdir(attack_versions_path):
+            os.makedirs(attack_versions_path, 0o744, exist_ok=True)
+        print(f"\u2139 The ATT&CK\u00AE JSON STIX file of version {attack_version} is required to continue. It will be downloaded into the store of ATT&CK\u00AE versions if not already present in the folder")
+        if get_resource_download(url_json_helper_enterprise_attack, get_attackstore_file(attack_version), attack_force):
+            print(f"{url_json_helper_enterprise_attack} has been downloaded.")
+        else:
+            print(f"\u2139 ATT&CK\u00AE version {attack_version} was present already in the store of ATT&CK\u00AE versions.")
+        return
+    url_json_helper_enterprise_attack = f"{url_base_attack_stix_data}/enterprise-attack/enterprise-attack.json"
     print("\u2139 The ATT&CK\u00AE JSON STIX file is required to continue. It will be downloaded if not already present in the folder")
-    if not os.path.isfile(file_json_helper_enterprise_attack) or attack_force or attack_version:
-        urllib.request.urlretrieve(url_json_helper_enterprise_attack, file_json_helper_enterprise_attack)
+    if get_resource_download(url_json_helper_enterprise_attack, file_json_helper_enterprise_attack, attack_force):
         print(f"{url_json_helper_enterprise_attack} has been downloaded.")
     else:
-        with open(file_json_helper_enterprise_attack, 'r', encoding='utf-8') as f:
-            array_obj_complete_attack = json.load(f)
-            modified = array_obj_complete_attack["objects"][0]["modified"]
-            modified_dt = datetime.strptime(modified, "%Y-%m-%dT%H:%M:%S.%fZ")
-            modified_str = modified_dt.strftime("%F")
-            version = array_obj_complete_attack["objects"][0]["x_mitre_version"]
+        obj_attack_metadata = get_attackbundle_metadata(file_json_helper_enterprise_attack, counts=False)
+        modified_dt = datetime.strptime(obj_attack_metadata["modified"], "%Y-%m-%dT%H:%M:%S.%fZ")
+        modified_str = modified_dt.strftime("%F")
+        version = obj_attack_metadata["version"]
         print(f"\u2139 The local ATT&CK\u00AE JSON STIX file was present already and was last modified on {modified_str}. It serves MITRE ATT&CK\u00AE version {version}")
-        print("\u2139 Consider running 'get_attack_enterprise_json(force=True)' to fetch the latest version or run 'get_attack_enterprise_json(attack_version='11.0')' for a specific version. The current file is not overwritten.")
+        print("\u2139 Consider running 'get_attack_enterprise_json(force=True)' to fetch the latest version or run 'get_attack_enterprise_json(attack_version='11.0')' for a specific version. The current file is not overwritten, a specific version is added to the store of ATT&CK\u00AE versions.")
+
+def get_attackbundle_objects(file_json, list_obj_types=None):
+    """
+    This function streams the objects of the "objects" array of a STIX bundle one by one.
+
+    :param file_json: str, the path of the STIX JSON file
+    :param list_obj_types: list, the STIX types to return. Default value is None, returning every object.
+    :return: generator, the objects of the bundle in the order of the file
+    """
+    obj_decoder = json.JSONDecoder()
+    chunk_size = 1024 * 1024
+    with open(file_json, 'r', encoding='utf-8') as f:
+        buffer = ""
+        position = 0
+        eof = False
+        def get_more():
+            nonlocal buffer, position, eof
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            return not eof
+        def get_token():
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position] in " \t\r\n":
+                    position += 1
+                if position < len(buffer):
+                    return buffer[position]
+                if not get_more():
+                    raise ValueError(f"{file_json} ends before the STIX bundle is complete")
+        def get_value():
+            nonlocal position
+            while True:
+                get_token()
+                try:
+                    value, end = obj_decoder.raw_decode(buffer, position)
+                    # A value reaching the end of the buffer could be cut, e.g. a number, it is only accepted at the end of the file
+                    if end < len(buffer) or eof:
+                        position = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                get_more()
+        if get_token() != "{":
+            raise ValueError(f"{file_json} is not a STIX bundle")
+        position += 1
+        while get_token() != "}":
+            if buffer[position] == ",":
+                position += 1
+            key = get_value()
+            if get_token() != ":":
+                raise ValueError(f"{file_json} is not a STIX bundle")
+            position += 1
+            if key != "objects":
+                get_value()
+                continue
+            if get_token() != "[":
+                raise ValueError(f"{file_json} is not a STIX bundle")
+            position += 1
+            while get_token() != "]":
+                if buffer[position] == ",":
+                    position += 1
+                obj = get_value()
+                if list_obj_types is None or obj.get("type") in list_obj_types:
+                    yield obj
+            position += 1
+
+def get_attackbundle_metadata(file_json, counts=True):
+    """
+    This function reads the modification date and version of the first object of the ATT&CK(r) STIX bundle and the number of objects per type.
+
+    :param file_json: str, the path of the ATT&CK(r) STIX JSON file
+    :param counts: bool, count the objects per type, which requires reading the complete file. Default value is True.
+    :return: dict, the modified date, the ATT&CK(r) version and the counts per type
+    """
+    obj_attack_metadata = {"modified": None, "version": None, "counts": {}}
+    for obj in get_attackbundle_objects(file_json):
+        if obj_attack_metadata["modified"] is None:
+            obj_attack_metadata["modified"] = obj.get("modified")
+            obj_attack_metadata["version"] = obj.get("x_mitre_version")
+            if not counts:
+                break
+        obj_attack_metadata["counts"][obj.get("type")] = obj_attack_metadata["counts"].get(obj.get("type"), 0) + 1
+    return obj_attack_metadata
 
 def get_cis_controls_json(cis_force):
     print("\u2139 The CIS Controls ATT&CK\u00AE mapping JSON STIX file is required to continue. It will be silently downloaded if not already present in the folder")
-    if not os.path.exists(file_json_helper_cis_controls_mapping) or cis_force:
-        url_json_helper_cis_controls_mapping = "https://raw.githubusercontent.com/nightly-nessie/attack-cis-controls/main/cis-controls-8-enterprise-attack-12.json"
-        urllib.request.urlretrieve(url_json_helper_cis_controls_mapping, file_json_helper_cis_controls_mapping)
+    url_json_helper_cis_controls_mapping = f"{url_base_cis_controls}/cis-controls-8-enterprise-attack-12.json"
+    get_resource_download(url_json_helper_cis_controls_mapping, file_json_helper_cis_controls_mapping, cis_force)
 
 def get_nist_controls_json(nist_force):
     """
     This function downloads the NIST 800-53 Rev 5 Controls ATT&CK mapping JSON STIX file if it is not already present in the folder.
     """
     print("\u2139 The NIST 800-53 Rev 5 Controls ATT&CK® mapping JSON STIX file is required to continue. It will be silently downloaded if not already present in the folder.")
-    if not os.path.isfile(file_json_helper_nist_mapping) or nist_force:
-        url_json_helper_nist_mapping = "https://raw.githubusercontent.com/center-for-threat-informed-defense/attack-control-framework-mappings/main/frameworks/attack_10_1/nist800_53_r5/stix/nist800-53-r5-enterprise-attack.json"
-        urllib.request.urlretrieve(url_json_helper_nist_mapping, file_json_helper_nist_mapping)
+    url_json_helper_nist_mapping = f"{url_base_nist_controls}/frameworks/attack_10_1/nist800_53_r5/stix/nist800-53-r5-enterprise-attack.json"
+    get_resource_download(url_json_helper_nist_mapping, file_json_helper_nist_mapping, nist_force)
 
 def get_ossem_json(ossem_force):
     """
     This function downloads the OSSEM ATT&CK mapping JSON file if it is not already present in the folder.
     """
     print("\u2139 The OSSEM ATT&CK mapping JSON file is required to continue. It will be silently downloaded if not already present in the folder.")
-    if not os.path.exists(file_json_helper_ossem_mapping_array) or ossem_force:
-        url_json_helper_ossem_mapping = "https://raw.githubusercontent.com/OTRF/OSSEM-DM/main/use-cases/mitre_attack/techniques_to_events_mapping.json"
-        urllib.request.urlretrieve(url_json_helper_ossem_mapping, file_json_helper_ossem_mapping_array)
+    url_json_helper_ossem_mapping = f"{url_base_ossem}/use-cases/mitre_attack/techniques_to_events_mapping.json"
+    get_resource_download(url_json_helper_ossem_mapping, file_json_helper_ossem_mapping_array, ossem_force)
 
 def get_atomic_red_team_json(atomicred_force):
     """
@@ -141,1145 +699,2748 @@ def get_atomic_red_team_json(atomicred_force):
     The downloaded file is used to get the complete atomic red team mapping array.
     """
     print("\u2139 The Red Canary Atomic Red Team tests mapping JSON file is required to continue. It will be silently downloaded if not already present in the folder")
-    if not os.path.exists(file_json_helper_atomicred_mapping_array) or atomicred_force:
-        url_json_helper_atomicred_mapping = "https://raw.githubusercontent.com/redcanaryco/atomic-red-team/master/atomics/Indexes/Attack-Navigator-Layers/art-navigator-layer.json"
-        urllib.request.urlretrieve(url_json_helper_atomicred_mapping, file_json_helper_atomicred_mapping_array)
+    url_json_helper_atomicred_mapping = f"{url_base_atomicred}/atomics/Indexes/Attack-Navigator-Layers/art-navigator-layer.json"
+    get_resource_download(url_json_helper_atomicred_mapping, file_json_helper_atomicred_mapping_array, atomicred_force)
 
+@attackstage
 def get_resources(attack_force=False, attack_version=None, cis_force=False, nist_force=False, ossem_force=False, atomicred_force=False):
-    get_attack_enterprise_json(attack_force, attack_version)
-    get_cis_controls_json(cis_force)
-    get_nist_controls_json(nist_force)
-    get_ossem_json(ossem_force)
-    get_atomic_red_team_json(atomicred_force)
+    if not os.path.isdir(resources_path):
+        os.mkdir(resources_path, 0o744)
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        list_futures = [
+            executor.submit(get_attack_enterprise_json, attack_force, attack_version),
+            executor.submit(get_cis_controls_json, cis_force),
+            executor.submit(get_nist_controls_json, nist_force),
+            executor.submit(get_ossem_json, ossem_force),
+            executor.submit(get_atomic_red_team_json, atomicred_force)
+        ]
+        for future in list_futures:
+            future.result()
+    get_resources_cache()
+    if attack_version:
+        with lock_attack_store:
+            get_attackstore()
 
+@attackstage
 def get_resources_content():
-    with open(file_json_helper_enterprise_attack, 'r', encoding='utf-8') as f:
-        array_obj_complete_attack = json.load(f)
-    with open(file_json_helper_cis_controls_mapping, 'r', encoding='utf-8') as f:
-        array_obj_complete_cis_controls_mapping = json.load(f)
-    with open(file_json_helper_nist_mapping, 'r', encoding='utf-8') as f:
-        array_obj_complete_nist_mapping = json.load(f)
-    with open(file_json_helper_ossem_mapping_array, 'r', encoding='utf-8') as f:
-        array_obj_complete_ossem_mapping = json.load(f)
-    with open(file_json_helper_atomicred_mapping_array, 'r', encoding='utf-8') as f:
-        array_obj_complete_atomicred_mapping = json.load(f)
-    globals()["array_obj_complete_attack"] = array_obj_complete_attack
-    globals()["array_obj_complete_cis_controls_mapping"] = array_obj_complete_cis_controls_mapping
-    globals()["array_obj_complete_nist_mapping"] = array_obj_complete_nist_mapping
-    globals()["array_obj_complete_ossem_mapping"] = array_obj_complete_ossem_mapping
-    globals()["array_obj_complete_atomicred_mapping"] = array_obj_complete_atomicred_mapping
-    
-def set_attack_empty(list_obj_attack_techniques=None):
-    get_resources_content()
-    filtered_objects = [obj for obj in array_obj_complete_attack["objects"] if obj.get('x_mitre_deprecated') != True and obj.get('revoked') != True and obj.get('type') == 'attack-pattern']
-    filtered_external_references = [ref for obj in filtered_objects for ref in obj.get('external_references', []) if ref.get('source_name') == 'mitre-attack']
-    list_obj_complete_techniques = [{'attack_id': ref.get('external_id')} for ref in filtered_external_references]
-    if list_obj_attack_techniques is None:
-        while True:
-            validated = True
-            list_obj_attack_techniques = input("🔨 Give a single or a semicolon separated list of ATT&CK® IDs (for example: T1566.002;T1018;T1033): ").split(";")
-            list_obj_selected_attack_techniques = [{'attack_id': x} for x in list_obj_attack_techniques]
-            for instance in list_obj_selected_attack_techniques:
-                # Check if the item exists in the other list
-                if not any(current.get("attack_id") == instance["attack_id"] for current in list_obj_complete_techniques):
-                    # If it doesn't exist, print a message and set the validated flag to False
-                    print("⚠️ "+ instance["attack_id"] + " does not exist in the current ATT&CK® Enterprise JSON. Please verify your input.")
-                    validated = False
-                    break
-            if validated:
-                globals()["list_obj_selected_attack_techniques"] = list_obj_selected_attack_techniques
-                break
+    global obj_attack_knowledgebase, obj_attack_controls_join, dict_obj_detection_descriptions, obj_ossem_mapping_store, obj_atomicred_index, dict_obj_resources_fingerprint
+    # The resources are only loaded again when one of the files changed since they were loaded
+    if dict_obj_resources_fingerprint is not None and get_resources_fingerprint(dict_obj_resources_fingerprint) == dict_obj_resources_fingerprint:
+        return
+    # Sessions in other threads share the knowledge base, it is loaded by one of them and replaced as a whole
+    with lock_resources_content:
+        if dict_obj_resources_fingerprint is not None and get_resources_fingerprint(dict_obj_resources_fingerprint) == dict_obj_resources_fingerprint:
+            return
+        obj_compiled_resources = get_resources_cache()
+        obj_attack_knowledgebase = obj_compiled_resources["obj_attack_knowledgebase"]
+        obj_attack_controls_join = obj_compiled_resources["obj_attack_controls_join"]
+        dict_obj_detection_descriptions = obj_compiled_resources["dict_obj_detection_descriptions"]
+        obj_ossem_mapping_store = obj_compiled_resources["obj_ossem_mapping_store"]
+        obj_atomicred_index = obj_compiled_resources["obj_atomicred_index"]
+        dict_obj_resources_fingerprint = obj_compiled_resources["dict_obj_resources_fingerprint"]
+
+def get_resources_fingerprint(dict_obj_cached_fingerprint=None):
+    """
+    This function fingerprints the five resource files with their SHA-256, modification time and size.
+
+    :param dict_obj_cached_fingerprint: dict, the fingerprint stored with the compiled cache. Default value is None.
+    :return: dict, the fingerprint per resource file name
+    """
+    dict_obj_fingerprint = {}
+    for file_json in list_file_json_helper_resources + get_atomicred_index_files():
+        file_name = os.path.basename(file_json)
+        dict_obj_fingerprint[file_name] = get_resource_fingerprint(file_json, (dict_obj_cached_fingerprint or {}).get(file_name))
+    return dict_obj_fingerprint
+
+def get_resource_fingerprint(file_json, obj_cached=None):
+    file_stat = os.stat(file_json)
+    if obj_cached and obj_cached["mtime"] == file_stat.st_mtime_ns and obj_cached["size"] == file_stat.st_size:
+        sha256 = obj_cached["sha256"]
     else:
-        list_obj_attack_techniques = list_obj_attack_techniques.split(";")
-        while True:
-            validated = True
-            list_obj_selected_attack_techniques = [{'attack_id': x} for x in list_obj_attack_techniques]
-            for instance in list_obj_selected_attack_techniques:
-                # Check if the item exists in the other list
-                if not any(current.get("attack_id") == instance["attack_id"] for current in list_obj_complete_techniques):
-                    # If it doesn't exist, print a message and set the validated flag to False
-                    print("⚠️ "+ instance["attack_id"] + " does not exist in the current ATT&CK® Enterprise JSON. Please verify your input.")
-                    list_obj_attack_techniques = input("🔨 Give a single or a semicolon separated list of ATT&CK® IDs (for example: T1566.002;T1018;T1033): ").split(";")
-                    validated = False
-                    break
-            if validated:
-                globals()["list_obj_selected_attack_techniques"] = list_obj_selected_attack_techniques
-                break
-    new_attackconstruct()
-
-def new_attackconstruct():
-    array_obj_complete_mapping_external_id_attack_pattern = list(filter(lambda x: x['type'] == 'attack-pattern', array_obj_complete_attack["objects"]))
-    array_obj_complete_mapping_external_id_attack_pattern = list(map(lambda x: {'id': x['id'], **x['external_references'][0]}, array_obj_complete_mapping_external_id_attack_pattern))
-    array_obj_complete_mapping_external_id_attack_pattern = list(filter(lambda x: x['source_name'] == 'mitre-attack', array_obj_complete_mapping_external_id_attack_pattern))
-    array_obj_complete_mapping_external_id_attack_pattern = list(map(lambda x: {'external_id': x['external_id'], 'id': x['id']}, array_obj_complete_mapping_external_id_attack_pattern))
-    array_obj_filtered_mapping_external_id_attack_pattern = list(filter(lambda x: x.get('external_id') in [d.get('attack_id') for d in list_obj_selected_attack_techniques], array_obj_complete_mapping_external_id_attack_pattern))
-    array_obj_sorted_mapping_external_id_attack_pattern = sorted(array_obj_filtered_mapping_external_id_attack_pattern, key=lambda x: x['external_id'])
-    array_obj_complete_construct = []
-    for attack_id in array_obj_sorted_mapping_external_id_attack_pattern:
-        obj_filtered_attack_attack_pattern = next((obj for obj in array_obj_complete_attack["objects"] if obj["type"] == "attack-pattern" and obj["id"] == attack_id["id"]), None)
-        content_introduction_attack_name = obj_filtered_attack_attack_pattern["name"]
-        array_obj_complete_attack_tactics = []
-        for phase_name in obj_filtered_attack_attack_pattern["kill_chain_phases"]:
-            array_obj_complete_attack_tactics.append(phase_name["phase_name"])
-        content_introduction_attack_description = obj_filtered_attack_attack_pattern["description"]
-        content_introduction_attack_description = re.sub(r'\(Citation:.*\)', '', content_introduction_attack_description)
-        content_introduction_attack_description = re.sub(r"\r?\n\r?\n", "\n", content_introduction_attack_description)
-        obj_filtered_attack_attack_pattern_property_external_references = next((ref for ref in obj_filtered_attack_attack_pattern["external_references"] if ref["source_name"] == "mitre-attack"), None)
-        content_introduction_attack_url = obj_filtered_attack_attack_pattern_property_external_references["url"]
-        obj_filtered_attack_attack_pattern_property_external_id = obj_filtered_attack_attack_pattern_property_external_references["external_id"]
-        guid = str(uuid.uuid4())
-        dict_row = {
-            "attack_title": obj_filtered_attack_attack_pattern_property_external_id + ": " + content_introduction_attack_name,
-            "attack_name": content_introduction_attack_name,
-            "attack_id": obj_filtered_attack_attack_pattern_property_external_id,
-            "attack_tactics": array_obj_complete_attack_tactics,
-            "attack_all_tactics": array_obj_complete_attack_tactics,
-            "attack_url": content_introduction_attack_url,
-            "attack_description": content_introduction_attack_description,
-            "guid": guid
+        obj_hash = hashlib.sha256()
+        with open(file_json, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                obj_hash.update(chunk)
+        sha256 = obj_hash.hexdigest()
+    return {"sha256": sha256, "mtime": file_stat.st_mtime_ns, "size": file_stat.st_size}
+
+def get_resources_cache():
+    """
+    This function returns the compiled resources, loading them from the compiled cache when it matches the SHA-256 of the resource files.
+    A stale cache is updated with the changes of the resource files.
+
+    :return: dict, the parsed resources and the prebuilt indexes
+    """
+    obj_compiled_resources_previous = None
+    if os.path.isfile(file_pickle_helper_compiled_resources):
+        try:
+            with open(file_pickle_helper_compiled_resources, 'rb') as f:
+                obj_cache_header = pickle.load(f)
+                dict_obj_fingerprint = get_resources_fingerprint(obj_cache_header.get("fingerprint"))
+                if obj_cache_header.get("format") == compiled_resources_format and obj_cache_header["fingerprint"].keys() == dict_obj_fingerprint.keys() and all(obj_cache_header["fingerprint"].get(file_name, {}).get("sha256") == obj["sha256"] for file_name, obj in dict_obj_fingerprint.items()):
+                    gc.disable()
+                    try:
+                        obj_compiled_resources = pickle.load(f)
+                    finally:
+                        gc.enable()
+                    obj_compiled_resources["dict_obj_resources_fingerprint"] = dict_obj_fingerprint
+                    return obj_compiled_resources
+                if obj_cache_header.get("format") == compiled_resources_format:
+                    gc.disable()
+                    try:
+                        obj_compiled_resources_previous = pickle.load(f)
+                    finally:
+                        gc.enable()
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError):
+            obj_compiled_resources_previous = None
+        if obj_compiled_resources_previous is None:
+            print("\u2139 The compiled resources cache is outdated and will be rebuilt.")
+        else:
+            print("\u2139 The compiled resources cache is outdated and is updated with the changes of the resources.")
+    return new_resources_cache(obj_compiled_resources_previous)
+
+def new_resources_cache(obj_compiled_resources_previous=None):
+    """
+    This function parses the five resource JSON files, builds the indexes and stores the result as the compiled resources cache.
+    When the previous compiled resources are given, only the changed resource files are parsed again, see set_resources_changelog().
+
+    :param obj_compiled_resources_previous: dict, the compiled resources of the previous resource files. Default value is None, building all indexes.
+    :return: dict, the parsed resources and the prebuilt indexes
+    """
+    dict_obj_fingerprint = get_resources_fingerprint()
+    dict_obj_previous_fingerprint = obj_compiled_resources_previous["dict_obj_resources_fingerprint"] if obj_compiled_resources_previous else {}
+    list_unchanged_file_names = [file_name for file_name, obj in dict_obj_fingerprint.items() if dict_obj_previous_fingerprint.get(file_name, {}).get("sha256") == obj["sha256"]]
+    list_file_atomicred_index = get_atomicred_index_files()
+    dict_obj_changes = None
+    gc.disable()
+    try:
+        if os.path.basename(file_json_helper_enterprise_attack) in list_unchanged_file_names:
+            obj_attack_knowledgebase = obj_compiled_resources_previous["obj_attack_knowledgebase"]
+            dict_obj_parsed_detection_descriptions = obj_compiled_resources_previous["dict_obj_detection_descriptions"]
+        else:
+            array_obj_attack_objects = get_attackbundle_objects(file_json_helper_enterprise_attack, list_attackknowledgebase_types)
+            objects_by_id_previous = {}
+            dict_obj_previous_descriptions = {}
+            if obj_compiled_resources_previous:
+                objects_by_id_previous = obj_compiled_resources_previous["obj_attack_knowledgebase"]["objects_by_id"]
+                dict_obj_previous_descriptions = obj_compiled_resources_previous["dict_obj_detection_descriptions"]
+                dict_obj_changes = {"added": [], "changed": [], "revoked": [], "deprecated": [], "removed": []}
+                array_obj_attack_objects = get_attackbundle_changes(objects_by_id_previous, array_obj_attack_objects, dict_obj_changes)
+            obj_attack_knowledgebase = new_attackknowledgebase(array_obj_attack_objects)
+            dict_obj_parsed_detection_descriptions = {}
+            for obj in obj_attack_knowledgebase["objects_by_id"].values():
+                if obj.get("relationship_type") == "detects":
+                    key = (obj.get("id"), obj.get("modified"))
+                    # An unchanged relationship is the instance of the previous knowledge base, its parsed description is kept
+                    if key in dict_obj_previous_descriptions and obj is objects_by_id_previous.get(obj.get("id")):
+                        dict_obj_parsed_detection_descriptions[key] = dict_obj_previous_descriptions[key]
+                    else:
+                        get_attackdetectiondescription(obj, dict_obj_parsed_detection_descriptions)
+        if os.path.basename(file_json_helper_cis_controls_mapping) in list_unchanged_file_names and os.path.basename(file_json_helper_nist_mapping) in list_unchanged_file_names:
+            obj_attack_controls_join = obj_compiled_resources_previous["obj_attack_controls_join"]
+        else:
+            with open(file_json_helper_cis_controls_mapping, 'r', encoding='utf-8') as f:
+                array_obj_complete_cis_controls_mapping = json.load(f)
+            with open(file_json_helper_nist_mapping, 'r', encoding='utf-8') as f:
+                array_obj_complete_nist_mapping = json.load(f)
+            obj_attack_controls_join = new_attackcontrolsjoin(array_obj_complete_cis_controls_mapping, array_obj_complete_nist_mapping)
+        if os.path.basename(file_json_helper_ossem_mapping_array) in list_unchanged_file_names:
+            obj_ossem_mapping_store = obj_compiled_resources_previous["obj_ossem_mapping_store"]
+        else:
+            with open(file_json_helper_ossem_mapping_array, 'r', encoding='utf-8') as f:
+                array_obj_complete_ossem_mapping = json.load(f)
+            obj_ossem_mapping_store = new_ossemmappingstore(array_obj_complete_ossem_mapping)
+        # The Atomic Red Team index also holds the tests of the local atomics folder, it is kept when neither the layer nor the set of index files changed
+        if dict_obj_fingerprint.keys() == dict_obj_previous_fingerprint.keys() and all(os.path.basename(file_json) in list_unchanged_file_names for file_json in [file_json_helper_atomicred_mapping_array] + list_file_atomicred_index):
+            obj_atomicred_index = obj_compiled_resources_previous["obj_atomicred_index"]
+        else:
+            with open(file_json_helper_atomicred_mapping_array, 'r', encoding='utf-8') as f:
+                array_obj_complete_atomicred_mapping = json.load(f)
+            obj_atomicred_index = new_atomicredindex(array_obj_complete_atomicred_mapping, list_file_atomicred_index)
+        obj_compiled_resources = {
+            "dict_obj_resources_fingerprint": dict_obj_fingerprint,
+            "obj_attack_knowledgebase": obj_attack_knowledgebase,
+            "dict_obj_detection_descriptions": dict_obj_parsed_detection_descriptions,
+            "obj_attack_controls_join": obj_attack_controls_join,
+            "obj_ossem_mapping_store": obj_ossem_mapping_store,
+            "obj_atomicred_index": obj_atomicred_index
         }
-        array_obj_complete_construct.append(dict_row)
-    array_obj_selected_construct = []
-    for attack in array_obj_complete_construct:
-        if (len(attack["attack_tactics"])) == 1:
-            array_obj_selected_construct.append(attack)
+    finally:
+        gc.enable()
+    obj_cache_header = {
+        "format": compiled_resources_format,
+        "fingerprint": dict_obj_fingerprint
+    }
+    if not os.path.isdir(cache_path):
+        os.mkdir(cache_path, 0o744)
+    file_pickle_temporary = file_pickle_helper_compiled_resources + "." + str(os.getpid()) + ".tmp"
+    with open(file_pickle_temporary, 'wb') as f:
+        pickle.dump(obj_cache_header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(obj_compiled_resources, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(file_pickle_temporary, file_pickle_helper_compiled_resources)
+    if obj_compiled_resources_previous:
+        set_resources_changelog(obj_compiled_resources_previous, obj_compiled_resources, dict_obj_changes)
+    return obj_compiled_resources
+
+def get_attackbundle_changes(objects_by_id_previous, array_obj_attack_objects, dict_obj_changes):
+    """
+    This function compares the streamed objects of an ATT&CK(r) STIX bundle with the previous bundle by STIX ID and modified timestamp, while passing them on to new_attackknowledgebase().
+
+    :param objects_by_id_previous: dict, the objects of the knowledge base of the previous bundle by STIX ID
+    :param array_obj_attack_objects: iterable, the objects of the bundle as streamed by get_attackbundle_objects()
+    :param dict_obj_changes: dict, receives the STIX IDs of the added, changed, revoked, deprecated and removed objects, the removed ones once the bundle is consumed
+    :return: iterable, the objects of the bundle in the order of the file
+    """
+    set_seen_ids = set()
+    for obj in array_obj_attack_objects:
+        # The relationship types the knowledge base does not keep are not compared
+        if obj.get("type") == "relationship" and obj.get("relationship_type") not in list_attackknowledgebase_relationship_types:
+            yield obj
+            continue
+        obj_id = obj.get("id")
+        set_seen_ids.add(obj_id)
+        obj_previous = objects_by_id_previous.get(obj_id)
+        if obj_previous is None:
+            dict_obj_changes["added"].append(obj_id)
+        elif obj_previous.get("modified") == obj.get("modified") and obj_previous == obj:
+            yield obj_previous
+            continue
+        elif obj.get("revoked") == True and obj_previous.get("revoked") != True:
+            dict_obj_changes["revoked"].append(obj_id)
+        elif obj.get("x_mitre_deprecated") == True and obj_previous.get("x_mitre_deprecated") != True:
+            dict_obj_changes["deprecated"].append(obj_id)
         else:
-            print("\nMultiple tactics were found for " + str(attack["attack_id"]) + ": " + (", ".join((attack["attack_all_tactics"])).replace("-", " ")).title())
-            for tactic in attack["attack_tactics"]:
-                guid = str(uuid.uuid4())
-                split_tactic = attack.copy()
-                split_tactic["attack_tactics"] = [tactic]
-                split_tactic["guid"] = guid
-                beautyfy_split_tactic = str(split_tactic["attack_tactics"][0])
-                beautyfy_split_tactic = (beautyfy_split_tactic.replace("-", " ")).title()
-                query_add_tactic = input("\u2328 Do you want to add " + str(split_tactic["attack_title"]) + "/" + beautyfy_split_tactic + " pair ([Y]/N) ")
-                if query_add_tactic == 'y' or query_add_tactic == "Y" or not query_add_tactic:
-                    array_obj_selected_construct.append(split_tactic)
-                    print("\u2328 " + str(split_tactic["attack_title"]) + "/" + beautyfy_split_tactic + " pair is added.")
+            dict_obj_changes["changed"].append(obj_id)
+        yield obj
+    dict_obj_changes["removed"] += [obj_id for obj_id in objects_by_id_previous if obj_id not in set_seen_ids]
+
+def get_attackbundle_object_label(obj, objects_by_id):
+    if obj.get("type") == "relationship":
+        return obj.get("relationship_type", "") + " " + get_attackbundle_object_label(objects_by_id.get(obj.get("source_ref"), {}), objects_by_id)
+    obj_reference = (obj.get("external_references") or [{}])[0]
+    if obj_reference.get("source_name") == "mitre-attack":
+        return obj_reference["external_id"] + " " + obj.get("name", "")
+    return obj.get("name", obj.get("id", ""))
+
+def get_attackbundle_changes_techniques(obj_attack_knowledgebase_previous, obj_attack_knowledgebase, dict_obj_changes):
+    """
+    This function maps the changed objects of the ATT&CK(r) STIX bundle to the (Sub-)Techniques they affect.
+
+    :param obj_attack_knowledgebase_previous: dict, the knowledge base of the previous bundle
+    :param obj_attack_knowledgebase: dict, the knowledge base of the new bundle
+    :param dict_obj_changes: dict, the STIX IDs of the added, changed, revoked, deprecated and removed objects, see get_attackbundle_changes()
+    :return: dict, the changes per ATT&CK(r) ID, each with its change, its type and the object
+    """
+    list_attack_knowledgebases = [obj_attack_knowledgebase, obj_attack_knowledgebase_previous]
+    objects_by_id = dict(obj_attack_knowledgebase_previous["objects_by_id"])
+    objects_by_id.update(obj_attack_knowledgebase["objects_by_id"])
+    dict_component_ids_by_data_source = {}
+    for obj in objects_by_id.values():
+        if obj.get("type") == "x-mitre-data-component":
+            dict_component_ids_by_data_source.setdefault(obj.get("x_mitre_data_source_ref"), set()).add(obj.get("id"))
+    dict_obj_changes_by_attack_id = {}
+    for change, list_obj_ids in dict_obj_changes.items():
+        for obj_id in list_obj_ids:
+            obj = objects_by_id[obj_id]
+            list_source_ids = [obj_id]
+            if obj.get("type") == "relationship":
+                list_target_refs = [obj.get("source_ref"), obj.get("target_ref")]
+            else:
+                if obj.get("type") == "x-mitre-data-source":
+                    list_source_ids = dict_component_ids_by_data_source.get(obj_id, set())
+                list_target_refs = [obj_id] + [obj_relationship.get("target_ref") for source_id in list_source_ids for obj_knowledgebase in list_attack_knowledgebases for obj_relationship in obj_knowledgebase["relationships_by_source"].get(source_id, [])]
+            obj_change = {"change": change, "type": obj.get("type"), "object": get_attackbundle_object_label(obj, objects_by_id)}
+            for target_ref in dict.fromkeys(list_target_refs):
+                obj_target = objects_by_id.get(target_ref, {})
+                obj_reference = (obj_target.get("external_references") or [{}])[0]
+                if obj_target.get("type") == "attack-pattern" and obj_reference.get("source_name") == "mitre-attack":
+                    list_obj_technique_changes = dict_obj_changes_by_attack_id.setdefault(obj_reference["external_id"], [])
+                    if obj_change not in list_obj_technique_changes:
+                        list_obj_technique_changes.append(obj_change)
+    return dict_obj_changes_by_attack_id
+
+def get_resources_stored_cases():
+    """
+    This function lists the case folders of the working folder with a run_report.json and the (Sub-)Techniques they were generated for.
+
+    :return: list, the case folder, the prefix, the pinned ATT&CK(r) version and the ATT&CK(r) IDs per case
+    """
+    array_obj_stored_cases = []
+    for entry in sorted(os.scandir(parent_dir), key=lambda x: x.name):
+        file_json_run_report = os.path.join(entry.path, "run_report.json")
+        if not entry.is_dir() or not os.path.isfile(file_json_run_report):
+            continue
+        try:
+            with open(file_json_run_report, 'r', encoding='utf-8') as f:
+                obj_run_report = json.load(f)
+            list_attack_ids = obj_run_report.get("attack_ids")
+            if list_attack_ids is None:
+                list_attack_ids = []
+                for file_name in sorted(os.listdir(entry.path)):
+                    if file_name.endswith("navigator_layer.json"):
+                        with open(os.path.join(entry.path, file_name), 'r', encoding='utf-8') as f:
+                            list_attack_ids += [technique["techniqueID"] for technique in json.load(f).get("techniques", [])]
+        except (OSError, ValueError, KeyError):
+            continue
+        array_obj_stored_cases.append({"case_path": entry.path, "prefix": obj_run_report.get("prefix", ""), "attack_version": obj_run_report.get("attack_version"), "attack_ids": list(dict.fromkeys(list_attack_ids))})
+    return array_obj_stored_cases
+
+def set_resources_changelog(obj_compiled_resources_previous, obj_compiled_resources, dict_obj_changes=None):
+    """
+    This function appends the changes of a refresh of the resources to resources/helper_resources_changelog.json and lists the stored cases whose reports are stale.
+
+    :param obj_compiled_resources_previous: dict, the compiled resources before the refresh
+    :param obj_compiled_resources: dict, the compiled resources after the refresh
+    :param dict_obj_changes: dict, the changed objects of the ATT&CK(r) STIX bundle, see get_attackbundle_changes(). Default value is None, the bundle did not change.
+    :return: dict, the entry of the changelog
+    """
+    dict_obj_previous_fingerprint = obj_compiled_resources_previous["dict_obj_resources_fingerprint"]
+    dict_obj_fingerprint = obj_compiled_resources["dict_obj_resources_fingerprint"]
+    obj_attack_knowledgebase_previous = obj_compiled_resources_previous["obj_attack_knowledgebase"]
+    obj_attack_knowledgebase = obj_compiled_resources["obj_attack_knowledgebase"]
+    array_obj_stored_cases = get_resources_stored_cases()
+    # A case pinned to a version of the store of ATT&CK(r) versions does not use the refreshed bundle, it is listed apart
+    array_obj_pinned_cases = [{"case_path": obj_case["case_path"], "prefix": obj_case["prefix"], "attack_version": obj_case["attack_version"]} for obj_case in array_obj_stored_cases if obj_case["attack_version"]]
+    array_obj_stored_cases = [obj_case for obj_case in array_obj_stored_cases if not obj_case["attack_version"]]
+    set_case_attack_ids = set(attack_id for obj_case in array_obj_stored_cases for attack_id in obj_case["attack_ids"])
+    dict_obj_changes_by_attack_id = {}
+    if dict_obj_changes:
+        dict_obj_changes_by_attack_id = get_attackbundle_changes_techniques(obj_attack_knowledgebase_previous, obj_attack_knowledgebase, dict_obj_changes)
+    def add_technique_change(attack_id, obj_change):
+        list_obj_technique_changes = dict_obj_changes_by_attack_id.setdefault(attack_id, [])
+        if obj_change not in list_obj_technique_changes:
+            list_obj_technique_changes.append(obj_change)
+    def get_technique_attack_id(obj_id):
+        obj = obj_attack_knowledgebase["objects_by_id"].get(obj_id) or obj_attack_knowledgebase_previous["objects_by_id"].get(obj_id, {})
+        obj_reference = (obj.get("external_references") or [{}])[0]
+        return obj_reference.get("external_id") if obj.get("type") == "attack-pattern" and obj_reference.get("source_name") == "mitre-attack" else None
+    obj_attack_controls_join_previous = obj_compiled_resources_previous["obj_attack_controls_join"]
+    obj_attack_controls_join = obj_compiled_resources["obj_attack_controls_join"]
+    if obj_attack_controls_join is not obj_attack_controls_join_previous:
+        for join_key, join_type in (("cis_controls_by_mitigation", "cis_controls"), ("nist_controls_by_technique", "nist_controls")):
+            dict_previous_join = obj_attack_controls_join_previous[join_key]
+            dict_join = obj_attack_controls_join[join_key]
+            for obj_id in set(dict_previous_join) | set(dict_join):
+                if dict_previous_join.get(obj_id) == dict_join.get(obj_id):
+                    continue
+                if join_type == "cis_controls":
+                    obj_mitigation = obj_attack_knowledgebase["objects_by_id"].get(obj_id) or obj_attack_knowledgebase_previous["objects_by_id"].get(obj_id, {})
+                    list_technique_ids = [obj_relationship.get("target_ref") for obj_knowledgebase in (obj_attack_knowledgebase, obj_attack_knowledgebase_previous) for obj_relationship in obj_knowledgebase["relationships_by_source"].get(obj_id, []) if obj_relationship.get("relationship_type") == "mitigates"]
+                    obj_change = {"change": "changed", "type": join_type, "object": get_attackbundle_object_label(obj_mitigation, obj_attack_knowledgebase["objects_by_id"]) if obj_mitigation else obj_id}
                 else:
-                    pass
-    attack_tactic_ranks = {
-        'initial-access': 0,
-        'execution': 1,
-        'persistence': 2,
-        'privilege-escalation': 3,
-        'defense-evasion': 4,
-        'credential-access': 5,
-        'discovery': 6,
-        'lateral-movement': 7,
-        'collection': 8,
-        'command-and-control': 9,
-        'exfiltration': 10,
-        'impact': 11
+                    list_technique_ids = [obj_id]
+                    obj_change = {"change": "changed", "type": join_type, "object": get_technique_attack_id(obj_id) or obj_id}
+                for technique_id in list_technique_ids:
+                    attack_id = get_technique_attack_id(technique_id)
+                    if attack_id:
+                        add_technique_change(attack_id, obj_change)
+    obj_ossem_mapping_store_previous = obj_compiled_resources_previous["obj_ossem_mapping_store"]
+    obj_ossem_mapping_store = obj_compiled_resources["obj_ossem_mapping_store"]
+    if obj_ossem_mapping_store is not obj_ossem_mapping_store_previous:
+        # The OSSEM-DM rows are only decoded for the (Sub-)Techniques of the stored cases, NaN values are compared by their JSON form
+        list_keys = [key for key in dict.fromkeys(list(obj_ossem_mapping_store_previous["rows_by_technique_component"]) + list(obj_ossem_mapping_store["rows_by_technique_component"])) if key[0] in set_case_attack_ids]
+        for technique_id, data_component in list_keys:
+            if json.dumps(get_ossemmappingstore_rows(technique_id, data_component, obj_ossem_mapping_store_previous)) != json.dumps(get_ossemmappingstore_rows(technique_id, data_component, obj_ossem_mapping_store)):
+                add_technique_change(technique_id, {"change": "changed", "type": "ossem", "object": data_component})
+    obj_atomicred_index_previous = obj_compiled_resources_previous["obj_atomicred_index"]
+    obj_atomicred_index = obj_compiled_resources["obj_atomicred_index"]
+    if obj_atomicred_index is not obj_atomicred_index_previous:
+        # The position of an entry only orders the validations of a case, an entry removed from the layer does not change the following ones
+        def get_atomicred_entries(obj_index, attack_id):
+            return [{key: value for key, value in technique.items() if key != "position"} for technique in obj_index.get(attack_id, [])]
+        for attack_id in set(obj_atomicred_index_previous) | set(obj_atomicred_index):
+            if get_atomicred_entries(obj_atomicred_index_previous, attack_id) != get_atomicred_entries(obj_atomicred_index, attack_id):
+                add_technique_change(attack_id, {"change": "changed", "type": "atomic_red_team", "object": attack_id})
+    array_obj_stale_cases = []
+    for obj_case in array_obj_stored_cases:
+        list_attack_ids = [attack_id for attack_id in obj_case["attack_ids"] if attack_id in dict_obj_changes_by_attack_id]
+        if list_attack_ids:
+            array_obj_stale_cases.append({"case_path": obj_case["case_path"], "prefix": obj_case["prefix"], "attack_ids": list_attack_ids})
+    obj_changelog_entry = {
+        "date": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "resources": {file_name: {"from": dict_obj_previous_fingerprint.get(file_name, {}).get("sha256"), "to": dict_obj_fingerprint.get(file_name, {}).get("sha256")} for file_name in dict.fromkeys(list(dict_obj_previous_fingerprint) + list(dict_obj_fingerprint)) if dict_obj_previous_fingerprint.get(file_name, {}).get("sha256") != dict_obj_fingerprint.get(file_name, {}).get("sha256")},
+        "attack": {change: len(list_obj_ids) for change, list_obj_ids in dict_obj_changes.items()} if dict_obj_changes else None,
+        "techniques": {attack_id: dict_obj_changes_by_attack_id[attack_id] for attack_id in sorted(set_case_attack_ids) if attack_id in dict_obj_changes_by_attack_id},
+        "stale_cases": array_obj_stale_cases,
+        "pinned_cases": array_obj_pinned_cases
+    }
+    with lock_resources_manifest:
+        array_obj_changelog = []
+        if os.path.isfile(file_json_helper_resources_changelog):
+            with open(file_json_helper_resources_changelog, 'r', encoding='utf-8') as f:
+                array_obj_changelog = json.load(f)
+        array_obj_changelog.append(obj_changelog_entry)
+        file_json_temporary = file_json_helper_resources_changelog + "." + str(os.getpid()) + ".tmp"
+        with open(file_json_temporary, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(array_obj_changelog, indent=4))
+        os.replace(file_json_temporary, file_json_helper_resources_changelog)
+    if dict_obj_changes:
+        print("\u2139 The ATT&CK\u00AE STIX bundle changed: " + ", ".join(str(len(list_obj_ids)) + " " + change for change, list_obj_ids in dict_obj_changes.items()) + " objects.")
+    for obj_case in array_obj_stale_cases:
+        print("\u26A0 The reports of " + (obj_case["prefix"] or "Untitled") + " in " + obj_case["case_path"] + " are stale, " + ", ".join(obj_case["attack_ids"]) + " changed.")
+    print("\u2139 " + str(len(array_obj_stale_cases)) + " of " + str(len(array_obj_stored_cases)) + " stored cases are affected by the changes of the resources, see " + file_json_helper_resources_changelog)
+    for obj_case in array_obj_pinned_cases:
+        print("\u2139 The reports of " + (obj_case["prefix"] or "Untitled") + " in " + obj_case["case_path"] + " are pinned to ATT&CK\u00AE version " + obj_case["attack_version"] + " and are not compared with the refreshed resources.")
+    return obj_changelog_entry
+
+def new_attackknowledgebase(array_obj_attack_objects):
+    """
+    This function builds the indexes over the objects of the ATT&CK(r) STIX bundle used by the construct functions.
+
+    :param array_obj_attack_objects: iterable, the objects of the ATT&CK(r) STIX bundle in the order of the file
+    :return: dict, the indexes of the knowledge base
+    """
+    attack_patterns = []
+    objects_by_id = {}
+    positions_by_id = {}
+    attack_patterns_by_external_id = {}
+    relationships_by_type_target = {}
+    relationships_by_source = {}
+    data_sources_by_ref = {}
+    position = 0
+    for obj in array_obj_attack_objects:
+        obj_type = obj.get("type")
+        if obj_type == "relationship" and obj.get("relationship_type") not in list_attackknowledgebase_relationship_types:
+            continue
+        obj_id = obj.get("id")
+        objects_by_id[obj_id] = obj
+        positions_by_id[obj_id] = position
+        position += 1
+        if obj_type == "attack-pattern":
+            attack_patterns.append(obj)
+            obj_reference = (obj.get("external_references") or [{}])[0]
+            if obj_reference.get("source_name") == "mitre-attack":
+                obj_current = attack_patterns_by_external_id.get(obj_reference["external_id"])
+                # A revoked or deprecated object never hides the active object carrying the same ATT&CK ID
+                if obj_current is None or obj_current.get("revoked") == True or obj_current.get("x_mitre_deprecated") == True:
+                    attack_patterns_by_external_id[obj_reference["external_id"]] = obj
+        elif obj_type == "relationship":
+            relationships_by_type_target.setdefault((obj.get("relationship_type"), obj.get("target_ref")), []).append(obj)
+            relationships_by_source.setdefault(obj.get("source_ref"), []).append(obj)
+        elif obj_type == "x-mitre-data-source":
+            data_sources_by_ref[obj_id] = obj
+    active_attack_ids = {}
+    for obj in attack_patterns:
+        if obj.get('x_mitre_deprecated') != True and obj.get('revoked') != True:
+            for obj_reference in obj.get('external_references', []):
+                if obj_reference.get('source_name') == 'mitre-attack':
+                    active_attack_ids[obj_reference.get('external_id')] = obj.get("name", "")
+    # The replacement of a revoked ATT&CK ID is followed through its chain of "revoked-by" relationships up to an active ID
+    replacements_by_external_id = {}
+    for (relationship_type, target_ref), array_obj_relationships in relationships_by_type_target.items():
+        if relationship_type != "revoked-by":
+            continue
+        obj_target_reference = (objects_by_id.get(target_ref, {}).get("external_references") or [{}])[0]
+        for obj in array_obj_relationships:
+            obj_source_reference = (objects_by_id.get(obj.get("source_ref"), {}).get("external_references") or [{}])[0]
+            if obj_source_reference.get("source_name") == "mitre-attack" and obj_target_reference.get("source_name") == "mitre-attack" and obj_source_reference["external_id"] not in active_attack_ids:
+                replacements_by_external_id[obj_source_reference["external_id"]] = obj_target_reference["external_id"]
+    for attack_id in replacements_by_external_id:
+        replacement_id = replacements_by_external_id[attack_id]
+        list_seen_ids = [attack_id]
+        while replacement_id not in active_attack_ids and replacement_id in replacements_by_external_id and replacement_id not in list_seen_ids:
+            list_seen_ids.append(replacement_id)
+            replacement_id = replacements_by_external_id[replacement_id]
+        replacements_by_external_id[attack_id] = replacement_id
+    obj_attack_knowledgebase = {
+        "active_attack_ids": active_attack_ids,
+        "sorted_attack_ids": sorted(active_attack_ids),
+        "sorted_attack_names": sorted((name.lower(), attack_id) for attack_id, name in active_attack_ids.items()),
+        "replacements_by_external_id": {attack_id: replacement_id for attack_id, replacement_id in replacements_by_external_id.items() if replacement_id in active_attack_ids},
+        "objects_by_id": objects_by_id,
+        "positions_by_id": positions_by_id,
+        "attack_patterns_by_external_id": attack_patterns_by_external_id,
+        "relationships_by_type_target": relationships_by_type_target,
+        "relationships_by_source": relationships_by_source,
+        "data_sources_by_ref": data_sources_by_ref
+    }
+    return obj_attack_knowledgebase
+
+def get_attackstore_version(attack_version):
+    return str(attack_version).strip().lower().lstrip("v")
+
+def get_attackstore_file(attack_version):
+    return os.path.join(attack_versions_path, "enterprise-attack-" + get_attackstore_version(attack_version) + ".json")
+
+def get_attackstore_versions():
+    """
+    This function lists the ATT&CK(r) versions of the store, the enterprise-attack-<version>.json files of resources/attack_versions, ordered by version.
+    """
+    if not os.path.isdir(attack_versions_path):
+        return []
+    list_versions = [file_name[len("enterprise-attack-"):-len(".json")] for file_name in os.listdir(attack_versions_path) if file_name.startswith("enterprise-attack-") and file_name.endswith(".json")]
+    return sorted(list_versions, key=lambda version: [(0, int(part), "") if part.isdigit() else (1, 0, part) for part in version.split(".")])
+
+def get_attackstore_value(value, dict_strings):
+    """
+    This function returns a copy of a STIX object in which every string, keys included, is the single instance of that string held by the store.
+    """
+    if isinstance(value, str):
+        return dict_strings.setdefault(value, value)
+    if isinstance(value, dict):
+        return {dict_strings.setdefault(key, key): get_attackstore_value(item, dict_strings) for key, item in value.items()}
+    if isinstance(value, list):
+        return [get_attackstore_value(item, dict_strings) for item in value]
+    return value
+
+def get_attackstore():
+    """
+    This function returns the store of ATT&CK(r) versions, updated with the changes of resources/attack_versions since it was stored in cache/helper_attack_store.pickle.
+    The caller holds lock_attack_store.
+
+    :return: dict, the objects by (STIX ID, modified), the strings and the fingerprint, metadata and keys per version
+    """
+    obj_attack_store = dict_obj_module_cache.get("attack_store")
+    if obj_attack_store is None and os.path.isfile(file_pickle_helper_attack_store):
+        try:
+            with open(file_pickle_helper_attack_store, 'rb') as f:
+                gc.disable()
+                try:
+                    obj_attack_store = pickle.load(f)
+                finally:
+                    gc.enable()
+            if obj_attack_store.get("format") != attack_store_format:
+                obj_attack_store = None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError):
+            obj_attack_store = None
+    if obj_attack_store is None:
+        obj_attack_store = {"format": attack_store_format, "objects": {}, "strings": {}, "versions": {}}
+    list_versions = get_attackstore_versions()
+    changed = False
+    removed = False
+    for version in list(obj_attack_store["versions"]):
+        if version not in list_versions:
+            del obj_attack_store["versions"][version]
+            dict_obj_attackstore_knowledgebases.pop(version, None)
+            changed = removed = True
+    for version in list_versions:
+        file_json = get_attackstore_file(version)
+        obj_version = obj_attack_store["versions"].get(version)
+        dict_obj_fingerprint = get_resource_fingerprint(file_json, obj_version and obj_version["fingerprint"])
+        if obj_version and obj_version["fingerprint"]["sha256"] == dict_obj_fingerprint["sha256"]:
+            changed = changed or obj_version["fingerprint"] != dict_obj_fingerprint
+            obj_version["fingerprint"] = dict_obj_fingerprint
+            continue
+        list_keys = []
+        gc.disable()
+        try:
+            for obj in get_attackbundle_objects(file_json, list_attackknowledgebase_types):
+                if obj.get("type") == "relationship" and obj.get("relationship_type") not in list_attackknowledgebase_relationship_types:
+                    continue
+                key = (obj.get("id"), obj.get("modified"))
+                if key not in obj_attack_store["objects"]:
+                    obj_attack_store["objects"][key] = get_attackstore_value(obj, obj_attack_store["strings"])
+                list_keys.append(key)
+        finally:
+            gc.enable()
+        obj_attack_store["versions"][version] = {"fingerprint": dict_obj_fingerprint, "metadata": get_attackbundle_metadata(file_json, counts=False), "keys": list_keys}
+        dict_obj_attackstore_knowledgebases.pop(version, None)
+        # The objects of the previous file of a changed version may no longer be used
+        removed = removed or obj_version is not None
+        changed = True
+        print("\u2139 ATT&CK\u00AE version " + version + " is added to the store of ATT&CK\u00AE versions.")
+    if removed:
+        # The objects and strings only held by a removed or changed version are dropped
+        set_used_keys = {key for obj_version in obj_attack_store["versions"].values() for key in obj_version["keys"]}
+        dict_strings = {}
+        obj_attack_store["objects"] = {key: get_attackstore_value(obj, dict_strings) for key, obj in obj_attack_store["objects"].items() if key in set_used_keys}
+        obj_attack_store["strings"] = dict_strings
+    if changed:
+        if not os.path.isdir(cache_path):
+            os.mkdir(cache_path, 0o744)
+        file_pickle_temporary = file_pickle_helper_attack_store + "." + str(os.getpid()) + ".tmp"
+        with open(file_pickle_temporary, 'wb') as f:
+            pickle.dump(obj_attack_store, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(file_pickle_temporary, file_pickle_helper_attack_store)
+    dict_obj_module_cache["attack_store"] = obj_attack_store
+    return obj_attack_store
+
+def get_attackstore_knowledgebase(attack_version):
+    """
+    This function returns the knowledge base of a version of the store of ATT&CK(r) versions, built once per process.
+
+    :param attack_version: str, the ATT&CK(r) version, for example 13.1
+    :return: dict, the indexes of the knowledge base, see new_attackknowledgebase()
+    """
+    attack_version = get_attackstore_version(attack_version)
+    obj_attack_knowledgebase_version = dict_obj_attackstore_knowledgebases.get(attack_version)
+    if obj_attack_knowledgebase_version is not None:
+        return obj_attack_knowledgebase_version
+    with lock_attack_store:
+        if attack_version in dict_obj_attackstore_knowledgebases:
+            return dict_obj_attackstore_knowledgebases[attack_version]
+        obj_attack_store = get_attackstore()
+        if attack_version not in obj_attack_store["versions"]:
+            raise ValueError("ATT&CK\u00AE version " + attack_version + " is not in the store of ATT&CK\u00AE versions, it is added by get_resources(attack_version='" + attack_version + "').")
+        objects_by_id = (obj_attack_knowledgebase or {}).get("objects_by_id", {})
+        def get_attackstore_object(key):
+            obj = objects_by_id.get(key[0])
+            if obj is not None and obj.get("modified") == key[1]:
+                return obj
+            return obj_attack_store["objects"][key]
+        obj_attack_knowledgebase_version = new_attackknowledgebase(get_attackstore_object(key) for key in obj_attack_store["versions"][attack_version]["keys"])
+        dict_obj_attackstore_knowledgebases[attack_version] = obj_attack_knowledgebase_version
+        return obj_attack_knowledgebase_version
+
+def get_attackknowledgebase():
+    # The knowledge base of the ATT&CK(r) version selected by the case running in the thread, the loaded one by default
+    attack_version = get_case_session().attack_version
+    if not attack_version:
+        return obj_attack_knowledgebase
+    return dict_obj_attackstore_knowledgebases.get(attack_version) or get_attackstore_knowledgebase(attack_version)
+
+def new_attackcontrolsjoin(array_obj_complete_cis_controls_mapping, array_obj_complete_nist_mapping):
+    """
+    This function joins the CIS Controls per ATT&CK(r) Mitigation and the NIST 800-53 Rev 5 controls per (Sub-)Technique with their mappings.
+
+    :param array_obj_complete_cis_controls_mapping: dict, the contents of the CIS Controls mapping STIX JSON file
+    :param array_obj_complete_nist_mapping: dict, the contents of the NIST 800-53 Rev 5 mapping STIX JSON file
+    :return: dict, the CIS Controls by Mitigation STIX ID and the NIST controls by (Sub-)Technique STIX ID
+    """
+    cis_controls_by_id = {}
+    for obj in array_obj_complete_cis_controls_mapping['objects']:
+        if obj['type'] == 'course-of-action':
+            cis_controls_by_id.setdefault(obj.get('id', ''), obj)
+    cis_controls_by_mitigation = {}
+    for obj in array_obj_complete_cis_controls_mapping['objects']:
+        obj_cis_control = cis_controls_by_id.get(obj.get('source_ref'))
+        if obj.get('target_ref', '') and obj_cis_control:
+            cis_controls_by_mitigation.setdefault(obj['target_ref'], []).append({
+                "cis_control_id": obj_cis_control.get("external_references")[0].get("external_id"),
+                "cis_control_name": obj_cis_control.get("name"),
+                "cis_control_ig": obj_cis_control.get("x_cis_ig")
+            })
+    nist_controls_by_id = {}
+    for obj in array_obj_complete_nist_mapping['objects']:
+        if obj.get("type") == "course-of-action":
+            nist_controls_by_id.setdefault(obj.get('id', ''), obj)
+    nist_controls_by_technique = {}
+    for obj in array_obj_complete_nist_mapping['objects']:
+        obj_nist_control = nist_controls_by_id.get(obj.get('source_ref'))
+        if obj.get("relationship_type") == "mitigates" and obj_nist_control:
+            nist_controls_by_technique.setdefault(obj.get('target_ref', ''), []).append(obj_nist_control["external_references"][0]["external_id"] + " " + obj_nist_control["name"])
+    for nist_control_array in nist_controls_by_technique.values():
+        nist_control_array.sort()
+    obj_attack_controls_join = {
+        "cis_controls_by_mitigation": cis_controls_by_mitigation,
+        "nist_controls_by_technique": nist_controls_by_technique
     }
-    array_obj_sorted_construct = sorted(array_obj_selected_construct, key=lambda x: attack_tactic_ranks[x['attack_tactics'][0]])
-    globals()["array_obj_sorted_construct"] = array_obj_sorted_construct
-    globals()["array_obj_filtered_mapping_external_id_attack_pattern"] = array_obj_filtered_mapping_external_id_attack_pattern
-    globals()["attack_tactic_ranks"] = attack_tactic_ranks       
-
-def new_condensed_navigator():
-    unique_attack_tactics = set()
-    for dictionary in array_obj_sorted_construct:
-        unique_attack_tactics.update(dictionary['attack_tactics'])
-    unique_attack_tactics = list(unique_attack_tactics)
-    sorted_unique_attack_tactic = sorted(unique_attack_tactics, key=lambda x: attack_tactic_ranks.get(x))
-    navigator_header_viz = "digraph customer {layout=dot;label = \"\";labelloc = \"t\";node [style=rounded shape=Mrecord style=filled fillcolor = lightgrey color = lightgrey];edge [style=\"invis\"];"
-    navigator_content_viz = ""
-    for tactic in sorted_unique_attack_tactic:
-        navigator_content_viz += tactic_viz(tactic)
-    condensed_navigator_graphviz = navigator_header_viz + navigator_content_viz + "}"
-    file_condensed_navigator_dot = os.path.join(case_path, "condensed_navigator.dot")
-    with open(file_condensed_navigator_dot, 'w') as file_graph_dot:
-        file_graph_dot.write(condensed_navigator_graphviz)
-    from subprocess import check_call
-    file_condensed_navigator = os.path.join(case_path, "condensed_navigator.png")
-    check_call(['dot','-Tpng',file_condensed_navigator_dot,'-o',file_condensed_navigator,'-Gsize=5,3\!','-Gdpi=300'])
-    globals()["file_condensed_navigator"] = file_condensed_navigator
+    return obj_attack_controls_join
+
+def new_ossemmappingstore(array_obj_complete_ossem_mapping):
+    """
+    This function stores the OSSEM-DM mapping as categorical columns, with the row range of every (technique_id, data_component) key.
+
+    :param array_obj_complete_ossem_mapping: list, the contents of the OSSEM-DM techniques to events mapping JSON file
+    :return: dict, the categories and codes per field and the row range per (technique_id, data_component)
+    """
+    from array import array
+    list_keys = [(ossem_obj.get("technique_id"), str(ossem_obj.get("data_component"))) for ossem_obj in array_obj_complete_ossem_mapping]
+    list_positions = sorted(range(len(array_obj_complete_ossem_mapping)), key=lambda position: (str(list_keys[position][0]), list_keys[position][1], position))
+    dict_categories = {field: [] for field in list_ossem_mapping_fields}
+    dict_codes = {field: array('I') for field in list_ossem_mapping_fields}
+    dict_category_codes = {field: {} for field in list_ossem_mapping_fields}
+    rows_by_technique_component = {}
+    for row, position in enumerate(list_positions):
+        ossem_obj = array_obj_complete_ossem_mapping[position]
+        for field in list_ossem_mapping_fields:
+            value = ossem_obj.get(field, float("nan"))
+            # The values are keyed by their JSON form: 4688 and "4688" keep distinct codes while every NaN shares a single code
+            code = dict_category_codes[field].setdefault(json.dumps(value), len(dict_categories[field]))
+            if code == len(dict_categories[field]):
+                dict_categories[field].append(value)
+            dict_codes[field].append(code)
+        start, _ = rows_by_technique_component.get(list_keys[position], (row, row))
+        rows_by_technique_component[list_keys[position]] = (start, row + 1)
+    obj_ossem_mapping_store = {
+        "categories": dict_categories,
+        "codes": dict_codes,
+        "rows_by_technique_component": rows_by_technique_component
+    }
+    return obj_ossem_mapping_store
+
+def get_ossemmappingstore_rows(technique_id, data_component, obj_store=None):
+    if obj_store is None:
+        obj_store = obj_ossem_mapping_store
+    start, stop = obj_store["rows_by_technique_component"].get((technique_id, data_component), (0, 0))
+    dict_categories = obj_store["categories"]
+    dict_codes = obj_store["codes"]
+    return [{field: dict_categories[field][dict_codes[field][row]] for field in list_ossem_mapping_fields} for row in range(start, stop)]
+
+def get_atomicred_index_files():
+    """
+    This function lists the test indexes of the local Atomic Red Team atomics folder set through ATTACKIR_ATOMICS_PATH, if any.
+    The per platform CSV indexes are preferred, the YAML index is only used when they are absent.
+
+    :return: list, the paths of the index files
+    """
+    if not atomics_path:
+        return []
+    atomics_index_path = os.path.join(atomics_path, "Indexes")
+    atomics_index_csv_path = os.path.join(atomics_index_path, "Indexes-CSV")
+    if os.path.isdir(atomics_index_csv_path):
+        return sorted(os.path.join(atomics_index_csv_path, file_name) for file_name in os.listdir(atomics_index_csv_path) if file_name.endswith("-index.csv"))
+    if os.path.isfile(os.path.join(atomics_index_path, "index.yaml")):
+        return [os.path.join(atomics_index_path, "index.yaml")]
+    print(f"\u26A0 No Atomic Red Team index was found in {atomics_index_path}, the validations are not enriched with the tests.")
+    return []
+
+def get_atomicred_tests(list_file_atomicred_index):
+    """
+    This function reads the Atomic Red Team tests per ATT&CK(r) ID from the indexes of a local atomics folder. Reading the YAML index requires PyYAML.
+
+    :param list_file_atomicred_index: list, the paths of the index files
+    :return: dict, the tests ordered by number per ATT&CK(r) ID, each with its number, name, platforms and executor
+    """
+    dict_obj_tests = {}
+    for file_atomicred_index in list_file_atomicred_index:
+        if file_atomicred_index.endswith(".csv"):
+            platform = os.path.basename(file_atomicred_index)[:-len("-index.csv")]
+            with open(file_atomicred_index, 'r', encoding='utf-8', newline='') as f:
+                for row in csv.DictReader(f):
+                    obj_test = dict_obj_tests.setdefault(row["Technique #"], {}).setdefault(row["Test GUID"], {
+                        "number": int(row["Test #"]),
+                        "name": row["Test Name"],
+                        "platforms": [],
+                        "executor": row["Executor Name"]
+                    })
+                    if platform not in obj_test["platforms"]:
+                        obj_test["platforms"].append(platform)
+        else:
+            try:
+                import yaml
+            except ImportError:
+                print("\u26A0 PyYAML is required to read " + file_atomicred_index + ", the validations are not enriched with the tests. It can be installed with 'pip install pyyaml'.")
+                continue
+            with open(file_atomicred_index, 'r', encoding='utf-8') as f:
+                obj_atomicred_yaml = yaml.safe_load(f)
+            for techniques in obj_atomicred_yaml.values():
+                for technique_id, technique in techniques.items():
+                    for number, test in enumerate(technique.get("atomic_tests") or [], 1):
+                        dict_obj_tests.setdefault(technique_id, {}).setdefault(test.get("auto_generated_guid") or technique_id + "#" + str(number), {
+                            "number": number,
+                            "name": test.get("name"),
+                            "platforms": list(test.get("supported_platforms") or []),
+                            "executor": (test.get("executor") or {}).get("name")
+                        })
+    return {technique_id: sorted(tests.values(), key=lambda x: x["number"]) for technique_id, tests in dict_obj_tests.items()}
+
+def new_atomicredindex(array_obj_complete_atomicred_mapping, list_file_atomicred_index):
+    """
+    This function indexes the Atomic Red Team Navigator layer by ATT&CK(r) ID, with the score, the links and the local tests of every technique.
+
+    :param array_obj_complete_atomicred_mapping: dict, the contents of the Atomic Red Team Navigator layer JSON file
+    :param list_file_atomicred_index: list, the paths of the index files of the local atomics folder
+    :return: dict, the entries of the layer per ATT&CK(r) ID
+    """
+    dict_obj_tests = get_atomicred_tests(list_file_atomicred_index)
+    obj_atomicred_index = {}
+    for position, technique in enumerate(array_obj_complete_atomicred_mapping["techniques"]):
+        obj_atomicred_index.setdefault(technique["techniqueID"], []).append({
+            "position": position,
+            "techniqueID": technique["techniqueID"],
+            "score": technique.get("score"),
+            "links": technique.get("links", []),
+            "tests": dict_obj_tests.get(technique["techniqueID"], [])
+        })
+    return obj_atomicred_index
+
+def get_attackknowledgebase_object(obj_type, obj_id):
+    obj = get_attackknowledgebase()["objects_by_id"].get(obj_id)
+    if obj is not None and obj.get("type") == obj_type:
+        return obj
+    return None
+
+def get_attackknowledgebase_relationships(relationship_type, list_target_refs):
+    # Relationships are returned in the order of the bundle
+    obj_attack_knowledgebase = get_attackknowledgebase()
+    relationships_by_type_target = obj_attack_knowledgebase["relationships_by_type_target"]
+    array_obj_relationships = [obj for target_ref in set(list_target_refs) for obj in relationships_by_type_target.get((relationship_type, target_ref), [])]
+    return sorted(array_obj_relationships, key=lambda x: obj_attack_knowledgebase["positions_by_id"][x["id"]])
+
+def get_attacktechniques_suggestions(attack_id, limit=3):
+    """
+    This function suggests the active ATT&CK(r) IDs nearest to an unknown ID.
+
+    :param attack_id: str, the unknown ATT&CK(r) ID or name
+    :param limit: int, the maximum number of suggestions. Default value is 3.
+    :return: list, the suggested ATT&CK(r) IDs
+    """
+    import bisect
+    list_suggestions = []
+    obj_attack_knowledgebase = get_attackknowledgebase()
+    sorted_attack_ids = obj_attack_knowledgebase["sorted_attack_ids"]
+    for length in range(len(attack_id), 2, -1):
+        prefix = attack_id[:length].upper()
+        position = bisect.bisect_left(sorted_attack_ids, prefix)
+        while position < len(sorted_attack_ids) and sorted_attack_ids[position].startswith(prefix) and len(list_suggestions) < limit:
+            list_suggestions.append(sorted_attack_ids[position])
+            position += 1
+        if list_suggestions:
+            break
+    sorted_attack_names = obj_attack_knowledgebase["sorted_attack_names"]
+    name = attack_id.lower()
+    position = bisect.bisect_left(sorted_attack_names, (name,))
+    while len(name) > 2 and position < len(sorted_attack_names) and sorted_attack_names[position][0].startswith(name) and len(list_suggestions) < limit:
+        if sorted_attack_names[position][1] not in list_suggestions:
+            list_suggestions.append(sorted_attack_names[position][1])
+        position += 1
+    return list_suggestions
+
+def get_attacktechniques_resolved(list_obj_attack_techniques):
+    """
+    This function validates a list of ATT&CK(r) IDs against the active (Sub-)Techniques, a revoked ID is replaced by the ID it was revoked by.
+
+    :param list_obj_attack_techniques: str or list, the ATT&CK(r) IDs, as a list or separated by semicolons, commas or white space
+    :return: tuple, the list of resolved ATT&CK(r) IDs, the replacements of revoked IDs and the suggestions per invalid ID
+    """
+    if isinstance(list_obj_attack_techniques, str):
+        list_obj_attack_techniques = re.split(r"[;,\s]+", list_obj_attack_techniques)
+    list_obj_attack_techniques = [attack_id.strip() for attack_id in list_obj_attack_techniques if attack_id.strip()]
+    obj_attack_knowledgebase = get_attackknowledgebase()
+    active_attack_ids = obj_attack_knowledgebase["active_attack_ids"]
+    replacements_by_external_id = obj_attack_knowledgebase["replacements_by_external_id"]
+    list_resolved_attack_ids = []
+    dict_replaced_attack_ids = {}
+    dict_invalid_attack_ids = {}
+    for attack_id in list_obj_attack_techniques:
+        if attack_id.upper() in active_attack_ids:
+            list_resolved_attack_ids.append(attack_id.upper())
+        elif attack_id.upper() in replacements_by_external_id:
+            dict_replaced_attack_ids[attack_id] = replacements_by_external_id[attack_id.upper()]
+            list_resolved_attack_ids.append(replacements_by_external_id[attack_id.upper()])
+        elif attack_id not in dict_invalid_attack_ids:
+            dict_invalid_attack_ids[attack_id] = get_attacktechniques_suggestions(attack_id)
+    if not list_obj_attack_techniques:
+        dict_invalid_attack_ids[""] = []
+    return list_resolved_attack_ids, dict_replaced_attack_ids, dict_invalid_attack_ids
+
+def set_attack_empty(list_obj_attack_techniques=None, tactic_pairs=None):
+    return case_session.set_attack_empty(list_obj_attack_techniques, tactic_pairs)
+
+def get_tactic_pairs(tactic_pairs):
+    """
+    This function normalises the (Sub-)Technique/Tactic pairs to keep for (Sub-)Techniques associated with multiple Tactics.
+    The pairs are given either as a dict of ATT&CK(r) IDs with their list of Tactics, or as a semicolon separated list of ID/Tactic pairs, for example T1053.005/execution;T1053.005/Privilege Escalation.
+
+    :param tactic_pairs: dict or str, the pairs to keep
+    :return: dict, the list of Tactics per ATT&CK(r) ID in the phase name notation (privilege-escalation)
+    """
+    if isinstance(tactic_pairs, str):
+        dict_tactic_pairs = {}
+        for pair in tactic_pairs.split(";"):
+            if pair.strip():
+                attack_id, tactic = pair.split("/", 1)
+                dict_tactic_pairs.setdefault(attack_id.strip(), []).append(tactic)
+        tactic_pairs = dict_tactic_pairs
+    return {attack_id.strip(): [tactic.strip().lower().replace(" ", "-") for tactic in tactics] for attack_id, tactics in tactic_pairs.items()}
+
+def new_attackconstruct(tactic_pairs=None):
+    return case_session.new_attackconstruct(tactic_pairs)
+
+def new_condensed_navigator(image_format="png", dpi=300):
+    return case_session.new_condensed_navigator(image_format, dpi)
 
 def new_attackdocintroduction():
-    if dot_present is not None:
-        new_condensed_navigator()
-    else:
-       pass
-    file_docx_introduction = os.path.join(case_path, document_prefix + "introduction.docx")
-    document = Document(file_docx_template)
-    document.add_heading("Introduction",1)
-    document.add_paragraph("This annex describes the possible mitigations, controls and eventually detections to implement to avoid a similar incident from happening again. The identified adversary TTPs (Techniques, Procedures and Tactics) are the result from the investigation conducted by CPIRT. The information presented stems from the common library for adversarial TTPs, the MITRE ATT&CK® Framework [https://attack.mitre.org/]. The different techniques are listed, explained, and linked with the adversary tactics. Tactics are the goals an adversary wants to achieve. Next, based on these techniques, possible mitigations are listed, each with a description and relation with both the MITRE ATT&CK® Techniques and CIS Controls. Some environments do not allow or struggle implementing the presented mitigations/controls. To cover these gaps, detections should be put in place. Coverage of the possible detections against the identified Techniques also includes the platform (IaaS, Containers, Linux, Windows ...) and the collection layer (Network, Host ...) to deploy the detection. Some detections may not be relevant for the environment as the platform may not be in use. The indication of the platform makes it straightforward to disregard those irrelevant detections.")
-    document.add_heading("Techniques",1)
-    document.add_paragraph("According to the MITRE ATT&CK® Framework 'Techniques' represent 'how' an adversary achieves a tactical goal (tactic) by performing an action. For example, an adversary may dump credentials to achieve credential access. Below are the identified MITRE ATT&CK® Techniques listed which provide insight in the actions performed by perpetrators during this incident. Depending on the available information and artefacts, this may not be an exhaustive list but should provide a very reasonable starting point to understand the techniques used and the follow up mitigations/controls to implement. Assure you have put detections in place where mitigations/controls were not implemented or are insufficient.")
-    for item in array_obj_sorted_construct:
-        document.add_heading(item['attack_title'],2)
-        table = document.add_table(rows=0,cols=1)
-        row_cells = table.add_row().cells
-        attack_tactic = (item['attack_tactics'][0]).replace("-", " ")
-        row_cells[0].text = "Selected ATT&CK® Tactic: " + (attack_tactic).title()
-        table.add_row()
-        row_cells = table.add_row().cells
-        attackurl = row_cells[0].paragraphs[0]
-        add_hyperlink(attackurl, "ATT&CK® URL: " + item['attack_id'], item['attack_url'])
-        row_cells = table.add_row().cells
-        para = row_cells[0].add_paragraph()
-        text = item['attack_description']
-        process_text_with_links_code(text, para)
-    if dot_present is not None:
-        document.add_page_break()
-        document.add_picture(file_condensed_navigator)
-    else:
-       pass
-    document.save(file_docx_introduction)
+    return case_session.new_attackdocintroduction()
 
 def new_attackmitigationsconstruct():
-    array_obj_complete_attack_mitigations = [obj for obj in array_obj_complete_attack["objects"] if obj.get("relationship_type") == "mitigates"]
-    array_obj_filtered_attack_mitigations = [obj for obj in array_obj_complete_attack_mitigations if obj["target_ref"] in [attack_pattern["id"] for attack_pattern in array_obj_filtered_mapping_external_id_attack_pattern] and obj.get("x_mitre_deprecated") != True]
-    array_obj_complete_mitigations = []
-    array_obj_filtered_cis_controls_prio = []
+    return case_session.new_attackmitigationsconstruct()
+
+def get_attackmitigationsmappings(ciscontrols,nistcontrols,interactive=True):
+    return case_session.get_attackmitigationsmappings(ciscontrols, nistcontrols, interactive)
+
+def new_attackdocmitigations(ciscontrols,nistcontrols,interactive=True,construct=True):
+    return case_session.new_attackdocmitigations(ciscontrols, nistcontrols, interactive, construct)
+
+def get_attackdetectiondescription(detection, dict_obj_parsed_detection_descriptions=None):
+    """
+    This function parses the description of a "detects" relationship into its cleaned description, its short description and its implementation/pseudocode pairs.
+
+    :param detection: dict, the "detects" relationship
+    :param dict_obj_parsed_detection_descriptions: dict, the memo to use. Default value is None, using the memo loaded with the resources.
+    :return: dict, the parsed description, the short descriptions and the implementation/pseudocode pairs as tuples. It is shared between calls and must not be modified.
+    """
+    if dict_obj_parsed_detection_descriptions is None:
+        dict_obj_parsed_detection_descriptions = dict_obj_detection_descriptions
+    key = (detection.get("id"), detection.get("modified"))
+    obj_parsed_description = dict_obj_parsed_detection_descriptions.get(key)
+    if obj_parsed_description is not None:
+        return obj_parsed_description
+    obj_detection_property_description = detection_citation_pattern.sub('', detection["description"])
+    obj_detection_property_description = detection_h4_open_pattern.sub('<h4>', obj_detection_property_description)
+    obj_detection_property_description = detection_h5_open_pattern.sub('<h5>', obj_detection_property_description)
+    obj_detection_property_description = detection_h4_close_pattern.sub('</h4>', obj_detection_property_description)
+    obj_detection_property_description = detection_h5_close_pattern.sub('</h5>', obj_detection_property_description)
+    description_short = detection_description_pattern.findall(obj_detection_property_description)
+    if len(description_short) == 0:
+        description_short.append(obj_detection_property_description)
+    description_implementations = detection_implementation_pattern.findall(obj_detection_property_description)
+    description_pseudocodes = detection_pseudocode_pattern.findall(obj_detection_property_description)
+    description_detections = []
+    for i in range(len(description_implementations)):
+        description_detection = {
+            "implementation": description_implementations[i].strip(),
+            "pseudocode": description_pseudocodes[i].strip()
+        }
+        description_detections.append(description_detection)
+    obj_parsed_description = {
+        "description": obj_detection_property_description,
+        "reduced_description": tuple(description_short),
+        "car_pseudocode": tuple(description_detections)
+    }
+    dict_obj_parsed_detection_descriptions[key] = obj_parsed_description
+    return obj_parsed_description
+
+def get_attackmitigationssections(dict_obj_filtered_mapping_attack_pattern):
+    """
+    This function derives the mitigations section of every given (Sub-)Technique: the fields of its mitigation rows and the CIS Controls(r) of every row.
+
+    :param dict_obj_filtered_mapping_attack_pattern: dict, the ATT&CK(r) ID and STIX ID of the (Sub-)Techniques by STIX ID
+    :return: dict, the rows by STIX ID of the (Sub-)Technique, every row holding the position of its relationship in the bundle, the fields of its AttackMitigationRecord and its CIS Controls(r)
+    """
+    dict_obj_mitigations_sections = {attack_pattern_id: [] for attack_pattern_id in dict_obj_filtered_mapping_attack_pattern}
+    positions_by_id = get_attackknowledgebase()["positions_by_id"]
+    array_obj_complete_attack_mitigations = get_attackknowledgebase_relationships("mitigates", dict_obj_filtered_mapping_attack_pattern)
+    array_obj_filtered_attack_mitigations = [obj for obj in array_obj_complete_attack_mitigations if obj.get("x_mitre_deprecated") != True]
     for mitigation in array_obj_filtered_attack_mitigations:
         obj_course_of_action_property_guid = mitigation['source_ref']
-        obj_mitigation = next((obj for obj in array_obj_complete_attack['objects'] if obj['type'] == 'course-of-action' and obj['id'] == obj_course_of_action_property_guid), None)
+        obj_mitigation = get_attackknowledgebase_object('course-of-action', obj_course_of_action_property_guid)
         if obj_mitigation and obj_mitigation.get('x_mitre_deprecated', False) == True:
             pass
         else:
-            obj_course_of_action_property_guid = mitigation['source_ref']
             obj_mitigation_property_description = mitigation['description']
             obj_mitigation_property_description = re.sub(r'\(Citation:.*\)', '', obj_mitigation_property_description)
             obj_mitigation_property_description_clean = re.sub(r"\r?\n\r?\n", "`n", obj_mitigation_property_description)
-            obj_mitigation_attack_pattern = next((obj for obj in array_obj_filtered_mapping_external_id_attack_pattern if obj['id'] == mitigation['target_ref']), None)
-            mitigation_component_block = next((obj for obj in array_obj_complete_attack['objects'] if obj['type'] == 'course-of-action' and obj['id'] == obj_course_of_action_property_guid), None)
+            obj_mitigation_attack_pattern = dict_obj_filtered_mapping_attack_pattern[mitigation['target_ref']]
+            mitigation_component_block = obj_mitigation
             obj_mitigation_property_id = next((ref for ref in mitigation_component_block['external_references'] if ref['source_name'] == 'mitre-attack'), None)
-            array_obj_filtered_cis_controls_mapping = [obj for obj in array_obj_complete_cis_controls_mapping['objects'] if obj.get('target_ref', '') == mitigation['source_ref']]
-            array_obj_complete_cis_control_content = []
-            for mapping in array_obj_filtered_cis_controls_mapping:
-                obj_complete_cis_control = [obj for obj in array_obj_complete_cis_controls_mapping['objects'] if obj['type'] == 'course-of-action']
-                obj_complete_cis_control = [obj for obj in obj_complete_cis_control if obj.get('id', '') == mapping['source_ref']]
-                content_cis_controls = obj_complete_cis_control[0]["external_references"][0]["external_id"] + " " + obj_complete_cis_control[0]["name"]
-                array_obj_complete_cis_control_content.append(content_cis_controls)
-            for mapping in array_obj_filtered_cis_controls_mapping:
-                obj_complete_cis_control = [obj for obj in array_obj_complete_cis_controls_mapping['objects'] if obj['type'] == 'course-of-action']
-                obj_complete_cis_control = [obj for obj in obj_complete_cis_control if obj.get('id', '') == mapping['source_ref']]
-                array_cis_row = {
-                    "cis_control_id": obj_complete_cis_control[0].get("external_references")[0].get("external_id"),
-                    "cis_control_name": obj_complete_cis_control[0].get("name"),
-                    "cis_control_ig": obj_complete_cis_control[0].get("x_cis_ig")
-                }
-                array_obj_filtered_cis_controls_prio.append(array_cis_row)
+            array_obj_filtered_cis_controls = obj_attack_controls_join["cis_controls_by_mitigation"].get(mitigation['source_ref'], [])
+            array_obj_complete_cis_control_content = [cis_control["cis_control_id"] + " " + cis_control["cis_control_name"] for cis_control in array_obj_filtered_cis_controls]
             query_content_cis_controls = not bool(array_obj_complete_cis_control_content)
             if not query_content_cis_controls:
-                content_cis_controls_body = "\n".join(array_obj_complete_cis_control_content)
+                content_cis_controls_body = sys.intern("\n".join(array_obj_complete_cis_control_content))
             else:
                 content_cis_controls_body = "There is no CIS Control® mapped with this Mitigation."
-            nist_coas = [obj for obj in array_obj_complete_nist_mapping["objects"] if obj.get("relationship_type") == "mitigates"]
-            nist_coas = [obj for obj in nist_coas if obj.get('target_ref', '') == mitigation['target_ref']]
-            nist_control_array = []
-            for coa in nist_coas:
-                nist_coa_block = [obj for obj in array_obj_complete_nist_mapping["objects"] if obj.get("type") == "course-of-action"]
-                nist_coa_block = [obj for obj in nist_coa_block if obj.get('id', '') == coa['source_ref']]
-                nist_control_id = nist_coa_block[0]["external_references"][0]["external_id"]
-                nist_control_name = nist_coa_block[0]["name"]
-                nist_string = nist_control_id + " " + nist_control_name
-                nist_control_array.append(nist_string)
-            nist_control_array.sort()
-            nist_control_body = "\n".join(nist_control_array)
-            array_mitigations_row = {
-                "name": mitigation_component_block["name"],
-                "external_id": obj_mitigation_property_id["external_id"],
-                "url": obj_mitigation_property_id["url"],
-                "description": obj_mitigation_property_description_clean,
-                "attack_id": obj_mitigation_attack_pattern["external_id"],
-                "cis_control": content_cis_controls_body,
-                "nist_control": nist_control_body
-            }
-            array_obj_complete_mitigations.append(array_mitigations_row)
-    array_obj_sorted_mitigations = sorted(array_obj_complete_mitigations, key=lambda x: x.get('external_id', ''))
-    from collections import defaultdict
-    grouped_cis_controls = defaultdict(list)
-    for control in array_obj_filtered_cis_controls_prio:
-        grouped_cis_controls[control['cis_control_id']].append(control)
-    array_obj_complete_cis_controls_prio = []
-    for control_id, controls in grouped_cis_controls.items():
-        cis_control_name = controls[0]['cis_control_name']
-        cis_control_ig = controls[0]['cis_control_ig']
-        cis_control_count = len(controls)
-        new_obj = {
-            'cis_control_id': control_id,
-            'cis_control_name': cis_control_name,
-            'cis_control_ig': cis_control_ig,
-            'cis_control_count': cis_control_count
-        }
-        array_obj_complete_cis_controls_prio.append(new_obj)
-    array_obj_complete_cis_controls_prio_sorted = sorted(array_obj_complete_cis_controls_prio, key=lambda x: (x['cis_control_ig'], -x['cis_control_count'], x['cis_control_id']))
-    globals()["array_obj_sorted_mitigations"] = array_obj_sorted_mitigations
-    globals()["array_obj_complete_cis_controls_prio_sorted"] = array_obj_complete_cis_controls_prio_sorted
-
-def get_attackmitigationsmappings(ciscontrols,nistcontrols):
-    if (ciscontrols and not nistcontrols):
-        switch_control_mapping_selection = "CX"
-    if (nistcontrols and not ciscontrols):
-        switch_control_mapping_selection = "XN"
-    if (ciscontrols and nistcontrols):
-        switch_control_mapping_selection = "CN"
-    if (not nistcontrols and not ciscontrols):
-        query_cis_controls_mapping = input("\u2328 Do you want to generate the CIS Controls® v8 mapping? ([Y]/N) ")
-        if not query_cis_controls_mapping or query_cis_controls_mapping.upper() == "Y":
-            query_nist_controls_mapping = input("\u2328 Do you want to generate the NIST 800-53 Rev 5 Controls mapping? (Y/[N]) ")
-            if not query_nist_controls_mapping or query_nist_controls_mapping.upper() == "N":
-                switch_control_mapping_selection = "CX"
-            else:
-                switch_control_mapping_selection = "CN"
-        else:
-            query_nist_controls_mapping = input("\u2328 Do you want to generate the NIST 800-53 Rev 5 Controls mapping? (Y/[N]) ")
-            if not query_nist_controls_mapping or query_nist_controls_mapping.upper() == "N":
-                switch_control_mapping_selection = "XX"
-            else:
-                switch_control_mapping_selection = "XN"
-    globals()["switch_control_mapping_selection"] = switch_control_mapping_selection
-
-def new_attackdocmitigations(ciscontrols,nistcontrols):
-    new_attackmitigationsconstruct()
-    get_attackmitigationsmappings(ciscontrols,nistcontrols)
-    file_docx_mitigations = os.path.join(case_path, document_prefix + "mitigations.docx")
-    if switch_control_mapping_selection == "CN":
-        document = Document(file_docx_template)
-        document.add_heading("Mitigations/Controls",1)
-        document.add_paragraph("Mitigations represent security concepts and classes of technologies that can be used to prevent (Sub)-Techniques from being successfully executed.")
-        document.add_paragraph()
-        document.add_heading("Mitigations Resume",2)
-        document.add_paragraph()
-        for mitigation in array_obj_sorted_mitigations:
-            bulleted = document.add_paragraph(style='List Bullet')
-            bulleted.add_run(mitigation["description"])
-        document.add_page_break()  
-        document.add_heading("Mitigations Overview",2)
-        document.add_paragraph()
-        document.add_paragraph("The mitigations listed below are mapped with the CIS Controls® v8 and the NIST 800-53 Rev 5 Controls. This mapping demonstrates which Controls are supported with the implementation of the corresponding Mitigations.")
-        table_mitigations = document.add_table(rows=0,cols=3)
-        table_mitigations.style = 'Table Grid'
-        row_cells = table_mitigations.add_row().cells
-        row_cells[0].paragraphs[0].add_run('Mitigation ID: Name').bold = True
-        row_cells[1].paragraphs[0].add_run('Mitigation URL').bold = True
-        row_cells[2].paragraphs[0].add_run('Covered ATT&CK® Technique').bold = True
-        row_cells = table_mitigations.add_row().cells
-        row_cells[0].merge(row_cells[2])
-        row_cells[0].paragraphs[0].add_run('Description').bold = True
-        row_cells = table_mitigations.add_row().cells
-        row_cells[0].merge(row_cells[2])
-        row_cells[0].paragraphs[0].add_run('CIS Controls® v8').bold = True
-        row_cells = table_mitigations.add_row().cells
-        row_cells[0].merge(row_cells[2])
-        row_cells[0].paragraphs[0].add_run('NIST 800-53 Rev 5 Controls').bold = True
-        for mitigation in array_obj_sorted_mitigations:
-            row_cells = table_mitigations.add_row().cells
-            row_cells[0].paragraphs[0].add_run(mitigation["external_id"] + ": " + mitigation["name"]).bold = True
-            mitigationurl = row_cells[1].paragraphs[0]
-            add_hyperlink(mitigationurl,mitigation['external_id'],mitigation['url'])
-            techniqueurl = row_cells[2].paragraphs[0]
-            content_generated_url = mitigation["attack_id"].replace(".", "/")
-            add_hyperlink(techniqueurl,mitigation['attack_id'],"https://attack.mitre.org/techniques/" + content_generated_url)
-            row_cells = table_mitigations.add_row().cells
-            row_cells[0].merge(row_cells[2])
-            row_cells[0].text = mitigation["description"]
-            row_cells = table_mitigations.add_row().cells
-            row_cells[0].merge(row_cells[2])
-            row_cells[0].text = mitigation["cis_control"]
-            row_cells = table_mitigations.add_row().cells
-            row_cells[0].merge(row_cells[2])
-            row_cells[0].text = mitigation["nist_control"]
-        document.add_page_break()  
-        document.add_heading("CIS Controls® Implementation Priority Guideline",2)
-        document.add_paragraph("Below list presents a possible implementation priority, based on the lowest implementation groups where the CIS Control® is associated with and the weight of that specific CIS Control® in the mapping with the identified ATT&CK® (Sub-)Techniques and their associated Mitigations.")
-        table_cis_controls_prio = document.add_table(rows=0,cols=4)
-        table_cis_controls_prio.style = 'Table Grid'
-        row_cells = table_cis_controls_prio.add_row().cells
-        row_cells[0].paragraphs[0].add_run('Control® ID').bold = True
-        row_cells[1].paragraphs[0].add_run('Control® Description').bold = True
-        row_cells[2].paragraphs[0].add_run('IG').bold = True
-        row_cells[3].paragraphs[0].add_run('Relative Weight').bold = True
-        for mitigation in array_obj_complete_cis_controls_prio_sorted:
-            row_cells = table_cis_controls_prio.add_row().cells
-            row_cells[0].paragraphs[0].add_run(mitigation["cis_control_id"]).bold = True
-            row_cells[1].text = mitigation["cis_control_name"]
-            row_cells[2].text = mitigation["cis_control_ig"]
-            row_cells[3].text = (str(mitigation["cis_control_count"]))
-        document.save(file_docx_mitigations)
-    elif switch_control_mapping_selection == "XN":
-        document = Document(file_docx_template)
+            nist_control_body = sys.intern("\n".join(obj_attack_controls_join["nist_controls_by_technique"].get(mitigation['target_ref'], [])))
+            tuple_mitigations_row = (
+                mitigation_component_block["name"],
+                sys.intern(obj_mitigation_property_id["external_id"]),
+                obj_mitigation_property_id["url"],
+                sys.intern(obj_mitigation_property_description_clean),
+                sys.intern(obj_mitigation_attack_pattern["external_id"]),
+                content_cis_controls_body,
+                nist_control_body
+            )
+            dict_obj_mitigations_sections[mitigation['target_ref']].append((positions_by_id[mitigation["id"]], tuple_mitigations_row, tuple(array_obj_filtered_cis_controls)))
+    return dict_obj_mitigations_sections
+
+def get_attackdetectionssections(dict_obj_filtered_mapping_attack_pattern):
+    """
+    This function derives the detections section of every given (Sub-)Technique: the fields of its detection rows, see get_attackmitigationssections().
+
+    :param dict_obj_filtered_mapping_attack_pattern: dict, the ATT&CK(r) ID and STIX ID of the (Sub-)Techniques by STIX ID
+    :return: dict, the rows by STIX ID of the (Sub-)Technique, every row holding the position of its relationship in the bundle and the fields of its AttackDetectionRecord
+    """
+    dict_obj_detections_sections = {attack_pattern_id: [] for attack_pattern_id in dict_obj_filtered_mapping_attack_pattern}
+    positions_by_id = get_attackknowledgebase()["positions_by_id"]
+    array_obj_complete_detections = get_attackknowledgebase_relationships("detects", dict_obj_filtered_mapping_attack_pattern)
+    array_obj_filtered_detections = [obj for obj in array_obj_complete_detections if obj.get("x_mitre_deprecated") != True and obj.get("revoked") != True]
+    for detection in array_obj_filtered_detections:
+        obj_detection_property_guid = detection["source_ref"]
+        obj_parsed_description = get_attackdetectiondescription(detection)
+        attack_detection_attack_pattern = dict_obj_filtered_mapping_attack_pattern[detection["target_ref"]]
+        detection_component_block = get_attackknowledgebase_object("x-mitre-data-component", obj_detection_property_guid)
+        detection_data_source = detection_component_block.get("x_mitre_data_source_ref")
+        detection_data_source_block = get_attackknowledgebase()["data_sources_by_ref"].get(detection_data_source)
+        detection_data_source_block_id = next((ref for ref in detection_data_source_block.get("external_references", []) if ref.get("source_name") == "mitre-attack"), None)
+        tuple_detections_row = (
+            detection_component_block.get("name"),
+            sys.intern(detection_data_source_block_id.get("external_id")),
+            sys.intern(detection_data_source_block_id.get("url").replace("-", "")),
+            obj_parsed_description["description"],
+            obj_parsed_description["reduced_description"],
+            obj_parsed_description["car_pseudocode"],
+            detection_data_source_block.get("x_mitre_platforms"),
+            detection_data_source_block.get("x_mitre_collection_layers"),
+            sys.intern(attack_detection_attack_pattern.get("external_id"))
+        )
+        dict_obj_detections_sections[detection["target_ref"]].append((positions_by_id[detection["id"]], tuple_detections_row))
+    return dict_obj_detections_sections
+
+def get_attackdocintroduction_inputs(attack):
+    """
+    This function returns the fields of an action written to the introduction document.
+    """
+    return [attack["attack_title"], attack["attack_tactics"][0], attack["attack_id"], attack["attack_url"], attack["attack_description"]]
+
+def get_attackmitigations_control_keys(ciscontrols, nistcontrols):
+    """
+    This function returns the keys of the controls written with every mitigation, cis_control and nist_control when selected.
+    """
+    return [key for key, selected in (("cis_control", ciscontrols), ("nist_control", nistcontrols)) if selected]
+
+def get_attackdocmitigations_inputs(mitigation, list_control_keys):
+    """
+    This function returns the fields of a mitigation written to the mitigations document, with the selected controls only.
+    """
+    return [mitigation["external_id"], mitigation["name"], mitigation["url"], mitigation["attack_id"], mitigation["description"]] + [mitigation[key] for key in list_control_keys]
+
+def add_attackdocintroduction_technique(document, item):
+    document.add_heading(item['attack_title'],2)
+    table = document.add_table(rows=0,cols=1)
+    row_cells = table.add_row().cells
+    attack_tactic = (item['attack_tactics'][0]).replace("-", " ")
+    row_cells[0].text = "Selected ATT&CK® Tactic: " + (attack_tactic).title()
+    table.add_row()
+    row_cells = table.add_row().cells
+    attackurl = row_cells[0].paragraphs[0]
+    add_hyperlink(attackurl, "ATT&CK® URL: " + item['attack_id'], item['attack_url'])
+    row_cells = table.add_row().cells
+    para = row_cells[0].add_paragraph()
+    text = item['attack_description']
+    process_text_with_links_code(text, para)
+
+def get_case_state_key(attack_version=None):
+    """
+    This function returns the key of the state of an incremental case: the SHA-256 of the resource files, the ATT&CK(r) version, the template of the documents and the formats.
+    """
+    obj_stat = os.stat(file_docx_template)
+    return {
+        "format": (case_state_format, compiled_resources_format),
+        "attack_version": attack_version,
+        "template": [obj_stat.st_mtime_ns, obj_stat.st_size],
+        "resources": {file_name: obj["sha256"] for file_name, obj in dict_obj_resources_fingerprint.items()}
+    }
+
+def new_attackdetectionsconstruct():
+    return case_session.new_attackdetectionsconstruct()
+
+def new_attackdocdetections(construct=True):
+    return case_session.new_attackdocdetections(construct)
+
+def new_attackdocvalidations():
+    return case_session.new_attackdocvalidations()
+
+def get_attackflow_schema():
+    """
+    This function returns the schema of the Attack Flow Builder file, serialised once per process from templates/attack_flow_schema.json.
+
+    :return: str, the compact JSON of the schema
+    """
+    if "attackflow_schema" not in dict_obj_module_cache:
+        file_json_attackflow_schema = os.path.join(template_path, "attack_flow_schema.json")
+        with open(file_json_attackflow_schema, 'r', encoding='utf-8') as f:
+            dict_obj_module_cache["attackflow_schema"] = json.dumps(json.load(f), separators=(",", ":"), ensure_ascii=False)
+    return dict_obj_module_cache["attackflow_schema"]
+
+def get_attackflow_object(obj_flow_object):
+    return json.dumps(obj_flow_object, separators=(",", ":"), ensure_ascii=False)
+
+def get_attackflow_action_key(technique):
+    return (technique["attack_id"], technique["attack_tactics"][0], technique["attack_name"])
+
+def get_attackflow_objects(flow_guid, flow_name, current_time, array_obj_construct, list_assets, dict_obj_stored_actions=None):
+    """
+    This function yields the serialised objects of the Attack Flow Builder file one by one: the flow, then every action and every asset, each followed by its 12 anchors.
+    An action is serialised with its anchors as a single item. The anchors and the properties of an action are stored by (Sub-)Technique and tactic in dict_obj_stored_actions and reused from it, only the id and the position of the action are written again.
+
+    :param dict_obj_stored_actions: dict, the stored actions of an incremental case. Default value is None, serialising every action.
+    :return: generator, the serialised objects of the flow
+    """
+    list_action_guids = [technique['guid'] for technique in array_obj_construct]
+    list_asset_guids = [str(uuid.uuid4()) for asset_name in list_assets]
+    yield get_attackflow_object({
+        "id": flow_guid, "x": -290, "y": -170, "attrs": 0, "template": "flow", "children": list_action_guids + list_asset_guids,
+        "properties": [["name", flow_name], ["description", None], ["author", [["name", "CPIRT"], ["identity_class", "db0f6f37ebeb6ea09489124345af2a45"], ["contact_information", "emergency-response@checkpoint.com"]]], ["scope", "3e072748feb6ecd1b1ba397704e009c0"], ["external_references", []], ["created", current_time]]
+    })
+    var_x_pos = -290
+    var_y_pos = -170
+    for technique in array_obj_construct:
+        key = get_attackflow_action_key(technique)
+        action_tail = dict_obj_stored_actions.get(key) if dict_obj_stored_actions is not None else None
+        if action_tail is None:
+            list_anchor_guids = [str(uuid.uuid4()) for angle in list_attackflow_anchor_angles]
+            # The id and the position lead the object, the rest of the action and its anchors do not depend on its place in the flow
+            action_tail = get_attackflow_object({
+                "attrs": 256, "template": "action", "children": list_anchor_guids,
+                "properties": [["name", technique["attack_name"]], ["tactic_id", None], ["tactic_ref", technique["attack_tactics"][0]], ["technique_id", technique["attack_id"]], ["technique_ref", None], ["description", "DESCRIPTION_PLACEHOLDER"], ["confidence", "62814720b26c68ab20bbb6669a1ec919"], ["execution_start", None], ["execution_end", None]]
+            })[1:] + "".join("," + get_attackflow_object({"id": anchor_guid, "x": 0, "y": 0, "attrs": 0, "template": "@__builtin__anchor", "children": [], "properties": [], "angle": angle}) for anchor_guid, angle in zip(list_anchor_guids, list_attackflow_anchor_angles))
+        if dict_obj_stored_actions is not None:
+            dict_obj_stored_actions[key] = action_tail
+        yield '{"id":' + get_attackflow_object(technique['guid']) + ',"x":' + str(var_x_pos) + ',"y":' + str(var_y_pos) + ',' + action_tail
+        var_x_pos += 100
+        var_y_pos += 50
+    var_x_pos = 100
+    var_y_pos = -300
+    for asset_guid, asset_name in zip(list_asset_guids, list_assets):
+        list_anchor_guids = [str(uuid.uuid4()) for angle in list_attackflow_anchor_angles]
+        yield get_attackflow_object({
+            "id": asset_guid, "x": var_x_pos, "y": var_y_pos, "attrs": 256, "template": "asset", "children": list_anchor_guids,
+            "properties": [["name", asset_name], ["description", "DESCRIPTION_PLACEHOLDER"]]
+        })
+        for anchor_guid, angle in zip(list_anchor_guids, list_attackflow_anchor_angles):
+            yield get_attackflow_object({"id": anchor_guid, "x": 0, "y": 0, "attrs": 0, "template": "@__builtin__anchor", "children": [], "properties": [], "angle": angle})
+        var_x_pos += 100
+        var_y_pos += 50
+
+def new_ctidattackflow(ctid_assets=None):
+    return case_session.new_ctidattackflow(ctid_assets)
+
+def get_document_prefix(prefix,interactive=True):
+    return case_session.get_document_prefix(prefix, interactive)
+
+def set_attackrecommendations_worker():
+    global instrumentation_run_report
+    # The run report of the case is written by the parent process
+    instrumentation_run_report = False
+    # A forked worker inherits the stages running in the parent, every document is an outermost stage
+    local_run_stages.__dict__.clear()
+
+def new_attackrecommendationsdocument(document_name, obj_case_state):
+    """
+    This function generates a single recommendations document from the precomputed case state, it is the unit of work of the parallel mode of new_attackrecommendations().
+
+    :param document_name: str, introduction, mitigations, detections or validations
+    :param obj_case_state: dict, the precomputed constructs of the case
+    :return: tuple, the time in seconds needed to generate the document and the stages recorded by the worker
+    """
+    session = CaseSession(obj_case_state["case_directory"])
+    vars(session).update(obj_case_state)
+    get_resources_content()
+    time_start = time.perf_counter()
+    if document_name == "introduction":
+        session.new_attackdocintroduction()
+    elif document_name == "mitigations":
+        session.new_attackdocmitigations(None, None, construct=False)
+    elif document_name == "detections":
+        session.new_attackdocdetections(construct=False)
+    elif document_name == "validations":
+        session.new_attackdocvalidations()
+    time_document = time.perf_counter() - time_start
+    with lock_run_stages:
+        return time_document, list(session.array_obj_run_stages)
+
+def new_attackrecommendations(prefix=None,ciscontrols=True,nistcontrols=False,interactive=True,parallel=False,incremental=False):
+    return case_session.new_attackrecommendations(prefix, ciscontrols, nistcontrols, interactive, parallel, incremental)
+
+def new_attacksighting(sighting_start=None, victim_sector=None, victim_country=None, detection_source=None, victim_platform_env=None, victim_privilegelevel=None, sighting_software=None):
+    return case_session.new_attacksighting(sighting_start, victim_sector, victim_country, detection_source, victim_platform_env, victim_privilegelevel, sighting_software)
+
+def new_attacknavigatorlayer():
+    return case_session.new_attacknavigatorlayer()
+
+def set_attack_version(attack_version=None):
+    return case_session.set_attack_version(attack_version)
+
+class AttackRecord(collections.abc.Mapping):
+    """
+    This class is the base of the immutable records of a case: the (Sub-)Techniques, the mitigations and the detections.
+    A record reads like a dict, record["attack_id"], record.get("url") and dict(record) are supported.
+    """
+    __slots__ = ()
+    record_fields = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(type(self).__name__ + " is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(type(self).__name__ + " is immutable")
+
+    def __getitem__(self, key):
+        if key not in self.record_fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.record_fields)
+
+    def __len__(self):
+        return len(self.record_fields)
+
+    def __reduce__(self):
+        return (type(self), tuple(object.__getattribute__(self, name) for name in self.__slots__))
+
+    def __repr__(self):
+        return type(self).__name__ + "(" + repr(dict(self)) + ")"
+
+class AttackTechniqueRecord(AttackRecord):
+    """
+    This class holds a (Sub-)Technique of the knowledge base as used by the reports, see get_attacktechniquerecord().
+    """
+    __slots__ = ("attack_title", "attack_name", "attack_id", "attack_all_tactics", "attack_url", "attack_description")
+    record_fields = __slots__
+
+class AttackConstructRecord(AttackRecord):
+    """
+    This class holds a selected (Sub-)Technique/Tactic pair of a case.
+    """
+    __slots__ = ("technique", "attack_tactics", "guid")
+    record_fields = ("attack_title", "attack_name", "attack_id", "attack_tactics", "attack_all_tactics", "attack_url", "attack_description", "guid")
+
+    def __getattr__(self, name):
+        if name == "technique":
+            raise AttributeError(name)
+        return getattr(self.technique, name)
+
+class AttackMitigationRecord(AttackRecord):
+    """
+    This class holds a mitigation of a (Sub-)Technique with its CIS Controls(r) and NIST 800-53 Rev 5 controls.
+    """
+    __slots__ = ("name", "external_id", "url", "description", "attack_id", "cis_control", "nist_control")
+    record_fields = __slots__
+
+class AttackDetectionRecord(AttackRecord):
+    """
+    This class holds a data component detecting a (Sub-)Technique, see get_attackdetectiondescription().
+    """
+    __slots__ = ("name", "external_id", "url", "description", "reduced_description", "car_pseudocode", "platforms", "collection_layers", "attack_id")
+    record_fields = __slots__
+
+class AttackCondensedDetectionRecord(AttackRecord):
+    """
+    This class holds a data component with all (Sub-)Techniques of the case it detects, as written to the detections document.
+    """
+    __slots__ = ("name", "external_id", "url", "attack_id", "platforms", "collection_layers", "description", "car_pseudocode", "combined_attack")
+    record_fields = __slots__
+
+def get_attacktechniquerecord(attack_pattern):
+    """
+    This function returns the technique record of an attack-pattern, memoized by STIX ID and modified timestamp.
+
+    :param attack_pattern: dict, the attack-pattern of the knowledge base
+    :return: AttackTechniqueRecord
+    """
+    key = (attack_pattern["id"], attack_pattern.get("modified"))
+    obj_technique_record = dict_obj_attack_technique_records.get(key)
+    if obj_technique_record is not None:
+        return obj_technique_record
+    attack_name = attack_pattern["name"]
+    attack_tactics = tuple(sys.intern(phase_name["phase_name"]) for phase_name in attack_pattern["kill_chain_phases"])
+    attack_description = re.sub(r'\(Citation:.*\)', '', attack_pattern["description"])
+    attack_description = re.sub(r"\r?\n\r?\n", "\n", attack_description)
+    obj_external_reference = next((ref for ref in attack_pattern["external_references"] if ref["source_name"] == "mitre-attack"), None)
+    attack_id = sys.intern(obj_external_reference["external_id"])
+    obj_technique_record = AttackTechniqueRecord(attack_id + ": " + attack_name, attack_name, attack_id, attack_tactics, obj_external_reference["url"], attack_description)
+    return dict_obj_attack_technique_records.setdefault(key, obj_technique_record)
+
+class CaseSession:
+    """
+    This class holds the state of a single case: its folder, the document prefix, the selected (Sub-)Techniques and the constructs derived from them.
+    The top-level functions work on case_session, the session of the interactive mode.
+
+        >>> session = CaseSession()
+        >>> session.set_attack_empty("T1053.005;T1486", tactic_pairs={})
+        >>> session.new_attackrecommendations("IR11337", interactive=False)
+
+    :param case_directory: str, the name of the case folder. Default value is a random uuid.
+    :param attack_version: str, the ATT&CK(r) version of the case, one of the store of ATT&CK(r) versions. Default value is None, using the version of resources/helper_enterprise_attack.json.
+    """
+    def __init__(self, case_directory=None, attack_version=None):
+        self.case_directory = case_directory or str(uuid.uuid4())
+        self.case_path = os.path.join(parent_dir, self.case_directory)
+        self.attack_version = get_attackstore_version(attack_version) if attack_version else None
+        self.incremental = False
+        self.document_prefix = ""
+        self.document_prefix_content = "Untitled"
+        self.list_obj_selected_attack_techniques = []
+        self.array_obj_sorted_construct = []
+        self.array_obj_sorted_mitigations = []
+        self.array_obj_condensed_detections = []
+        self.array_obj_run_stages = []
+        self.obj_incremental_state = None
+        self.list_unchanged_artifacts = []
+        self.dict_obj_case_fragments = {}
+
+    def get_case_path(self):
+        """
+        This function returns the case folder, creating it when the first artifact of the case is written.
+
+        :return: str, the path of the case folder
+        """
+        if not os.path.isdir(self.case_path):
+            os.mkdir(self.case_path, 0o744)
+        return self.case_path
+
+    def set_attack_version(self, attack_version=None):
+        """
+        This function selects the ATT&CK(r) version of the case from the store of ATT&CK(r) versions, to be called before set_attack_empty().
+
+        :param attack_version: str, the ATT&CK(r) version, for example 13.1. Default value is None, selecting the version of resources/helper_enterprise_attack.json.
+        """
+        if attack_version:
+            attack_version = get_attackstore_version(attack_version)
+            get_resources_content()
+            get_attackstore_knowledgebase(attack_version)
+            print("\u2139 The case uses ATT&CK\u00AE version " + attack_version + " of the store of ATT&CK\u00AE versions.")
+        self.attack_version = attack_version or None
+
+    def get_case_state(self):
+        """
+        This function returns the state of an incremental case, read from case_state.pickle in the case folder on first use, see get_case_state_key().
+
+        :return: dict, the key, the sections and the artifacts of the case
+        """
+        obj_incremental_state_key = get_case_state_key(self.attack_version)
+        obj_incremental_state = self.obj_incremental_state
+        if obj_incremental_state is None:
+            file_case_state = os.path.join(self.case_path, case_state_file_name)
+            try:
+                with open(file_case_state, 'rb') as f:
+                    obj_incremental_state = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+                obj_incremental_state = None
+        if obj_incremental_state is None or obj_incremental_state.get("key") != obj_incremental_state_key:
+            obj_incremental_state = {"key": obj_incremental_state_key, "sections": {"mitigations": {}, "detections": {}}, "artifacts": {}, "fragments": {}}
+        self.obj_incremental_state = obj_incremental_state
+        return obj_incremental_state
+
+    def set_case_state(self):
+        # The state is written to a temporary file first, an interrupted run never leaves a partial state behind
+        file_case_state = os.path.join(self.get_case_path(), case_state_file_name)
+        file_case_state_temporary = file_case_state + "." + str(os.getpid()) + ".tmp"
+        with open(file_case_state_temporary, 'wb') as f:
+            pickle.dump(self.obj_incremental_state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(file_case_state_temporary, file_case_state)
+
+    def get_case_sections(self, section_name, dict_obj_filtered_mapping_attack_pattern, get_sections):
+        """
+        This function returns the sections of the selected (Sub-)Techniques. An incremental case only derives the sections of the (Sub-)Techniques added since its previous run and drops the ones of the removed (Sub-)Techniques.
+
+        :param section_name: str, mitigations or detections
+        :param dict_obj_filtered_mapping_attack_pattern: dict, the ATT&CK(r) ID and STIX ID of the selected (Sub-)Techniques by STIX ID
+        :param get_sections: function, deriving the sections of the given (Sub-)Techniques
+        :return: dict, the sections by STIX ID of the (Sub-)Technique
+        """
+        if not self.incremental:
+            return get_sections(dict_obj_filtered_mapping_attack_pattern)
+        obj_incremental_state = self.get_case_state()
+        dict_obj_stored_sections = obj_incremental_state["sections"][section_name]
+        dict_obj_added_attack_patterns = {attack_pattern_id: attack_pattern for attack_pattern_id, attack_pattern in dict_obj_filtered_mapping_attack_pattern.items() if attack_pattern_id not in dict_obj_stored_sections}
+        dict_obj_sections = {attack_pattern_id: dict_obj_stored_sections[attack_pattern_id] for attack_pattern_id in dict_obj_filtered_mapping_attack_pattern if attack_pattern_id in dict_obj_stored_sections}
+        removed = len(dict_obj_stored_sections) - len(dict_obj_sections)
+        if dict_obj_added_attack_patterns:
+            dict_obj_sections.update(get_sections(dict_obj_added_attack_patterns))
+        if dict_obj_added_attack_patterns or removed:
+            print("\u2139 The " + section_name + " of " + str(len(dict_obj_added_attack_patterns)) + " added (Sub-)Techniques are derived, the ones of " + str(removed) + " removed (Sub-)Techniques are dropped.")
+            obj_incremental_state["sections"][section_name] = dict_obj_sections
+            self.set_case_state()
+        return dict_obj_sections
+
+    def get_case_artifact(self, artifact_name):
+        """
+        This function verifies an artifact of an incremental case against the inputs it was last generated from.
+
+        :param artifact_name: str, introduction, mitigations, detections, validations or navigator_layer
+        :return: str, the digest of the inputs to store with set_case_artifact() once the artifact is written, an empty string when the case is not incremental, None when the artifact is unchanged and kept
+        """
+        if not self.incremental:
+            return ""
+        if artifact_name == "introduction":
+            file_template = file_docx_template
+            list_inputs = [get_dot_present() is not None, [get_attackdocintroduction_inputs(attack) for attack in self.array_obj_sorted_construct]]
+        elif artifact_name == "mitigations":
+            file_template = file_docx_template
+            list_control_keys = get_attackmitigations_control_keys(self.switch_control_mapping_selection[0] == "C", self.switch_control_mapping_selection[1] == "N")
+            list_inputs = [self.switch_control_mapping_selection, [get_attackdocmitigations_inputs(mitigation, list_control_keys) for mitigation in self.array_obj_sorted_mitigations], self.array_obj_complete_cis_controls_prio_sorted]
+        elif artifact_name == "detections":
+            file_template = file_docx_template
+            list_inputs = [self.array_obj_condensed_detections]
+        elif artifact_name == "validations":
+            file_template = file_docx_template
+            list_inputs = [list(dict.fromkeys(attack["attack_id"] for attack in self.list_obj_selected_attack_techniques))]
+        else:
+            file_template = os.path.join(template_path, "navigator_template.json")
+            list_inputs = [self.document_prefix_content, self.attack_version, [[attack["attack_id"], attack["attack_tactics"]] for attack in self.array_obj_sorted_construct]]
+        obj_stat = os.stat(file_template)
+        digest = hashlib.sha256(json.dumps([obj_stat.st_mtime_ns, obj_stat.st_size, list_inputs], default=dict).encode()).hexdigest()
+        file_name = self.document_prefix + artifact_name + (".json" if artifact_name == "navigator_layer" else ".docx")
+        if self.get_case_state()["artifacts"].get(file_name) == digest and os.path.isfile(os.path.join(self.case_path, file_name)):
+            self.list_unchanged_artifacts.append(artifact_name)
+            return None
+        self.dict_obj_case_fragments.pop(artifact_name, None)
+        return digest
+
+    def set_case_artifact(self, artifact_name, digest):
+        if not digest:
+            return
+        file_name = self.document_prefix + artifact_name + (".json" if artifact_name == "navigator_layer" else ".docx")
+        obj_incremental_state = self.get_case_state()
+        obj_incremental_state["artifacts"][file_name] = digest
+        # Only the fragments of the written artifact are kept, the ones of removed (Sub-)Techniques are dropped
+        if artifact_name in self.dict_obj_case_fragments:
+            obj_incremental_state["fragments"][artifact_name] = self.dict_obj_case_fragments.pop(artifact_name)
+        self.set_case_state()
+
+    def add_case_fragment(self, artifact_name, document, parent, list_inputs, add_content):
+        """
+        This function appends the content of a single (Sub-)Technique, mitigation or detection to the body or to a table of a document. An incremental case reuses the content built from the same inputs by its previous run, only the content of new inputs is built by add_content().
+
+        :param artifact_name: str, introduction, mitigations or detections
+        :param document: the python-docx document
+        :param parent: the body or the table element the content is appended to
+        :param list_inputs: list, the inputs the content is built from
+        :param add_content: function, appending the content to parent
+        """
+        if not self.incremental:
+            add_content()
+            return
+        key = hashlib.sha256(json.dumps(list_inputs, default=dict).encode()).hexdigest()
+        dict_obj_fragments = self.dict_obj_case_fragments.setdefault(artifact_name, {})
+        obj_fragment = dict_obj_fragments.get(key) or self.get_case_state()["fragments"].get(artifact_name, {}).get(key)
+        if obj_fragment is not None:
+            add_attackdocument_fragment(document, parent, obj_fragment)
+        else:
+            obj_position = get_attackdocument_position(parent)
+            add_content()
+            obj_fragment = get_attackdocument_fragment(document, parent, obj_position)
+        dict_obj_fragments[key] = obj_fragment
+
+    @attackstage
+    def set_attack_empty(self, list_obj_attack_techniques=None, tactic_pairs=None):
+        get_resources_content()
+        while True:
+            if list_obj_attack_techniques is None:
+                list_obj_attack_techniques = input("🔨 Give a single or a semicolon separated list of ATT&CK® IDs (for example: T1566.002;T1018;T1033): ")
+            list_resolved_attack_ids, dict_replaced_attack_ids, dict_invalid_attack_ids = get_attacktechniques_resolved(list_obj_attack_techniques)
+            for attack_id, replacement_id in dict_replaced_attack_ids.items():
+                print("\u2139 " + attack_id + " has been revoked and is replaced by " + replacement_id + ".")
+            if not dict_invalid_attack_ids:
+                break
+            for attack_id, list_suggestions in dict_invalid_attack_ids.items():
+                if not attack_id:
+                    print("⚠️ No ATT&CK® ID was given. Please verify your input.")
+                elif attack_id.upper() in get_attackknowledgebase()["attack_patterns_by_external_id"]:
+                    print("⚠️ "+ attack_id + " is deprecated or revoked without replacement in the current ATT&CK® Enterprise JSON. Please verify your input.")
+                elif list_suggestions:
+                    print("⚠️ "+ attack_id + " does not exist in the current ATT&CK® Enterprise JSON. Did you mean " + ", ".join(list_suggestions) + "?")
+                else:
+                    print("⚠️ "+ attack_id + " does not exist in the current ATT&CK® Enterprise JSON. Please verify your input.")
+            list_obj_attack_techniques = None
+        self.list_obj_selected_attack_techniques = [{'attack_id': attack_id} for attack_id in list_resolved_attack_ids]
+        self.new_attackconstruct(tactic_pairs)
+
+    @attackstage
+    def new_attackconstruct(self, tactic_pairs=None):
+        if tactic_pairs is not None:
+            tactic_pairs = get_tactic_pairs(tactic_pairs)
+        attack_patterns_by_external_id = get_attackknowledgebase()["attack_patterns_by_external_id"]
+        list_selected_attack_ids = dict.fromkeys(d.get('attack_id') for d in self.list_obj_selected_attack_techniques)
+        array_obj_filtered_mapping_external_id_attack_pattern = [{'external_id': attack_id, 'id': attack_patterns_by_external_id[attack_id]['id']} for attack_id in list_selected_attack_ids if attack_id in attack_patterns_by_external_id]
+        array_obj_sorted_mapping_external_id_attack_pattern = sorted(array_obj_filtered_mapping_external_id_attack_pattern, key=lambda x: x['external_id'])
+        array_obj_complete_construct = []
+        for attack_id in array_obj_sorted_mapping_external_id_attack_pattern:
+            obj_filtered_attack_attack_pattern = get_attackknowledgebase_object("attack-pattern", attack_id["id"])
+            obj_technique_record = get_attacktechniquerecord(obj_filtered_attack_attack_pattern)
+            guid = str(uuid.uuid4())
+            array_obj_complete_construct.append(AttackConstructRecord(obj_technique_record, obj_technique_record.attack_all_tactics, guid))
+        array_obj_selected_construct = []
+        for attack in array_obj_complete_construct:
+            if (len(attack["attack_tactics"])) == 1:
+                array_obj_selected_construct.append(attack)
+            else:
+                print("\nMultiple tactics were found for " + str(attack["attack_id"]) + ": " + (", ".join((attack["attack_all_tactics"])).replace("-", " ")).title())
+                for tactic in attack["attack_tactics"]:
+                    guid = str(uuid.uuid4())
+                    split_tactic = AttackConstructRecord(attack.technique, (tactic,), guid)
+                    beautyfy_split_tactic = str(split_tactic["attack_tactics"][0])
+                    beautyfy_split_tactic = (beautyfy_split_tactic.replace("-", " ")).title()
+                    if tactic_pairs is None:
+                        query_add_tactic = input("\u2328 Do you want to add " + str(split_tactic["attack_title"]) + "/" + beautyfy_split_tactic + " pair ([Y]/N) ")
+                    elif attack["attack_id"] in tactic_pairs:
+                        query_add_tactic = "Y" if tactic in tactic_pairs[attack["attack_id"]] else "N"
+                    else:
+                        query_add_tactic = "Y"
+                    if query_add_tactic == 'y' or query_add_tactic == "Y" or not query_add_tactic:
+                        array_obj_selected_construct.append(split_tactic)
+                        print("\u2328 " + str(split_tactic["attack_title"]) + "/" + beautyfy_split_tactic + " pair is added.")
+                    else:
+                        pass
+        attack_tactic_ranks = {
+            'initial-access': 0,
+            'execution': 1,
+            'persistence': 2,
+            'privilege-escalation': 3,
+            'defense-evasion': 4,
+            'credential-access': 5,
+            'discovery': 6,
+            'lateral-movement': 7,
+            'collection': 8,
+            'command-and-control': 9,
+            'exfiltration': 10,
+            'impact': 11
+        }
+        array_obj_sorted_construct = sorted(array_obj_selected_construct, key=lambda x: attack_tactic_ranks[x['attack_tactics'][0]])
+        self.array_obj_sorted_construct = array_obj_sorted_construct
+        self.array_obj_filtered_mapping_external_id_attack_pattern = array_obj_filtered_mapping_external_id_attack_pattern
+        self.attack_tactic_ranks = attack_tactic_ranks       
+
+    def new_condensed_navigator(self, image_format="png", dpi=300):
+        """
+        This function writes the condensed navigator DOT file to the case folder and hands its render to the Graphviz pool.
+
+        :param image_format: str, the output format of dot, for example png or svg. Default value is png.
+        :param dpi: int, the resolution of the render. Default value is 300.
+        :return: Future, resolving to the path of the render copied into the case folder
+        """
+        dict_attack_tactic_constructs = {}
+        for dictionary in self.array_obj_sorted_construct:
+            for tactic in dictionary['attack_tactics']:
+                dict_attack_tactic_constructs.setdefault(tactic, []).append(dictionary)
+        sorted_unique_attack_tactic = sorted(dict_attack_tactic_constructs, key=lambda x: self.attack_tactic_ranks.get(x))
+        navigator_header_viz = "digraph customer {layout=dot;label = \"\";labelloc = \"t\";node [style=rounded shape=Mrecord style=filled fillcolor = lightgrey color = lightgrey];edge [style=\"invis\"];"
+        condensed_navigator_graphviz = navigator_header_viz + "".join(tactic_viz(tactic, dict_attack_tactic_constructs[tactic]) for tactic in sorted_unique_attack_tactic) + "}"
+        file_condensed_navigator_dot = os.path.join(self.get_case_path(), "condensed_navigator.dot")
+        with open(file_condensed_navigator_dot, 'w') as file_graph_dot:
+            file_graph_dot.write(condensed_navigator_graphviz)
+        file_condensed_navigator = os.path.join(self.get_case_path(), "condensed_navigator" + ("" if dpi == 300 else "_" + str(dpi) + "dpi") + "." + image_format)
+        def get_condensed_navigator_render():
+            local_run_stages.session = self
+            shutil.copyfile(get_graphviz_render(condensed_navigator_graphviz, image_format, dpi), file_condensed_navigator)
+            return file_condensed_navigator
+        return get_graphviz_executor().submit(get_condensed_navigator_render)
+
+    @attackstage
+    def new_attackdocintroduction(self):
+        get_docx()
+        digest = self.get_case_artifact("introduction")
+        if digest is None:
+            return
+        # The graph is rendered by the Graphviz pool while the document is built
+        if get_dot_present() is not None:
+            future_condensed_navigator = self.new_condensed_navigator()
+        file_docx_introduction = os.path.join(self.get_case_path(), self.document_prefix + "introduction.docx")
+        document = new_attackdocument()
+        document.add_heading("Introduction",1)
+        document.add_paragraph("This annex describes the possible mitigations, controls and eventually detections to implement to avoid a similar incident from happening again. The identified adversary TTPs (Techniques, Procedures and Tactics) are the result from the investigation conducted by CPIRT. The information presented stems from the common library for adversarial TTPs, the MITRE ATT&CK® Framework [https://attack.mitre.org/]. The different techniques are listed, explained, and linked with the adversary tactics. Tactics are the goals an adversary wants to achieve. Next, based on these techniques, possible mitigations are listed, each with a description and relation with both the MITRE ATT&CK® Techniques and CIS Controls. Some environments do not allow or struggle implementing the presented mitigations/controls. To cover these gaps, detections should be put in place. Coverage of the possible detections against the identified Techniques also includes the platform (IaaS, Containers, Linux, Windows ...) and the collection layer (Network, Host ...) to deploy the detection. Some detections may not be relevant for the environment as the platform may not be in use. The indication of the platform makes it straightforward to disregard those irrelevant detections.")
+        document.add_heading("Techniques",1)
+        document.add_paragraph("According to the MITRE ATT&CK® Framework 'Techniques' represent 'how' an adversary achieves a tactical goal (tactic) by performing an action. For example, an adversary may dump credentials to achieve credential access. Below are the identified MITRE ATT&CK® Techniques listed which provide insight in the actions performed by perpetrators during this incident. Depending on the available information and artefacts, this may not be an exhaustive list but should provide a very reasonable starting point to understand the techniques used and the follow up mitigations/controls to implement. Assure you have put detections in place where mitigations/controls were not implemented or are insufficient.")
+        for item in self.array_obj_sorted_construct:
+            self.add_case_fragment("introduction", document, document.element.body, get_attackdocintroduction_inputs(item), lambda: add_attackdocintroduction_technique(document, item))
+        if get_dot_present() is not None:
+            document.add_page_break()
+            document.add_picture(future_condensed_navigator.result())
+        save_attackdocument(document, file_docx_introduction)
+        self.set_case_artifact("introduction", digest)
+
+    @attackstage
+    def new_attackmitigationsconstruct(self):
+        dict_obj_filtered_mapping_attack_pattern = {attack_pattern["id"]: attack_pattern for attack_pattern in self.array_obj_filtered_mapping_external_id_attack_pattern}
+        dict_obj_mitigations_sections = self.get_case_sections("mitigations", dict_obj_filtered_mapping_attack_pattern, get_attackmitigationssections)
+        # The rows of the sections are put back in the order of the bundle, as a single pass over the relationships returns them
+        array_obj_section_rows = sorted((row for section in dict_obj_mitigations_sections.values() for row in section), key=lambda x: x[0])
+        array_obj_complete_mitigations = [AttackMitigationRecord(*row[1]) for row in array_obj_section_rows]
+        array_obj_filtered_cis_controls_prio = [cis_control for row in array_obj_section_rows for cis_control in row[2]]
+        array_obj_sorted_mitigations = sorted(array_obj_complete_mitigations, key=lambda x: x.get('external_id', ''))
+        from collections import defaultdict
+        grouped_cis_controls = defaultdict(list)
+        for control in array_obj_filtered_cis_controls_prio:
+            grouped_cis_controls[control['cis_control_id']].append(control)
+        array_obj_complete_cis_controls_prio = []
+        for control_id, controls in grouped_cis_controls.items():
+            cis_control_name = controls[0]['cis_control_name']
+            cis_control_ig = controls[0]['cis_control_ig']
+            cis_control_count = len(controls)
+            new_obj = {
+                'cis_control_id': control_id,
+                'cis_control_name': cis_control_name,
+                'cis_control_ig': cis_control_ig,
+                'cis_control_count': cis_control_count
+            }
+            array_obj_complete_cis_controls_prio.append(new_obj)
+        array_obj_complete_cis_controls_prio_sorted = sorted(array_obj_complete_cis_controls_prio, key=lambda x: (x['cis_control_ig'], -x['cis_control_count'], x['cis_control_id']))
+        self.array_obj_sorted_mitigations = array_obj_sorted_mitigations
+        self.array_obj_complete_cis_controls_prio_sorted = array_obj_complete_cis_controls_prio_sorted
+
+    def get_attackmitigationsmappings(self, ciscontrols,nistcontrols,interactive=True):
+        if (ciscontrols and not nistcontrols):
+            switch_control_mapping_selection = "CX"
+        if (nistcontrols and not ciscontrols):
+            switch_control_mapping_selection = "XN"
+        if (ciscontrols and nistcontrols):
+            switch_control_mapping_selection = "CN"
+        if (not nistcontrols and not ciscontrols and not interactive):
+            switch_control_mapping_selection = "XX"
+        elif (not nistcontrols and not ciscontrols):
+            query_cis_controls_mapping = input("\u2328 Do you want to generate the CIS Controls® v8 mapping? ([Y]/N) ")
+            if not query_cis_controls_mapping or query_cis_controls_mapping.upper() == "Y":
+                query_nist_controls_mapping = input("\u2328 Do you want to generate the NIST 800-53 Rev 5 Controls mapping? (Y/[N]) ")
+                if not query_nist_controls_mapping or query_nist_controls_mapping.upper() == "N":
+                    switch_control_mapping_selection = "CX"
+                else:
+                    switch_control_mapping_selection = "CN"
+            else:
+                query_nist_controls_mapping = input("\u2328 Do you want to generate the NIST 800-53 Rev 5 Controls mapping? (Y/[N]) ")
+                if not query_nist_controls_mapping or query_nist_controls_mapping.upper() == "N":
+                    switch_control_mapping_selection = "XX"
+                else:
+                    switch_control_mapping_selection = "XN"
+        self.switch_control_mapping_selection = switch_control_mapping_selection
+
+    def new_attackmitigationsdocument(self, file_docx_mitigations, ciscontrols, nistcontrols):
+        """
+        This function writes the mitigations document, with the CIS Controls(r) v8 and the NIST 800-53 Rev 5 Controls rows when selected.
+
+        :param file_docx_mitigations: str, the path of the document
+        :param ciscontrols: bool, add the CIS Controls(r) v8 rows and the implementation priority guideline
+        :param nistcontrols: bool, add the NIST 800-53 Rev 5 Controls rows
+        """
+        list_mapped_controls = [name for name, selected in (("the CIS Controls® v8", ciscontrols), ("the NIST 800-53 Rev 5 Controls", nistcontrols)) if selected]
+        list_control_keys = get_attackmitigations_control_keys(ciscontrols, nistcontrols)
+        document = new_attackdocument()
         document.add_heading("Mitigations/Controls",1)
         document.add_paragraph("Mitigations represent security concepts and classes of technologies that can be used to prevent (Sub)-Techniques from being successfully executed.")
         document.add_paragraph()
         document.add_heading("Mitigations Resume",2)
         document.add_paragraph()
-        for mitigation in array_obj_sorted_mitigations:
-            bulleted = document.add_paragraph(style='List Bullet')
-            bulleted.add_run(mitigation["description"])
+        for mitigation in self.array_obj_sorted_mitigations:
+            self.add_case_fragment("mitigations", document, document.element.body, ["resume", mitigation["description"]], lambda: document.add_paragraph(style='List Bullet').add_run(mitigation["description"]))
         document.add_page_break()  
         document.add_heading("Mitigations Overview",2)
         document.add_paragraph()
-        document.add_paragraph("The mitigations listed below are mapped with the NIST 800-53 Rev 5 Controls. This mapping demonstrates which Controls are supported with the implementation of the corresponding Mitigations.")
+        if list_mapped_controls:
+            document.add_paragraph("The mitigations listed below are mapped with " + " and ".join(list_mapped_controls) + ". This mapping demonstrates which Controls are supported with the implementation of the corresponding Mitigations.")
         table_mitigations = document.add_table(rows=0,cols=3)
         table_mitigations.style = 'Table Grid'
         row_cells = table_mitigations.add_row().cells
         row_cells[0].paragraphs[0].add_run('Mitigation ID: Name').bold = True
         row_cells[1].paragraphs[0].add_run('Mitigation URL').bold = True
         row_cells[2].paragraphs[0].add_run('Covered ATT&CK® Technique').bold = True
-        row_cells = table_mitigations.add_row().cells
-        row_cells[0].merge(row_cells[2])
-        row_cells[0].paragraphs[0].add_run('Description').bold = True
-        row_cells = table_mitigations.add_row().cells
-        row_cells[0].merge(row_cells[2])
-        row_cells[0].paragraphs[0].add_run('NIST 800-53 Rev 5 Controls').bold = True
-        for mitigation in array_obj_sorted_mitigations:
-            row_cells = table_mitigations.add_row().cells
-            row_cells[0].paragraphs[0].add_run(mitigation["external_id"] + ": " + mitigation["name"]).bold = True
-            mitigationurl = row_cells[1].paragraphs[0]
-            add_hyperlink(mitigationurl,mitigation['external_id'],mitigation['url'])
-            techniqueurl = row_cells[2].paragraphs[0]
-            content_generated_url = mitigation["attack_id"].replace(".", "/")
-            add_hyperlink(techniqueurl,mitigation['attack_id'],"https://attack.mitre.org/techniques/" + content_generated_url)
+        for title in ['Description'] + [title for title, selected in (('CIS Controls® v8', ciscontrols), ('NIST 800-53 Rev 5 Controls', nistcontrols)) if selected]:
             row_cells = table_mitigations.add_row().cells
             row_cells[0].merge(row_cells[2])
-            row_cells[0].text = mitigation["description"]
-            row_cells = table_mitigations.add_row().cells
-            row_cells[0].merge(row_cells[2])
-            row_cells[0].text = mitigation["nist_control"]
-        document.save(file_docx_mitigations)
-    elif switch_control_mapping_selection == "CX":
-        document = Document(file_docx_template)
-        document.add_heading("Mitigations/Controls",1)
-        document.add_paragraph("Mitigations represent security concepts and classes of technologies that can be used to prevent (Sub)-Techniques from being successfully executed.")
-        document.add_paragraph()
-        document.add_heading("Mitigations Resume",2)
-        document.add_paragraph()
-        for mitigation in array_obj_sorted_mitigations:
-            bulleted = document.add_paragraph(style='List Bullet')
-            bulleted.add_run(mitigation["description"])
-        document.add_page_break()  
-        document.add_heading("Mitigations Overview",2)
-        document.add_paragraph()
-        document.add_paragraph("The mitigations listed below are mapped with the CIS Controls® v8. This mapping demonstrates which Controls are supported with the implementation of the corresponding Mitigations.")
-        table_mitigations = document.add_table(rows=0,cols=3)
-        table_mitigations.style = 'Table Grid'
-        row_cells = table_mitigations.add_row().cells
-        row_cells[0].paragraphs[0].add_run('Mitigation ID: Name').bold = True
-        row_cells[1].paragraphs[0].add_run('Mitigation URL').bold = True
-        row_cells[2].paragraphs[0].add_run('Covered ATT&CK® Technique').bold = True
-        row_cells = table_mitigations.add_row().cells
-        row_cells[0].merge(row_cells[2])
-        row_cells[0].paragraphs[0].add_run('Description').bold = True
-        row_cells = table_mitigations.add_row().cells
-        row_cells[0].merge(row_cells[2])
-        row_cells[0].paragraphs[0].add_run('CIS Controls® v8').bold = True
-        for mitigation in array_obj_sorted_mitigations:
-            row_cells = table_mitigations.add_row().cells
+            row_cells[0].paragraphs[0].add_run(title).bold = True
+        def add_mitigation_rows(mitigation):
+            list_row_cells = add_table_rows(table_mitigations, [None, (0, 2)] + [(0, 2)] * len(list_control_keys))
+            row_cells = list_row_cells[0]
             row_cells[0].paragraphs[0].add_run(mitigation["external_id"] + ": " + mitigation["name"]).bold = True
             mitigationurl = row_cells[1].paragraphs[0]
             add_hyperlink(mitigationurl,mitigation['external_id'],mitigation['url'])
             techniqueurl = row_cells[2].paragraphs[0]
             content_generated_url = mitigation["attack_id"].replace(".", "/")
             add_hyperlink(techniqueurl,mitigation['attack_id'],"https://attack.mitre.org/techniques/" + content_generated_url)
-            row_cells = table_mitigations.add_row().cells
-            row_cells[0].merge(row_cells[2])
-            row_cells[0].text = mitigation["description"]
-            row_cells = table_mitigations.add_row().cells
-            row_cells[0].merge(row_cells[2])
-            row_cells[0].text = mitigation["cis_control"]
-        document.add_page_break()  
-        document.add_heading("CIS Controls® Implementation Priority Guideline",2)
-        document.add_paragraph("Below list presents a possible implementation priority, based on the lowest implementation groups where the CIS Control® is associated with and the weight of that specific CIS Control® in the mapping with the identified ATT&CK® (Sub-)Techniques and their associated Mitigations.")
-        table_cis_controls_prio = document.add_table(rows=0,cols=4)
-        table_cis_controls_prio.style = 'Table Grid'
-        row_cells = table_cis_controls_prio.add_row().cells
-        row_cells[0].paragraphs[0].add_run('Control® ID').bold = True
-        row_cells[1].paragraphs[0].add_run('Control® Description').bold = True
-        row_cells[2].paragraphs[0].add_run('IG').bold = True
-        row_cells[3].paragraphs[0].add_run('Relative Weight').bold = True
-        for mitigation in array_obj_complete_cis_controls_prio_sorted:
+            list_row_cells[1][0].text = mitigation["description"]
+            for row_cells, key in zip(list_row_cells[2:], list_control_keys):
+                row_cells[0].text = mitigation[key]
+        for mitigation in self.array_obj_sorted_mitigations:
+            self.add_case_fragment("mitigations", document, table_mitigations._tbl, ["overview", list_control_keys] + get_attackdocmitigations_inputs(mitigation, list_control_keys), lambda: add_mitigation_rows(mitigation))
+        if ciscontrols:
+            document.add_page_break()  
+            document.add_heading("CIS Controls® Implementation Priority Guideline",2)
+            document.add_paragraph("Below list presents a possible implementation priority, based on the lowest implementation groups where the CIS Control® is associated with and the weight of that specific CIS Control® in the mapping with the identified ATT&CK® (Sub-)Techniques and their associated Mitigations.")
+            table_cis_controls_prio = document.add_table(rows=0,cols=4)
+            table_cis_controls_prio.style = 'Table Grid'
             row_cells = table_cis_controls_prio.add_row().cells
-            row_cells[0].paragraphs[0].add_run(mitigation["cis_control_id"]).bold = True
-            row_cells[1].text = mitigation["cis_control_name"]
-            row_cells[2].text = mitigation["cis_control_ig"]
-            row_cells[3].text = (str(mitigation["cis_control_count"]))
-        document.save(file_docx_mitigations)
-    elif switch_control_mapping_selection == "XX":
-        document = Document(file_docx_template)
-        document.add_heading("Mitigations/Controls",1)
-        document.add_paragraph("Mitigations represent security concepts and classes of technologies that can be used to prevent (Sub)-Techniques from being successfully executed.")
-        document.add_paragraph()
-        document.add_heading("Mitigations Resume",2)
-        document.add_paragraph()
-        for mitigation in array_obj_sorted_mitigations:
-            bulleted = document.add_paragraph(style='List Bullet')
-            bulleted.add_run(mitigation["description"])
-        document.add_page_break()  
-        document.add_heading("Mitigations Overview",2)
-        document.add_paragraph()
-        table_mitigations = document.add_table(rows=0,cols=3)
-        table_mitigations.style = 'Table Grid'
-        row_cells = table_mitigations.add_row().cells
-        row_cells[0].paragraphs[0].add_run('Mitigation ID: Name').bold = True
-        row_cells[1].paragraphs[0].add_run('Mitigation URL').bold = True
-        row_cells[2].paragraphs[0].add_run('Covered ATT&CK® Technique').bold = True
-        row_cells = table_mitigations.add_row().cells
-        row_cells[0].merge(row_cells[2])
-        row_cells[0].paragraphs[0].add_run('Description').bold = True
-        for mitigation in array_obj_sorted_mitigations:
-            row_cells = table_mitigations.add_row().cells
-            row_cells[0].paragraphs[0].add_run(mitigation["external_id"] + ": " + mitigation["name"]).bold = True
-            mitigationurl = row_cells[1].paragraphs[0]
-            add_hyperlink(mitigationurl,mitigation['external_id'],mitigation['url'])
-            techniqueurl = row_cells[2].paragraphs[0]
-            content_generated_url = mitigation["attack_id"].replace(".", "/")
-            add_hyperlink(techniqueurl,mitigation['attack_id'],"https://attack.mitre.org/techniques/" + content_generated_url)
-            row_cells = table_mitigations.add_row().cells
-            row_cells[0].merge(row_cells[2])
-            row_cells[0].text = mitigation["description"]
-        document.save(file_docx_mitigations)
-    else:
-        pass
+            row_cells[0].paragraphs[0].add_run('Control® ID').bold = True
+            row_cells[1].paragraphs[0].add_run('Control® Description').bold = True
+            row_cells[2].paragraphs[0].add_run('IG').bold = True
+            row_cells[3].paragraphs[0].add_run('Relative Weight').bold = True
+            for mitigation in self.array_obj_complete_cis_controls_prio_sorted:
+                row_cells = add_table_rows(table_cis_controls_prio, [None])[0]
+                row_cells[0].paragraphs[0].add_run(mitigation["cis_control_id"]).bold = True
+                row_cells[1].text = mitigation["cis_control_name"]
+                row_cells[2].text = mitigation["cis_control_ig"]
+                row_cells[3].text = (str(mitigation["cis_control_count"]))
+        save_attackdocument(document, file_docx_mitigations)
 
-def new_attackdetectionsconstruct():
-    array_obj_complete_detections = [obj for obj in array_obj_complete_attack["objects"] if obj.get("x_mitre_deprecated") != True and obj.get("revoked") != True and obj.get("relationship_type") == "detects"]
-    array_obj_filtered_detections = [obj for obj in array_obj_complete_detections if obj["target_ref"] in [attack_pattern["id"] for attack_pattern in array_obj_filtered_mapping_external_id_attack_pattern]]
-    array_obj_filtered_mitigations_detections = []
-    for detection in array_obj_filtered_detections:
-        obj_detection_property_guid = detection["source_ref"]
-        obj_detection_property_description = re.sub(r'\(Citation:.*\)', '', detection["description"])
-        obj_detection_property_description = re.sub(r'<h4>\s+', '<h4>', obj_detection_property_description)
-        obj_detection_property_description = re.sub(r'<h5>\s+', '<h5>', obj_detection_property_description)
-        obj_detection_property_description = re.sub(r'\s*</h4>', '</h4>', obj_detection_property_description)
-        obj_detection_property_description = re.sub(r'\s*</h5>', '</h5>', obj_detection_property_description)
-        description_pattern = re.compile(r'^(.*?)\n\n<h4>', re.DOTALL)
-        implementation_pattern = re.compile(r'<h4>Implementation\s*\d*\s*:\s*(.*?)</h4>', re.DOTALL)
-        pseudocode_pattern = re.compile(r'<h5>Detection Pseudocode</h5>\n<code>(.*?)</code>', re.DOTALL)
-    #    notes_pattern = re.compile(r'<h4>Detection Notes<\/h4>\n\n(.*?)\n', re.DOTALL)
-        description_short = description_pattern.findall(obj_detection_property_description)
-        if len(description_short) == 0:
-            description_short.append(obj_detection_property_description)
-        description_implementations = implementation_pattern.findall(obj_detection_property_description)
-        description_pseudocodes = pseudocode_pattern.findall(obj_detection_property_description)
-    #    description_notes = notes_pattern.findall(obj_detection_property_description)
-        description_detections = []
-        for i in range(len(description_implementations)):
-            description_detection = {
-                "implementation": description_implementations[i].strip(),
-                "pseudocode": description_pseudocodes[i].strip()
-    #            "notes": description_notes[i].strip()
-            }
-            description_detections.append(description_detection)
-        attack_detection_attack_pattern = next((attack_pattern for attack_pattern in array_obj_filtered_mapping_external_id_attack_pattern if attack_pattern["id"] == detection["target_ref"]), None)
-        detection_component_block = next((obj for obj in array_obj_complete_attack["objects"] if obj.get("type") == "x-mitre-data-component" and obj.get("id") == obj_detection_property_guid), None)
-        detection_data_source = detection_component_block.get("x_mitre_data_source_ref")
-        detection_data_source_block = next((obj for obj in array_obj_complete_attack["objects"] if obj.get("type") == "x-mitre-data-source" and obj.get("id") == detection_data_source), None)
-        detection_data_source_block_id = next((ref for ref in detection_data_source_block.get("external_references", []) if ref.get("source_name") == "mitre-attack"), None)
-        array_row = {
-            "name": detection_component_block.get("name"),
-            "external_id": detection_data_source_block_id.get("external_id"),
-            "url": detection_data_source_block_id.get("url").replace("-", ""),
-            "description": obj_detection_property_description,
-            "reduced_description": description_short,
-            "car_pseudocode": description_detections,
-            "platforms": detection_data_source_block.get("x_mitre_platforms"),
-            "collection_layers": detection_data_source_block.get("x_mitre_collection_layers"),
-            "attack_id": attack_detection_attack_pattern.get("external_id")
-        }
-        array_obj_filtered_mitigations_detections.append(array_row)
-    array_obj_sorted_detections = sorted(array_obj_filtered_mitigations_detections, key=lambda x: (x["external_id"], x["name"], x["attack_id"]), reverse=False)
-    grouped_detections = {}
-    for detection in array_obj_sorted_detections:
-        key = (detection["external_id"], detection["name"])
-        if key not in grouped_detections:
-            grouped_detections[key] = []
-        grouped_detections[key].append(detection)
-
-    array_obj_condensed_detections = []
-    for key, group in grouped_detections.items():
-        condensed_detection = {
-            "name": group[0]["name"],
-            "external_id": group[0]["external_id"],
-            "url": group[0]["url"],
-            "attack_id": [detection["attack_id"] for detection in group],
-            "platforms": group[0]["platforms"],
-            "collection_layers": group[0]["collection_layers"],
-            "description": [],
-            "car_pseudocode": [],
-            "combined_attack": group[0]["attack_id"]
-        }
-        for detection in group:
-            condensed_detection["car_pseudocode"].extend(detection["car_pseudocode"])
-            condensed_detection["description"].extend(detection["reduced_description"])
-        array_obj_condensed_detections.append(condensed_detection)
-    globals()["array_obj_condensed_detections"] = array_obj_condensed_detections
-    globals()["array_obj_filtered_mitigations_detections"] = array_obj_filtered_mitigations_detections
-
-def new_attackdocdetections():
-    new_attackdetectionsconstruct()
-    file_docx_detections = os.path.join(case_path, document_prefix + "detections.docx")
-    document = Document(file_docx_template)
-    document.add_heading("Detections",1)
-    document.add_paragraph("Detections are based on data sources and their components associated with the identified (Sub-)Techniques required to create detections where the mitigations/controls prove to be impossible to implement or inadequate.\nThe table includes the mapping with the Open Source Security Events Metadata Detection Model (OSSEM-DM) and extracted information from MITRE Cyber Analytics Repository (CAR) where available. It facilitates the detection of adversary techniques.\nThe provided information may help or drive the development of detection rules for adversary actions mapped to the MITRE ATT&CK knowledge base.")
-    document.add_paragraph()
-    table = document.add_table(rows=0,cols=3)
-    table.style = 'Table Grid'
-    row_cells = table.add_row().cells
-    row_cells[0].paragraphs[0].add_run('Detection ID: Name').bold = True
-    row_cells[1].paragraphs[0].add_run('Detection URL').bold = True
-    row_cells[2].paragraphs[0].add_run('Covered ATT&CK® Technique').bold = True
-    row_cells = table.add_row().cells
-    row_cells[0].paragraphs[0].add_run('Platforms').bold = True
-    row_cells[1].merge(row_cells[2])
-    row_cells[1].paragraphs[0].add_run('Collection Layers').bold = True
-    row_cells = table.add_row().cells
-    row_cells[0].merge(row_cells[2])
-    row_cells[0].paragraphs[0].add_run('Description').bold = True
-    row_cells = table.add_row().cells
-    row_cells[0].merge(row_cells[2])
-    row_cells = table.add_row().cells
-    row_cells[0].merge(row_cells[2])
-    row_cells[0].paragraphs[0].add_run('CAR Pseudocode').bold = True
-    row_cells = table.add_row().cells
-    row_cells[0].merge(row_cells[2])
-    row_cells = table.add_row().cells
-    row_cells[0].merge(row_cells[2])
-    row_cells[0].paragraphs[0].add_run('Source - Relationship - Target').bold = True
-    row_cells = table.add_row().cells
-    row_cells[0].merge(row_cells[2])
-    row_cells[0].paragraphs[0].add_run('Log Source/Channel').bold = True
-    row_cells = table.add_row().cells
-    row_cells[0].merge(row_cells[2])
-    row_cells[0].paragraphs[0].add_run('EventID - Event Name | Defender Advanced Hunting Schema/ActionType filter').bold = True
-    row_cells = table.add_row().cells
-    row_cells[0].merge(row_cells[2])
-    row_cells[0].paragraphs[0].add_run('Platform/Audit Category/Audit Subcategory : Filter').bold = True
-    document.add_paragraph()
-    for item in array_obj_condensed_detections:
-        document.add_page_break()
+    @attackstage
+    def new_attackdocmitigations(self, ciscontrols,nistcontrols,interactive=True,construct=True):
+        get_docx()
+        if construct:
+            self.new_attackmitigationsconstruct()
+            self.get_attackmitigationsmappings(ciscontrols,nistcontrols,interactive)
+        digest = self.get_case_artifact("mitigations")
+        if digest is None:
+            return
+        file_docx_mitigations = os.path.join(self.get_case_path(), self.document_prefix + "mitigations.docx")
+        if self.switch_control_mapping_selection in ("CN", "XN", "CX", "XX"):
+            self.new_attackmitigationsdocument(file_docx_mitigations, self.switch_control_mapping_selection[0] == "C", self.switch_control_mapping_selection[1] == "N")
+        self.set_case_artifact("mitigations", digest)
+
+    @attackstage
+    def new_attackdetectionsconstruct(self):
+        dict_obj_filtered_mapping_attack_pattern = {attack_pattern["id"]: attack_pattern for attack_pattern in self.array_obj_filtered_mapping_external_id_attack_pattern}
+        dict_obj_detections_sections = self.get_case_sections("detections", dict_obj_filtered_mapping_attack_pattern, get_attackdetectionssections)
+        array_obj_section_rows = sorted((row for section in dict_obj_detections_sections.values() for row in section), key=lambda x: x[0])
+        array_obj_filtered_mitigations_detections = [AttackDetectionRecord(*row[1]) for row in array_obj_section_rows]
+        array_obj_sorted_detections = sorted(array_obj_filtered_mitigations_detections, key=lambda x: (x["external_id"], x["name"], x["attack_id"]), reverse=False)
+        grouped_detections = {}
+        for detection in array_obj_sorted_detections:
+            key = (detection["external_id"], detection["name"])
+            if key not in grouped_detections:
+                grouped_detections[key] = []
+            grouped_detections[key].append(detection)
+
+        array_obj_condensed_detections = []
+        for key, group in grouped_detections.items():
+            condensed_detection = AttackCondensedDetectionRecord(
+                group[0]["name"],
+                group[0]["external_id"],
+                group[0]["url"],
+                tuple(detection["attack_id"] for detection in group),
+                group[0]["platforms"],
+                group[0]["collection_layers"],
+                tuple(description for detection in group for description in detection["reduced_description"]),
+                tuple(car_pseudocode for detection in group for car_pseudocode in detection["car_pseudocode"]),
+                group[0]["attack_id"]
+            )
+            array_obj_condensed_detections.append(condensed_detection)
+        self.array_obj_condensed_detections = array_obj_condensed_detections
+        self.array_obj_filtered_mitigations_detections = array_obj_filtered_mitigations_detections
+
+    @attackstage
+    def new_attackdocdetections(self, construct=True):
+        docx = get_docx()
+        if construct:
+            self.new_attackdetectionsconstruct()
+        digest = self.get_case_artifact("detections")
+        if digest is None:
+            return
+        file_docx_detections = os.path.join(self.get_case_path(), self.document_prefix + "detections.docx")
+        document = new_attackdocument()
+        document.add_heading("Detections",1)
+        document.add_paragraph("Detections are based on data sources and their components associated with the identified (Sub-)Techniques required to create detections where the mitigations/controls prove to be impossible to implement or inadequate.\nThe table includes the mapping with the Open Source Security Events Metadata Detection Model (OSSEM-DM) and extracted information from MITRE Cyber Analytics Repository (CAR) where available. It facilitates the detection of adversary techniques.\nThe provided information may help or drive the development of detection rules for adversary actions mapped to the MITRE ATT&CK knowledge base.")
+        document.add_paragraph()
         table = document.add_table(rows=0,cols=3)
         table.style = 'Table Grid'
         row_cells = table.add_row().cells
-        run = row_cells[0].paragraphs[0].add_run(item['external_id'] + ": " + item['name'])
-        run.bold = True
-        run.font.color.rgb = RGBColor(218,21,114)
-        datasourceurl = row_cells[1].paragraphs[0]
-        add_hyperlink(datasourceurl,item['external_id'],item['url'])
-        row_cells[2].text = ", ".join(item['attack_id'])
+        row_cells[0].paragraphs[0].add_run('Detection ID: Name').bold = True
+        row_cells[1].paragraphs[0].add_run('Detection URL').bold = True
+        row_cells[2].paragraphs[0].add_run('Covered ATT&CK® Technique').bold = True
         row_cells = table.add_row().cells
-        row_cells[0].text = ", ".join(item['platforms'])
+        row_cells[0].paragraphs[0].add_run('Platforms').bold = True
         row_cells[1].merge(row_cells[2])
-        row_cells[1].text = ", ".join(item['collection_layers'])
+        row_cells[1].paragraphs[0].add_run('Collection Layers').bold = True
         row_cells = table.add_row().cells
         row_cells[0].merge(row_cells[2])
-        para = row_cells[0].paragraphs[0]
-        description = sorted(set(item['description']))
-        text = "\n".join(description)
-        process_text_with_links_code(text, para)
-        var_car_pseudocode_elements = len(item["car_pseudocode"])
-        table_pseudocode = document.add_table(rows=0,cols=1)
-        table_pseudocode.style = 'Table Grid'
-        table_pseudocode.add_row()
-        row_cells = table_pseudocode.add_row().cells
-        if var_car_pseudocode_elements == 0:
-            run = row_cells[0].paragraphs[0].add_run('No CAR Pseudocode Information available.')
-            run.bold = True
-            run.font.color.rgb = RGBColor(140,14,74)
-        else:
-            run = row_cells[0].paragraphs[0].add_run('CAR Pseudocode Information:')
-            run.bold = True
-            run.italic = True
-            run.font.color.rgb = RGBColor(218,21,114)
-            for c in (item["car_pseudocode"]):
-                table_pseudocode.add_row()
-                row_cells = table_pseudocode.add_row().cells
-                row_cells[0].paragraphs[0].add_run(c['implementation']).bold = True
-                row_cells = table_pseudocode.add_row().cells
-                row_cells[0].paragraphs[0].add_run(c['pseudocode']).bold = False
-        array_obj_filtered_ossem_data = [ossem_obj for ossem_obj in array_obj_complete_ossem_mapping if ossem_obj["technique_id"] == item["combined_attack"] and str(ossem_obj["data_component"]) == item["name"].lower()]
-        var_ossem_elements = len(array_obj_filtered_ossem_data)
-        table_ossem = document.add_table(rows=0,cols=1)
-        table_ossem.style = 'Table Grid'
-        table_ossem.add_row()
-        row_cells = table_ossem.add_row().cells
-        if var_ossem_elements == 0:
-            run = row_cells[0].paragraphs[0].add_run('No OSSEM DM Information available.')
-            run.bold = True
-            run.font.color.rgb = RGBColor(140,14,74)
-        else:
-            run = row_cells[0].paragraphs[0].add_run('OSSEM DM Information:')
+        row_cells[0].paragraphs[0].add_run('Description').bold = True
+        row_cells = table.add_row().cells
+        row_cells[0].merge(row_cells[2])
+        row_cells = table.add_row().cells
+        row_cells[0].merge(row_cells[2])
+        row_cells[0].paragraphs[0].add_run('CAR Pseudocode').bold = True
+        row_cells = table.add_row().cells
+        row_cells[0].merge(row_cells[2])
+        row_cells = table.add_row().cells
+        row_cells[0].merge(row_cells[2])
+        row_cells[0].paragraphs[0].add_run('Source - Relationship - Target').bold = True
+        row_cells = table.add_row().cells
+        row_cells[0].merge(row_cells[2])
+        row_cells[0].paragraphs[0].add_run('Log Source/Channel').bold = True
+        row_cells = table.add_row().cells
+        row_cells[0].merge(row_cells[2])
+        row_cells[0].paragraphs[0].add_run('EventID - Event Name | Defender Advanced Hunting Schema/ActionType filter').bold = True
+        row_cells = table.add_row().cells
+        row_cells[0].merge(row_cells[2])
+        row_cells[0].paragraphs[0].add_run('Platform/Audit Category/Audit Subcategory : Filter').bold = True
+        document.add_paragraph()
+        def add_detection_tables(item, array_obj_filtered_ossem_data):
+            document.add_page_break()
+            table = document.add_table(rows=0,cols=3)
+            table.style = 'Table Grid'
+            list_row_cells = add_table_rows(table, [None, (1, 2), (0, 2)])
+            row_cells = list_row_cells[0]
+            run = row_cells[0].paragraphs[0].add_run(item['external_id'] + ": " + item['name'])
             run.bold = True
-            run.italic = True
-            run.font.color.rgb = RGBColor(218,21,114)
-            for j in array_obj_filtered_ossem_data:
-                table_ossem.add_row()
-                row_cells = table_ossem.add_row().cells
-                row_cells[0].paragraphs[0].add_run('Source - Relationship - Target: ' + j['name']).bold = True
-                row_cells = table_ossem.add_row().cells
-                if j['log_source'] == "sysmon" or j['log_source'] == "Microsoft Defender for Endpoint":
-                    row_cells[0].text = "Log Source: " + j['log_source']
-                elif j['log_source'] == "Microsoft-Windows-Sysmon":
-                    row_cells[0].text = "Log Source/Channel: " + (str(j['channel']))
-                else:
-                    if str(j['channel']) == 'nan':
-                        row_cells[0].text = "Log Source/Channel: " + j['log_source']
+            run.font.color.rgb = docx.shared.RGBColor(218,21,114)
+            datasourceurl = row_cells[1].paragraphs[0]
+            add_hyperlink(datasourceurl,item['external_id'],item['url'])
+            row_cells[2].text = ", ".join(item['attack_id'])
+            row_cells = list_row_cells[1]
+            row_cells[0].text = ", ".join(item['platforms'])
+            row_cells[1].text = ", ".join(item['collection_layers'])
+            para = list_row_cells[2][0].paragraphs[0]
+            description = sorted(set(item['description']))
+            text = "\n".join(description)
+            process_text_with_links_code(text, para)
+            var_car_pseudocode_elements = len(item["car_pseudocode"])
+            table_pseudocode = document.add_table(rows=0,cols=1)
+            table_pseudocode.style = 'Table Grid'
+            row_cells = add_table_rows(table_pseudocode, [None, None])[1]
+            if var_car_pseudocode_elements == 0:
+                run = row_cells[0].paragraphs[0].add_run('No CAR Pseudocode Information available.')
+                run.bold = True
+                run.font.color.rgb = docx.shared.RGBColor(140,14,74)
+            else:
+                run = row_cells[0].paragraphs[0].add_run('CAR Pseudocode Information:')
+                run.bold = True
+                run.italic = True
+                run.font.color.rgb = docx.shared.RGBColor(218,21,114)
+                for c in (item["car_pseudocode"]):
+                    list_row_cells = add_table_rows(table_pseudocode, [None, None, None])
+                    list_row_cells[1][0].paragraphs[0].add_run(c['implementation']).bold = True
+                    list_row_cells[2][0].paragraphs[0].add_run(c['pseudocode']).bold = False
+            var_ossem_elements = len(array_obj_filtered_ossem_data)
+            table_ossem = document.add_table(rows=0,cols=1)
+            table_ossem.style = 'Table Grid'
+            row_cells = add_table_rows(table_ossem, [None, None])[1]
+            if var_ossem_elements == 0:
+                run = row_cells[0].paragraphs[0].add_run('No OSSEM DM Information available.')
+                run.bold = True
+                run.font.color.rgb = docx.shared.RGBColor(140,14,74)
+            else:
+                run = row_cells[0].paragraphs[0].add_run('OSSEM DM Information:')
+                run.bold = True
+                run.italic = True
+                run.font.color.rgb = docx.shared.RGBColor(218,21,114)
+                for j in array_obj_filtered_ossem_data:
+                    list_row_cells = add_table_rows(table_ossem, [None, None, None, None, None])
+                    list_row_cells[1][0].paragraphs[0].add_run('Source - Relationship - Target: ' + j['name']).bold = True
+                    row_cells = list_row_cells[2]
+                    if j['log_source'] == "sysmon" or j['log_source'] == "Microsoft Defender for Endpoint":
+                        row_cells[0].text = "Log Source: " + j['log_source']
+                    elif j['log_source'] == "Microsoft-Windows-Sysmon":
+                        row_cells[0].text = "Log Source/Channel: " + (str(j['channel']))
                     else:
-                        row_cells[0].text = "Log Source/Channel: " + j['log_source']  + "/" + (str(j['channel']))
-                row_cells = table_ossem.add_row().cells
-                if j['log_source'] == "Microsoft Defender for Endpoint":
-                    row_cells[0].text = "Defender Advanced Hunting Schema/ActionType filter: " + j['event_id'] + "/" + j['filter_in'][0]['ActionType']
-                else:
-                    row_cells[0].text = "EventID - Event Name: " + str(j['event_id']) + " - " + j['event_name']
-                row_cells = table_ossem.add_row().cells
-                if str(j['audit_sub_category']) == 'nan':
-                    if str(j['audit_category']) == 'nan':
-                        row_cells[0].text = "Platform: " + j['event_platform']
+                        if str(j['channel']) == 'nan':
+                            row_cells[0].text = "Log Source/Channel: " + j['log_source']
+                        else:
+                            row_cells[0].text = "Log Source/Channel: " + j['log_source']  + "/" + (str(j['channel']))
+                    row_cells = list_row_cells[3]
+                    if j['log_source'] == "Microsoft Defender for Endpoint":
+                        row_cells[0].text = "Defender Advanced Hunting Schema/ActionType filter: " + j['event_id'] + "/" + j['filter_in'][0]['ActionType']
                     else:
-                        if str(j['filter_in']) == 'nan':
-                            row_cells[0].text = "Platform/Audit Category: " + j['event_platform'] + "/" + j['audit_category']
+                        row_cells[0].text = "EventID - Event Name: " + str(j['event_id']) + " - " + j['event_name']
+                    row_cells = list_row_cells[4]
+                    if str(j['audit_sub_category']) == 'nan':
+                        if str(j['audit_category']) == 'nan':
+                            row_cells[0].text = "Platform: " + j['event_platform']
                         else:
-                            row_cells[0].text = "Platform/Audit Category : Filter: " + j['event_platform'] + "/" + j['audit_category'] + " : " + str(j['filter_in'])
-                else:
-                    if str(j['filter_in']) == 'nan':
-                        row_cells[0].text = "Platform/Audit Category/Audit Subcategory: " + j['event_platform'] + "/" + j['audit_category'] + "/" + j['audit_sub_category']
+                            if str(j['filter_in']) == 'nan':
+                                row_cells[0].text = "Platform/Audit Category: " + j['event_platform'] + "/" + j['audit_category']
+                            else:
+                                row_cells[0].text = "Platform/Audit Category : Filter: " + j['event_platform'] + "/" + j['audit_category'] + " : " + str(j['filter_in'])
                     else:
-                        row_cells[0].text = "Platform/Audit Category/Audit Subcategory : Filter: " + j['event_platform'] + "/" + j['audit_category'] + "/" + j['audit_sub_category'] + " : " + str(j['filter_in'])
-    document.save(file_docx_detections)
+                        if str(j['filter_in']) == 'nan':
+                            row_cells[0].text = "Platform/Audit Category/Audit Subcategory: " + j['event_platform'] + "/" + j['audit_category'] + "/" + j['audit_sub_category']
+                        else:
+                            row_cells[0].text = "Platform/Audit Category/Audit Subcategory : Filter: " + j['event_platform'] + "/" + j['audit_category'] + "/" + j['audit_sub_category'] + " : " + str(j['filter_in'])
+        for item in self.array_obj_condensed_detections:
+            array_obj_filtered_ossem_data = get_ossemmappingstore_rows(item["combined_attack"], item["name"].lower())
+            get_run_thread_counts()["ossem_rows"] += len(array_obj_filtered_ossem_data)
+            self.add_case_fragment("detections", document, document.element.body, [item], lambda: add_detection_tables(item, array_obj_filtered_ossem_data))
+        save_attackdocument(document, file_docx_detections)
+        self.set_case_artifact("detections", digest)
 
-def new_attackdocvalidations():
-    file_docx_validations = os.path.join(case_path, document_prefix + "validations.docx")
-    array_obj_complete_validation = []
-    array_obj_complete_validation = [technique for technique in array_obj_complete_atomicred_mapping["techniques"] if technique["techniqueID"] in [attack["attack_id"] for attack in list_obj_selected_attack_techniques]]
-    document = Document(file_docx_template)
-    document.add_heading("Validations",1)
-    document.add_paragraph("Validations are based on Atomic Red Team tests. The references point to the available tests for the given Techniques. These are not to be considered as providing a complete coverage of all possible ways to simulate the effects of a given Technique. It facilitates validation your mitigations and detections for your environment.")
-    document.add_paragraph()
-    table = document.add_table(rows=0,cols=2)
-    table.style = 'Table Grid'
-    row_cells = table.add_row().cells
-    row_cells[0].paragraphs[0].add_run('Atomic Red Team test URL').bold = True
-    row_cells[1].paragraphs[0].add_run('Score').bold = True
-    for item in array_obj_complete_validation:
-            row_cells = table.add_row().cells
-            validationsourceeurl = row_cells[0].paragraphs[0]
-            add_hyperlink(validationsourceeurl,"Atomic Red Team test for " + item['techniqueID'],item['links'][0]['url'])
-            row_cells[1].text = str(item['score'])
-    document.save(file_docx_validations)
+    @attackstage
+    def new_attackdocvalidations(self):
+        get_docx()
+        digest = self.get_case_artifact("validations")
+        if digest is None:
+            return
+        file_docx_validations = os.path.join(self.get_case_path(), self.document_prefix + "validations.docx")
+        list_selected_attack_ids = dict.fromkeys(attack["attack_id"] for attack in self.list_obj_selected_attack_techniques)
+        array_obj_complete_validation = sorted((technique for attack_id in list_selected_attack_ids for technique in obj_atomicred_index.get(attack_id, [])), key=lambda x: x["position"])
+        document = new_attackdocument()
+        document.add_heading("Validations",1)
+        document.add_paragraph("Validations are based on Atomic Red Team tests. The references point to the available tests for the given Techniques. These are not to be considered as providing a complete coverage of all possible ways to simulate the effects of a given Technique. It facilitates validation your mitigations and detections for your environment.")
+        document.add_paragraph()
+        table = document.add_table(rows=0,cols=2)
+        table.style = 'Table Grid'
+        row_cells = table.add_row().cells
+        row_cells[0].paragraphs[0].add_run('Atomic Red Team test URL').bold = True
+        row_cells[1].paragraphs[0].add_run('Score').bold = True
+        for item in array_obj_complete_validation:
+                row_cells = add_table_rows(table, [None])[0]
+                validationsourceeurl = row_cells[0].paragraphs[0]
+                for index, link in enumerate(item['links']):
+                    if index == 0:
+                        add_hyperlink(validationsourceeurl,"Atomic Red Team test for " + item['techniqueID'],link['url'])
+                    else:
+                        add_hyperlink(row_cells[0].add_paragraph(),"Atomic Red Team " + link.get('label', 'test') + " for " + item['techniqueID'],link['url'])
+                for test in item['tests']:
+                    row_cells[0].add_paragraph("Test " + str(test['number']) + ": " + str(test['name']) + " (" + ", ".join(test['platforms']) + " - " + str(test['executor']) + ")")
+                row_cells[1].text = str(item['score'])
+        save_attackdocument(document, file_docx_validations)
+        self.set_case_artifact("validations", digest)
 
-def new_ctidattackflow(ctid_assets=None):
-    file_afb_ctid_flow = os.path.join(case_path, document_prefix + "ctid_attack_flow.afb")
-    var_obj_flow_property_GUID = str(uuid.uuid4())
-    var_obj_flow_property_background_colour = "#ffffff"
-    var_obj_flow_property_grid_colour = "#f5f5f5"
-    var_obj_flow_objects_property_anchor_markers_colour = "#fb6fa5"
-    var_obj_flow_objects_property_anchor_hover_colour = "rgba(200, 88, 135, 0.25)"
-    var_obj_flow_objects_property_box_colour = "#fefefe"
-    now = datetime.utcnow()
-    current_time = now.strftime('%Y-%m-%dT%H:%M:%S') + 'Z'
-    obj_flow_template_header_0  = '''{"version":"2.0.1","id":"'''
-    obj_flow_template_header_1  = var_obj_flow_property_GUID
-    obj_flow_template_header_2  = '''","schema":{"page_template":"flow","templates":[{"id":"@__builtin__page","type":7,"role":0,"grid":[10,10],"properties":{"name":{"type":2,"value":"Untitled Document","is_primary":true}},"style":{"grid_color":"'''
-    obj_flow_template_header_3 = var_obj_flow_property_grid_colour
-    obj_flow_template_header_4 = '''","background_color":"'''
-    obj_flow_template_header_5 = var_obj_flow_property_background_colour
-    obj_flow_template_header_6 = '''","drop_shadow":{"color":"rgba(0,0,0,.4)","offset":[3,3]}}},{"id":"@__builtin__anchor","type":0,"role":0,"radius":10,"line_templates":{"0":"@__builtin__line_horizontal_elbow","1":"@__builtin__line_vertical_elbow"},"style":{"color":"'''
-    obj_flow_template_header_7 = var_obj_flow_objects_property_anchor_hover_colour
-    obj_flow_template_header_8 = '''"}},{"id":"@__builtin__line_handle","type":4,"role":0,"style":{"radius":6,"fill_color":"#fedb22","stroke_color":"#fefefe","stroke_width":1.5}},{"id":"@__builtin__line_source","type":3,"role":12288,"style":{"radius":6,"fill_color":"#fedb22","stroke_color":"#141414","stroke_width":1.5}},{"id":"@__builtin__line_target","type":3,"role":16384,"style":{"radius":6,"fill_color":"#fedb22","stroke_color":"#141414","stroke_width":1.5}},{"id":"@__builtin__line_horizontal_elbow","namespace":"horizontal_elbow","type":5,"role":8192,"hitbox_width":20,"line_handle_template":"@__builtin__line_handle","line_ending_template":{"source":"@__builtin__line_source","target":"@__builtin__line_target"},"style":{"width":5,"cap_size":16,"color":"#646464","select_color":"#646464"}},{"id":"@__builtin__line_vertical_elbow","namespace":"vertical_elbow","type":6,"role":8192,"hitbox_width":20,"line_handle_template":"@__builtin__line_handle","line_ending_template":{"source":"@__builtin__line_source","target":"@__builtin__line_target"},"style":{"width":5,"cap_size":16,"color":"#646464","select_color":"#646464"}},{"id":"flow","type":7,"role":4096,"grid":[10,10],"properties":{"name":{"type":2,"value":"Untitled Document","is_primary":true},"description":{"type":2},"author":{"type":6,"form":{"name":{"type":2,"is_primary":true},"identity_class":{"type":4,"options":{"type":5,"form":{"type":2},"value":[["individual","Individual"],["group","Group"],["system","System"],["organization","Organization"],["class","Class"],["unknown","Unknown"]]}},"contact_information":{"type":2}}},"scope":{"type":4,"options":{"type":5,"form":{"type":2},"value":[["incident","Incident"],["campaign","Campaign"],["threat-actor","Threat Actor"],["malware","Malware"],["other","Other"]]},"value":"incident"},"external_references":{"type":5,"form":{"type":6,"form":{"source_name":{"type":2,"is_primary":true,"is_required":true},"description":{"type":2},"url":{"type":2}}}},"created":{"type":3,"value":"'''
-    obj_flow_template_header_9 = '''current_time","is_visible":false}},"style":{"grid_color":"'''
-    obj_flow_template_header_10 = var_obj_flow_property_grid_colour
-    obj_flow_template_header_11 = '''","background_color":"'''
-    obj_flow_template_header_12 = var_obj_flow_property_background_colour
-    obj_flow_template_header_13 = '''","drop_shadow":{"color":"rgba(0,0,0,.4)","offset":[3,3]}}},{"id":"true_anchor","type":0,"role":0,"radius":10,"line_templates":{"0":"@__builtin__line_horizontal_elbow","1":"@__builtin__line_vertical_elbow"},"style":{"color":"rgba(255, 255, 255, 0.25)"}},{"id":"false_anchor","type":0,"role":0,"radius":10,"line_templates":{"0":"@__builtin__line_horizontal_elbow","1":"@__builtin__line_vertical_elbow"},"style":{"color":"rgba(255, 255, 255, 0.25)"}},{"id":"action","namespace":"attack_flow.action","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true,"is_required":true},"tactic_id":{"type":2},"tactic_ref":{"type":2},"technique_id":{"type":2},"technique_ref":{"type":2},"description":{"type":2},"confidence":{"type":4,"options":{"type":5,"form":{"type":6,"form":{"text":{"type":2,"is_primary":true},"value":{"type":0}}},"value":[["speculative",{"text":"Speculative","value":0}],["very-doubtful",{"text":"Very Doubtful","value":10}],["doubtful",{"text":"Doubtful","value":30}],["even-odds",{"text":"Even Odds","value":50}],["probable",{"text":"Probable","value":70}],["very-probable",{"text":"Very Probable","value":90}],["certain",{"text":"Certain","value":100}]]},"value":null},"execution_start":{"type":3},"execution_end":{"type":3}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#637bc9","stroke_color":"#708ce6","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_14 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_15 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_16 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_17 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"asset","namespace":"attack_flow.asset","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true,"is_required":true},"description":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#c26130","stroke_color":"#e57339","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_18 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_19 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_20 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_21 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"condition","namespace":"attack_flow.condition","type":1,"role":4096,"properties":{"description":{"type":2,"is_primary":true,"is_required":true},"pattern":{"type":2},"pattern_type":{"type":2},"pattern_version":{"type":2},"date":{"type":3}},"branches":[{"text":"True","anchor_template":"true_anchor"},{"text":"False","anchor_template":"false_anchor"}],"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#2a9642","stroke_color":"#32b34e","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_22 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_23 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"branch":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","vertical_padding":12,"horizontal_padding":30},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_24 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_25 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"or","namespace":"attack_flow.OR_operator","type":8,"role":4096,"properties":{"operator":{"type":2,"value":"OR","is_primary":true,"is_visible":false,"is_editable":false}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"fill_color":"#c94040","stroke_color":"#dd5050","text":{"font":{"family":"Inter","size":"14pt","weight":800},"color":"#d8d8d8","line_height":24},"border_radius":13,"select_outline":{"color":"#e6d845","padding":4,"border_radius":19},"anchor_markers":{"color":"'''
-    obj_flow_template_header_26 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_27 = '''","size":3},"vertical_padding":18,"horizontal_padding":35}},{"id":"and","namespace":"attack_flow.AND_operator","type":8,"role":4096,"properties":{"operator":{"type":2,"value":"AND","is_primary":true,"is_visible":false,"is_editable":false}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"fill_color":"#c94040","stroke_color":"#dd5050","text":{"font":{"family":"Inter","size":"14pt","weight":800},"color":"#d8d8d8","line_height":24},"border_radius":13,"select_outline":{"color":"#e6d845","padding":4,"border_radius":19},"anchor_markers":{"color":"'''
-    obj_flow_template_header_28 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_29 = '''","size":3},"vertical_padding":18,"horizontal_padding":35}},{"id":"attack_pattern","namespace":"stix_object.attack_pattern","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true,"is_required":true},"description":{"type":2},"aliases":{"type":5,"form":{"type":2}},"kill_chain_phases":{"type":5,"form":{"type":2}}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_30 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_31 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_32 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_33 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"campaign","namespace":"stix_object.campaign","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true,"is_required":true},"description":{"type":2},"aliases":{"type":5,"form":{"type":2}},"first_seen":{"type":3},"last_seen":{"type":3},"objective":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_34 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_35 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_36 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_37 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"course_of_action","namespace":"stix_object.course_of_action","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true,"is_required":true},"description":{"type":2},"action_type":{"type":2},"os_execution_envs":{"type":5,"form":{"type":2}},"action_bin":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_38 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_39 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_40 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_41 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"grouping","namespace":"stix_object.grouping","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true},"description":{"type":2},"context":{"type":2,"is_required":true}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_42 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_43 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_44 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_45 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"identity","namespace":"stix_object.identity","type":2,"role":4096,"properties":{"name":{"type":2,"is_required":true,"is_primary":true},"description":{"type":2},"roles":{"type":5,"form":{"type":2}},"identity_class":{"type":2,"is_required":true},"sectors":{"type":5,"form":{"type":2}},"contact_information":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_46 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_47 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_48 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_49 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"indicator","namespace":"stix_object.indicator","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true},"description":{"type":2},"indicator_types":{"type":5,"form":{"type":2,"is_required":true}},"pattern":{"type":2,"is_required":true},"pattern_type":{"type":2,"is_required":true},"patter_version":{"type":2},"valid_from":{"type":3,"is_required":true},"valid_until":{"type":3},"kill_chain_phases":{"type":5,"form":{"type":2}}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_50 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_51 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_52 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_53 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"infrastructure","namespace":"stix_object.infrastructure","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true,"is_required":true},"description":{"type":2},"infrastructure_types":{"type":5,"form":{"type":2,"is_required":true}},"aliases":{"type":5,"form":{"type":2}},"kill_chain_phases":{"type":5,"form":{"type":2}},"first_seen":{"type":3},"last_seen":{"type":3}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_54 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_55 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_56 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_57 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"intrusion_set","namespace":"stix_object.intrusion_set","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true,"is_required":true},"description":{"type":2},"aliases":{"type":5,"form":{"type":2,"is_required":true}},"first_seen":{"type":3},"last_seen":{"type":3},"goals":{"type":5,"form":{"type":2}},"resource_level":{"type":2},"primary_motivation":{"type":2},"secondary_motivations":{"type":5,"form":{"type":2}}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_58 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_59 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_60 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_61 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"location","namespace":"stix_object.location","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true},"description":{"type":2},"latitude":{"type":1,"min":-90,"max":90},"longitude":{"type":1,"min":-180,"max":180},"precision":{"type":1},"region":{"type":2},"country":{"type":2},"administrative_area":{"type":2},"city":{"type":2},"street_address":{"type":2},"postal_code":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_62 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_63 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_64 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_65 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"malware","namespace":"stix_object.malware","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true},"description":{"type":2},"malware_types":{"type":5,"form":{"type":2,"is_required":true}},"is_family":{"type":4,"options":{"type":5,"form":{"type":2},"value":[["true","True"],["false","False"]]},"is_required":true},"aliases":{"type":5,"form":{"type":2}},"kill_chain_phases":{"type":5,"form":{"type":2}},"first_seen":{"type":3},"last_seen":{"type":3},"os_execution_envs":{"type":5,"form":{"type":2}},"architecture_execution_envs":{"type":5,"form":{"type":2}},"implementation_languages":{"type":5,"form":{"type":2}},"capabilities":{"type":5,"form":{"type":2}}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_66 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_67 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_68 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_69 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"malware_analysis","namespace":"stix_object.malware_analysis","type":2,"role":4096,"properties":{"product":{"type":2,"is_primary":true,"is_required":true},"version":{"type":2},"configuration_version":{"type":2},"modules":{"type":5,"form":{"type":2}},"analysis_engine_version":{"type":2},"analysis_definition_version":{"type":2},"submitted":{"type":3},"analysis_started":{"type":3},"analysis_ended":{"type":3},"av_result":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_70 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_71 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_72 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_73 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"note","namespace":"stix_object.note","type":2,"role":4096,"properties":{"abstract":{"type":2,"is_primary":true},"content":{"type":2,"is_required":true},"authors":{"type":5,"form":{"type":2}}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_74 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_75 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_76 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_77 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"observed_data","namespace":"stix_object.observed_data","type":2,"role":4096,"properties":{"first_observed":{"type":3,"is_required":true},"last_observed":{"type":3,"is_required":true},"number_observed":{"type":0,"min":0,"is_required":true}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_78 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_79 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_80 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_81 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"opinion","namespace":"stix_object.opinion","type":2,"role":4096,"properties":{"explanation":{"type":2,"is_primary":true},"authors":{"type":5,"form":{"type":2}},"opinion":{"type":2,"is_required":true}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_82 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_83 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_84 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_85 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"report","namespace":"stix_object.report","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true,"is_required":true},"description":{"type":2},"report_types":{"type":5,"form":{"type":2,"is_required":true}},"published":{"type":3,"is_required":true}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_86 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_87 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_88 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_89 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"threat_actor","namespace":"stix_object.threat_actor","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true,"is_required":true},"description":{"type":2},"threat_actor_types":{"type":5,"form":{"type":2,"is_required":true}},"aliases":{"type":5,"form":{"type":2}},"first_seen":{"type":3},"last_seen":{"type":3},"roles":{"type":5,"form":{"type":2}},"goals":{"type":5,"form":{"type":2}},"sophistication":{"type":2},"resource_level":{"type":2},"primary_motivation":{"type":2},"secondary_motivations":{"type":5,"form":{"type":2}},"personal_motivations":{"type":5,"form":{"type":2}}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_90 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_91 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_92 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_93 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"tool","namespace":"stix_object.tool","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true,"is_required":true},"description":{"type":2},"tool_types":{"type":5,"form":{"type":2,"is_required":true}},"aliases":{"type":5,"form":{"type":2}},"kill_chain_phases":{"type":5,"form":{"type":2}},"tool_version":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_94 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_95 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_96 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_97 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"vulnerability","namespace":"stix_object.vulnerability","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true,"is_required":true},"description":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_98 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_99 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_100 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_101 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"artifact","namespace":"stix_observable.artifact","type":2,"role":4096,"properties":{"mime_type":{"type":2},"payload_bin":{"type":2},"url":{"type":2},"hashes":{"type":2},"encryption_algorithm":{"type":2},"decryption_key":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_102 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_103 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_104 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_105 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"autonomous_system","namespace":"stix_observable.autonomous_system","type":2,"role":4096,"properties":{"number":{"type":2,"is_primary":true,"is_required":true},"name":{"type":2},"rir":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_106 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_107 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_108 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_109 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"directory","namespace":"stix_observable.directory","type":2,"role":4096,"properties":{"path":{"type":2,"is_primary":true,"is_required":true},"path_enc":{"type":2},"ctime":{"type":3},"mtime":{"type":3},"atime":{"type":3}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_110 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_111 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_112 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_113 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"domain_name","namespace":"stix_observable.domain_name","type":2,"role":4096,"properties":{"value":{"type":2,"is_required":true}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_114 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_115 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_116 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_117 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"email_address","namespace":"stix_observable.email_address","type":2,"role":4096,"properties":{"value":{"type":2,"is_required":true},"display_name":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_118 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_119 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_120 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_121 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"email_message","namespace":"stix_observable.email_message","type":2,"role":4096,"properties":{"is_multipart":{"type":4,"options":{"type":5,"form":{"type":2},"value":[["true","True"],["false","False"]]},"is_required":true},"date":{"type":2},"content_type":{"type":2},"message_id":{"type":2},"subject":{"type":2,"is_primary":true},"received_lines":{"type":2},"additional_header_fields":{"type":2},"body":{"type":2},"body_multipart":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_122 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_123 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_124 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_125 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"file","namespace":"stix_observable.file","type":2,"role":4096,"properties":{"hashes":{"type":2},"size":{"type":2},"name":{"type":2,"is_primary":true},"name_enc":{"type":2},"magic_number_hex":{"type":2},"mime_type":{"type":2},"ctime":{"type":3},"mtime":{"type":3},"atime":{"type":3}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_126 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_127 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_128 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_129 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"ipv4_addr","namespace":"stix_observable.ipv4_addr","type":2,"role":4096,"properties":{"value":{"type":2,"is_required":true}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_130 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_131 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_132 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_133 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"ipv6_addr","namespace":"stix_observable.ipv6_addr","type":2,"role":4096,"properties":{"value":{"type":2,"is_required":true}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_134 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_135 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_136 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_137 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"mac_addr","namespace":"stix_observable.mac_addr","type":2,"role":4096,"properties":{"value":{"type":2,"is_required":true}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_138 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_139 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_140 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_141 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"mutex","namespace":"stix_observable.mutex","type":2,"role":4096,"properties":{"name":{"type":2,"is_required":true}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_142 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_143 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_144 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_145 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"network_traffic","namespace":"stix_observable.network_traffic","type":2,"role":4096,"properties":{"start":{"type":3},"end":{"type":3},"is_active":{"type":4,"options":{"type":5,"form":{"type":2},"value":[["true","True"],["false","False"]]}},"src_port":{"type":0,"min":0,"max":65535},"dst_port":{"type":0,"min":0,"max":65535},"protocols":{"type":5,"form":{"type":2,"is_required":true}},"src_byte_count":{"type":0,"min":0},"dst_byte_count":{"type":0,"min":0},"src_packets":{"type":0,"min":0},"dst_packets":{"type":0,"min":0},"ipfix":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_146 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_147 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_148 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_149 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"process","namespace":"stix_observable.process","type":2,"role":4096,"properties":{"is_hidden":{"type":4,"options":{"type":5,"form":{"type":2},"value":[["true","True"],["false","False"]]}},"pid":{"type":0,"min":0},"created_time":{"type":3},"cwd":{"type":2},"command_line":{"type":2,"is_required":true},"environment_variables":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_150 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_151 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_152 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_153 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"software","namespace":"stix_observable.software","type":2,"role":4096,"properties":{"name":{"type":2,"is_primary":true,"is_required":true},"cpe":{"type":2},"languages":{"type":5,"form":{"type":2}},"vendor":{"type":2},"version":{"type":2}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_154 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_155 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_156 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_157 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"url","namespace":"stix_observable.url","type":2,"role":4096,"properties":{"value":{"type":2,"is_required":true}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_158 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_159 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_160 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_161 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"user_account","namespace":"stix_observable.user_account","type":2,"role":4096,"properties":{"user_id":{"type":2},"credential":{"type":2},"account_login":{"type":2},"account_type":{"type":2},"display_name":{"type":2,"is_primary":true,"is_required":true},"is_service_account":{"type":4,"options":{"type":5,"form":{"type":2},"value":[["true","True"],["false","False"]]}},"is_privileged":{"type":4,"options":{"type":5,"form":{"type":2},"value":[["true","True"],["false","False"]]}},"can_escalate_privs":{"type":4,"options":{"type":5,"form":{"type":2},"value":[["true","True"],["false","False"]]}},"is_disabled":{"type":4,"options":{"type":5,"form":{"type":2},"value":[["true","True"],["false","False"]]}},"account_created":{"type":3},"account_expires":{"type":3},"credential_last_changed":{"type":3},"account_first_login":{"type":3},"account_last_login":{"type":3}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_162 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_163 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_164 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_165 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"windows_registry_key","namespace":"stix_observable.windows_registry_key","type":2,"role":4096,"properties":{"key":{"type":2,"is_primary":true},"values":{"type":5,"form":{"type":2}},"modified_time":{"type":3},"number_of_subkeys":{"type":0,"min":0}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_166 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_167 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_168 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_169 = '''","size":3},"border_radius":5,"horizontal_padding":20}},{"id":"x509_certificate","namespace":"stix_observable.x509_certificate","type":2,"role":4096,"properties":{"subject":{"type":2,"is_primary":true,"is_required":true},"is_self_signed":{"type":4,"options":{"type":5,"form":{"type":2},"value":[["true","True"],["false","False"]]}},"hashes":{"type":2},"version":{"type":2},"serial_number":{"type":2},"signature_algorithm":{"type":2},"issuer":{"type":2},"validity_not_before":{"type":3},"validity_not_after":{"type":3},"subject_public_key_algorithm":{"type":2},"subject_public_key_modulus":{"type":2},"subject_public_key_exponent":{"type":0,"min":0}},"anchor_template":"@__builtin__anchor","style":{"max_width":320,"head":{"fill_color":"#737373","stroke_color":"#8c8c8c","one_title":{"title":{"font":{"family":"Inter","size":"10.5pt","weight":800},"color":"#d8d8d8"}},"two_title":{"title":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#d8d8d8","padding":8},"subtitle":{"font":{"family":"Inter","size":"13pt","weight":800},"color":"#d8d8d8","line_height":23}},"vertical_padding":14},"body":{"fill_color":"'''
-    obj_flow_template_header_170 = var_obj_flow_objects_property_box_colour
-    obj_flow_template_header_171 = '''","stroke_color":"#383838","field_name":{"font":{"family":"Inter","size":"8pt","weight":600},"color":"#b3b3b3","padding":12},"field_value":{"font":{"family":"Inter","size":"10.5pt"},"color":"#bfbfbf","line_height":20,"padding":22},"vertical_padding":18},"select_outline":{"color":"#e6d845","padding":4,"border_radius":9},"anchor_markers":{"color":"'''
-    obj_flow_template_header_172 = var_obj_flow_objects_property_anchor_markers_colour
-    obj_flow_template_header_173 = '''","size":3},"border_radius":5,"horizontal_padding":20}}]},'''
-    obj_flow_template_header = obj_flow_template_header_0 + obj_flow_template_header_1 + obj_flow_template_header_2 + obj_flow_template_header_3 + obj_flow_template_header_4 + obj_flow_template_header_5 + obj_flow_template_header_6 + obj_flow_template_header_7 + obj_flow_template_header_8 + obj_flow_template_header_9 + obj_flow_template_header_10 + obj_flow_template_header_11 + obj_flow_template_header_12 + obj_flow_template_header_13 + obj_flow_template_header_14 + obj_flow_template_header_15 + obj_flow_template_header_16 + obj_flow_template_header_17 + obj_flow_template_header_18 + obj_flow_template_header_19 + obj_flow_template_header_20 + obj_flow_template_header_21 + obj_flow_template_header_22 + obj_flow_template_header_23 + obj_flow_template_header_24 + obj_flow_template_header_25 + obj_flow_template_header_26 + obj_flow_template_header_27 + obj_flow_template_header_28 + obj_flow_template_header_29 + obj_flow_template_header_30 + obj_flow_template_header_31 + obj_flow_template_header_32 + obj_flow_template_header_33 + obj_flow_template_header_34 + obj_flow_template_header_35 + obj_flow_template_header_36 + obj_flow_template_header_37 + obj_flow_template_header_38 + obj_flow_template_header_39 + obj_flow_template_header_40 + obj_flow_template_header_41 + obj_flow_template_header_42 + obj_flow_template_header_43 + obj_flow_template_header_44 + obj_flow_template_header_45 + obj_flow_template_header_46 + obj_flow_template_header_47 + obj_flow_template_header_48 + obj_flow_template_header_49 + obj_flow_template_header_50 + obj_flow_template_header_51 + obj_flow_template_header_52 + obj_flow_template_header_53 + obj_flow_template_header_54 + obj_flow_template_header_55 + obj_flow_template_header_56 + obj_flow_template_header_57 + obj_flow_template_header_58 + obj_flow_template_header_59 + obj_flow_template_header_60 + obj_flow_template_header_61 + obj_flow_template_header_62 + obj_flow_template_header_63 + obj_flow_template_header_64 + obj_flow_template_header_65 + obj_flow_template_header_66 + obj_flow_template_header_67 + obj_flow_template_header_68 + obj_flow_template_header_69 + obj_flow_template_header_70 + obj_flow_template_header_71 + obj_flow_template_header_72 + obj_flow_template_header_73 + obj_flow_template_header_74 + obj_flow_template_header_75 + obj_flow_template_header_76 + obj_flow_template_header_77 + obj_flow_template_header_78 + obj_flow_template_header_79 + obj_flow_template_header_80 + obj_flow_template_header_81 + obj_flow_template_header_82 + obj_flow_template_header_83 + obj_flow_template_header_84 + obj_flow_template_header_85 + obj_flow_template_header_86 + obj_flow_template_header_87 + obj_flow_template_header_88 + obj_flow_template_header_89 + obj_flow_template_header_90 + obj_flow_template_header_91 + obj_flow_template_header_92 + obj_flow_template_header_93 + obj_flow_template_header_94 + obj_flow_template_header_95 + obj_flow_template_header_96 + obj_flow_template_header_97 + obj_flow_template_header_98 + obj_flow_template_header_99 + obj_flow_template_header_100 + obj_flow_template_header_101 + obj_flow_template_header_102 + obj_flow_template_header_103 + obj_flow_template_header_104 + obj_flow_template_header_105 + obj_flow_template_header_106 + obj_flow_template_header_107 + obj_flow_template_header_108 + obj_flow_template_header_109 + obj_flow_template_header_110 + obj_flow_template_header_111 + obj_flow_template_header_112 + obj_flow_template_header_113 + obj_flow_template_header_114 + obj_flow_template_header_115 + obj_flow_template_header_116 + obj_flow_template_header_117 + obj_flow_template_header_118 + obj_flow_template_header_119 + obj_flow_template_header_120 + obj_flow_template_header_121 + obj_flow_template_header_122 + obj_flow_template_header_123 + obj_flow_template_header_124 + obj_flow_template_header_125 + obj_flow_template_header_126 + obj_flow_template_header_127 + obj_flow_template_header_128 + obj_flow_template_header_129 + obj_flow_template_header_130 + obj_flow_template_header_131 + obj_flow_template_header_132 + obj_flow_template_header_133 + obj_flow_template_header_134 + obj_flow_template_header_135 + obj_flow_template_header_136 + obj_flow_template_header_137 + obj_flow_template_header_138 + obj_flow_template_header_139 + obj_flow_template_header_140 + obj_flow_template_header_141 + obj_flow_template_header_142 + obj_flow_template_header_143 + obj_flow_template_header_144 + obj_flow_template_header_145 + obj_flow_template_header_146 + obj_flow_template_header_147 + obj_flow_template_header_148 + obj_flow_template_header_149 + obj_flow_template_header_150 + obj_flow_template_header_151 + obj_flow_template_header_152 + obj_flow_template_header_153 + obj_flow_template_header_154 + obj_flow_template_header_155 + obj_flow_template_header_156 + obj_flow_template_header_157 + obj_flow_template_header_158 + obj_flow_template_header_159 + obj_flow_template_header_160 + obj_flow_template_header_161 + obj_flow_template_header_162 + obj_flow_template_header_163 + obj_flow_template_header_164 + obj_flow_template_header_165 + obj_flow_template_header_166 + obj_flow_template_header_167 + obj_flow_template_header_168 + obj_flow_template_header_169 + obj_flow_template_header_170 + obj_flow_template_header_171 + obj_flow_template_header_172 + obj_flow_template_header_173
-    obj_flow_objects_actions_content = ""
-    obj_flow_action_child_definition = ""
-    obj_flow_action_child_header = ""
-    obj_flow_objects_actions_child_content = ""
-    flow_name_content = document_prefix_content
-    var_x_pos = -290
-    var_y_pos = -170
-    for technique in array_obj_sorted_construct:
-        obj_flow_action_child_header_GUID = technique['guid']
-        obj_list_flow_objects_action_child_GUID = []
-        for count in range(1, 13):
-            obj_action_child_GUID = str(uuid.uuid4())
-            obj_list_flow_objects_action_child_GUID.append(obj_action_child_GUID)
-        attack_flow_action_child_GUID_group = '","'.join(str(guid) for guid in obj_list_flow_objects_action_child_GUID)
-        obj_flow_action_child_header = f'''{{"id":"{obj_flow_action_child_header_GUID}","x":{var_x_pos},"y":{var_y_pos},"attrs":256,"template":"action","children":["{attack_flow_action_child_GUID_group}"],"properties":[["name","{technique["attack_name"]}"],["tactic_id",null],["tactic_ref","{technique["attack_tactics"][0]}"],["technique_id","{technique["attack_id"]}"],["technique_ref",null],["description","DESCRIPTION_PLACEHOLDER"],["confidence","62814720b26c68ab20bbb6669a1ec919"],["execution_start",null],["execution_end",null]]}},'''
-        obj_flow_action_child_definition = f'''{{"id":"{obj_list_flow_objects_action_child_GUID[0]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":1}},{{"id":"{obj_list_flow_objects_action_child_GUID[1]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":1}},{{"id":"{obj_list_flow_objects_action_child_GUID[2]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":1}},{{"id":"{obj_list_flow_objects_action_child_GUID[3]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":0}},{{"id":"{obj_list_flow_objects_action_child_GUID[4]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":0}},{{"id":"{obj_list_flow_objects_action_child_GUID[5]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":0}},{{"id":"{obj_list_flow_objects_action_child_GUID[6]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":1}},{{"id":"{obj_list_flow_objects_action_child_GUID[7]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":1}},{{"id":"{obj_list_flow_objects_action_child_GUID[8]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":1}},{{"id":"{obj_list_flow_objects_action_child_GUID[9]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":0}},{{"id":"{obj_list_flow_objects_action_child_GUID[10]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":0}},{{"id":"{obj_list_flow_objects_action_child_GUID[11]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":0}}'''
-        obj_flow_objects_actions_child_content = obj_flow_action_child_header + obj_flow_action_child_definition
-        obj_flow_objects_actions_content += obj_flow_objects_actions_child_content
-        var_x_pos += 100
-        var_y_pos += 50
-    current_time = str(current_time)
-    obj_flow_objects_actions_content = obj_flow_objects_actions_content.replace("}{","},{")
-    obj_array_assets = []
-    obj_list_assets = []
-    if ctid_assets is None:
-        obj_list_assets = input("Give a single or a semicolon separated list of asset names to generate (for example: SYSTEM01;SRV-EXCH-01;Obsolete Device). Simply press enter if no assets need to be defined: ")
-        if not obj_list_assets:
-            pass
-        else:
-            obj_list_assets = obj_list_assets.split(';')
-    else:
-        obj_list_assets = ctid_assets.split(";")
-    obj_array_assets = [{'asset': asset_name} for asset_name in obj_list_assets]
-    asset_flow_object_child_GUID_list = []
-    for asset in obj_array_assets:
-        asset_guid = str(uuid.uuid4())
-        asset_flow_object_child_GUID_list.append(asset_guid)
-    obj_flow_objects_asset_content = ""
-    asset_flow_action_children_definition = ""
-    asset_flow_action_children_header = ""
-    asset_flow_action_complete = ""
-    var_x_pos = 100
-    var_y_pos = -300
-    range_techniques = range(len(obj_array_assets))
-    for technique in range_techniques:
-        obj_list_flow_objects_asset_child_GUID = []
-        for count in range(1, 13):
-            obj_action_child_GUID = str(uuid.uuid4())
-            obj_list_flow_objects_asset_child_GUID.append(str(obj_action_child_GUID))
-        asset_flow_action_child_GUID_group = '","'.join(obj_list_flow_objects_asset_child_GUID)
-        asset_flow_action_children_header = f'{{"id":"{asset_flow_object_child_GUID_list[technique]}","x":{var_x_pos},"y":{var_y_pos},"attrs":256,"template":"asset","children":["{asset_flow_action_child_GUID_group}"],"properties":[["name","{obj_array_assets[technique]["asset"]}"],["description","DESCRIPTION_PLACEHOLDER"]]}},'
-        asset_flow_action_children_definition = f'''{{"id":"{obj_list_flow_objects_asset_child_GUID[0]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":1}},{{"id":"{obj_list_flow_objects_asset_child_GUID[1]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":1}},{{"id":"{obj_list_flow_objects_asset_child_GUID[2]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":1}},{{"id":"{obj_list_flow_objects_asset_child_GUID[3]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":0}},{{"id":"{obj_list_flow_objects_asset_child_GUID[4]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":0}},{{"id":"{obj_list_flow_objects_asset_child_GUID[5]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":0}},{{"id":"{obj_list_flow_objects_asset_child_GUID[6]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":1}},{{"id":"{obj_list_flow_objects_asset_child_GUID[7]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":1}},{{"id":"{obj_list_flow_objects_asset_child_GUID[8]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":1}},{{"id":"{obj_list_flow_objects_asset_child_GUID[9]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":0}},{{"id":"{obj_list_flow_objects_asset_child_GUID[10]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":0}},{{"id":"{obj_list_flow_objects_asset_child_GUID[11]}","x":0,"y":0,"attrs":0,"template":"@__builtin__anchor","children":[],"properties":[],"angle":0}}'''
-        asset_flow_action_complete = asset_flow_action_children_header + asset_flow_action_children_definition
-        obj_flow_objects_asset_content += asset_flow_action_complete
-        var_x_pos = var_x_pos + 100
-        var_y_pos = var_y_pos + 50
-    obj_flow_objects_asset_content = obj_flow_objects_asset_content.replace("}{","},{")
-    if len(obj_array_assets) == 0:
-        obj_list_flow_property_GUID = '","'.join([attack['guid'] for attack in array_obj_sorted_construct])
-    else:
-        obj_list_flow_property_GUID = '","'.join([attack['guid'] for attack in array_obj_sorted_construct] + asset_flow_object_child_GUID_list)
-    obj_flow_objects_header_0 = '''"objects":[{"id":"'''
-    obj_flow_objects_header_1 = var_obj_flow_property_GUID
-    obj_flow_objects_header_2 = '''","x":-290,"y":-170,"attrs":0,"template":"flow","children":["'''
-    obj_flow_objects_header_3 = obj_list_flow_property_GUID
-    obj_flow_objects_header_4 = '''"],"properties":[["name","'''
-    obj_flow_objects_header_5 = flow_name_content
-    obj_flow_objects_header_6 = '''"],["description",null],["author",[["name","CPIRT"],["identity_class","db0f6f37ebeb6ea09489124345af2a45"],["contact_information","emergency-response@checkpoint.com"]]],["scope","3e072748feb6ecd1b1ba397704e009c0"],["external_references",[]],["created","'''
-    obj_flow_objects_header_7 = current_time
-    obj_flow_objects_header_8 = '''"]]},'''
-    obj_flow_objects_header = obj_flow_objects_header_0 + obj_flow_objects_header_1 + obj_flow_objects_header_2 + obj_flow_objects_header_3 + obj_flow_objects_header_4 + obj_flow_objects_header_5 + obj_flow_objects_header_6 + obj_flow_objects_header_7 + obj_flow_objects_header_8
-    obj_flow_template_footer = '''],"location":{"x":-0.5,"y":-0.5,"k":1}}'''
-    if len(obj_array_assets) == 0:
-        obj_flow = obj_flow_template_header + obj_flow_objects_header + obj_flow_objects_actions_content + obj_flow_template_footer
-    else:
-        obj_flow = obj_flow_template_header + obj_flow_objects_header + obj_flow_objects_actions_content + "," + obj_flow_objects_asset_content + obj_flow_template_footer
-    with open(file_afb_ctid_flow, "w") as file_flow:
-        file_flow.write(obj_flow)
-
-def get_document_prefix(prefix):
-    if not prefix:
-        document_prefix_content = input("Provide the prefix of the generated documents. This could be the case number or name. This will also be used to name the Navigator Layer and CTID Flow. Simply press enter if none is required.")
-        if document_prefix_content:
-            document_prefix = (document_prefix_content.lower()).replace(" ","_") + "_"
+    @attackstage
+    def new_ctidattackflow(self, ctid_assets=None):
+        file_afb_ctid_flow = os.path.join(self.get_case_path(), self.document_prefix + "ctid_attack_flow.afb")
+        var_obj_flow_property_GUID = str(uuid.uuid4())
+        now = datetime.now(timezone.utc)
+        current_time = now.strftime('%Y-%m-%dT%H:%M:%S') + 'Z'
+        flow_name_content = self.document_prefix_content
+        obj_list_assets = []
+        if ctid_assets is None:
+            obj_list_assets = input("Give a single or a semicolon separated list of asset names to generate (for example: SYSTEM01;SRV-EXCH-01;Obsolete Device). Simply press enter if no assets need to be defined: ")
+            if not obj_list_assets:
+                obj_list_assets = []
+            else:
+                obj_list_assets = obj_list_assets.split(';')
         else:
+            obj_list_assets = [asset_name for asset_name in ctid_assets.split(";") if asset_name]
+        # An incremental case reuses the actions of its previous run
+        dict_obj_stored_actions = dict(self.get_case_state()["fragments"].get("ctid_attack_flow", {})) if self.incremental else None
+        # The objects are serialised one at a time straight into the file, the flow is never assembled in memory
+        with open(file_afb_ctid_flow, "w", encoding="utf-8") as file_flow:
+            file_flow.write('{"version":"2.0.1","id":' + json.dumps(var_obj_flow_property_GUID) + ',"schema":' + get_attackflow_schema() + ',"objects":[')
+            for index, flow_object in enumerate(get_attackflow_objects(var_obj_flow_property_GUID, flow_name_content, current_time, self.array_obj_sorted_construct, obj_list_assets, dict_obj_stored_actions)):
+                if index:
+                    file_flow.write(",")
+                file_flow.write(flow_object)
+            file_flow.write('],"location":{"x":-0.5,"y":-0.5,"k":1}}')
+        if self.incremental:
+            # Only the actions of the (Sub-)Techniques of the case are kept, the ones of removed (Sub-)Techniques are dropped
+            self.get_case_state()["fragments"]["ctid_attack_flow"] = {get_attackflow_action_key(technique): dict_obj_stored_actions[get_attackflow_action_key(technique)] for technique in self.array_obj_sorted_construct}
+            self.set_case_state()
+
+    def get_document_prefix(self, prefix,interactive=True):
+        if not prefix and not interactive:
             document_prefix_content = "Untitled"
             document_prefix = ""
-    else:
-        document_prefix_content = prefix
-        document_prefix = (prefix.lower()).replace(" ","_") + "_"
-    globals()["document_prefix_content"] = document_prefix_content
-    globals()["document_prefix"] = document_prefix
-
-def new_attackrecommendations(prefix=None,ciscontrols=True,nistcontrols=False):
-    get_document_prefix(prefix)
-    new_attackdocintroduction()
-    new_attackdocmitigations(ciscontrols,nistcontrols)
-    new_attackdocdetections()
-    new_attackdocvalidations()
-
-def new_attacksighting():
-    sightings_id = str(uuid.uuid4())
-    file_sighting_json = sightings_id + "_sighting.json"
-    file_sighting_json = os.path.join(case_path, file_sighting_json)
-    file_json_sighting_template = os.path.join(template_path, "sightings_template.json")
-    sighting_version = "2.0"
-    detection_type = "human_validated"
-    sightings_techniques_array = []
-    sightings_techniques_array = [attack['attack_id'] for attack in array_obj_sorted_construct]
-    format = "%Y-%m-%dT%H:%M:%SZ"
-    while True:
-        sighting_start = input("\u2139 Please provide the start time for the sightings.\n\u2328 Please use RFC 3339 timestamps in UTC time [2022-12-22T12:03:23Z]: ")
-        try:
-            parseddate = datetime.strptime(sighting_start, format)
-            break
-        except ValueError:
-            print("\u26A0 Invalid input. Try again.")
-    naics_list = {11: "Agriculture, Forestry, Fishing and Hunting",
-                 21: "Mining, Quarrying, and Oil and Gas Extraction",
-                 22: "Utilities",
-                 23: "Construction",
-                 31: "Manufacturing",
-                 32: "Manufacturing",
-                 33: "Manufacturing",
-                 42: "Wholesale Trade",
-                 44: "Retail Trade",
-                 45: "Retail Trade",
-                 48: "Transportation and Warehousing",
-                 49: "Transportation and Warehousing",
-                 51: "Information",
-                 52: "Finance and Insurance",
-                 53: "Real Estate and Rental and Leasing",
-                 54: "Professional, Scientific, and Technical Services",
-                 55: "Management of Companies and Enterprises",
-                 56: "Administrative and Support and Waste Management and Remediation Services",
-                 61: "Educational Services",
-                 62: "Health Care and Social Assistance",
-                 71: "Arts, Entertainment, and Recreation",
-                 72: "Accommodation and Food Services",
-                 81: "Other Services (except Public Administration)",
-                 92: "Public Administration"}
-    while True:
-        victim_sector = input("\u2328 Provide the victim sector NAICS code, first 2 digits only [eg 22]. Tap Enter to present the list: ")
-        try:
-            if int(victim_sector) not in naics_list.keys():
-                raise ValueError
+        elif not prefix:
+            document_prefix_content = input("Provide the prefix of the generated documents. This could be the case number or name. This will also be used to name the Navigator Layer and CTID Flow. Simply press enter if none is required.")
+            if document_prefix_content:
+                document_prefix = (document_prefix_content.lower()).replace(" ","_") + "_"
             else:
-                victim_sector_name = naics_list[int(victim_sector)]
-                print("\u2705 You selected the following sector:", victim_sector_name)
-                break
-        except ValueError as error:
-            print("\u26A0", victim_sector, "is not in the NAICS list. Verify your input please.")
-            naics_table = sorted(naics_list.items())
-            print("Refer to the following list:")
-            for sector, name in naics_table:
-                print(sector, "-", name)
-    iso_country_list = {"AF": "The Islamic Republic of Afghanistan","AX": "Åland","AL": "The Republic of Albania","DZ": "The People's Democratic Republic of Algeria","AS": "The Territory of American Samoa","AD": "The Principality of Andorra","AO": "The Republic of Angola","AI": "Anguilla","AQ": "All land and ice shelves south of the 60th parallel south","AG": "Antigua and Barbuda","AR": "The Argentine Republic","AM": "The Republic of Armenia","AW": "Aruba","AU": "The Commonwealth of Australia","AT": "The Republic of Austria","AZ": "The Republic of Azerbaijan","BS": "The Commonwealth of The Bahamas","BH": "The Kingdom of Bahrain","BD": "The People's Republic of Bangladesh","BB": "Barbados","BY": "The Republic of Belarus","BE": "The Kingdom of Belgium","BZ": "Belize","BJ": "The Republic of Benin","BM": "Bermuda","BT": "The Kingdom of Bhutan","BO": "The Plurinational State of Bolivia","BQ": "Bonaire, Sint Eustatius and Saba","BA": "Bosnia and Herzegovina","BW": "The Republic of Botswana","BV": "Bouvet Island","BR": "The Federative Republic of Brazil","IO": "The British Indian Ocean Territory","BN": "The Nation of Brunei, the Abode of Peace","BG": "The Republic of Bulgaria","BF": "Burkina Faso","BI": "The Republic of Burundi","CV": "The Republic of Cabo Verde","KH": "The Kingdom of Cambodia","CM": "The Republic of Cameroon","CA": "Canada","KY": "The Cayman Islands","CF": "The Central African Republic","TD": "The Republic of Chad","CL": "The Republic of Chile","CN": "The People's Republic of China","CX": "The Territory of Christmas Island","CC": "The Territory of Cocos (Keeling) Islands","CO": "The Republic of Colombia","KM": "The Union of the Comoros","CD": "The Democratic Republic of the Congo","CG": "The Republic of the Congo","CK": "The Cook Islands","CR": "The Republic of Costa Rica","CI": "The Republic of Côte d'Ivoire","HR": "The Republic of Croatia","CU": "The Republic of Cuba","CW": "The Country of Curaçao","CY": "The Republic of Cyprus","CZ": "The Czech Republic","DK": "The Kingdom of Denmark","DJ": "The Republic of Djibouti","DM": "The Commonwealth of Dominica","DO": "The Dominican Republic","EC": "The Republic of Ecuador","EG": "The Arab Republic of Egypt","SV": "The Republic of El Salvador","GQ": "The Republic of Equatorial Guinea","ER": "The State of Eritrea","EE": "The Republic of Estonia","SZ": "The Kingdom of Eswatini","ET": "The Federal Democratic Republic of Ethiopia","FK": "The Falkland Islands","FO": "The Faroe Islands","FJ": "The Republic of Fiji","FI": "The Republic of Finland","FR": "The French Republic","GF": "Guyane","PF": "French Polynesia","TF": "The French Southern and Antarctic Lands","GA": "The Gabonese Republic","GM": "The Republic of The Gambia","GE": "Georgia","DE": "The Federal Republic of Germany","GH": "The Republic of Ghana","GI": "Gibraltar","GR": "The Hellenic Republic","GL": "Kalaallit Nunaat","GD": "Grenada","GP": "Guadeloupe","GU": "The Territory of Guam","GT": "The Republic of Guatemala","GG": "The Bailiwick of Guernsey","GN": "The Republic of Guinea","GW": "The Republic of Guinea-Bissau","GY": "The Co-operative Republic of Guyana","HT": "The Republic of Haiti","HM": "The Territory of Heard Island and McDonald Islands","VA": "The Holy See","HN": "The Republic of Honduras","HK": "The Hong Kong Special Administrative Region of China[10]","HU": "Hungary","IS": "Iceland","IN": "The Republic of India","ID": "The Republic of Indonesia","IR": "The Islamic Republic of Iran","IQ": "The Republic of Iraq","IE": "Ireland","IM": "The Isle of Man","IL": "The State of Israel","IT": "The Italian Republic","JM": "Jamaica","JP": "Japan","JE": "The Bailiwick of Jersey","JO": "The Hashemite Kingdom of Jordan","KZ": "The Republic of Kazakhstan","KE": "The Republic of Kenya","KI": "The Republic of Kiribati","KP": "The Democratic People's Republic of Korea","KR": "The Republic of Korea","KW": "The State of Kuwait","KG": "The Kyrgyz Republic","LA": "The Lao People's Democratic Republic","LV": "The Republic of Latvia","LB": "The Lebanese Republic","LS": "The Kingdom of Lesotho","LR": "The Republic of Liberia","LY": "The State of Libya","LI": "The Principality of Liechtenstein","LT": "The Republic of Lithuania","LU": "The Grand Duchy of Luxembourg","MO": "The Macao Special Administrative Region of China[11]","MK": "The Republic of North Macedonia[12]","MG": "The Republic of Madagascar","MW": "The Republic of Malawi","MY": "Malaysia","MV": "The Republic of Maldives","ML": "The Republic of Mali","MT": "The Republic of Malta","MH": "The Republic of the Marshall Islands","MQ": "Martinique","MR": "The Islamic Republic of Mauritania","MU": "The Republic of Mauritius","YT": "The Department of Mayotte","MX": "The United Mexican States","FM": "The Federated States of Micronesia","MD": "The Republic of Moldova","MC": "The Principality of Monaco","MN": "Mongolia","ME": "Montenegro","MS": "Montserrat","MA": "The Kingdom of Morocco","MZ": "The Republic of Mozambique","MM": "The Republic of the Union of Myanmar","NA": "The Republic of Namibia","NR": "The Republic of Nauru","NP": "The Federal Democratic Republic of Nepal","NL": "The Kingdom of the Netherlands","NC": "New Caledonia","NZ": "New Zealand","NI": "The Republic of Nicaragua","NE": "The Republic of the Niger","NG": "The Federal Republic of Nigeria","NU": "Niue","NF": "The Territory of Norfolk Island","MP": "The Commonwealth of the Northern Mariana Islands","NO": "The Kingdom of Norway","OM": "The Sultanate of Oman","PK": "The Islamic Republic of Pakistan","PW": "The Republic of Palau","PS": "The State of Palestine","PA": "The Republic of Panamá","PG": "The Independent State of Papua New Guinea","PY": "The Republic of Paraguay","PE": "The Republic of Perú","PH": "The Republic of the Philippines","PN": "The Pitcairn, Henderson, Ducie and Oeno Islands","PL": "The Republic of Poland","PT": "The Portuguese Republic","PR": "The Commonwealth of Puerto Rico","QA": "The State of Qatar","RE": "Réunion","RO": "Romania","RU": "The Russian Federation","RW": "The Republic of Rwanda","BL": "The Collectivity of Saint-Barthélemy","SH": "Saint Helena, Ascension and Tristan da Cunha","KN": "Saint Kitts and Nevis","LC": "Saint Lucia","MF": "The Collectivity of Saint-Martin","PM": "The Overseas Collectivity of Saint-Pierre and Miquelon","VC": "Saint Vincent and the Grenadines","WS": "The Independent State of Samoa","SM": "The Republic of San Marino","ST": "The Democratic Republic of São Tomé and Príncipe","SA": "The Kingdom of Saudi Arabia","SN": "The Republic of Senegal","RS": "The Republic of Serbia","SC": "The Republic of Seychelles","SL": "The Republic of Sierra Leone","SG": "The Republic of Singapore","SX": "Sint Maarten","SK": "The Slovak Republic","SI": "The Republic of Slovenia","SB": "The Solomon Islands","SO": "The Federal Republic of Somalia","ZA": "The Republic of South Africa","GS": "South Georgia and the South Sandwich Islands","SS": "The Republic of South Sudan","ES": "The Kingdom of Spain","LK": "The Democratic Socialist Republic of Sri Lanka","SD": "The Republic of the Sudan","SR": "The Republic of Suriname","SJ": "Svalbard and Jan Mayen","SE": "The Kingdom of Sweden","CH": "The Swiss Confederation","SY": "The Syrian Arab Republic","TW": "The Republic of China","TJ": "The Republic of Tajikistan","TZ": "The United Republic of Tanzania","TH": "The Kingdom of Thailand","TL": "The Democratic Republic of Timor-Leste","TG": "The Togolese Republic","TK": "Tokelau","TO": "The Kingdom of Tonga","TT": "The Republic of Trinidad and Tobago","TN": "The Republic of Tunisia","TR": "The Republic of Türkiye","TM": "Turkmenistan","TC": "The Turks and Caicos Islands","TV": "Tuvalu","UG": "The Republic of Uganda","UA": "Ukraine","AE": "The United Arab Emirates","GB": "The United Kingdom of Great Britain and Northern Ireland","UM": "Baker Island, Howland Island, Jarvis Island, Johnston Atoll, Kingman Reef, Midway Atoll, Navassa Island, Palmyra Atoll, and Wake Island","US": "The United States of America","UY": "The Oriental Republic of Uruguay","UZ": "The Republic of Uzbekistan","VU": "The Republic of Vanuatu","VE": "The Bolivarian Republic of Venezuela","VN": "The Socialist Republic of Viet Nam","VG": "The Virgin Islands","VI": "The Virgin Islands of the United States","WF": "The Territory of the Wallis and Futuna Islands","EH": "The Sahrawi Arab Democratic Republic","YE": "The Republic of Yemen","ZM": "The Republic of Zambia","ZW": "The Republic of Zimbabwe"}
-    while True:
-        victim_country = input("\u2328 Provide the victim ISO 3166-1 alpha-2 country code [eg BE]: ")
-        victim_country = victim_country.upper()
-        try:
-            if (victim_country) not in iso_country_list.keys():
-                raise ValueError
+                document_prefix_content = "Untitled"
+                document_prefix = ""
+        else:
+            document_prefix_content = prefix
+            document_prefix = (prefix.lower()).replace(" ","_") + "_"
+        self.document_prefix_content = document_prefix_content
+        self.document_prefix = document_prefix
+
+    @attackstage
+    def new_attackrecommendations(self, prefix=None,ciscontrols=True,nistcontrols=False,interactive=True,parallel=False,incremental=False):
+        self.get_document_prefix(prefix,interactive)
+        self.incremental = incremental
+        self.list_unchanged_artifacts = []
+        list_document_names = ["introduction", "mitigations", "detections", "validations"]
+        dict_document_timings = {}
+        if not parallel:
+            time_start = time.perf_counter()
+            self.new_attackdocintroduction()
+            dict_document_timings["introduction"] = time.perf_counter() - time_start
+            time_start = time.perf_counter()
+            self.new_attackdocmitigations(ciscontrols,nistcontrols,interactive)
+            dict_document_timings["mitigations"] = time.perf_counter() - time_start
+            time_start = time.perf_counter()
+            self.new_attackdocdetections()
+            dict_document_timings["detections"] = time.perf_counter() - time_start
+            time_start = time.perf_counter()
+            self.new_attackdocvalidations()
+            dict_document_timings["validations"] = time.perf_counter() - time_start
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            # The constructs are computed once, the workers only render the documents
+            self.new_attackmitigationsconstruct()
+            self.get_attackmitigationsmappings(ciscontrols,nistcontrols,interactive)
+            self.new_attackdetectionsconstruct()
+            obj_case_state = {
+                "case_directory": self.case_directory,
+                "case_path": self.get_case_path(),
+                "attack_version": self.attack_version,
+                "document_prefix": self.document_prefix,
+                "document_prefix_content": self.document_prefix_content,
+                "list_obj_selected_attack_techniques": self.list_obj_selected_attack_techniques,
+                "array_obj_sorted_construct": self.array_obj_sorted_construct,
+                "attack_tactic_ranks": self.attack_tactic_ranks,
+                "array_obj_sorted_mitigations": self.array_obj_sorted_mitigations,
+                "array_obj_complete_cis_controls_prio_sorted": self.array_obj_complete_cis_controls_prio_sorted,
+                "switch_control_mapping_selection": self.switch_control_mapping_selection,
+                "array_obj_condensed_detections": self.array_obj_condensed_detections
+            }
+            # The artifacts of an incremental case are verified here, the workers only render the changed documents
+            dict_document_digests = {document_name: self.get_case_artifact(document_name) for document_name in list_document_names}
+            for document_name in self.list_unchanged_artifacts:
+                dict_document_timings[document_name] = 0
+            with ProcessPoolExecutor(max_workers=len(list_document_names), initializer=set_attackrecommendations_worker) as executor:
+                dict_document_futures = {document_name: executor.submit(new_attackrecommendationsdocument, document_name, obj_case_state) for document_name in list_document_names if dict_document_digests[document_name] is not None}
+                for document_name, future in dict_document_futures.items():
+                    dict_document_timings[document_name], array_obj_document_stages = future.result()
+                    self.set_case_artifact(document_name, dict_document_digests[document_name])
+                    for obj_stage in array_obj_document_stages:
+                        if obj_stage["depth"] == 0:
+                            obj_stage["parent"] = "new_attackrecommendations"
+                            for key in list_run_count_keys:
+                                get_run_thread_counts()[key] += obj_stage["counts"][key]
+                        obj_stage["depth"] += 1
+                    with lock_run_stages:
+                        self.array_obj_run_stages.extend(array_obj_document_stages)
+        for document_name in list_document_names:
+            if document_name in self.list_unchanged_artifacts:
+                print("\u2139 " + self.document_prefix + document_name + ".docx is unchanged and is kept.")
             else:
-                victim_country_name = iso_country_list[(victim_country)]
-                print("\u2705 You selected the following country:", victim_country_name)
+                print("\u23F1 " + self.document_prefix + document_name + ".docx generated in " + str(round(dict_document_timings[document_name], 3)) + "s")
+        self.dict_document_timings = dict_document_timings
+
+    @attackstage
+    def new_attacksighting(self, sighting_start=None, victim_sector=None, victim_country=None, detection_source=None, victim_platform_env=None, victim_privilegelevel=None, sighting_software=None):
+        sightings_id = str(uuid.uuid4())
+        file_sighting_json = sightings_id + "_sighting.json"
+        file_sighting_json = os.path.join(self.get_case_path(), file_sighting_json)
+        file_json_sighting_template = os.path.join(template_path, "sightings_template.json")
+        sighting_version = "2.0"
+        detection_type = "human_validated"
+        sightings_techniques_array = []
+        sightings_techniques_array = [attack['attack_id'] for attack in self.array_obj_sorted_construct]
+        format = "%Y-%m-%dT%H:%M:%SZ"
+        while True:
+            if sighting_start is None:
+                sighting_start = input("\u2139 Please provide the start time for the sightings.\n\u2328 Please use RFC 3339 timestamps in UTC time [2022-12-22T12:03:23Z]: ")
+            try:
+                parseddate = datetime.strptime(sighting_start, format)
                 break
-        except ValueError as error:
-            print("\u26A0", victim_country, "is not in the ISO Country list. Verify your input please.")
-    detection_list = ["host_based", "network_based", "cloud_based"]
-    while True:
-        detection_source = input("\u2328 Define the detection source [host_based, network_based, cloud_based]: ")
-        detection_source = detection_source.lower()
-        try:
-            index = detection_list.index(detection_source)
-            break
-        except:
-            print("\u26A0", detection_source, "is not in the list. Verify your input please.")
-    platform_list = ["windows","macos","nix","other"]
-    while True:
-        victim_platform_env = input("\u2328 Define the platform [windows, macos, nix, other]: ")
-        victim_platform_env = victim_platform_env.lower()
-        try:
-            index = platform_list.index(victim_platform_env)
-            break
-        except ValueError:
-            print("\u26A0", victim_platform_env, "is not in the list. Verify your input please.")
-    privilege_list = ["system","admin","user","none"]
-    while True:
-        victim_privilegelevel = input("\u2328 Provide the privilege level [system, admin, user, none]: ")
-        victim_privilegelevel = victim_privilegelevel.lower()
+            except ValueError:
+                print("\u26A0 Invalid input. Try again.")
+                sighting_start = None
+        naics_list = {11: "Agriculture, Forestry, Fishing and Hunting",
+                     21: "Mining, Quarrying, and Oil and Gas Extraction",
+                     22: "Utilities",
+                     23: "Construction",
+                     31: "Manufacturing",
+                     32: "Manufacturing",
+                     33: "Manufacturing",
+                     42: "Wholesale Trade",
+                     44: "Retail Trade",
+                     45: "Retail Trade",
+                     48: "Transportation and Warehousing",
+                     49: "Transportation and Warehousing",
+                     51: "Information",
+                     52: "Finance and Insurance",
+                     53: "Real Estate and Rental and Leasing",
+                     54: "Professional, Scientific, and Technical Services",
+                     55: "Management of Companies and Enterprises",
+                     56: "Administrative and Support and Waste Management and Remediation Services",
+                     61: "Educational Services",
+                     62: "Health Care and Social Assistance",
+                     71: "Arts, Entertainment, and Recreation",
+                     72: "Accommodation and Food Services",
+                     81: "Other Services (except Public Administration)",
+                     92: "Public Administration"}
+        while True:
+            if victim_sector is None:
+                victim_sector = input("\u2328 Provide the victim sector NAICS code, first 2 digits only [eg 22]. Tap Enter to present the list: ")
+            victim_sector = str(victim_sector)
+            try:
+                if int(victim_sector) not in naics_list.keys():
+                    raise ValueError
+                else:
+                    victim_sector_name = naics_list[int(victim_sector)]
+                    print("\u2705 You selected the following sector:", victim_sector_name)
+                    break
+            except ValueError as error:
+                print("\u26A0", victim_sector, "is not in the NAICS list. Verify your input please.")
+                naics_table = sorted(naics_list.items())
+                print("Refer to the following list:")
+                for sector, name in naics_table:
+                    print(sector, "-", name)
+                victim_sector = None
+        iso_country_list = {"AF": "The Islamic Republic of Afghanistan","AX": "Åland","AL": "The Republic of Albania","DZ": "The People's Democratic Republic of Algeria","AS": "The Territory of American Samoa","AD": "The Principality of Andorra","AO": "The Republic of Angola","AI": "Anguilla","AQ": "All land and ice shelves south of the 60th parallel south","AG": "Antigua and Barbuda","AR": "The Argentine Republic","AM": "The Republic of Armenia","AW": "Aruba","AU": "The Commonwealth of Australia","AT": "The Republic of Austria","AZ": "The Republic of Azerbaijan","BS": "The Commonwealth of The Bahamas","BH": "The Kingdom of Bahrain","BD": "The People's Republic of Bangladesh","BB": "Barbados","BY": "The Republic of Belarus","BE": "The Kingdom of Belgium","BZ": "Belize","BJ": "The Republic of Benin","BM": "Bermuda","BT": "The Kingdom of Bhutan","BO": "The Plurinational State of Bolivia","BQ": "Bonaire, Sint Eustatius and Saba","BA": "Bosnia and Herzegovina","BW": "The Republic of Botswana","BV": "Bouvet Island","BR": "The Federative Republic of Brazil","IO": "The British Indian Ocean Territory","BN": "The Nation of Brunei, the Abode of Peace","BG": "The Republic of Bulgaria","BF": "Burkina Faso","BI": "The Republic of Burundi","CV": "The Republic of Cabo Verde","KH": "The Kingdom of Cambodia","CM": "The Republic of Cameroon","CA": "Canada","KY": "The Cayman Islands","CF": "The Central African Republic","TD": "The Republic of Chad","CL": "The Republic of Chile","CN": "The People's Republic of China","CX": "The Territory of Christmas Island","CC": "The Territory of Cocos (Keeling) Islands","CO": "The Republic of Colombia","KM": "The Union of the Comoros","CD": "The Democratic Republic of the Congo","CG": "The Republic of the Congo","CK": "The Cook Islands","CR": "The Republic of Costa Rica","CI": "The Republic of Côte d'Ivoire","HR": "The Republic of Croatia","CU": "The Republic of Cuba","CW": "The Country of Curaçao","CY": "The Republic of Cyprus","CZ": "The Czech Republic","DK": "The Kingdom of Denmark","DJ": "The Republic of Djibouti","DM": "The Commonwealth of Dominica","DO": "The Dominican Republic","EC": "The Republic of Ecuador","EG": "The Arab Republic of Egypt","SV": "The Republic of El Salvador","GQ": "The Republic of Equatorial Guinea","ER": "The State of Eritrea","EE": "The Republic of Estonia","SZ": "The Kingdom of Eswatini","ET": "The Federal Democratic Republic of Ethiopia","FK": "The Falkland Islands","FO": "The Faroe Islands","FJ": "The Republic of Fiji","FI": "The Republic of Finland","FR": "The French Republic","GF": "Guyane","PF": "French Polynesia","TF": "The French Southern and Antarctic Lands","GA": "The Gabonese Republic","GM": "The Republic of The Gambia","GE": "Georgia","DE": "The Federal Republic of Germany","GH": "The Republic of Ghana","GI": "Gibraltar","GR": "The Hellenic Republic","GL": "Kalaallit Nunaat","GD": "Grenada","GP": "Guadeloupe","GU": "The Territory of Guam","GT": "The Republic of Guatemala","GG": "The Bailiwick of Guernsey","GN": "The Republic of Guinea","GW": "The Republic of Guinea-Bissau","GY": "The Co-operative Republic of Guyana","HT": "The Republic of Haiti","HM": "The Territory of Heard Island and McDonald Islands","VA": "The Holy See","HN": "The Republic of Honduras","HK": "The Hong Kong Special Administrative Region of China[10]","HU": "Hungary","IS": "Iceland","IN": "The Republic of India","ID": "The Republic of Indonesia","IR": "The Islamic Republic of Iran","IQ": "The Republic of Iraq","IE": "Ireland","IM": "The Isle of Man","IL": "The State of Israel","IT": "The Italian Republic","JM": "Jamaica","JP": "Japan","JE": "The Bailiwick of Jersey","JO": "The Hashemite Kingdom of Jordan","KZ": "The Republic of Kazakhstan","KE": "The Republic of Kenya","KI": "The Republic of Kiribati","KP": "The Democratic People's Republic of Korea","KR": "The Republic of Korea","KW": "The State of Kuwait","KG": "The Kyrgyz Republic","LA": "The Lao People's Democratic Republic","LV": "The Republic of Latvia","LB": "The Lebanese Republic","LS": "The Kingdom of Lesotho","LR": "The Republic of Liberia","LY": "The State of Libya","LI": "The Principality of Liechtenstein","LT": "The Republic of Lithuania","LU": "The Grand Duchy of Luxembourg","MO": "The Macao Special Administrative Region of China[11]","MK": "The Republic of North Macedonia[12]","MG": "The Republic of Madagascar","MW": "The Republic of Malawi","MY": "Malaysia","MV": "The Republic of Maldives","ML": "The Republic of Mali","MT": "The Republic of Malta","MH": "The Republic of the Marshall Islands","MQ": "Martinique","MR": "The Islamic Republic of Mauritania","MU": "The Republic of Mauritius","YT": "The Department of Mayotte","MX": "The United Mexican States","FM": "The Federated States of Micronesia","MD": "The Republic of Moldova","MC": "The Principality of Monaco","MN": "Mongolia","ME": "Montenegro","MS": "Montserrat","MA": "The Kingdom of Morocco","MZ": "The Republic of Mozambique","MM": "The Republic of the Union of Myanmar","NA": "The Republic of Namibia","NR": "The Republic of Nauru","NP": "The Federal Democratic Republic of Nepal","NL": "The Kingdom of the Netherlands","NC": "New Caledonia","NZ": "New Zealand","NI": "The Republic of Nicaragua","NE": "The Republic of the Niger","NG": "The Federal Republic of Nigeria","NU": "Niue","NF": "The Territory of Norfolk Island","MP": "The Commonwealth of the Northern Mariana Islands","NO": "The Kingdom of Norway","OM": "The Sultanate of Oman","PK": "The Islamic Republic of Pakistan","PW": "The Republic of Palau","PS": "The State of Palestine","PA": "The Republic of Panamá","PG": "The Independent State of Papua New Guinea","PY": "The Republic of Paraguay","PE": "The Republic of Perú","PH": "The Republic of the Philippines","PN": "The Pitcairn, Henderson, Ducie and Oeno Islands","PL": "The Republic of Poland","PT": "The Portuguese Republic","PR": "The Commonwealth of Puerto Rico","QA": "The State of Qatar","RE": "Réunion","RO": "Romania","RU": "The Russian Federation","RW": "The Republic of Rwanda","BL": "The Collectivity of Saint-Barthélemy","SH": "Saint Helena, Ascension and Tristan da Cunha","KN": "Saint Kitts and Nevis","LC": "Saint Lucia","MF": "The Collectivity of Saint-Martin","PM": "The Overseas Collectivity of Saint-Pierre and Miquelon","VC": "Saint Vincent and the Grenadines","WS": "The Independent State of Samoa","SM": "The Republic of San Marino","ST": "The Democratic Republic of São Tomé and Príncipe","SA": "The Kingdom of Saudi Arabia","SN": "The Republic of Senegal","RS": "The Republic of Serbia","SC": "The Republic of Seychelles","SL": "The Republic of Sierra Leone","SG": "The Republic of Singapore","SX": "Sint Maarten","SK": "The Slovak Republic","SI": "The Republic of Slovenia","SB": "The Solomon Islands","SO": "The Federal Republic of Somalia","ZA": "The Republic of South Africa","GS": "South Georgia and the South Sandwich Islands","SS": "The Republic of South Sudan","ES": "The Kingdom of Spain","LK": "The Democratic Socialist Republic of Sri Lanka","SD": "The Republic of the Sudan","SR": "The Republic of Suriname","SJ": "Svalbard and Jan Mayen","SE": "The Kingdom of Sweden","CH": "The Swiss Confederation","SY": "The Syrian Arab Republic","TW": "The Republic of China","TJ": "The Republic of Tajikistan","TZ": "The United Republic of Tanzania","TH": "The Kingdom of Thailand","TL": "The Democratic Republic of Timor-Leste","TG": "The Togolese Republic","TK": "Tokelau","TO": "The Kingdom of Tonga","TT": "The Republic of Trinidad and Tobago","TN": "The Republic of Tunisia","TR": "The Republic of Türkiye","TM": "Turkmenistan","TC": "The Turks and Caicos Islands","TV": "Tuvalu","UG": "The Republic of Uganda","UA": "Ukraine","AE": "The United Arab Emirates","GB": "The United Kingdom of Great Britain and Northern Ireland","UM": "Baker Island, Howland Island, Jarvis Island, Johnston Atoll, Kingman Reef, Midway Atoll, Navassa Island, Palmyra Atoll, and Wake Island","US": "The United States of America","UY": "The Oriental Republic of Uruguay","UZ": "The Republic of Uzbekistan","VU": "The Republic of Vanuatu","VE": "The Bolivarian Republic of Venezuela","VN": "The Socialist Republic of Viet Nam","VG": "The Virgin Islands","VI": "The Virgin Islands of the United States","WF": "The Territory of the Wallis and Futuna Islands","EH": "The Sahrawi Arab Democratic Republic","YE": "The Republic of Yemen","ZM": "The Republic of Zambia","ZW": "The Republic of Zimbabwe"}
+        while True:
+            if victim_country is None:
+                victim_country = input("\u2328 Provide the victim ISO 3166-1 alpha-2 country code [eg BE]: ")
+            victim_country = victim_country.upper()
+            try:
+                if (victim_country) not in iso_country_list.keys():
+                    raise ValueError
+                else:
+                    victim_country_name = iso_country_list[(victim_country)]
+                    print("\u2705 You selected the following country:", victim_country_name)
+                    break
+            except ValueError as error:
+                print("\u26A0", victim_country, "is not in the ISO Country list. Verify your input please.")
+                victim_country = None
+        detection_list = ["host_based", "network_based", "cloud_based"]
+        while True:
+            if detection_source is None:
+                detection_source = input("\u2328 Define the detection source [host_based, network_based, cloud_based]: ")
+            detection_source = detection_source.lower()
+            try:
+                index = detection_list.index(detection_source)
+                break
+            except:
+                print("\u26A0", detection_source, "is not in the list. Verify your input please.")
+                detection_source = None
+        platform_list = ["windows","macos","nix","other"]
+        while True:
+            if victim_platform_env is None:
+                victim_platform_env = input("\u2328 Define the platform [windows, macos, nix, other]: ")
+            victim_platform_env = victim_platform_env.lower()
+            try:
+                index = platform_list.index(victim_platform_env)
+                break
+            except ValueError:
+                print("\u26A0", victim_platform_env, "is not in the list. Verify your input please.")
+                victim_platform_env = None
+        privilege_list = ["system","admin","user","none"]
+        while True:
+            if victim_privilegelevel is None:
+                victim_privilegelevel = input("\u2328 Provide the privilege level [system, admin, user, none]: ")
+            victim_privilegelevel = victim_privilegelevel.lower()
+            try:
+                index = privilege_list.index(victim_privilegelevel)
+                break
+            except ValueError:
+                print("\u26A0", victim_privilegelevel, "is not in the list. Verify your input please.")
+                victim_privilegelevel = None
+        if sighting_software is None:
+            sighting_software = input("Provide the malicious software name that was observed. This should be an exact name from the list https://attack.mitre.org/software/. Simply press enter if not applicable.")
+        with open(file_json_sighting_template,'r+') as file:
+            sightings_array_json = json.load(file)
+        sightings_array_json["version"] = sighting_version
+        sightings_array_json["id"] = sightings_id
+        sightings_array_json["start_time"] = sighting_start
+        sightings_array_json["tid"] += sightings_techniques_array
+        sightings_array_json["detection_type"] = detection_type
+        sightings_array_json["detection_source"] = detection_source
+        sightings_array_json["sector"] = victim_sector
+        sightings_array_json["country"] = victim_country
+        sightings_array_json["platform"] = victim_platform_env
+        sightings_array_json["privilege_level"] = victim_privilegelevel
+        if sighting_software:
+            sightings_array_json["software_name"] = sighting_software
+        with open(file_sighting_json, 'w') as file_sighting:
+            file_sighting.write(json.dumps(sightings_array_json, indent=4))
+
+    @attackstage
+    def new_attacknavigatorlayer(self):
+        digest = self.get_case_artifact("navigator_layer")
+        if digest is None:
+            print("\u2139 The ATT&CK\u00AE Navigator Layer is unchanged and is kept.")
+            return
+        file_prefix = ""
+        file_navigator_layer_json = os.path.join(self.get_case_path(), file_prefix, self.document_prefix + "navigator_layer.json")
+        file_json_navigator_layer_template = os.path.join(template_path, "navigator_template.json")
+        var_obj_layer_technique_property_colour = "#c41a9f"
+        var_obj_layer_tactic_property_colour = "#c41a9f"
+        array_obj_navigator_techniques = []
+        for attack in self.array_obj_sorted_construct:
+                techniqueID = attack['attack_id']
+                tactic = attack['attack_tactics']
+                color = var_obj_layer_technique_property_colour
+                new_obj = {
+                    'techniqueID': techniqueID,
+                    'tactic': tactic,
+                    'color': color
+                }
+                array_obj_navigator_techniques.append(new_obj)
+        with open(file_json_navigator_layer_template,'r+') as file:
+                obj_complete_navigator_layer = json.load(file)
+        obj_complete_navigator_layer["name"] = self.document_prefix_content
+        if self.attack_version:
+            obj_complete_navigator_layer["versions"]["attack"] = self.attack_version.split(".")[0]
+        obj_complete_navigator_layer["tacticRowBackground"] = var_obj_layer_tactic_property_colour
+        obj_complete_navigator_layer["techniques"] += array_obj_navigator_techniques
+        with open(file_navigator_layer_json, "w") as file_navigator_layer:
+            file_navigator_layer.write(json.dumps(obj_complete_navigator_layer, indent=4))
+        self.set_case_artifact("navigator_layer", digest)
+
+case_session = CaseSession(case_directory)
+
+def get_attackbatch_switch(value, default):
+    if value is None or value == "":
+        return default
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "y")
+    return bool(value)
+
+def get_attackbatch_manifest(file_manifest):
+    """
+    This function reads the cases of a batch manifest, either a JSONL file with one case per line or a CSV file with one case per row.
+    Every case accepts the following fields, only techniques is required:
+    - prefix: the prefix of the generated documents
+    - techniques: semicolon separated list (or JSON list) of ATT&CK(r) IDs
+    - tactics: the (Sub-)Technique/Tactic pairs to keep, T1053.005/execution;T1053.005/persistence (or a JSON object). All pairs are kept for the IDs not listed.
+    - ciscontrols, nistcontrols: the CIS Controls and NIST 800-53 Rev 5 switches. Default values are true and false.
+    - assets: semicolon separated list (or JSON list) of asset names for the CTID ATT&CK(r) Flow
+    - start_time, sector, country, detection_source, platform, privilege_level, software_name: the sighting fields, a sighting is generated when start_time is given
+    - case_directory: the name of the case folder. Default value is a random uuid.
+    - attack_version: the ATT&CK(r) version of the case, one of the store of ATT&CK(r) versions. Default value is the version of resources/helper_enterprise_attack.json.
+    - incremental: only derive the sections of added (Sub-)Techniques and only write the changed artifacts of an existing case folder, any change to the (Sub-)Techniques writes every artifact again. Default value is false.
+
+    :param file_manifest: str, the path of the JSONL or CSV manifest
+    :return: list, the normalised cases
+    """
+    with open(file_manifest, 'r', encoding='utf-8', newline='') as f:
+        if file_manifest.lower().endswith(".csv"):
+            array_obj_rows = [dict(row) for row in csv.DictReader(f)]
+        else:
+            array_obj_rows = [json.loads(line) for line in f if line.strip()]
+    return [get_attackbatch_case(row, index) for index, row in enumerate(array_obj_rows)]
+
+def get_attackbatch_case(row, index=0):
+    """
+    This function normalises a single case of a batch manifest or of a request to the report service, see get_attackbatch_manifest() for the fields.
+
+    :param row: dict, the fields of the case
+    :param index: int, the position of the case in the manifest. Default value is 0.
+    :return: dict, the normalised case
+    """
+    techniques = row.get("techniques") or ""
+    assets = row.get("assets") or ""
+    obj_case = {
+        "index": index,
+        "prefix": row.get("prefix") or "",
+        "techniques": ";".join(techniques) if isinstance(techniques, list) else techniques.strip(),
+        "tactics": row.get("tactics") or {},
+        "ciscontrols": get_attackbatch_switch(row.get("ciscontrols"), True),
+        "nistcontrols": get_attackbatch_switch(row.get("nistcontrols"), False),
+        "assets": ";".join(assets) if isinstance(assets, list) else assets,
+        "case_directory": row.get("case_directory") or str(uuid.uuid4()),
+        "attack_version": row.get("attack_version") or None,
+        "incremental": get_attackbatch_switch(row.get("incremental"), False),
+        "sighting": None
+    }
+    if row.get("start_time"):
+        obj_case["sighting"] = {
+            "sighting_start": row.get("start_time"),
+            "victim_sector": row.get("sector"),
+            "victim_country": row.get("country"),
+            "detection_source": row.get("detection_source"),
+            "victim_platform_env": row.get("platform"),
+            "victim_privilegelevel": row.get("privilege_level"),
+            "sighting_software": row.get("software_name") or ""
+        }
+    return obj_case
+
+def set_attackbatch_worker():
+    # A worker never waits for an answer: multiprocessing attaches the stdin of every worker process to os.devnull, a prompt fails the case with EOFError
+    get_resources_content()
+
+def new_attackbatch_case(obj_case):
+    """
+    This function generates all artifacts of a single batch case: the recommendations, the CTID ATT&CK(r) Flow, the ATT&CK(r) Navigator Layer and, when the sighting fields are given, the sighting.
+    The output of the case is written to batch.log in its case folder.
+
+    :param obj_case: dict, a case as returned by get_attackbatch_manifest()
+    :return: dict, the status and the timings of the case
+    """
+    session = CaseSession(obj_case["case_directory"], attack_version=obj_case["attack_version"])
+    obj_status = {
+        "index": obj_case["index"],
+        "prefix": obj_case["prefix"],
+        "case_path": session.case_path,
+        "status": "ok",
+        "error": None,
+        "timings": {}
+    }
+    obj_log = io.StringIO()
+    time_case_start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(obj_log):
+            list_stages = [
+                ("set_attack_empty", lambda: session.set_attack_empty(obj_case["techniques"], obj_case["tactics"])),
+                ("new_attackrecommendations", lambda: session.new_attackrecommendations(obj_case["prefix"], obj_case["ciscontrols"], obj_case["nistcontrols"], interactive=False, incremental=obj_case["incremental"])),
+                ("new_ctidattackflow", lambda: session.new_ctidattackflow(obj_case["assets"])),
+                ("new_attacknavigatorlayer", lambda: session.new_attacknavigatorlayer())
+            ]
+            if obj_case["sighting"]:
+                list_stages.append(("new_attacksighting", lambda: session.new_attacksighting(**obj_case["sighting"])))
+            for stage_name, stage in list_stages:
+                time_stage_start = time.perf_counter()
+                stage()
+                obj_status["timings"][stage_name] = round(time.perf_counter() - time_stage_start, 4)
+    except EOFError:
+        obj_status["status"] = "failed"
+        obj_status["error"] = "An answer was requested while running unattended, verify the case in the manifest."
+    except Exception as error:
+        obj_status["status"] = "failed"
+        obj_status["error"] = type(error).__name__ + ": " + str(error)
+    obj_status["timings"]["total"] = round(time.perf_counter() - time_case_start, 4)
+    with open(os.path.join(session.get_case_path(), "batch.log"), 'w', encoding='utf-8') as file_log:
+        file_log.write(obj_log.getvalue())
+    return obj_status
+
+def new_attackbatch(file_manifest, max_workers=None):
+    """
+    This function generates the artifacts for all cases of a manifest without any prompt. The cases are spread over a pool of worker processes, each worker loads the knowledge base once.
+    The status and timings per case are written to <manifest>_summary.json next to the manifest.
+
+    :param file_manifest: str, the path of the JSONL or CSV manifest, see get_attackbatch_manifest()
+    :param max_workers: int, the number of worker processes. Default value is the number of processors.
+    :return: list, the status and timings per case
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    array_obj_cases = get_attackbatch_manifest(file_manifest)
+    # The compiled cache is verified once before the workers start
+    get_resources_content()
+    time_batch_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=set_attackbatch_worker) as executor:
+        array_obj_status = list(executor.map(new_attackbatch_case, array_obj_cases))
+    time_batch = round(time.perf_counter() - time_batch_start, 4)
+    for obj_status in array_obj_status:
+        if obj_status["status"] == "ok":
+            print("\u2705 " + (obj_status["prefix"] or "Untitled") + " generated in " + str(obj_status["timings"]["total"]) + "s: " + obj_status["case_path"])
+        else:
+            print("\u26A0 " + (obj_status["prefix"] or "Untitled") + " failed: " + obj_status["error"])
+    obj_summary = {
+        "manifest": os.path.abspath(file_manifest),
+        "cases": len(array_obj_cases),
+        "failed": len([obj_status for obj_status in array_obj_status if obj_status["status"] != "ok"]),
+        "wall_time": time_batch,
+        "results": array_obj_status
+    }
+    file_batch_summary = os.path.splitext(file_manifest)[0] + "_summary.json"
+    with open(file_batch_summary, 'w') as file_summary:
+        file_summary.write(json.dumps(obj_summary, indent=4))
+    print("\u2139 " + str(obj_summary["cases"]) + " cases processed in " + str(time_batch) + "s, " + str(obj_summary["failed"]) + " failed. The summary is written to " + file_batch_summary)
+    return array_obj_status
+
+def set_attackservice_worker():
+    # A service worker keeps the knowledge base and the parsed template resident between jobs
+    set_attackbatch_worker()
+    get_docx()
+    new_attackdocument()
+
+def get_attackservice_worker(index):
+    return os.getpid()
+
+def get_attackservice_archive(case_path):
+    """
+    This function returns the artifacts of a case as a zip archive: the recommendations documents, the CTID ATT&CK(r) Flow, the ATT&CK(r) Navigator Layer and the sighting.
+
+    :param case_path: str, the path of the case folder
+    :return: bytes, the zip archive
+    """
+    obj_archive = io.BytesIO()
+    with zipfile.ZipFile(obj_archive, 'w', zipfile.ZIP_DEFLATED) as file_zip:
+        for file_name in sorted(os.listdir(case_path)):
+            if file_name.endswith((".docx", ".afb")) or (file_name.endswith(".json") and file_name != "run_report.json"):
+                # A DOCX document is a zip archive already, it is stored as it is
+                file_zip.write(os.path.join(case_path, file_name), file_name, compress_type=zipfile.ZIP_STORED if file_name.endswith(".docx") else None)
+    return obj_archive.getvalue()
+
+def get_attackservice_latency(list_latencies):
+    """
+    This function returns the count, mean, maximum and the 50th, 95th and 99th percentiles of a list of latencies in seconds.
+    """
+    list_sorted = sorted(list_latencies)
+    if not list_sorted:
+        return {"count": 0}
+    obj_latency = {"count": len(list_sorted), "mean": round(sum(list_sorted) / len(list_sorted), 4), "max": round(list_sorted[-1], 4)}
+    for percentile in (50, 95, 99):
+        obj_latency["p" + str(percentile)] = round(list_sorted[min(len(list_sorted) - 1, len(list_sorted) * percentile // 100)], 4)
+    return obj_latency
+
+def get_attackservice_metrics(obj_service):
+    """
+    This function returns the metrics of the report service: the jobs running or waiting, the completed, failed, rejected, timed out and errored jobs and the latencies of the recent jobs.
+
+    :param obj_service: dict, the state of the service as created by new_attackservice()
+    :return: dict, the metrics
+    """
+    with obj_service["lock"]:
+        array_obj_jobs = list(obj_service["jobs"])
+        obj_metrics = {
+            "workers": obj_service["workers"],
+            "queue_size": obj_service["queue_size"],
+            "pending": obj_service["pending"],
+            "completed": obj_service["completed"],
+            "failed": obj_service["failed"],
+            "rejected": obj_service["rejected"],
+            "timeouts": obj_service["timeouts"],
+            "abandoned": obj_service["abandoned"],
+            "errors": obj_service["errors"],
+            "uptime": round(time.perf_counter() - obj_service["time_start"], 4)
+        }
+    obj_metrics["latency"] = {
+        "total": get_attackservice_latency([obj_job["total"] for obj_job in array_obj_jobs]),
+        "queue": get_attackservice_latency([obj_job["queue"] for obj_job in array_obj_jobs]),
+        "report": get_attackservice_latency([obj_job["report"] for obj_job in array_obj_jobs])
+    }
+    obj_metrics["recent"] = array_obj_jobs[-10:]
+    return obj_metrics
+
+def set_attackservice_job_done(obj_service, abandoned_case_path=None):
+    """
+    This function releases the slot of a finished job of the report service and removes the case folder of an abandoned job.
+    """
+    obj_service["slots"].release()
+    with obj_service["lock"]:
+        obj_service["pending"] -= 1
+        if abandoned_case_path:
+            obj_service["abandoned"] -= 1
+    if abandoned_case_path:
+        shutil.rmtree(abandoned_case_path, ignore_errors=True)
+
+def new_attackservice_job(obj_service, obj_request):
+    """
+    This function runs a single request of the report service on the worker pool and returns the HTTP status, the headers and the body of the response.
+    A request is rejected with 503 when all workers are busy and the queue is full, answered with 504 when the report is not generated within the job timeout and with 500 when the worker pool fails to run the job.
+
+    :param obj_service: dict, the state of the service as created by new_attackservice()
+    :param obj_request: dict, the fields of the case, see get_attackbatch_manifest(). The case folder is always a random uuid.
+    :return: tuple, the HTTP status, the headers and the body
+    """
+    from concurrent.futures import TimeoutError as FutureTimeoutError
+    if not obj_service["slots"].acquire(blocking=False):
+        with obj_service["lock"]:
+            obj_service["rejected"] += 1
+        return 503, {"Content-Type": "application/json", "Retry-After": "1"}, json.dumps({"error": "The queue of the report service is full, retry later."}).encode()
+    with obj_service["lock"]:
+        obj_service["pending"] += 1
+        obj_service["requests"] += 1
+        index = obj_service["requests"]
+    time_start = time.perf_counter()
+    obj_case = None
+    timed_out = False
+    error = None
+    try:
+        obj_case = get_attackbatch_case({key: value for key, value in obj_request.items() if key != "case_directory"}, index)
+        future = obj_service["executor"].submit(new_attackbatch_case, obj_case)
+        obj_status = future.result(timeout=obj_service["job_timeout"])
+        body = get_attackservice_archive(obj_status["case_path"]) if obj_status["status"] == "ok" else None
+    except FutureTimeoutError:
+        timed_out = True
+        future.cancel()
+    except Exception as exception:
+        # A dead worker, a job that cannot be pickled or a failure of the job itself
+        error = type(exception).__name__ + ": " + str(exception)
+    finally:
+        if timed_out:
+            # A running worker cannot be interrupted, the slot of the abandoned job is released once it finishes
+            with obj_service["lock"]:
+                obj_service["abandoned"] += 1
+            future.add_done_callback(lambda future_done: set_attackservice_job_done(obj_service, os.path.join(parent_dir, obj_case["case_directory"])))
+        else:
+            set_attackservice_job_done(obj_service)
+    if timed_out:
+        with obj_service["lock"]:
+            obj_service["timeouts"] += 1
+        return 504, {"Content-Type": "application/json"}, json.dumps({"error": "The report was not generated within " + str(obj_service["job_timeout"]) + "s, the job is abandoned.", "case": obj_case["case_directory"]}).encode()
+    if error:
+        with obj_service["lock"]:
+            obj_service["errors"] += 1
+        return 500, {"Content-Type": "application/json"}, json.dumps({"error": "The report service failed to run the job, " + error, "case": obj_case["case_directory"] if obj_case else None}).encode()
+    time_total = time.perf_counter() - time_start
+    obj_job = {
+        "case_path": obj_status["case_path"],
+        "status": obj_status["status"],
+        "total": round(time_total, 4),
+        "report": obj_status["timings"]["total"],
+        "queue": round(max(0, time_total - obj_status["timings"]["total"]), 4),
+        "timings": obj_status["timings"]
+    }
+    with obj_service["lock"]:
+        obj_service["completed" if obj_status["status"] == "ok" else "failed"] += 1
+        obj_service["jobs"].append(obj_job)
+    if obj_status["status"] != "ok":
+        return 422, {"Content-Type": "application/json"}, json.dumps({"error": obj_status["error"], "job": obj_job}).encode()
+    obj_headers = {
+        "Content-Type": "application/zip",
+        "Content-Disposition": "attachment; filename=\"" + os.path.basename(obj_status["case_path"]) + ".zip\"",
+        "X-AttackIr-Case": os.path.basename(obj_status["case_path"]),
+        "X-AttackIr-Timings": json.dumps(obj_job["timings"])
+    }
+    return 200, obj_headers, body
+
+def new_attackservice(host="127.0.0.1", port=8337, max_workers=None, queue_size=16, job_timeout=300, serve=True):
+    """
+    This function starts the report service: a local HTTP API generating the artifacts of a case for every request on a pool of workers.
+    - POST /reports: a JSON object with the fields of a batch case, see get_attackbatch_manifest(). The response is a zip of the documents, the CTID ATT&CK(r) Flow, the ATT&CK(r) Navigator Layer and the sighting.
+    - GET /metrics: the jobs running or waiting, the completed, failed and rejected jobs and the latency percentiles of the recent jobs.
+    - GET /health: the status of the service.
+
+        >>> new_attackservice(port=8337, max_workers=4)
+
+    :param host: str, the address the service listens on. Default value is 127.0.0.1.
+    :param port: int, the port the service listens on, 0 picks a free port. Default value is 8337.
+    :param max_workers: int, the number of worker processes. Default value is the number of processors.
+    :param queue_size: int, the number of requests waiting for a worker before new requests are rejected. Default value is 16.
+    :param job_timeout: int, the seconds a request waits for its report. Default value is 300.
+    :param serve: bool, serve the requests until interrupted. When False, the started server is returned and serve_forever() is left to the caller. Default value is True.
+    :return: ThreadingHTTPServer, the server with its state in obj_service
+    """
+    import collections
+    import http.server
+    from concurrent.futures import ProcessPoolExecutor
+    # The compiled cache is verified once before the workers start
+    get_resources_content()
+    max_workers = max_workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=set_attackservice_worker)
+    # The workers are started before the first request is accepted, a request never waits for a worker loading the resources
+    list(executor.map(get_attackservice_worker, range(max_workers)))
+    obj_service = {
+        "executor": executor,
+        "workers": max_workers,
+        "queue_size": queue_size,
+        "job_timeout": job_timeout,
+        "slots": threading.BoundedSemaphore(max_workers + queue_size),
+        "lock": threading.Lock(),
+        "requests": 0,
+        "pending": 0,
+        "completed": 0,
+        "failed": 0,
+        "rejected": 0,
+        "timeouts": 0,
+        "abandoned": 0,
+        "errors": 0,
+        "jobs": collections.deque(maxlen=1000),
+        "time_start": time.perf_counter()
+    }
+
+    class AttackServiceHandler(http.server.BaseHTTPRequestHandler):
+        def set_response(self, status, obj_headers, body):
+            self.send_response(status)
+            for header, value in obj_headers.items():
+                self.send_header(header, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def set_json_response(self, status, obj_body):
+            self.set_response(status, {"Content-Type": "application/json"}, json.dumps(obj_body, indent=4).encode())
+
+        def do_GET(self):
+            if self.path == "/health":
+                self.set_json_response(200, {"status": "ok", "workers": obj_service["workers"]})
+            elif self.path == "/metrics":
+                self.set_json_response(200, get_attackservice_metrics(obj_service))
+            else:
+                self.set_json_response(404, {"error": "Unknown path " + self.path})
+
+        def do_POST(self):
+            if self.path != "/reports":
+                self.set_json_response(404, {"error": "Unknown path " + self.path})
+                return
+            try:
+                obj_request = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            except ValueError:
+                self.set_json_response(400, {"error": "The request is not valid JSON."})
+                return
+            if not isinstance(obj_request, dict) or not obj_request.get("techniques"):
+                self.set_json_response(400, {"error": "The request requires techniques."})
+                return
+            self.set_response(*new_attackservice_job(obj_service, obj_request))
+
+        def log_message(self, format, *args):
+            if instrumentation_verbose:
+                super().log_message(format, *args)
+
+    server = http.server.ThreadingHTTPServer((host, port), AttackServiceHandler)
+    server.daemon_threads = True
+    server.obj_service = obj_service
+    print("\u2139 The report service listens on http://" + server.server_address[0] + ":" + str(server.server_address[1]) + " with " + str(max_workers) + " workers and a queue of " + str(queue_size) + " requests.")
+    if not serve:
+        return server
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        executor.shutdown(cancel_futures=True)
+    return server
+
+def get_attackportfolio_cases(list_case_paths=None):
+    """
+    This function reads the selected (Sub-)Technique/Tactic pairs of stored cases from their ATT&CK(r) Navigator Layer, with the sector and start time of their sighting.
+
+    :param list_case_paths: list, the case folders. Default value is None, reading the case folders of the working folder, the folders holding a run_report.json.
+    :return: list, the case folder, the prefix, the sector, the date and the (Sub-)Technique/Tactic pairs per case
+    """
+    if list_case_paths is None:
+        list_case_paths = sorted(entry.path for entry in os.scandir(parent_dir) if entry.is_dir() and os.path.isfile(os.path.join(entry.path, "run_report.json")))
+    array_obj_cases = []
+    for case_path in list_case_paths:
+        list_file_names = sorted(os.listdir(case_path))
+        list_file_layers = [os.path.join(case_path, file_name) for file_name in list_file_names if file_name.endswith("navigator_layer.json")]
+        if not list_file_layers:
+            continue
+        obj_case = {"case_path": case_path, "prefix": "", "sector": None, "date": None, "pairs": []}
         try:
-            index = privilege_list.index(victim_privilegelevel)
-            break
-        except ValueError:
-            print("\u26A0", victim_privilegelevel, "is not in the list. Verify your input please.")
-    sighting_software = input("Provide the malicious software name that was observed. This should be an exact name from the list https://attack.mitre.org/software/. Simply press enter if not applicable.")
-    with open(file_json_sighting_template,'r+') as file:
-        sightings_array_json = json.load(file)
-    sightings_array_json["version"] = sighting_version
-    sightings_array_json["id"] = sightings_id
-    sightings_array_json["start_time"] = sighting_start
-    sightings_array_json["tid"] += sightings_techniques_array
-    sightings_array_json["detection_type"] = detection_type
-    sightings_array_json["detection_source"] = detection_source
-    sightings_array_json["sector"] = victim_sector
-    sightings_array_json["country"] = victim_country
-    sightings_array_json["platform"] = victim_platform_env
-    sightings_array_json["privilege_level"] = victim_privilegelevel
-    if sighting_software:
-        sightings_array_json["software_name"] = sighting_software
-    with open(file_sighting_json, 'w') as file_sighting:
-        file_sighting.write(json.dumps(sightings_array_json, indent=4))
+            for file_layer in list_file_layers:
+                with open(file_layer, 'r', encoding='utf-8') as f:
+                    obj_layer = json.load(f)
+                obj_case["prefix"] = obj_layer.get("name") or obj_case["prefix"]
+                for technique in obj_layer.get("techniques", []):
+                    list_tactics = technique.get("tactic") if isinstance(technique.get("tactic"), list) else [technique.get("tactic")]
+                    obj_case["pairs"] += [(technique["techniqueID"], tactic) for tactic in list_tactics]
+            for file_name in list_file_names:
+                if file_name.endswith("_sighting.json"):
+                    with open(os.path.join(case_path, file_name), 'r', encoding='utf-8') as f:
+                        obj_sighting = json.load(f)
+                    obj_case["sector"] = obj_sighting.get("sector") or None
+                    obj_case["date"] = (obj_sighting.get("start_time") or "")[:10] or None
+        except (OSError, ValueError, KeyError):
+            continue
+        if obj_case["date"] is None:
+            file_json_run_report = os.path.join(case_path, "run_report.json")
+            file_dated = file_json_run_report if os.path.isfile(file_json_run_report) else list_file_layers[0]
+            obj_case["date"] = datetime.fromtimestamp(os.path.getmtime(file_dated), timezone.utc).strftime("%Y-%m-%d")
+        array_obj_cases.append(obj_case)
+    return array_obj_cases
 
-def new_attacknavigatorlayer():
-    file_prefix = ""
-    file_navigator_layer_json = os.path.join(case_path, file_prefix, document_prefix + "navigator_layer.json")
-    file_json_navigator_layer_template = os.path.join(template_path, "navigator_template.json")
-    var_obj_layer_technique_property_colour = "#c41a9f"
-    var_obj_layer_tactic_property_colour = "#c41a9f"
-    array_obj_navigator_techniques = []
-    for attack in array_obj_sorted_construct:
-            techniqueID = attack['attack_id']
-            tactic = attack['attack_tactics']
-            color = var_obj_layer_technique_property_colour
-            new_obj = {
-                'techniqueID': techniqueID,
-                'tactic': tactic,
-                'color': color
-            }
-            array_obj_navigator_techniques.append(new_obj)
-    with open(file_json_navigator_layer_template,'r+') as file:
-            obj_complete_navigator_layer = json.load(file)
-    obj_complete_navigator_layer["name"] = document_prefix_content
-    obj_complete_navigator_layer["tacticRowBackground"] = var_obj_layer_tactic_property_colour
-    obj_complete_navigator_layer["techniques"] += array_obj_navigator_techniques
-    with open(file_navigator_layer_json, "w") as file_navigator_layer:
-        file_navigator_layer.write(json.dumps(obj_complete_navigator_layer, indent=4))
+def new_attackportfolio(array_obj_cases=None):
+    """
+    This function loads the constructs of many cases into a portfolio: a matrix of cases by (Sub-)Technique/Tactic pairs, with the sector and date of every case. Requires NumPy.
+
+    :param array_obj_cases: list, the cases with their sector, date and (Sub-)Technique/Tactic pairs, see get_attackportfolio_cases(). Default value is None, reading the stored cases.
+    :return: dict, the pairs, the tactics, the tactic of every pair, the matrix, the tactics of every case, the case folders, prefixes, sectors and dates
+    """
+    try:
+        import numpy
+    except ImportError:
+        print("\u26A0 NumPy is required to aggregate the cases into a portfolio. It can be installed with 'pip install numpy'.")
+        return None
+    if array_obj_cases is None:
+        array_obj_cases = get_attackportfolio_cases()
+    list_pairs = sorted(set(tuple(pair) for obj_case in array_obj_cases for pair in obj_case["pairs"]))
+    dict_pair_columns = {pair: column for column, pair in enumerate(list_pairs)}
+    list_tactics = sorted(set(tactic for attack_id, tactic in list_pairs), key=lambda tactic: (list_attackportfolio_tactics.index(tactic) if tactic in list_attackportfolio_tactics else len(list_attackportfolio_tactics), str(tactic)))
+    list_rows = [row for row, obj_case in enumerate(array_obj_cases) for pair in obj_case["pairs"]]
+    list_columns = [dict_pair_columns[tuple(pair)] for obj_case in array_obj_cases for pair in obj_case["pairs"]]
+    matrix = numpy.zeros((len(array_obj_cases), len(list_pairs)), dtype=numpy.uint8)
+    matrix[list_rows, list_columns] = 1
+    obj_portfolio = {
+        "pairs": list_pairs,
+        "tactics": list_tactics,
+        "pair_tactics": numpy.zeros((len(list_pairs), len(list_tactics)), dtype=numpy.uint8),
+        "matrix": matrix,
+        "case_paths": [obj_case.get("case_path") for obj_case in array_obj_cases],
+        "prefixes": [obj_case.get("prefix", "") for obj_case in array_obj_cases],
+        "sectors": numpy.array([str(obj_case.get("sector") or "unknown") for obj_case in array_obj_cases]),
+        "dates": numpy.array([obj_case.get("date") or "NaT" for obj_case in array_obj_cases], dtype="datetime64[D]")
+    }
+    obj_portfolio["pair_tactics"][numpy.arange(len(list_pairs)), [list_tactics.index(tactic) for attack_id, tactic in list_pairs]] = 1
+    # A case selects a tactic when it selects any pair of the tactic
+    obj_portfolio["case_tactics"] = (matrix.astype(numpy.float64) @ obj_portfolio["pair_tactics"] > 0).astype(numpy.uint8)
+    return obj_portfolio
+
+def get_attackportfolio_groups(obj_portfolio, by=None):
+    """
+    This function assigns every case of the portfolio to a slice: all cases together, or one slice per sector, year, quarter or month.
+
+    :param obj_portfolio: dict, the portfolio, see new_attackportfolio()
+    :param by: str, one of sector, year, quarter or month. Default value is None, a single slice named all.
+    :return: tuple, the names of the slices and the slice of every case
+    """
+    import numpy
+    dates = obj_portfolio["dates"]
+    if by is None:
+        keys = numpy.full(len(dates), "all")
+    elif by == "sector":
+        keys = obj_portfolio["sectors"]
+    elif by == "year":
+        keys = dates.astype("datetime64[Y]").astype(str)
+    elif by == "month":
+        keys = dates.astype("datetime64[M]").astype(str)
+    elif by == "quarter":
+        months = dates.astype("datetime64[M]").astype(numpy.int64)
+        keys = numpy.char.add(numpy.char.add((months // 12 + 1970).astype(str), "-Q"), (months % 12 // 3 + 1).astype(str))
+        keys[numpy.isnat(dates)] = "NaT"
+    else:
+        raise ValueError("A portfolio is sliced by sector, year, quarter or month, not by " + str(by) + ".")
+    list_groups, codes = numpy.unique(keys, return_inverse=True)
+    return [str(group) for group in list_groups], codes.reshape(-1)
+
+def get_attackportfolio_scores(obj_portfolio, by=None, sector=None, period_start=None, period_end=None, half_life=None, reference_date=None):
+    """
+    This function scores every (Sub-)Technique/Tactic pair and every tactic per slice of the portfolio as the share of its cases selecting it, from 0 to 100.
+    With a half-life, a case half-life days older than the reference date counts for half.
+
+    :param obj_portfolio: dict, the portfolio, see new_attackportfolio()
+    :param by: str, one of sector, year, quarter or month. Default value is None, scoring all cases together.
+    :param sector: str or list, the NAICS sectors of the cases to keep. Default value is None, keeping all sectors.
+    :param period_start: str, the first date of the cases to keep, 2023-01-01. Default value is None.
+    :param period_end: str, the last date of the cases to keep, 2023-12-31. Default value is None.
+    :param half_life: float, the half-life of the weight of a case in days. Default value is None, all cases weigh the same.
+    :param reference_date: str, the date a case weighs 1 at. Default value is None, the date of the most recent case.
+    :return: dict, per slice its name, the number of cases, the number of cases per pair, the score per pair and the score per tactic
+    """
+    import numpy
+    dates = obj_portfolio["dates"]
+    selected = numpy.ones(len(dates), dtype=bool)
+    if sector is not None:
+        selected &= numpy.isin(obj_portfolio["sectors"], [str(value) for value in (sector if isinstance(sector, (list, tuple, set)) else [sector])])
+    if period_start is not None:
+        selected &= dates >= numpy.datetime64(period_start, "D")
+    if period_end is not None:
+        selected &= dates <= numpy.datetime64(period_end, "D")
+    weights = selected.astype(numpy.float64)
+    if half_life:
+        if reference_date is None:
+            reference_date = dates[~numpy.isnat(dates)].max() if (~numpy.isnat(dates)).any() else numpy.datetime64("today", "D")
+        ages = (numpy.datetime64(reference_date, "D") - dates).astype(numpy.float64)
+        # An undated case is not weighted down, a case dated after the reference date weighs 1
+        weights *= numpy.where(numpy.isnat(dates), 1.0, 0.5 ** (numpy.clip(ages, 0, None) / half_life))
+    list_groups, codes = get_attackportfolio_groups(obj_portfolio, by)
+    group_weights = numpy.zeros((len(list_groups), len(dates)))
+    group_weights[codes, numpy.arange(len(dates))] = weights
+    matrix = obj_portfolio["matrix"]
+    weight_totals = group_weights.sum(axis=1)
+    scale = numpy.divide(100.0, weight_totals, out=numpy.zeros_like(weight_totals), where=weight_totals > 0)[:, None]
+    group_selected = (group_weights > 0).astype(numpy.float64)
+    obj_scores = {
+        "groups": list_groups,
+        "cases": group_selected.sum(axis=1).astype(numpy.int64),
+        "counts": (group_selected @ matrix).astype(numpy.int64),
+        "scores": (group_weights @ matrix) * scale,
+        "tactic_scores": (group_weights @ obj_portfolio["case_tactics"]) * scale
+    }
+    return obj_scores
+
+def new_attackportfoliolayer(obj_portfolio, name="Portfolio", by=None, sector=None, period_start=None, period_end=None, half_life=None, reference_date=None):
+    """
+    This function writes a scored ATT&CK(r) Navigator Layer per slice of the portfolio to the working folder, see get_attackportfolio_scores().
+
+    :param obj_portfolio: dict, the portfolio, see new_attackportfolio()
+    :param name: str, the name of the layers, completed with the sector and period kept and the name of the slice. Default value is Portfolio.
+    :return: list, the paths of the written layers
+    """
+    obj_scores = get_attackportfolio_scores(obj_portfolio, by, sector, period_start, period_end, half_life, reference_date)
+    with open(os.path.join(template_path, "navigator_template.json"), 'r') as file:
+        obj_navigator_layer_template = json.load(file)
+    list_details = []
+    list_name_parts = [name]
+    if sector is not None:
+        list_details.append("sector " + (", ".join(str(value) for value in sector) if isinstance(sector, (list, tuple, set)) else str(sector)))
+        list_name_parts.append(list_details[-1])
+    if period_start is not None or period_end is not None:
+        list_details.append("from " + str(period_start or "the first case") + " to " + str(period_end or "the last case"))
+        list_name_parts.append(str(period_start or "") + ".." + str(period_end or ""))
+    if half_life:
+        list_details.append("weighted by recency with a half-life of " + str(half_life) + " days")
+    list_file_layers = []
+    for index, group in enumerate(obj_scores["groups"]):
+        if obj_scores["cases"][index] == 0:
+            continue
+        obj_navigator_layer = copy.deepcopy(obj_navigator_layer_template)
+        obj_navigator_layer["name"] = " ".join(list_name_parts + ([] if by is None else [group]))
+        obj_navigator_layer["description"] = "Share of " + str(obj_scores["cases"][index]) + " cases selecting every (Sub-)Technique/Tactic pair" + (", " + ", ".join(list_details) if list_details else "") + "."
+        list_counts = obj_scores["counts"][index].tolist()
+        list_scores = obj_scores["scores"][index].tolist()
+        comment_cases = " of " + str(obj_scores["cases"][index]) + " cases"
+        obj_navigator_layer["techniques"] = [{
+            "techniqueID": attack_id,
+            "tactic": tactic,
+            "score": round(score, 2),
+            "comment": str(count) + comment_cases
+        } for (attack_id, tactic), count, score in zip(obj_portfolio["pairs"], list_counts, list_scores) if count]
+        obj_navigator_layer["metadata"] = [{"name": tactic, "value": str(round(score, 2))} for tactic, score in zip(obj_portfolio["tactics"], obj_scores["tactic_scores"][index].tolist())]
+        file_navigator_layer_json = os.path.join(parent_dir, re.sub(r'[^\w.-]+', '_', obj_navigator_layer["name"]).strip("_") + "_navigator_layer.json")
+        with open(file_navigator_layer_json, "w") as file_navigator_layer:
+            file_navigator_layer.write(json.dumps(obj_navigator_layer, indent=4))
+        list_file_layers.append(file_navigator_layer_json)
+    print("\u2705 " + str(len(list_file_layers)) + " scored ATT&CK\u00AE Navigator Layers of " + str(len(obj_portfolio["case_paths"])) + " cases are written to " + parent_dir)
+    return list_file_layers
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="ATT&CK\u00AE for IR Reporting. Run without arguments in interactive mode (python -i) to use the functions.")
+    parser.add_argument("--batch", metavar="MANIFEST", help="generate the artifacts for all cases of a JSONL or CSV manifest")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes for --batch and --serve")
+    parser.add_argument("--serve", action="store_true", help="start the report service, a local HTTP API generating the artifacts of a case per request")
+    parser.add_argument("--host", default="127.0.0.1", help="address the report service listens on")
+    parser.add_argument("--port", type=int, default=8337, help="port the report service listens on")
+    parser.add_argument("--queue-size", type=int, default=16, help="number of requests waiting for a worker of the report service")
+    parser.add_argument("--portfolio", action="store_true", help="write scored ATT&CK\u00AE Navigator Layers aggregating the stored cases, requires NumPy")
+    parser.add_argument("--by", choices=["sector", "year", "quarter", "month"], help="write a portfolio layer per sector, year, quarter or month")
+    parser.add_argument("--half-life", type=float, default=None, help="weight the cases of the portfolio by recency with a half-life in days")
+    args = parser.parse_args()
+    if args.batch:
+        new_attackbatch(args.batch, args.workers)
+    elif args.serve:
+        new_attackservice(args.host, args.port, args.workers, args.queue_size)
+    elif args.portfolio:
+        obj_portfolio = new_attackportfolio()
+        if obj_portfolio is not None:
+            new_attackportfoliolayer(obj_portfolio, by=args.by, half_life=args.half_life)
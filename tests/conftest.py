@@ -0,0 +1,44 @@
+import importlib.util
+import os
+import shutil
+import sys
+
+import pytest
+
+repository_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def attackirreporting(tmp_path, monkeypatch):
+    """
+    This fixture imports a fresh instance of AttackIrReporting working in a temporary folder, the script resolves its folders from the working folder at import.
+    The instance is registered as AttackIrReporting so the worker processes of the parallel modes can unpickle its functions.
+    """
+    shutil.copytree(os.path.join(repository_path, "templates"), os.path.join(tmp_path, "templates"))
+    monkeypatch.chdir(tmp_path)
+    spec = importlib.util.spec_from_file_location("AttackIrReporting", os.path.join(repository_path, "scripts", "AttackIrReporting.py"))
+    module = importlib.util.module_from_spec(spec)
+    monkeypatch.setitem(sys.modules, "AttackIrReporting", module)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def attackirbenchmark():
+    """
+    This fixture imports AttackIrBenchmark for its generator of synthetic resources.
+    """
+    spec = importlib.util.spec_from_file_location("AttackIrBenchmark", os.path.join(repository_path, "scripts", "AttackIrBenchmark.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def attackirresources(attackirreporting, attackirbenchmark, tmp_path):
+    """
+    This fixture writes small synthetic resource files into the temporary folder, loads them and returns the ATT&CK(r) IDs of the active (Sub-)Techniques.
+    """
+    list_attack_ids = attackirbenchmark.new_synthetic_resources(os.path.join(tmp_path, "resources"), techniques=60, mitigations=12, data_sources=8, filler_objects=100)
+    attackirreporting.get_resources_content()
+    return list_attack_ids
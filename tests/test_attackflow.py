@@ -0,0 +1,103 @@
+import json
+import os
+import uuid
+
+import pytest
+
+from conftest import repository_path
+
+list_attack_tactics = ["initial-access", "execution", "persistence", "privilege-escalation", "defense-evasion", "credential-access", "discovery", "lateral-movement", "collection", "command-and-control", "exfiltration", "impact"]
+
+
+def get_attackflow_schema():
+    with open(os.path.join(repository_path, "templates", "attack_flow_schema.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_attackflow_construct(actions, attack_name='Technique "{}" \\ C:\\Temp\\'):
+    return [{"guid": str(uuid.uuid4()), "attack_name": attack_name.format(index), "attack_id": "T" + str(1000 + index), "attack_tactics": [list_attack_tactics[index % len(list_attack_tactics)]]} for index in range(actions)]
+
+
+def new_attackflow(module, array_obj_construct, ctid_assets, prefix='Case "7" \\ flow'):
+    """
+    This function writes the CTID ATT&CK(r) Flow of a case with the given constructs and returns the parsed file.
+    """
+    session = module.CaseSession()
+    session.get_document_prefix(prefix, interactive=False)
+    session.array_obj_sorted_construct = array_obj_construct
+    session.new_ctidattackflow(ctid_assets)
+    file_afb_ctid_flow = os.path.join(session.get_case_path(), session.document_prefix + "ctid_attack_flow.afb")
+    with open(file_afb_ctid_flow, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def assert_attackflow_schema(obj_flow, obj_schema):
+    """
+    This function verifies the objects of a flow against the templates of the Attack Flow Builder schema: every object uses a template of the schema, only sets its properties with a value of their type and every child is an object of the flow.
+    """
+    dict_obj_templates = {template["id"]: template for template in obj_schema["templates"]}
+    assert obj_flow["schema"] == obj_schema
+    assert obj_flow["objects"][0]["id"] == obj_flow["id"]
+    dict_obj_objects = {obj_object["id"]: obj_object for obj_object in obj_flow["objects"]}
+    assert len(dict_obj_objects) == len(obj_flow["objects"])
+    for obj_object in obj_flow["objects"]:
+        assert obj_object["template"] in dict_obj_templates
+        dict_obj_properties = dict_obj_templates[obj_object["template"]].get("properties", {})
+        for name, value in obj_object["properties"]:
+            assert name in dict_obj_properties
+            if dict_obj_properties[name]["type"] in (2, 3):
+                assert value is None or isinstance(value, str)
+        list_set_properties = [name for name, value in obj_object["properties"] if value]
+        for name, obj_property in dict_obj_properties.items():
+            if obj_property.get("is_required"):
+                assert name in list_set_properties
+        for child_id in obj_object["children"]:
+            assert child_id in dict_obj_objects
+        if obj_object["template"] in ("action", "asset"):
+            assert [dict_obj_objects[child_id]["template"] for child_id in obj_object["children"]] == ["@__builtin__anchor"] * 12
+
+
+def test_attackflow_quotes_and_backslashes(attackirreporting):
+    array_obj_construct = get_attackflow_construct(3)
+    obj_flow = new_attackflow(attackirreporting, array_obj_construct, 'SRV "01";C:\\Users\\Public;Obsolete Device')
+    assert_attackflow_schema(obj_flow, get_attackflow_schema())
+    assert obj_flow["objects"][0]["properties"][0] == ["name", 'Case "7" \\ flow']
+    list_actions = [obj_object for obj_object in obj_flow["objects"] if obj_object["template"] == "action"]
+    assert [dict(action["properties"])["name"] for action in list_actions] == [technique["attack_name"] for technique in array_obj_construct]
+    list_assets = [obj_object for obj_object in obj_flow["objects"] if obj_object["template"] == "asset"]
+    assert [dict(asset["properties"])["name"] for asset in list_assets] == ['SRV "01"', "C:\\Users\\Public", "Obsolete Device"]
+
+
+def test_attackflow_actions_follow_constructs(attackirreporting):
+    array_obj_construct = get_attackflow_construct(14)
+    obj_flow = new_attackflow(attackirreporting, array_obj_construct, "")
+    list_actions = [obj_object for obj_object in obj_flow["objects"] if obj_object["template"] == "action"]
+    assert obj_flow["objects"][0]["children"] == [technique["guid"] for technique in array_obj_construct]
+    for action, technique in zip(list_actions, array_obj_construct):
+        dict_obj_properties = dict(action["properties"])
+        assert action["id"] == technique["guid"]
+        assert dict_obj_properties["technique_id"] == technique["attack_id"]
+        assert dict_obj_properties["tactic_ref"] == technique["attack_tactics"][0]
+
+
+def test_attackflow_empty_techniques(attackirreporting):
+    obj_flow = new_attackflow(attackirreporting, [], "")
+    assert_attackflow_schema(obj_flow, get_attackflow_schema())
+    assert len(obj_flow["objects"]) == 1
+    assert obj_flow["objects"][0]["template"] == "flow"
+    assert obj_flow["objects"][0]["children"] == []
+
+
+def test_attackflow_empty_techniques_with_assets(attackirreporting):
+    obj_flow = new_attackflow(attackirreporting, [], "SYSTEM01;;SRV-EXCH-01")
+    assert_attackflow_schema(obj_flow, get_attackflow_schema())
+    assert len(obj_flow["objects"]) == 1 + 13 * 2
+
+
+@pytest.mark.parametrize("actions", [2000, 5000])
+def test_attackflow_thousands_of_actions(attackirreporting, actions):
+    array_obj_construct = get_attackflow_construct(actions)
+    obj_flow = new_attackflow(attackirreporting, array_obj_construct, "SYSTEM01")
+    assert_attackflow_schema(obj_flow, get_attackflow_schema())
+    assert len(obj_flow["objects"]) == 1 + 13 * (actions + 1)
+    assert dict(obj_flow["objects"][-13]["properties"])["name"] == "SYSTEM01"
@@ -0,0 +1,77 @@
+import json
+import os
+import shutil
+
+
+def new_attackstore_versions(module):
+    """
+    This function writes the loaded bundle as ATT&CK(r) version 13.1 and the bundle with an older description of its first (Sub-)Technique as version 12.1, and returns the STIX ID of that (Sub-)Technique.
+    """
+    os.makedirs(module.attack_versions_path)
+    shutil.copyfile(module.file_json_helper_enterprise_attack, os.path.join(module.attack_versions_path, "enterprise-attack-13.1.json"))
+    with open(module.file_json_helper_enterprise_attack, "r", encoding="utf-8") as f:
+        obj_bundle = json.load(f)
+    obj_technique = next(obj for obj in obj_bundle["objects"] if obj["type"] == "attack-pattern")
+    obj_technique["modified"] = "2022-10-25T14:00:00.188Z"
+    obj_technique["description"] = "Adversaries may perform the technique of version 12.1."
+    with open(os.path.join(module.attack_versions_path, "enterprise-attack-12.1.json"), "w", encoding="utf-8") as f:
+        json.dump(obj_bundle, f)
+    return obj_technique["id"]
+
+
+def get_attackstore(module):
+    with module.lock_attack_store:
+        return module.get_attackstore()
+
+
+def test_attackstore_deduplicated_objects(attackirreporting, attackirresources):
+    technique_id = new_attackstore_versions(attackirreporting)
+    obj_attack_store = get_attackstore(attackirreporting)
+    assert list(obj_attack_store["versions"]) == ["12.1", "13.1"]
+    list_keys_12 = obj_attack_store["versions"]["12.1"]["keys"]
+    list_keys_13 = obj_attack_store["versions"]["13.1"]["keys"]
+    assert len(list_keys_12) == len(list_keys_13)
+    # Only the changed (Sub-)Technique is stored twice
+    assert set(list_keys_12) ^ set(list_keys_13) == {(technique_id, "2022-10-25T14:00:00.188Z"), (technique_id, "2023-04-25T14:00:00.188Z")}
+    assert len(obj_attack_store["objects"]) == len(list_keys_13) + 1
+    # The repeated strings of the stored objects are single instances
+    list_techniques = [obj for obj in obj_attack_store["objects"].values() if obj["type"] == "attack-pattern" and obj["id"] != technique_id]
+    assert list_techniques[0]["type"] is list_techniques[1]["type"]
+    assert list_techniques[0]["modified"] is list_techniques[1]["modified"]
+    assert list_techniques[0]["kill_chain_phases"][0]["kill_chain_name"] is list_techniques[1]["kill_chain_phases"][0]["kill_chain_name"]
+
+
+def test_attackstore_knowledgebase_versions(attackirreporting, attackirresources):
+    technique_id = new_attackstore_versions(attackirreporting)
+    obj_attack_knowledgebase_12 = attackirreporting.get_attackstore_knowledgebase("12.1")
+    obj_attack_knowledgebase_13 = attackirreporting.get_attackstore_knowledgebase("v13.1")
+    for attack_version, obj_attack_knowledgebase_version in (("12.1", obj_attack_knowledgebase_12), ("13.1", obj_attack_knowledgebase_13)):
+        assert obj_attack_knowledgebase_version == attackirreporting.new_attackknowledgebase(attackirreporting.get_attackbundle_objects(attackirreporting.get_attackstore_file(attack_version), attackirreporting.list_attackknowledgebase_types))
+    assert obj_attack_knowledgebase_12["objects_by_id"][technique_id]["description"] == "Adversaries may perform the technique of version 12.1."
+    assert obj_attack_knowledgebase_13["objects_by_id"][technique_id] is attackirreporting.obj_attack_knowledgebase["objects_by_id"][technique_id]
+    # The unchanged objects are the single instances shared by the versions
+    assert all(obj is obj_attack_knowledgebase_13["objects_by_id"][obj_id] for obj_id, obj in obj_attack_knowledgebase_12["objects_by_id"].items() if obj_id != technique_id)
+    assert attackirreporting.get_attackstore_knowledgebase("V12.1") is obj_attack_knowledgebase_12
+    assert attackirreporting.get_attackstore_knowledgebase("13.1") is obj_attack_knowledgebase_13
+
+
+def test_attackstore_pinned_case(attackirreporting, attackirresources):
+    new_attackstore_versions(attackirreporting)
+    session = attackirreporting.CaseSession("pinned", attack_version="12.1")
+    session.set_attack_empty(attackirresources[0], tactic_pairs={})
+    assert session.array_obj_sorted_construct[0]["attack_description"] == "Adversaries may perform the technique of version 12.1."
+    session = attackirreporting.CaseSession("current")
+    session.set_attack_empty(attackirresources[0], tactic_pairs={})
+    assert session.array_obj_sorted_construct[0]["attack_description"].startswith("Adversaries may perform synthetic technique 0.")
+
+
+def test_attackstore_reload_and_removed_version(attackirreporting, attackirbenchmark, attackirresources):
+    new_attackstore_versions(attackirreporting)
+    obj_attack_knowledgebase_12 = attackirreporting.get_attackstore_knowledgebase("12.1")
+    module = attackirbenchmark.get_attackirreporting(os.getcwd())
+    module.get_resources_content()
+    assert module.get_attackstore_knowledgebase("12.1") == obj_attack_knowledgebase_12
+    os.remove(module.get_attackstore_file("12.1"))
+    obj_attack_store = get_attackstore(module)
+    assert list(obj_attack_store["versions"]) == ["13.1"]
+    assert set(obj_attack_store["objects"]) == set(obj_attack_store["versions"]["13.1"]["keys"])
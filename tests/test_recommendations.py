@@ -0,0 +1,41 @@
+import os
+import zipfile
+
+import pytest
+
+
+def get_recommendations_documents(module, list_attack_ids, ciscontrols, nistcontrols, parallel):
+    """
+    This function writes the recommendations documents of a case and returns the session with the document part of every document by file name.
+    """
+    session = module.CaseSession()
+    session.set_attack_empty(";".join(list_attack_ids), tactic_pairs={})
+    session.new_attackrecommendations("Parallel case", ciscontrols, nistcontrols, interactive=False, parallel=parallel)
+    dict_documents = {}
+    for file_name in sorted(os.listdir(session.get_case_path())):
+        if file_name.endswith(".docx"):
+            with zipfile.ZipFile(os.path.join(session.get_case_path(), file_name)) as file_docx:
+                dict_documents[file_name] = file_docx.read("word/document.xml")
+    return session, dict_documents
+
+
+@pytest.mark.parametrize("ciscontrols, nistcontrols", [(True, False), (False, True), (True, True)])
+def test_recommendations_parallel_identical(attackirreporting, attackirresources, ciscontrols, nistcontrols):
+    list_attack_ids = attackirresources[:20]
+    sequential_session, dict_sequential_documents = get_recommendations_documents(attackirreporting, list_attack_ids, ciscontrols, nistcontrols, parallel=False)
+    parallel_session, dict_parallel_documents = get_recommendations_documents(attackirreporting, list_attack_ids, ciscontrols, nistcontrols, parallel=True)
+    assert list(dict_sequential_documents) == ["parallel_case_detections.docx", "parallel_case_introduction.docx", "parallel_case_mitigations.docx", "parallel_case_validations.docx"]
+    assert dict_parallel_documents == dict_sequential_documents
+    assert set(sequential_session.dict_document_timings) == set(parallel_session.dict_document_timings) == {"introduction", "mitigations", "detections", "validations"}
+
+
+def test_recommendations_parallel_content(attackirreporting, attackirresources):
+    list_attack_ids = attackirresources[:5]
+    session, dict_documents = get_recommendations_documents(attackirreporting, list_attack_ids, True, False, parallel=True)
+    assert session.array_obj_sorted_mitigations
+    for mitigation in session.array_obj_sorted_mitigations:
+        assert mitigation["external_id"].encode() in dict_documents["parallel_case_mitigations.docx"]
+    for attack_id in list_attack_ids:
+        assert attack_id.encode() in dict_documents["parallel_case_introduction.docx"]
+        assert attack_id.encode() in dict_documents["parallel_case_detections.docx"]
+    assert all(timing > 0 for timing in session.dict_document_timings.values())
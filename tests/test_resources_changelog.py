@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+
+
+def new_stored_case(module, case_directory, list_attack_ids, attack_version=None):
+    session = module.CaseSession(case_directory, attack_version=attack_version)
+    session.set_attack_empty(";".join(list_attack_ids), tactic_pairs={})
+    session.new_attacknavigatorlayer()
+    return session
+
+
+def get_attackbundle_technique(obj_bundle, attack_id):
+    return next(obj for obj in obj_bundle["objects"] if obj["type"] == "attack-pattern" and obj["external_references"][0]["external_id"] == attack_id)
+
+
+def get_resources_changelog(module):
+    with open(module.file_json_helper_resources_changelog, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_resources_changelog_attackbundle(attackirreporting, attackirresources):
+    os.makedirs(attackirreporting.attack_versions_path)
+    shutil.copyfile(attackirreporting.file_json_helper_enterprise_attack, os.path.join(attackirreporting.attack_versions_path, "enterprise-attack-13.1.json"))
+    new_stored_case(attackirreporting, "case_revoked", attackirresources[0:2])
+    new_stored_case(attackirreporting, "case_changed", attackirresources[2:5])
+    new_stored_case(attackirreporting, "case_unchanged", attackirresources[6:9])
+    new_stored_case(attackirreporting, "case_pinned", attackirresources[0:5], attack_version="13.1")
+    with open(attackirreporting.file_json_helper_enterprise_attack, "r", encoding="utf-8") as f:
+        obj_bundle = json.load(f)
+    obj_revoked = get_attackbundle_technique(obj_bundle, attackirresources[0])
+    obj_revoked["revoked"] = True
+    obj_revoked["modified"] = "2030-01-01T00:00:00.000Z"
+    obj_changed = get_attackbundle_technique(obj_bundle, attackirresources[3])
+    obj_changed["description"] += " Changed."
+    obj_changed["modified"] = "2030-01-01T00:00:00.000Z"
+    obj_bundle["objects"].append({"type": "attack-pattern", "id": "attack-pattern--00000000-0000-4000-8000-000000001999", "modified": "2030-01-01T00:00:00.000Z", "name": "Added Technique", "kill_chain_phases": [{"kill_chain_name": "mitre-attack", "phase_name": "execution"}], "external_references": [{"source_name": "mitre-attack", "external_id": "T1999"}]})
+    with open(attackirreporting.file_json_helper_enterprise_attack, "w", encoding="utf-8") as f:
+        json.dump(obj_bundle, f)
+    obj_compiled_resources = attackirreporting.get_resources_cache()
+    assert "T1999" in obj_compiled_resources["obj_attack_knowledgebase"]["active_attack_ids"]
+    array_obj_changelog = get_resources_changelog(attackirreporting)
+    assert len(array_obj_changelog) == 1
+    obj_changelog_entry = array_obj_changelog[0]
+    assert list(obj_changelog_entry["resources"]) == ["helper_enterprise_attack.json"]
+    assert obj_changelog_entry["attack"] == {"added": 1, "changed": 1, "revoked": 1, "deprecated": 0, "removed": 0}
+    assert obj_changelog_entry["techniques"] == {
+        attackirresources[0]: [{"change": "revoked", "type": "attack-pattern", "object": attackirresources[0] + " Synthetic Technique 0"}],
+        attackirresources[3]: [{"change": "changed", "type": "attack-pattern", "object": attackirresources[3] + " Synthetic Technique 3"}]
+    }
+    assert [(os.path.basename(obj_case["case_path"]), obj_case["attack_ids"]) for obj_case in obj_changelog_entry["stale_cases"]] == [("case_changed", [attackirresources[3]]), ("case_revoked", [attackirresources[0]])]
+    assert [(os.path.basename(obj_case["case_path"]), obj_case["attack_version"]) for obj_case in obj_changelog_entry["pinned_cases"]] == [("case_pinned", "13.1")]
+
+
+def test_resources_changelog_atomicred(attackirreporting, attackirresources):
+    new_stored_case(attackirreporting, "case_atomicred", attackirresources[0:3])
+    with open(attackirreporting.file_json_helper_atomicred_mapping_array, "r", encoding="utf-8") as f:
+        obj_atomicred = json.load(f)
+    obj_atomicred["techniques"] = [technique for technique in obj_atomicred["techniques"] if technique["techniqueID"] != attackirresources[0]]
+    with open(attackirreporting.file_json_helper_atomicred_mapping_array, "w", encoding="utf-8") as f:
+        json.dump(obj_atomicred, f)
+    attackirreporting.get_resources_cache()
+    obj_changelog_entry = get_resources_changelog(attackirreporting)[0]
+    assert list(obj_changelog_entry["resources"]) == ["helper_atomicred_attack_mapping.json"]
+    assert obj_changelog_entry["attack"] is None
+    assert obj_changelog_entry["techniques"] == {attackirresources[0]: [{"change": "changed", "type": "atomic_red_team", "object": attackirresources[0]}]}
+    assert [(os.path.basename(obj_case["case_path"]), obj_case["attack_ids"]) for obj_case in obj_changelog_entry["stale_cases"]] == [("case_atomicred", [attackirresources[0]])]
+    assert obj_changelog_entry["pinned_cases"] == []
+
+
+def test_resources_changelog_unchanged(attackirreporting, attackirresources):
+    new_stored_case(attackirreporting, "case_unchanged", attackirresources[0:3])
+    attackirreporting.get_resources_cache()
+    assert not os.path.isfile(attackirreporting.file_json_helper_resources_changelog)
@@ -0,0 +1,66 @@
+import json
+
+
+def get_attackbundle(module):
+    with open(module.file_json_helper_enterprise_attack, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_attackbundle_replacements(obj_bundle):
+    """
+    This function returns the ATT&CK(r) ID each revoked (Sub-)Technique of a bundle is revoked by, read from its "revoked-by" relationship.
+    """
+    dict_obj_objects = {obj["id"]: obj for obj in obj_bundle["objects"]}
+    return {dict_obj_objects[obj["source_ref"]]["external_references"][0]["external_id"]: dict_obj_objects[obj["target_ref"]]["external_references"][0]["external_id"] for obj in obj_bundle["objects"] if obj.get("relationship_type") == "revoked-by"}
+
+
+def test_techniques_bulk_resolution(attackirreporting, attackirresources):
+    list_separators = [";", ",", " ", ";\n", ", "]
+    list_obj_attack_techniques = "".join((attack_id.lower() if index % 2 else attack_id) + list_separators[index % len(list_separators)] for index, attack_id in enumerate(attackirresources))
+    list_resolved_attack_ids, dict_replaced_attack_ids, dict_invalid_attack_ids = attackirreporting.get_attacktechniques_resolved(list_obj_attack_techniques)
+    assert list_resolved_attack_ids == attackirresources
+    assert dict_replaced_attack_ids == {}
+    assert dict_invalid_attack_ids == {}
+    assert attackirreporting.get_attacktechniques_resolved(list(attackirresources)) == (attackirresources, {}, {})
+
+
+def test_techniques_revoked_replacement(attackirreporting, attackirresources):
+    dict_replacements = get_attackbundle_replacements(get_attackbundle(attackirreporting))
+    assert list(dict_replacements) == ["T0900"]
+    list_resolved_attack_ids, dict_replaced_attack_ids, dict_invalid_attack_ids = attackirreporting.get_attacktechniques_resolved("t0900;" + attackirresources[0])
+    assert list_resolved_attack_ids == [dict_replacements["T0900"], attackirresources[0]]
+    assert dict_replaced_attack_ids == {"t0900": dict_replacements["T0900"]}
+    assert dict_invalid_attack_ids == {}
+    session = attackirreporting.CaseSession()
+    session.set_attack_empty("T0900", tactic_pairs={})
+    assert [technique["attack_id"] for technique in session.array_obj_sorted_construct] == [dict_replacements["T0900"]]
+
+
+def test_techniques_revoked_chain(attackirreporting, attackirresources):
+    # A technique revoked by a revoked technique resolves to the active end of the chain
+    obj_bundle = get_attackbundle(attackirreporting)
+    obj_revoked = next(obj for obj in obj_bundle["objects"] if obj["type"] == "attack-pattern" and obj["external_references"][0]["external_id"] == "T0900")
+    obj_bundle["objects"].append({"type": "attack-pattern", "id": "attack-pattern--00000000-0000-4000-8000-000000000001", "name": "Revoked Technique Chain", "revoked": True, "external_references": [{"source_name": "mitre-attack", "external_id": "T0950"}]})
+    obj_bundle["objects"].append({"type": "relationship", "id": "relationship--00000000-0000-4000-8000-000000000001", "relationship_type": "revoked-by", "source_ref": "attack-pattern--00000000-0000-4000-8000-000000000001", "target_ref": obj_revoked["id"]})
+    with open(attackirreporting.file_json_helper_enterprise_attack, "w", encoding="utf-8") as f:
+        json.dump(obj_bundle, f)
+    attackirreporting.get_resources_content()
+    replacement_id = get_attackbundle_replacements(obj_bundle)["T0900"]
+    assert attackirreporting.get_attacktechniques_resolved("T0950") == ([replacement_id], {"T0950": replacement_id}, {})
+
+
+def test_techniques_suggestions(attackirreporting, attackirresources):
+    assert attackirreporting.get_attacktechniques_suggestions("T100") == ["T1000", "T1000.001", "T1000.002"]
+    assert attackirreporting.get_attacktechniques_suggestions("t1003.009") == ["T1003.001", "T1003.002"]
+    assert attackirreporting.get_attacktechniques_suggestions("T1003.009", limit=1) == ["T1003.001"]
+    # A partial name suggests the (Sub-)Techniques whose name starts with it
+    assert attackirreporting.get_attacktechniques_suggestions("Synthetic Technique 5") == [attackirresources[5], attackirresources[50], attackirresources[51]]
+    assert attackirreporting.get_attacktechniques_suggestions("T9999") == []
+
+
+def test_techniques_invalid_suggestions(attackirreporting, attackirresources):
+    list_resolved_attack_ids, dict_replaced_attack_ids, dict_invalid_attack_ids = attackirreporting.get_attacktechniques_resolved(["T1000", "T1003.009", "T9999", "T9999"])
+    assert list_resolved_attack_ids == ["T1000"]
+    assert dict_replaced_attack_ids == {}
+    assert dict_invalid_attack_ids == {"T1003.009": ["T1003.001", "T1003.002"], "T9999": []}
+    assert attackirreporting.get_attacktechniques_resolved(" ; ") == ([], {}, {"": []})